@@ -119,6 +119,33 @@ def create_shell_commands_for_local_execution(arguments,
     return shell_commands
 
 
+####################################################################################################
+# @run_local_target_batch
+####################################################################################################
+def run_local_target_batch(arguments):
+    """Processes a target with a pool of local workers. Each worker is a Blender process that opens
+    the circuit once and streams its share of the morphologies of the target.
+
+    :param arguments:
+        Command line arguments.
+    """
+
+    # Launch the workers in parallel
+    workers = list()
+    for worker_index in range(max(1, arguments.batch_workers)):
+
+        # The commands of the worker are executed one after the other
+        shell_commands = arguments_parser.create_executable_for_worker(arguments, worker_index)
+        shell_command = ' ; '.join(shell_commands)
+
+        print('RUNNING: ' + shell_command)
+        workers.append(subprocess.Popen(shell_command, shell=True))
+
+    # Wait for all the workers to finish
+    for worker in workers:
+        worker.wait()
+
+
 ####################################################################################################
 # @run_local_neuromorphovis
 ####################################################################################################
@@ -129,9 +156,20 @@ def run_local_neuromorphovis(arguments):
         Command line arguments.
     """
 
-    # Target and GID options are only available on the BBP visualization clusters
-    if arguments.input == 'target' or arguments.input == 'gid':
-        print('ERROR, Target and GID options are only available on the BBP visualization clusters')
+    # A target is processed in batch mode by a pool of local workers
+    if arguments.input == 'target':
+
+        # Ensure a valid blue config and a target
+        if arguments.blue_config is None or arguments.target is None:
+            print('ERROR: Empty circuit configuration file or target')
+            exit(0)
+
+        # Run the workers
+        run_local_target_batch(arguments=arguments)
+
+    # The GID option is only available on the BBP visualization clusters
+    elif arguments.input == 'gid':
+        print('ERROR, GID option is only available on the BBP visualization clusters')
         exit(0)
 
     # Load morphology files (.H5 or .SWC)
@@ -207,6 +245,11 @@ def run_cluster_neuromorphovis(arguments):
             print('ERROR: Empty circuit configuration file or target')
             exit(0)
 
+        # Batch mode, a job per worker that streams its share of the target
+        if arguments.target_batch:
+            slurm.run_target_batch_jobs_on_cluster(arguments=arguments)
+            return
+
         # Import brain
         try:
             import brain
@@ -108,19 +108,16 @@ def confirm_object_bounding_box(scene_object):
         The bounding box of the given object.
     """
 
-    # Compute the bounding box of the object from the vertices
-    box = scene_object.bound_box
-
-    # Compute the bounding box from the vertices of the object
-    verts = list()
-    verts.append((box[0][0], box[0][1], box[0][2]))
-    verts.append((box[1][0], box[1][1], box[1][2]))
-    verts.append((box[2][0], box[2][1], box[2][2]))
-    verts.append((box[3][0], box[3][1], box[3][2]))
-    verts.append((box[4][0], box[4][1], box[4][2]))
-    verts.append((box[5][0], box[5][1], box[5][2]))
-    verts.append((box[6][0], box[6][1], box[6][2]))
-    verts.append((box[7][0], box[7][1], box[7][2]))
+    # The transformation of the object, the basis matrix is computed from the location, the
+    # rotation and the scale of the object, so it is valid even before the scene is updated
+    if scene_object.parent is None:
+        matrix_world = scene_object.matrix_basis
+    else:
+        matrix_world = scene_object.matrix_world
+
+    # The corners of the local bounding box of the object, transformed to the world coordinates
+    verts = [matrix_world * Vector((corner[0], corner[1], corner[2]))
+             for corner in scene_object.bound_box]
 
     # Initialize the min and max points
     p_min = Vector((10000000, 10000000, 10000000))
@@ -140,13 +137,6 @@ def confirm_object_bounding_box(scene_object):
         if verts[point][2] > p_max[2]:
             p_max[2] = verts[point][2]
 
-    # Get object location
-    location = scene_object.location
-
-    # Adjust the bounding box transform
-    p_min += location
-    p_max += location
-
     # Build bounding box object
     bounding_box = nmv.bbox.BoundingBox(p_min=p_min, p_max=p_max)
 
@@ -448,9 +438,8 @@ def draw_bounding_box(bbox,
             color=(1, 0, 0), name=line_name)
         line_list.append(line)
 
-    # Convert the lines to meshes
-    for i in range(len(line_list)):
-        line_list[i] = nmv.scene.ops.convert_object_to_mesh(line_list[i])
+    # Convert the lines to meshes in a single pass
+    line_list = nmv.scene.ops.convert_objects_to_meshes(line_list)
 
     # Union them into a single mesh object
     bbox_mesh = nmv.mesh.ops.join_mesh_objects(line_list, name=name)
@@ -65,24 +65,12 @@ def get_nearest_face_index(bmesh_object,
         The index of the nearest face in the bmesh object to the point.
     """
 
-    # Compute the shortest distance between the point and the centroid of all the faces of the
-    # bmesh object, and return the index of the nearest face.
-    nearest_face_index = -1
-    shortest_distance = nmv.consts.Math.INFINITY
-
-    # Iterate over all the faces in the bmesh object
-    for face in bmesh_object.faces[:]:
-
-        # Compute the distance between the face center and the point
-        distance = (point - face.calc_center_median()).length
-
-        # Update the shortest distance
-        if distance < shortest_distance:
-            shortest_distance = distance
-            nearest_face_index = face.index
+    # Query the spatial index of the face centroids of the bmesh object
+    nearest_face_index, _ = nmv.geometry.get_bmesh_faces_spatial_index(
+        bmesh_object).find_nearest(point)
 
-    # Return the index of the nearest face to the point
-    return nearest_face_index
+    # Return the index of the nearest face to the point, or -1 if the object has no faces
+    return -1 if nearest_face_index is None else nearest_face_index
 
 
 ####################################################################################################
@@ -143,27 +131,12 @@ def get_nearest_face_index_from_list(bmesh_object,
         The index of the nearest face to the given point.
     """
 
-    # Compute the shortest distance between the point and the centroid of all the given face of
-    # the bmesh object, and return the index of the nearest face.
-    nearest_face_index = -1
-    shortest_distance = nmv.consts.Math.INFINITY
-
-    # Iterate over all the indices in the list and retrieve the faces
-    for face_index in faces_indices:
-
-        # Retrieve the face from its index
-        face = get_face_from_index(bmesh_object, face_index)
-
-        # Compute the distance between the face center and the point
-        distance = (point - face.calc_center_median()).length
-
-        # Update the shortest distance
-        if distance < shortest_distance:
-            shortest_distance = distance
-            nearest_face_index = face.index
+    # Query the spatial index of the face centroids of the bmesh object on the given faces only
+    nearest_face_index, _ = nmv.geometry.get_bmesh_faces_spatial_index(
+        bmesh_object).find_nearest_in_subset(point, faces_indices)
 
-    # Return the index of the nearest face to the point
-    return nearest_face_index
+    # Return the index of the nearest face to the point, or -1 if the list is empty
+    return -1 if nearest_face_index is None else nearest_face_index
 
 
 ####################################################################################################
@@ -196,6 +169,9 @@ def merge_faces_into_one_face(bmesh_object,
     final_face_dict = bmesh.ops.contextual_create(
         bmesh_object, geom=faces_to_be_merged)
 
+    # The faces of the object have changed, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
     # Return the index of the resulting face from the merge operation
     return final_face_dict['faces'][0].index
 
@@ -239,6 +215,9 @@ def rotate_face_in_object_towards_point(bmesh_object,
         # Transform
         vertex.co = matrix_object * vertex.co
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 ####################################################################################################
 # @rotate_face_from_center_to_point
 ####################################################################################################
@@ -278,6 +257,9 @@ def rotate_face_from_center_to_point(bmesh_object,
     # Rotate the face
     bmesh.ops.rotate(bmesh_object, cent=face_center, matrix=rotation_matrix, verts=face.verts[:])
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 
 ####################################################################################################
 # @rotate_face_from_point_to_point
@@ -314,6 +296,9 @@ def rotate_face_from_point_to_point(bmesh_object,
     bmesh.ops.rotate(bmesh_object, verts=face.verts[:], cent=Vector((0, 0, 0)),
                      matrix=rotation_matrix)
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 
 ####################################################################################################
 # @extrude_face_to_face
@@ -330,8 +315,13 @@ def extrude_face_to_face(bmesh_object,
         The index of the extruded face.
     """
 
-    # Return a reference to the extruded face
+    # Extrude the face
     extruded_face_dict = bmesh.ops.extrude_discrete_faces(bmesh_object, faces=[face])
+
+    # The faces of the object have changed, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
+    # Return a reference to the extruded face
     return extruded_face_dict['faces'][0]
 
 
@@ -517,6 +507,9 @@ def subdivide_face(bmesh_object,
     subdivided_faces = bmesh.ops.subdivide_edges(bmesh_object, edges=edges, cuts=cuts,
                                                  use_grid_fill=True)
 
+    # The faces of the object have changed, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
     # Filter the faces from the dictionary and get their indices
     subdivided_faces_indices = []
     for i in subdivided_faces['geom']:
@@ -569,6 +562,9 @@ def subdivide_faces(bmesh_object,
     subdivided_faces = bmesh.ops.subdivide_edges(bmesh_object, edges=edges, cuts=cuts,
                                                  use_grid_fill=True)
 
+    # The faces of the object have changed, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
     # Filter the faces from the dictionary and get their indices
     subdivided_faces_indices = []
     for i in subdivided_faces['geom']:
@@ -758,6 +754,9 @@ def set_face_radius(bmesh_object,
     face.verts[2].co = new_p_2
     face.verts[3].co = new_p_3
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
     return
 
 
@@ -885,6 +884,9 @@ def map_face_to_circle(bmesh_object,
                 nearest_vertex = mapping_vertex
         face_vertex.co = nearest_vertex.co
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 
 ####################################################################################################
 # @convert_face_to_circle
@@ -920,6 +922,9 @@ def convert_face_to_circle(bmesh_object,
         # Compute the mapping point along that direction and set the vertex coordinates to it
         vertex.co = face_center + direction * face_radius
 
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 
 ####################################################################################################
 # @retrieve_face_vertices_as_list
@@ -990,3 +995,6 @@ def scale_face(bmesh_object,
 
         # Compute the mapping point along that direction and set the vertex coordinates to it
         vertex.co = face_center + direction * scale_factor
+
+    # The face centroids have moved, invalidate the spatial index of the object
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
@@ -19,6 +19,10 @@
 import bpy
 import bmesh
 
+# Internal imports
+import nmv
+import nmv.geometry
+
 
 ####################################################################################################
 # @convert_to_mesh_object
@@ -135,6 +139,9 @@ def delete_bmesh(bmesh_object):
     """
     bmesh.ops.delete(bmesh_object, geom=bmesh_object.faces)
 
+    # The object is empty, release its spatial index
+    nmv.geometry.invalidate_spatial_index(bmesh_object)
+
 
 ####################################################################################################
 # @delete_bmesh_list
@@ -20,3 +20,5 @@ from .meta_builder import *
 from .piecewise_builder import *
 from .union_builder import *
 from .skinning_builder import *
+from .sdf_builder import *
+from .arbors_workers import *
@@ -0,0 +1,468 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import sys
+import copy
+import copyreg
+import heapq
+import pickle
+import shutil
+import subprocess
+import tempfile
+
+# Blender imports
+import bpy
+from mathutils import Vector
+
+# Internal imports
+import nmv
+import nmv.builders
+import nmv.consts
+import nmv.file
+
+
+####################################################################################################
+# @reduce_vector
+####################################################################################################
+def reduce_vector(vector):
+    """Reduces a mathutils vector to its components, the samples of the arbors are pickled with
+    their points when they are sent to the workers.
+
+    :param vector:
+        A given vector.
+    :return:
+        A tuple of the constructor of the vector and its arguments.
+    """
+
+    return Vector, (tuple(vector),)
+
+
+# Pickle the vectors by their components
+copyreg.pickle(Vector, reduce_vector)
+
+
+####################################################################################################
+# @get_builder_arbors
+####################################################################################################
+def get_builder_arbors(builder):
+    """Returns the arbors of the morphology of a builder that are not ignored, with their names,
+    their maximum branching orders and their materials.
+
+    :param builder:
+        An object of the builder that is used to reconstruct the neuron mesh.
+    :return:
+        A list of tuples (key, root, name, max_branching_order, materials) of the arbors.
+    """
+
+    arbors = list()
+
+    # Apical dendrite
+    if not builder.options.morphology.ignore_apical_dendrite:
+        if builder.morphology.apical_dendrite is not None:
+            arbors.append(('apical_dendrite', builder.morphology.apical_dendrite,
+                           nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
+                           builder.options.morphology.apical_dendrite_branch_order,
+                           builder.apical_dendrites_materials))
+
+    # Basal dendrites
+    if not builder.options.morphology.ignore_basal_dendrites:
+        if builder.morphology.dendrites is not None:
+            for i, basal_dendrite in enumerate(builder.morphology.dendrites):
+                arbors.append(('basal_dendrite_%d' % i, basal_dendrite,
+                               '%s_%d' % (nmv.consts.Arbors.BASAL_DENDRITES_PREFIX, i),
+                               builder.options.morphology.basal_dendrites_branch_order,
+                               builder.basal_dendrites_materials))
+
+    # Axon
+    if not builder.options.morphology.ignore_axon:
+        if builder.morphology.axon is not None:
+            arbors.append(('axon', builder.morphology.axon, nmv.consts.Arbors.AXON_PREFIX,
+                           builder.options.morphology.axon_branch_order,
+                           builder.axon_materials))
+
+    # Return the arbors
+    return arbors
+
+
+####################################################################################################
+# @get_arbor_number_samples
+####################################################################################################
+def get_arbor_number_samples(root,
+                             max_branching_order):
+    """Counts the samples of an arbor up to a given branching order, as an estimate of the work
+    needed to build its mesh.
+
+    :param root:
+        The root section of the arbor.
+    :param max_branching_order:
+        The maximum branching order of the arbor.
+    :return:
+        The number of samples.
+    """
+
+    number_samples = 0
+    stack = [(root, 0)]
+    while stack:
+        section, level = stack.pop()
+        if level >= max_branching_order:
+            continue
+        number_samples += len(section.samples)
+        stack.extend((child, level + 1) for child in section.children)
+    return number_samples
+
+
+####################################################################################################
+# @split_arbor
+####################################################################################################
+def split_arbor(root,
+                max_branching_order,
+                target_samples):
+    """Splits an arbor into sub-trees of about target_samples samples, to balance the work of the
+    workers when an arbor, typically the axon, is much larger than the others.
+
+    The arbor is traversed bottom-up, and at every branching point the largest sub-trees are cut
+    until the remaining part is small enough. Only the sub-trees of the children that are not the
+    first one are cut, since the first child continues the poly-line of its parent, while the other
+    children start new ones, so the meshes of the pieces are the same as the meshes of the arbor.
+
+    :param root:
+        The root section of the arbor.
+    :param max_branching_order:
+        The maximum branching order of the arbor.
+    :param target_samples:
+        The target number of samples of every piece.
+    :return:
+        A list of tuples (path, branching_level, samples) of the pieces, where the path is the list
+        of the indices of the children from the root of the arbor to the root of the piece, and the
+        branching level is the number of sections above it. The first piece is the root one.
+    """
+
+    # The sections in a depth-first order, with their paths, within the branching order
+    sections = list()
+    stack = [(root, (), 0)]
+    while stack:
+        section, path, level = stack.pop()
+        if level >= max_branching_order:
+            continue
+        sections.append((section, path, level))
+        for i, child in enumerate(section.children):
+            stack.append((child, path + (i,), level + 1))
+
+    # The samples of the pieces that are not cut yet, bottom-up
+    remaining_samples = dict()
+    pieces = list()
+    for section, path, level in reversed(sections):
+        samples = len(section.samples)
+        children = [(remaining_samples[path + (i,)], path + (i,))
+                    for i in range(len(section.children)) if path + (i,) in remaining_samples]
+        samples += sum(child_samples for child_samples, _ in children)
+
+        # Cut the largest children, except the first one, until the piece is small enough
+        for child_samples, child_path in sorted(children, reverse=True):
+            if samples <= target_samples:
+                break
+            if child_path[-1] == 0:
+                continue
+            pieces.append((child_path, level + 1, child_samples))
+            samples -= child_samples
+
+        remaining_samples[path] = samples
+
+    # The root piece first
+    return [((), 0, remaining_samples[()])] + pieces[::-1]
+
+
+####################################################################################################
+# @get_arbors_tasks
+####################################################################################################
+def get_arbors_tasks(builder,
+                     parameters,
+                     number_workers,
+                     split_arbors=False):
+    """Creates the tasks of the workers that build the arbors of a builder.
+
+    :param builder:
+        An object of the builder that is used to reconstruct the neuron mesh.
+    :param parameters:
+        A dictionary of the parameters of the builder that are passed to every task.
+    :param number_workers:
+        The number of workers.
+    :param split_arbors:
+        Split the large arbors into pieces, if the builder can build the pieces independently.
+    :return:
+        A tuple (tasks, arbors) of a list of the tasks and a dictionary of the roots of the arbors.
+    """
+
+    arbors = get_builder_arbors(builder)
+
+    # Balance the arbors to the workers
+    target_samples = None
+    if split_arbors:
+        total_samples = sum(
+            get_arbor_number_samples(root, max_branching_order)
+            for _, root, _, max_branching_order, _ in arbors)
+        target_samples = max(1, total_samples // number_workers)
+
+    tasks = list()
+    for key, root, name, max_branching_order, materials in arbors:
+
+        # The pieces of the arbor
+        if split_arbors:
+            pieces = split_arbor(root, max_branching_order, target_samples)
+        else:
+            pieces = [((), 0, get_arbor_number_samples(root, max_branching_order))]
+
+        # The cuts of every piece are the roots of the pieces below it
+        for path, branching_level, samples in pieces:
+            cuts = [cut for cut, _, _ in pieces
+                    if len(cut) > len(path) and cut[:len(path)] == path]
+            tasks.append({'index': len(tasks),
+                          'arbor': key,
+                          'path': path,
+                          'cuts': cuts,
+                          'branching_level': branching_level,
+                          'name': name,
+                          'max_branching_order': max_branching_order,
+                          'materials': [material.name for material in materials],
+                          'samples': samples,
+                          'parameters': parameters})
+
+    # Return the tasks and the arbors
+    return tasks, {key: root for key, root, _, _, _ in arbors}
+
+
+####################################################################################################
+# @get_task_section
+####################################################################################################
+def get_task_section(root,
+                     task):
+    """Returns the root section of the piece of an arbor of a task, after detaching the sections
+    of the pieces below it that are built by the other tasks.
+
+    NOTE: The arbor is modified, so this must be called on a copy of the arbor.
+
+    :param root:
+        The root section of the arbor.
+    :param task:
+        The task.
+    :return:
+        The root section of the piece.
+    """
+
+    # Find the sections before detaching any of them
+    def get_section(path):
+        section = root
+        for i in path:
+            section = section.children[i]
+        return section
+
+    section = get_section(task['path'])
+    cut_sections = [get_section(cut) for cut in task['cuts']]
+
+    # Detach the cut sections
+    for cut_section in cut_sections:
+        if cut_section.parent is not None and cut_section in cut_section.parent.children:
+            cut_section.parent.children.remove(cut_section)
+
+    # Return the root of the piece
+    return section
+
+
+####################################################################################################
+# @dump_arbors_tasks
+####################################################################################################
+def dump_arbors_tasks(data,
+                      file_path):
+    """Writes the data of a worker to a file.
+
+    The arbors are deep trees of sections, so the recursion limit is raised while pickling them.
+
+    :param data:
+        A dictionary of the data of the worker.
+    :param file_path:
+        The path to the file.
+    """
+
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, 100000))
+    try:
+        with open(file_path, 'wb') as tasks_file:
+            pickle.dump(data, tasks_file, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+
+####################################################################################################
+# @load_arbors_tasks
+####################################################################################################
+def load_arbors_tasks(file_path):
+    """Reads the data of a worker from a file.
+
+    :param file_path:
+        The path to the file.
+    :return:
+        A dictionary of the data of the worker.
+    """
+
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, 100000))
+    try:
+        with open(file_path, 'rb') as tasks_file:
+            return pickle.load(tasks_file)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+
+####################################################################################################
+# @get_task_materials
+####################################################################################################
+def get_task_materials(task):
+    """Returns the materials of a task in a worker. The worker does not have the materials of the
+    builder, it uses empty materials with the same names, which are replaced by the materials of
+    the builder when the meshes are imported back.
+
+    :param task:
+        The task.
+    :return:
+        A list of materials.
+    """
+
+    materials = list()
+    for name in task['materials']:
+        material = bpy.data.materials.get(name)
+        if material is None:
+            material = bpy.data.materials.new(name)
+        materials.append(material)
+    return materials
+
+
+####################################################################################################
+# @run_arbors_worker
+####################################################################################################
+def run_arbors_worker(tasks_file_path):
+    """The entry point of a worker process. The worker builds the arbors of its tasks and saves
+    their meshes to mesh cache files next to the tasks file.
+
+    :param tasks_file_path:
+        The path to the tasks file of the worker.
+    """
+
+    data = load_arbors_tasks(tasks_file_path)
+    output_directory = os.path.dirname(tasks_file_path)
+
+    # An instance of the builder, the tasks have all the parameters it needs
+    builder = getattr(nmv.builders, data['builder'])(None, None)
+
+    for task in data['tasks']:
+        nmv.logger.info('Task [%d]: %s' % (task['index'], task['name']))
+
+        # Build the piece of the arbor
+        section = get_task_section(data['arbors'][task['arbor']], task)
+        mesh_objects = builder.build_arbor_task(section, task, get_task_materials(task))
+
+        # Save the meshes, the cache file is renamed once it is complete
+        file_name = 'task_%d' % task['index']
+        nmv.file.write_mesh_cache_file(mesh_objects, output_directory, '%s.part' % file_name)
+        extension = nmv.consts.Meshing.MESH_CACHE_EXTENSION
+        os.rename('%s/%s.part%s' % (output_directory, file_name, extension),
+                  '%s/%s%s' % (output_directory, file_name, extension))
+
+
+####################################################################################################
+# @build_arbors_in_workers
+####################################################################################################
+def build_arbors_in_workers(builder,
+                            tasks,
+                            arbors,
+                            number_workers):
+    """Builds the arbors of a builder in background Blender processes.
+
+    The tasks are balanced between the workers by their number of samples, and every worker gets
+    a file with its tasks and the arbors they need. The meshes are sent back as mesh cache files
+    and imported into the scene. The tasks of a failing worker are built in this process.
+
+    :param builder:
+        An object of the builder that is used to reconstruct the neuron mesh. The builder must
+        implement build_arbor_task(section, task, materials).
+    :param tasks:
+        A list of the tasks.
+    :param arbors:
+        A dictionary of the roots of the arbors of the tasks.
+    :param number_workers:
+        The number of workers.
+    :return:
+        A list of the lists of the mesh objects of the tasks.
+    """
+
+    # Balance the tasks, the largest first to the least loaded worker
+    number_workers = max(1, min(number_workers, len(tasks)))
+    loads = [(0, i) for i in range(number_workers)]
+    workers_tasks = [list() for _ in range(number_workers)]
+    for task in sorted(tasks, key=lambda task: task['samples'], reverse=True):
+        load, worker = heapq.heappop(loads)
+        workers_tasks[worker].append(task)
+        heapq.heappush(loads, (load + task['samples'], worker))
+
+    # The directory of the files that are exchanged with the workers
+    directory = tempfile.mkdtemp(prefix='nmv_arbors_')
+    nmv_path = os.path.dirname(os.path.dirname(os.path.abspath(nmv.__file__)))
+
+    # Launch the workers
+    workers = list()
+    for i, worker_tasks in enumerate(workers_tasks):
+        tasks_file_path = '%s/worker_%d.tasks' % (directory, i)
+        dump_arbors_tasks(
+            {'builder': builder.__class__.__name__,
+             'tasks': worker_tasks,
+             'arbors': {task['arbor']: arbors[task['arbor']] for task in worker_tasks}},
+            tasks_file_path)
+        nmv.logger.info('Worker [%d]: %d tasks, %d samples' % (
+            i, len(worker_tasks), sum(task['samples'] for task in worker_tasks)))
+        workers.append(subprocess.Popen(
+            [bpy.app.binary_path, '-b', '--factory-startup', '--python-expr',
+             'import sys; sys.path.insert(0, %r); import nmv.builders; '
+             'nmv.builders.run_arbors_worker(%r)' % (nmv_path, tasks_file_path)],
+            stdout=subprocess.DEVNULL))
+
+    # Wait for all the workers
+    for worker in workers:
+        if worker.wait() != 0:
+            nmv.logger.log('WARNING: An arbors worker failed, its missing tasks are built here')
+
+    # Import the meshes of the tasks
+    tasks_objects = list()
+    for task in tasks:
+        file_name = 'task_%d%s' % (task['index'], nmv.consts.Meshing.MESH_CACHE_EXTENSION)
+        mesh_objects = None
+        if os.path.isfile('%s/%s' % (directory, file_name)):
+            mesh_objects = nmv.file.import_mesh_cache_file(directory, file_name)
+
+        # Build the missing task on a copy of the arbor, the arbor itself must not be modified
+        if mesh_objects is None:
+            section = get_task_section(copy.deepcopy(arbors[task['arbor']]), task)
+            mesh_objects = builder.build_arbor_task(
+                section, task, [bpy.data.materials[name] for name in task['materials']])
+
+        tasks_objects.append(mesh_objects)
+
+    # Clean the exchanged files
+    shutil.rmtree(directory, ignore_errors=True)
+
+    # Return the meshes of the tasks
+    return tasks_objects
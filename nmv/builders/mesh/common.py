@@ -87,6 +87,7 @@ def create_skeleton_materials(builder):
 ####################################################################################################
 # @modify_morphology_skeleton
 ####################################################################################################
+@nmv.utilities.profile_stage('skeleton.modify')
 def modify_morphology_skeleton(builder):
     """Modifies the morphology skeleton, if required. These modifications are generic and not
     specific to any builder. Specific modifications can be implemented as a function in the
@@ -112,6 +113,7 @@ def modify_morphology_skeleton(builder):
 ####################################################################################################
 # @reconstruct_soma_mesh
 ####################################################################################################
+@nmv.utilities.profile_stage('soma')
 def reconstruct_soma_mesh(builder):
     """Reconstruct the mesh of the soma.
 
@@ -233,6 +235,7 @@ def adjust_texture_mapping_of_all_meshes(builder, texspace_size=5.0):
 ####################################################################################################
 # @connect_arbors_to_soma
 ####################################################################################################
+@nmv.utilities.profile_stage('soma.connection')
 def connect_arbors_to_soma(builder):
     """Connects the root section of a given arbor to the soma at its initial segment.
 
@@ -284,6 +287,7 @@ def connect_arbors_to_soma(builder):
 ################################################################################################
 # @decimate_neuron_mesh
 ################################################################################################
+@nmv.utilities.profile_stage('decimation')
 def decimate_neuron_mesh(builder):
     """Decimates the reconstructed neuron mesh.
 
@@ -317,9 +321,35 @@ def decimate_neuron_mesh(builder):
         adjust_texture_mapping(neuron_mesh_objects)
 
 
+####################################################################################################
+# @report_neuron_mesh_topology
+####################################################################################################
+@nmv.utilities.profile_stage('topology')
+def report_neuron_mesh_topology(builder):
+    """Logs a quality report of the topology of every mesh object of the reconstructed neuron,
+    computed on the arrays of the meshes once the reconstruction is done.
+
+    :param builder:
+        An object of the builder that is used to reconstruct the neuron mesh.
+    :return:
+        A dictionary of the topology statistics of every mesh object, by name.
+    """
+
+    nmv.logger.header('Mesh Topology')
+
+    # The statistics of every mesh object
+    statistics = dict()
+    for mesh_object in get_neuron_mesh_objects(builder=builder, exclude_spines=True):
+        statistics[mesh_object.name] = nmv.mesh.ops.report_mesh_topology(mesh_object)
+
+    # Return the statistics
+    return statistics
+
+
 ####################################################################################################
 # @add_surface_noise_to_arbor
 ####################################################################################################
+@nmv.utilities.profile_stage('roughness')
 def add_surface_noise_to_arbor(builder):
     """Adds noise to the surface of the arbors of the reconstructed mesh(es).
 
@@ -373,6 +403,9 @@ def add_surface_noise_to_arbor(builder):
             # Deselect all the vertices
             nmv.mesh.ops.deselect_all_vertices(mesh_object=mesh_object)
 
+            # The vertices of the object have changed, invalidate its spatial indices
+            nmv.geometry.invalidate_spatial_index(mesh_object)
+
             # Decimate each mesh object
             nmv.mesh.ops.decimate_mesh_object(mesh_object=mesh_object, decimation_ratio=0.5)
 
@@ -383,6 +416,7 @@ def add_surface_noise_to_arbor(builder):
 ####################################################################################################
 # @add_spines_to_surface
 ####################################################################################################
+@nmv.utilities.profile_stage('spines')
 def add_spines_to_surface(builder,
                           join_spine_meshes=False):
     """Adds spines meshes to the surface mesh of the neuron.
@@ -423,6 +457,7 @@ def add_spines_to_surface(builder,
 ####################################################################################################
 # @join_mesh_object_into_single_object
 ####################################################################################################
+@nmv.utilities.profile_stage('join')
 def join_mesh_object_into_single_object(builder):
     """Join all the mesh objects in the scene into a single mesh.
 
@@ -449,6 +484,7 @@ def join_mesh_object_into_single_object(builder):
 ####################################################################################################
 # @transform_to_global_coordinates
 ####################################################################################################
+@nmv.utilities.profile_stage('transform')
 def transform_to_global_coordinates(builder):
     """Transforms the neuron mesh to the global coordinates.
 
@@ -467,6 +503,21 @@ def transform_to_global_coordinates(builder):
             gid=builder.options.morphology.gid)
 
 
+####################################################################################################
+# @release_spatial_indices
+####################################################################################################
+def release_spatial_indices(builder):
+    """Releases the spatial indices that were cached during the reconstruction of the mesh, to
+    avoid keeping the arbors, the bmeshes and their KD-trees alive after the builder is done.
+
+    :param builder:
+        An object of the builder that is used to reconstruct the neuron mesh.
+    """
+
+    # The indices are only valid within the lifetime of the builder
+    nmv.geometry.clear_spatial_indices()
+
+
 ################################################################################################
 # @update_samples_indices_per_arbor
 ################################################################################################
@@ -16,7 +16,7 @@
 ####################################################################################################
 
 # Syetsm imports
-import copy
+import numpy
 
 # Blender imports
 import bpy, mathutils
@@ -24,6 +24,7 @@ import bpy, mathutils
 # Internal modules
 import nmv
 import nmv.builders
+import nmv.consts
 import nmv.enums
 import nmv.mesh
 import nmv.shading
@@ -52,8 +53,9 @@ class MetaBuilder:
             Loaded options from NeuroMorphoVis.
         """
 
-        # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        # Morphology, shared with the other builders until it is replaced by a preprocessed private
+        # copy when the morphology is verified
+        self.morphology = morphology
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -85,9 +87,18 @@ class MetaBuilder:
         # The smallest detected radius while building the model, to be used for meta-ball resolution
         self.smallest_radius = 1e5
 
+        # The meta segments of the neuron, grouped by the part of the neuron they belong to. Every
+        # group has a list of arrays of the first points, second points, first radii, second
+        # radii and the radii that define the resolution of the segments
+        self.meta_segments = dict()
+
+        # The part of the neuron that is being built
+        self.current_group = None
+
     ################################################################################################
     # @verify_and_repair_morphology
     ################################################################################################
+    @nmv.utilities.profile_stage('skeleton.repair')
     def verify_and_repair_morphology(self):
         """Verifies and repairs the morphology if the contain any artifacts that would potentially
         affect the reconstruction quality of the mesh.
@@ -95,23 +106,133 @@ class MetaBuilder:
 
         # Remove the internal samples, or the samples that intersect the soma at the first
         # section and each arbor
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology, nmv.skeleton.ops.remove_samples_inside_soma])
+        operations = [('remove_samples_inside_soma',)]
 
         # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
         # for example, an axon that is emanating from a dendrite or two intersecting dendrites
-        nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
 
         # Label the primary and secondary sections based on angles
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology,
-              nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
+        operations.append(('label_sections_based_on_angles',))
+
+        # Apply the operations in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.morphology, operations)
+
+    ################################################################################################
+    # @get_meta_elements_along_segments
+    ################################################################################################
+    @staticmethod
+    def get_meta_elements_along_segments(points_1, points_2, radii_1, radii_2):
+        """Computes the meta elements along a batch of segments at once.
+
+        Along a segment, an element is placed every r / 2, where the radius r is interpolated
+        linearly between the two radii. The distances between the elements grow or shrink
+        geometrically with a ratio (1 + k / 2), where k is the slope of the radius, so the elements
+        are computed in closed form rather than marching along every segment.
+
+        :param points_1:
+            An array of the first points of the segments.
+        :param points_2:
+            An array of the second points of the segments.
+        :param radii_1:
+            An array of the first radii of the segments.
+        :param radii_2:
+            An array of the second radii of the segments.
+        :return:
+            A tuple of the arrays of the centers and the radii of the elements.
+        """
+
+        # Segments vectors
+        segments = points_2 - points_1
+        lengths = numpy.linalg.norm(segments, axis=1)
+
+        # Make sure that the segment length is not zero
+        valid = lengths >= 0.001
+        points_1, segments, lengths = points_1[valid], segments[valid], lengths[valid]
+
+        # Verify the radii, or fix them
+        radii_1 = numpy.maximum(radii_1[valid], 0.001 * lengths)
+        radii_2 = numpy.maximum(radii_2[valid], 0.001 * lengths)
+
+        # The slopes of the radii and the ratios of the steps
+        slopes = (radii_2 - radii_1) / lengths
+        constant = numpy.abs(slopes) < 1e-9
+        ratios = 1.0 + slopes / 2.0
+
+        # The number of the elements of every segment, one element if the first step is too long
+        counts = numpy.ceil(2.0 * lengths / radii_1)
+        varying = ~constant & (ratios > 0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            geometric_counts = numpy.ceil(
+                numpy.log((radii_1 + slopes * lengths) / radii_1) / numpy.log(ratios))
+        counts[varying] = numpy.where(numpy.isfinite(geometric_counts[varying]),
+                                      geometric_counts[varying], 1)
+        counts[~constant & (ratios <= 0)] = 1
+        counts = numpy.maximum(counts, 1).astype(numpy.int64)
+
+        # The index of every element along its segment
+        offsets = numpy.cumsum(counts) - counts
+        indices = numpy.arange(counts.sum()) - numpy.repeat(offsets, counts)
+        segment_indices = numpy.repeat(numpy.arange(len(counts)), counts)
+
+        # The radii and the travelled distances of the elements
+        element_radii_1 = radii_1[segment_indices]
+        element_slopes = slopes[segment_indices]
+        element_constant = constant[segment_indices]
+        radii = numpy.where(element_constant, element_radii_1,
+                            element_radii_1 * ratios[segment_indices] ** indices)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            distances = numpy.where(element_constant, indices * element_radii_1 / 2.0,
+                                    (radii - element_radii_1) / element_slopes)
+
+        # The centers of the elements
+        centers = points_1[segment_indices] + segments[segment_indices] * \
+            (distances / lengths[segment_indices])[:, None]
+
+        # Return the elements
+        return centers, radii
+
+    ################################################################################################
+    # @add_meta_elements
+    ################################################################################################
+    @staticmethod
+    def add_meta_elements(meta_skeleton,
+                          centers,
+                          radii):
+        """Adds a batch of meta elements to a meta skeleton, the elements are updated in bulk.
+
+        :param meta_skeleton:
+            A meta skeleton.
+        :param centers:
+            An array of the centers of the elements.
+        :param radii:
+            An array of the radii of the elements.
+        """
+
+        # Create the elements
+        first_element = len(meta_skeleton.elements)
+        for i in range(len(radii)):
+            meta_skeleton.elements.new()
+
+        # Read all the elements, including the existing ones, and update the new ones
+        number_elements = len(meta_skeleton.elements)
+        all_centers = numpy.zeros(number_elements * 3, dtype=numpy.float32)
+        all_radii = numpy.zeros(number_elements, dtype=numpy.float32)
+        meta_skeleton.elements.foreach_get('co', all_centers)
+        meta_skeleton.elements.foreach_get('radius', all_radii)
+        all_centers[first_element * 3:] = numpy.asarray(centers, dtype=numpy.float32).ravel()
+        all_radii[first_element:] = radii
+        meta_skeleton.elements.foreach_set('co', all_centers)
+        meta_skeleton.elements.foreach_set('radius', all_radii)
 
     ################################################################################################
     # @create_meta_segment
     ################################################################################################
-    def create_meta_segment(self, p1, p2, r1, r2):
-        """Constructs a segment that is composed of two points with a meta object.
+    def create_meta_segment(self, p1, p2, r1, r2, resolution_radius=None):
+        """Adds a segment that is composed of two points to the meta segments of the current part
+        of the neuron. The meta elements are created later for all the segments at once.
 
         :param p1:
             First point coordinate.
@@ -121,58 +242,39 @@ class MetaBuilder:
             First point radius.
         :param r2:
             Second point radius.
+        :param resolution_radius:
+            The radius that defines the resolution needed by the segment, r1 by default.
         """
 
-        # Segment vector
-        segment = p2 - p1
-        segment_length = segment.length
-
-        # Make sure that the segment length is not zero
-        if segment_length < 0.001:
-            return
-
-        # Verify the radii, or fix them
-        if r1 < 0.001 * segment_length:
-            r1 = 0.001 * segment_length
-        if r2 < 0.001 * segment_length:
-            r2 = 0.001 * segment_length
-
-        # Compute the deltas between the first and last points along the segments
-        dr = r2 - r1
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dz = p2[2] - p1[2]
-
-        # Keep track on the distance traveled along the segment while building, initially 0
-        travelled_distance = 0.0
-
-        # Local points, initially at the first point
-        r = r1
-        x = p1[0]
-        y = p1[1]
-        z = p1[2]
-
-        # Construct the meta elements along the segment
-        while travelled_distance < segment_length:
-
-            # Make a meta ball (or sphere) at this point
-            meta_element = self.meta_skeleton.elements.new()
+        self.add_meta_segments(
+            numpy.array([p1]), numpy.array([p2]), numpy.array([r1]), numpy.array([r2]),
+            numpy.array([r1 if resolution_radius is None else resolution_radius]))
 
-            # Set its radius
-            meta_element.radius = r
-
-            # Update its coordinates
-            meta_element.co = (x, y, z)
-
-            # Proceed to the second point
-            travelled_distance += r / 2
-
-            r = r1 + (travelled_distance * dr / segment_length)
+    ################################################################################################
+    # @add_meta_segments
+    ################################################################################################
+    def add_meta_segments(self,
+                          points_1,
+                          points_2,
+                          radii_1,
+                          radii_2,
+                          resolution_radii):
+        """Adds a batch of segments to the meta segments of the current part of the neuron.
+
+        :param points_1:
+            An array of the first points of the segments.
+        :param points_2:
+            An array of the second points of the segments.
+        :param radii_1:
+            An array of the first radii of the segments.
+        :param radii_2:
+            An array of the second radii of the segments.
+        :param resolution_radii:
+            An array of the radii that define the resolution needed by every segment.
+        """
 
-            # Get the next point
-            x = p1[0] + (travelled_distance * dx / segment_length)
-            y = p1[1] + (travelled_distance * dy / segment_length)
-            z = p1[2] + (travelled_distance * dz / segment_length)
+        self.meta_segments.setdefault(self.current_group, list()).append(
+            (points_1, points_2, radii_1, radii_2, resolution_radii))
 
     ################################################################################################
     # @create_meta_section
@@ -192,18 +294,19 @@ class MetaBuilder:
         if len(samples) < 2:
             return
 
-        # Proceed segment by segment
-        for i in range(len(samples) - 1):
+        # The points and the radii of the samples
+        points = numpy.array([sample.point for sample in samples], dtype=numpy.float64)
+        radii = numpy.array([sample.radius for sample in samples], dtype=numpy.float64)
 
-            if samples[i].radius < self.smallest_radius:
-                self.smallest_radius = samples[i].radius
+        # The smallest radius of the section
+        self.smallest_radius = min(self.smallest_radius, float(radii[:-1].min()))
 
-            # Create the meta segment
-            self.create_meta_segment(
-                p1=samples[i].point,
-                p2=samples[i + 1].point,
-                r1=samples[i].radius * self.magic_scale_factor,
-                r2=samples[i + 1].radius * self.magic_scale_factor)
+        # Add the segments of the section
+        self.add_meta_segments(
+            points_1=points[:-1], points_2=points[1:],
+            radii_1=radii[:-1] * self.magic_scale_factor,
+            radii_2=radii[1:] * self.magic_scale_factor,
+            resolution_radii=numpy.minimum(radii[:-1], radii[1:]))
 
     ################################################################################################
     # @create_meta_arbor
@@ -233,6 +336,7 @@ class MetaBuilder:
     ################################################################################################
     # @build_arbors
     ################################################################################################
+    @nmv.utilities.profile_stage('arbors')
     def build_arbors(self):
         """Builds the arbors of the neuron as tubes and AT THE END converts them into meshes.
         If you convert them during the building, the scene is getting crowded and the process is
@@ -247,6 +351,7 @@ class MetaBuilder:
         if not self.options.morphology.ignore_apical_dendrite:
             if self.morphology.apical_dendrite is not None:
                 nmv.logger.info('Apical Dendrite')
+                self.current_group = 'apical_dendrite'
                 self.create_meta_arbor(
                     root=self.morphology.apical_dendrite,
                     max_branching_order=self.options.morphology.apical_dendrite_branch_order)
@@ -256,6 +361,7 @@ class MetaBuilder:
             if self.morphology.dendrites is not None:
                 for i, basal_dendrite in enumerate(self.morphology.dendrites):
                     nmv.logger.info('Dendrite [%d]' % i)
+                    self.current_group = 'basal_dendrite_%d' % i
                     self.create_meta_arbor(
                         root=basal_dendrite,
                         max_branching_order=self.options.morphology.basal_dendrites_branch_order)
@@ -264,6 +370,7 @@ class MetaBuilder:
         if not self.options.morphology.ignore_axon:
             if self.morphology.axon is not None:
                 nmv.logger.info('Axon')
+                self.current_group = 'axon'
                 self.create_meta_arbor(
                     root=self.morphology.axon,
                     max_branching_order=self.options.morphology.axon_branch_order)
@@ -320,16 +427,21 @@ class MetaBuilder:
                 p1=self.morphology.soma.centroid,
                 p2=arbor.samples[0].point,
                 r1=self.morphology.soma.mean_radius,
-                r2=arbor.samples[0].radius * self.magic_scale_factor)
+                r2=arbor.samples[0].radius * self.magic_scale_factor,
+                resolution_radius=arbor.samples[0].radius)
 
     ################################################################################################
     # @build_soma_from_meta_objects
     ################################################################################################
+    @nmv.utilities.profile_stage('soma')
     def build_soma_from_meta_objects(self):
 
         # Header
         nmv.logger.header('Building Soma from Meta Objects')
 
+        # The segments of the soma are grouped together
+        self.current_group = 'soma'
+
         # Emanate towards the apical dendrite, if exists
         if not self.options.morphology.ignore_apical_dendrite:
             nmv.logger.info('Apical dendrite')
@@ -358,9 +470,62 @@ class MetaBuilder:
             if self.morphology.axon is not None:
                 self.emanate_soma_towards_arbor(arbor=self.morphology.axon)
 
+    ################################################################################################
+    # @get_group_segments
+    ################################################################################################
+    def get_group_segments(self,
+                           group):
+        """Returns the meta segments of a group concatenated into arrays.
+
+        :param group:
+            The key of the group.
+        :return:
+            A list of the arrays of the first points, second points, first radii, second radii and
+            resolution radii of the segments of the group.
+        """
+
+        return [numpy.concatenate(arrays) for arrays in zip(*self.meta_segments[group])]
+
+    ################################################################################################
+    # @get_adaptive_groups
+    ################################################################################################
+    def get_adaptive_groups(self):
+        """Splits the segments of every part of the neuron by the levels of their radii. The level
+        of a segment is the power of two of its radius relative to the smallest radius of the
+        neuron, so a thin terminal does not impose the resolution of the thick parts.
+
+        :return:
+            A list of the tuples of the name, the resolution and the segments arrays of the groups.
+        """
+
+        groups = list()
+
+        # The smallest radius, to compute the levels
+        smallest_radius = max(self.smallest_radius, 1e-3)
+        number_levels = nmv.consts.Meshing.META_RESOLUTION_LEVELS
+
+        for group in sorted(self.meta_segments.keys()):
+
+            # The segments of the group and their levels
+            segments = self.get_group_segments(group)
+            resolution_radii = numpy.maximum(segments[4], smallest_radius)
+            levels = numpy.clip(numpy.floor(numpy.log2(resolution_radii / smallest_radius)),
+                                0, number_levels - 1).astype(numpy.int64)
+
+            # A group per level, with the resolution of the smallest radius of the level
+            for level in numpy.unique(levels):
+                in_level = levels == level
+                groups.append(('%s_%d' % (group, level),
+                               float(resolution_radii[in_level].min()) * 2.0,
+                               [array[in_level] for array in segments]))
+
+        # Return the groups
+        return groups
+
     ################################################################################################
     # @finalize_meta_object
     ################################################################################################
+    @nmv.utilities.profile_stage('meta.finalize')
     def finalize_meta_object(self):
         """Converts the meta object to a mesh and get it ready for export or visualization.
         """
@@ -368,6 +533,19 @@ class MetaBuilder:
         # Header
         nmv.logger.header('Meshing the Meta Object')
 
+        # With the adaptive resolution, every group is meshed with its own resolution, and the
+        # whole neuron is meshed at the finest resolution if the groups cannot be merged cleanly
+        if self.options.mesh.adaptive_meta_resolution:
+            if self.finalize_adaptive_meta_objects():
+                return
+            nmv.logger.info('Meshing the neuron with a single resolution')
+
+        # Create the elements of all the segments in batches
+        for group in sorted(self.meta_segments.keys()):
+            segments = self.get_group_segments(group)
+            centers, radii = self.get_meta_elements_along_segments(*segments[0:4])
+            self.add_meta_elements(self.meta_skeleton, centers, radii)
+
         # Deselect all objects
         nmv.scene.ops.deselect_all()
 
@@ -393,6 +571,83 @@ class MetaBuilder:
         # Set the mesh to be the active one
         nmv.scene.set_active_object(self.meta_mesh)
 
+    ################################################################################################
+    # @finalize_adaptive_meta_objects
+    ################################################################################################
+    def finalize_adaptive_meta_objects(self):
+        """Meshes every group of segments as a separate meta object with the resolution of its
+        radii, and merges the meshes of the groups into the mesh of the neuron.
+
+        Every meta object is a separate field, so the meshes of the groups overlap where the groups
+        share their connecting samples. They are merged with boolean unions and their duplicate
+        vertices are welded, and the result is accepted only if it is watertight and manifold.
+
+        :return:
+            True if the mesh of the neuron is watertight and manifold, otherwise False, and the
+            meta object of the whole neuron is kept to be meshed with a single resolution.
+        """
+
+        scene = bpy.context.scene
+
+        # Blender meshes the meta objects whose names have the same prefix before a dot together
+        prefix = self.morphology.label.replace('.', '_')
+
+        group_meshes = list()
+        for name, resolution, segments in self.get_adaptive_groups():
+
+            # A meta object per group, in its own family to be polygonized with its own resolution
+            meta_skeleton = bpy.data.metaballs.new('%s_%s' % (prefix, name))
+            meta_object = bpy.data.objects.new('%s_%s' % (prefix, name), meta_skeleton)
+            scene.objects.link(meta_object)
+
+            # The elements of the group and its resolution
+            centers, radii = self.get_meta_elements_along_segments(*segments[0:4])
+            self.add_meta_elements(meta_skeleton, centers, radii)
+            meta_skeleton.resolution = resolution
+            nmv.logger.info('Meta Resolution [%s] [%f]' % (name, resolution))
+
+            # Polygonize the group and remove its meta object
+            group_mesh = meta_object.to_mesh(scene, True, 'PREVIEW')
+            scene.objects.unlink(meta_object)
+            bpy.data.objects.remove(meta_object)
+            bpy.data.metaballs.remove(meta_skeleton)
+
+            # Add the mesh of the group to the scene
+            group_object = bpy.data.objects.new('%s_%s_mesh' % (prefix, name), group_mesh)
+            scene.objects.link(group_object)
+            group_meshes.append(group_object)
+
+        # Merge the overlapping meshes of the groups, the interior faces are removed by the unions
+        union_mesh = nmv.mesh.union_mesh_objects_in_tree(group_meshes)
+
+        # Weld the duplicate vertices along the intersections, without capping any hole
+        statistics = nmv.mesh.repair_mesh_topology(union_mesh, close_holes=False)
+        nmv.mesh.report_mesh_topology(union_mesh, statistics)
+
+        # An open or a self-intersecting mesh is discarded
+        if not statistics['watertight'] or not statistics['manifold']:
+            nmv.logger.info('The meshes of the groups cannot be merged into a watertight mesh')
+            nmv.scene.ops.delete_objects([union_mesh])
+            return False
+
+        # The meta object of the whole neuron is not used
+        scene.objects.unlink(self.meta_mesh)
+        bpy.data.objects.remove(self.meta_mesh)
+        bpy.data.metaballs.remove(self.meta_skeleton)
+
+        # The merged mesh is the mesh of the neuron
+        self.meta_mesh = union_mesh
+        self.meta_mesh.name = self.morphology.label
+
+        # Re-select it again to be able to perform post-processing operations in it
+        self.meta_mesh.select = True
+
+        # Set the mesh to be the active one
+        nmv.scene.set_active_object(self.meta_mesh)
+
+        # The mesh of the neuron is valid
+        return True
+
     ################################################################################################
     # @assign_material_to_mesh
     ################################################################################################
@@ -449,8 +704,14 @@ class MetaBuilder:
         # Assign the material to the mesh
         self.assign_material_to_mesh()
 
+        # Report the topology of the final mesh objects
+        nmv.builders.report_neuron_mesh_topology(builder=self)
+
         # Transform to the global coordinates, if required
         nmv.builders.transform_to_global_coordinates(builder=self)
 
+        # Release the spatial indices of the build
+        nmv.builders.release_spatial_indices(builder=self)
+
         # Mission done
         nmv.logger.header('Mesh Reconstruction Done!')
@@ -56,8 +56,9 @@ class PiecewiseBuilder:
             Loaded options from NeuroMorphoVis.
         """
 
-        # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        # Morphology, shared with the other builders until it is replaced by a preprocessed private
+        # copy when the morphology is verified
+        self.morphology = morphology
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -92,6 +93,7 @@ class PiecewiseBuilder:
     ################################################################################################
     # @verify_morphology_skeleton
     ################################################################################################
+    @nmv.utilities.profile_stage('skeleton.repair')
     def verify_morphology_skeleton(self):
         """Verifies and repairs the morphology if the contain any artifacts that would potentially
         affect the reconstruction quality of the mesh.
@@ -102,8 +104,7 @@ class PiecewiseBuilder:
 
         # Remove the internal samples, or the samples that intersect the soma at the first
         # section and each arbor
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology, nmv.skeleton.ops.remove_samples_inside_soma])
+        operations = [('remove_samples_inside_soma',)]
 
         # The arbors can be selected to be reconstructed with sharp edges or smooth ones. For the
         # sharp edges, we do NOT need to re-sample the morphology skeleton. However, if the smooth
@@ -114,27 +115,27 @@ class PiecewiseBuilder:
         if self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH:
 
             # Apply the re-sampling filter on the whole morphology skeleton
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_sections])
+            operations.append(('resample_sections', 2.5))
 
         # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
         # for example, an axon that is emanating from a dendrite or two intersecting dendrites
-        nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
 
         # Primary and secondary branching
         if self.options.mesh.branching == nmv.enums.Meshing.Branching.ANGLES:
 
             # Label the primary and secondary sections based on angles
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
+            operations.append(('label_sections_based_on_angles',))
 
         else:
 
             # Label the primary and secondary sections based on radii
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_radii])
+            operations.append(('label_sections_based_on_radii',))
+
+        # Apply the operations in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.morphology, operations)
 
     ################################################################################################
     # @build_arbors
@@ -185,13 +186,13 @@ class PiecewiseBuilder:
                 # Ensure that apical dendrite objects were reconstructed
                 if len(self.apical_dendrites_meshes) > 0:
 
+                    # Convert the section objects (tubes) into meshes in a single pass
+                    self.apical_dendrites_meshes[:] = nmv.scene.ops.convert_objects_to_meshes(
+                        self.apical_dendrites_meshes)
+
                     # Add a reference to the mesh object
                     self.morphology.apical_dendrite.mesh = self.apical_dendrites_meshes[0]
 
-                    # Convert the section object (tubes) into meshes
-                    for arbor_object in self.apical_dendrites_meshes:
-                        nmv.scene.ops.convert_object_to_mesh(arbor_object)
-
         # Draw the basal dendrites
         if not self.options.morphology.ignore_basal_dendrites:
 
@@ -220,16 +221,16 @@ class PiecewiseBuilder:
                     # Ensure that basal dendrite objects were reconstructed
                     if len(basal_dendrite_objects) > 0:
 
+                        # Convert the section objects (tubes) into meshes in a single pass
+                        basal_dendrite_objects = nmv.scene.ops.convert_objects_to_meshes(
+                            basal_dendrite_objects)
+
                         # Add a reference to the mesh object
                         self.morphology.dendrites[i].mesh = basal_dendrite_objects[0]
 
                         # Add the sections (tubes) of the basal dendrite to the list
                         self.basal_dendrites_meshes.extend(basal_dendrite_objects)
 
-                        # Convert the section object (tubes) into meshes
-                        for arbor_object in basal_dendrite_objects:
-                            nmv.scene.ops.convert_object_to_mesh(arbor_object)
-
         # Draw the axon as a set connected sections
         if not self.options.morphology.ignore_axon:
 
@@ -252,12 +253,100 @@ class PiecewiseBuilder:
                 # Ensure that axon objects were reconstructed
                 if len(self.axon_meshes) > 0:
 
+                    # Convert the section objects (tubes) into meshes in a single pass
+                    self.axon_meshes[:] = nmv.scene.ops.convert_objects_to_meshes(self.axon_meshes)
+
                     # Add a reference to the mesh object
                     self.morphology.axon.mesh = self.axon_meshes[0]
 
-                    # Convert the section object (tubes) into meshes
-                    for arbor_object in self.axon_meshes:
-                        nmv.scene.ops.convert_object_to_mesh(arbor_object)
+    ################################################################################################
+    # @build_arbor_task
+    ################################################################################################
+    @staticmethod
+    def build_arbor_task(section,
+                         task,
+                         materials):
+        """Builds the meshes of a piece of an arbor, in a worker or in this process.
+
+        :param section:
+            The root section of the piece.
+        :param task:
+            The task of the piece, with the parameters of the arbors.
+        :param materials:
+            The materials of the arbor.
+        :return:
+            A list of the meshes of the sections of the piece.
+        """
+
+        soft = task['parameters']['soft']
+
+        # The bevel object, with 4 sides for the smooth edges and 16 for the hard ones
+        bevel_object = nmv.mesh.create_bezier_circle(
+            radius=1.0, vertices=4 if soft else 16, name='arbors_bevel')
+
+        # Draw the piece as a set connected sections, starting at its branching level
+        sections_objects = list()
+        nmv.skeleton.ops.draw_connected_sections(
+            section=section, poly_line_data=list(), sections_objects=sections_objects,
+            secondary_sections=list(), branching_level=task['branching_level'],
+            max_branching_level=task['max_branching_order'], name=task['name'],
+            material_list=materials, bevel_object=bevel_object, repair_morphology=True,
+            caps=not soft, roots_connection=task['parameters']['roots_connection'])
+
+        # Convert the section objects (tubes) into meshes in a single pass
+        if len(sections_objects) > 0:
+            sections_objects = nmv.scene.ops.convert_objects_to_meshes(sections_objects)
+
+        # Smooth the meshes of the smooth edges, or close the caps of the hard ones
+        for mesh in sections_objects:
+            if soft:
+                nmv.mesh.ops.smooth_object_vertices(mesh_object=mesh, level=2)
+            else:
+                nmv.mesh.close_open_faces(mesh)
+
+        # Delete the bevel object
+        nmv.scene.ops.delete_object_in_scene(bevel_object)
+
+        # Return the meshes
+        return sections_objects
+
+    ################################################################################################
+    # @build_arbors_in_workers
+    ################################################################################################
+    def build_arbors_in_workers(self):
+        """Reconstruct the meshes of the arbors in several background processes. The large arbors
+        are split into pieces to keep all the workers busy.
+        """
+
+        # If the meshes of the arbors are 'welded' into the soma, then do NOT connect them to the
+        #  soma origin, otherwise extend the arbors to the origin
+        if self.options.mesh.soma_connection == nmv.enums.Meshing.SomaConnection.CONNECTED:
+            roots_connection = nmv.enums.Arbors.Roots.CONNECTED_TO_SOMA
+        else:
+            roots_connection = nmv.enums.Arbors.Roots.CONNECTED_TO_ORIGIN
+
+        # The tasks of the workers
+        tasks, arbors = nmv.builders.get_arbors_tasks(
+            builder=self,
+            parameters={'soft': self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH,
+                        'roots_connection': roots_connection},
+            number_workers=self.options.mesh.arbors_workers, split_arbors=True)
+
+        # Build the arbors
+        tasks_objects = nmv.builders.build_arbors_in_workers(
+            builder=self, tasks=tasks, arbors=arbors,
+            number_workers=self.options.mesh.arbors_workers)
+
+        # Collect the meshes per arbor, the mesh of an arbor is the first mesh of its root piece
+        for task, mesh_objects in zip(tasks, tasks_objects):
+            if task['arbor'] == 'apical_dendrite':
+                self.apical_dendrites_meshes.extend(mesh_objects)
+            elif task['arbor'] == 'axon':
+                self.axon_meshes.extend(mesh_objects)
+            else:
+                self.basal_dendrites_meshes.extend(mesh_objects)
+            if len(task['path']) == 0 and len(mesh_objects) > 0:
+                arbors[task['arbor']].mesh = mesh_objects[0]
 
     ################################################################################################
     # @build_hard_edges_arbors
@@ -331,6 +420,7 @@ class PiecewiseBuilder:
     ################################################################################################
     # @reconstruct_arbors_meshes
     ################################################################################################
+    @nmv.utilities.profile_stage('arbors')
     def reconstruct_arbors_meshes(self):
         """Reconstruct the arbors.
 
@@ -343,8 +433,12 @@ class PiecewiseBuilder:
 
         nmv.logger.header('Building arbors')
 
+        # Build the arbors in several processes
+        if self.options.mesh.arbors_workers > 1:
+            self.build_arbors_in_workers()
+
         # Hard edges (less samples per branch)
-        if self.options.mesh.edges == nmv.enums.Meshing.Edges.HARD:
+        elif self.options.mesh.edges == nmv.enums.Meshing.Edges.HARD:
             self.build_hard_edges_arbors()
 
         # Smooth edges (more samples per branch)
@@ -397,8 +491,14 @@ class PiecewiseBuilder:
         # Join all the objects into a single object
         nmv.builders.join_mesh_object_into_single_object(builder=self)
 
+        # Report the topology of the final mesh objects
+        nmv.builders.report_neuron_mesh_topology(builder=self)
+
         # Transform to the global coordinates, if required
         nmv.builders.transform_to_global_coordinates(builder=self)
 
+        # Release the spatial indices of the build
+        nmv.builders.release_spatial_indices(builder=self)
+
         # Report
         nmv.logger.header('Mesh Reconstruction Done!')
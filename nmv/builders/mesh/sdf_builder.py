@@ -0,0 +1,324 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal modules
+import nmv
+import nmv.builders
+import nmv.consts
+import nmv.enums
+import nmv.mesh
+import nmv.shading
+import nmv.skeleton
+import nmv.utilities
+import nmv.scene
+
+
+####################################################################################################
+# @SDFBuilder
+####################################################################################################
+class SDFBuilder:
+    """Mesh builder that creates watertight meshes from the signed distance field of the segments
+    of the morphology, without any boolean operations"""
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 morphology,
+                 options):
+        """Constructor
+
+        :param morphology:
+            A given morphology skeleton to create the mesh for.
+        :param options:
+            Loaded options from NeuroMorphoVis.
+        """
+
+        # Morphology, shared with the other builders until it is replaced by a preprocessed private
+        # copy when the morphology is verified
+        self.morphology = morphology
+
+        # Loaded options from NeuroMorphoVis
+        self.options = options
+
+        # A list of the colors/materials of the soma
+        self.soma_materials = None
+
+        # A list of the colors/materials of the axon
+        self.axon_materials = None
+
+        # A list of the colors/materials of the basal dendrites
+        self.basal_dendrites_materials = None
+
+        # A list of the colors/materials of the apical dendrite
+        self.apical_dendrite_materials = None
+
+        # A list of the colors/materials of the spines
+        self.spines_materials = None
+
+        # The segments of the neuron, as lists of arrays of the first points, second points, first
+        # radii, second radii and sections ids
+        self.segments = [list(), list(), list(), list(), list()]
+
+        # The number of the sections that have segments, the segments of the same section are not
+        # blended together
+        self.number_sections = 0
+
+        # The reconstructed mesh of the neuron
+        self.neuron_mesh = None
+
+    ################################################################################################
+    # @verify_and_repair_morphology
+    ################################################################################################
+    @nmv.utilities.profile_stage('skeleton.repair')
+    def verify_and_repair_morphology(self):
+        """Verifies and repairs the morphology if the contain any artifacts that would potentially
+        affect the reconstruction quality of the mesh.
+        """
+
+        # Remove the internal samples, or the samples that intersect the soma at the first
+        # section and each arbor
+        operations = [('remove_samples_inside_soma',)]
+
+        # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
+        # for example, an axon that is emanating from a dendrite or two intersecting dendrites
+        operations.append(('update_arbors_connection_to_soma',))
+
+        # Apply the operations in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.morphology, operations)
+
+    ################################################################################################
+    # @add_segments
+    ################################################################################################
+    def add_segments(self,
+                     points_1,
+                     points_2,
+                     radii_1,
+                     radii_2):
+        """Adds a batch of segments of a new section to the distance field of the neuron.
+
+        :param points_1:
+            The first points of the segments.
+        :param points_2:
+            The second points of the segments.
+        :param radii_1:
+            The first radii of the segments.
+        :param radii_2:
+            The second radii of the segments.
+        """
+
+        for i, array in enumerate([points_1, points_2, radii_1, radii_2]):
+            self.segments[i].append(numpy.asarray(array, dtype=numpy.float64))
+
+        # All the segments belong to the same section
+        self.segments[4].append(numpy.full(len(radii_1), self.number_sections, dtype=numpy.int64))
+        self.number_sections += 1
+
+    ################################################################################################
+    # @add_arbor_segments
+    ################################################################################################
+    def add_arbor_segments(self,
+                           root,
+                           max_branching_order):
+        """Adds the segments of an arbor, section by section, to the distance field of the neuron.
+
+        :param root:
+            The root section of the arbor.
+        :param max_branching_order:
+            The maximum branching order set by the user to terminate the traversal.
+        """
+
+        # Traverse the sections of the arbor with a stack
+        sections = [root]
+        while sections:
+            section = sections.pop()
+
+            # Do not proceed if the branching order limit is hit
+            if section.branching_order > max_branching_order:
+                continue
+
+            # The segments of the section
+            if len(section.samples) > 1:
+                points = numpy.array([sample.point for sample in section.samples])
+                radii = numpy.array([sample.radius for sample in section.samples])
+                self.add_segments(points[:-1], points[1:], radii[:-1], radii[1:])
+
+            # The children
+            sections.extend(section.children)
+
+    ################################################################################################
+    # @add_soma_segments
+    ################################################################################################
+    def add_soma_segments(self,
+                          arbors):
+        """Adds the soma to the distance field of the neuron as a sphere, with a segment from its
+        center to the first sample of every connected arbor, since the samples inside the soma were
+        removed.
+
+        :param arbors:
+            A list of the arbors of the neuron.
+        """
+
+        centroid = numpy.array(self.morphology.soma.centroid, dtype=numpy.float64)
+        radius = self.morphology.soma.mean_radius
+
+        # The soma
+        self.add_segments([centroid], [centroid], [radius], [radius])
+
+        # The connection to the arbors
+        for arbor in arbors:
+            if arbor.connected_to_soma and len(arbor.samples) > 0:
+                arbor_radius = arbor.samples[0].radius
+                self.add_segments([centroid], [arbor.samples[0].point],
+                                  [arbor_radius], [arbor_radius])
+
+    ################################################################################################
+    # @collect_segments
+    ################################################################################################
+    @nmv.utilities.profile_stage('arbors')
+    def collect_segments(self):
+        """Collects the segments of the soma and the arbors of the neuron.
+        """
+
+        # Header
+        nmv.logger.header('Collecting the Segments')
+
+        # The arbors with their maximum branching orders
+        arbors = list()
+
+        # Apical dendrite
+        if not self.options.morphology.ignore_apical_dendrite:
+            if self.morphology.apical_dendrite is not None:
+                arbors.append((self.morphology.apical_dendrite,
+                               self.options.morphology.apical_dendrite_branch_order))
+
+        # Basal dendrites
+        if not self.options.morphology.ignore_basal_dendrites:
+            if self.morphology.dendrites is not None:
+                for basal_dendrite in self.morphology.dendrites:
+                    arbors.append((basal_dendrite,
+                                   self.options.morphology.basal_dendrites_branch_order))
+
+        # Axon
+        if not self.options.morphology.ignore_axon:
+            if self.morphology.axon is not None:
+                arbors.append((self.morphology.axon, self.options.morphology.axon_branch_order))
+
+        # The soma
+        self.add_soma_segments([arbor for arbor, _ in arbors])
+
+        # The arbors
+        for arbor, max_branching_order in arbors:
+            self.add_arbor_segments(arbor, max_branching_order)
+
+        nmv.logger.info('Segments [%d]' % sum(len(radii) for radii in self.segments[2]))
+
+    ################################################################################################
+    # @build_sdf_mesh
+    ################################################################################################
+    @nmv.utilities.profile_stage('sdf.mesh')
+    def build_sdf_mesh(self):
+        """Builds the mesh of the neuron from the signed distance field of its segments.
+        """
+
+        # Header
+        nmv.logger.header('Building the Signed Distance Field Mesh')
+
+        # The segments
+        points_1, points_2, radii_1, radii_2, sections = [
+            numpy.concatenate(arrays) for arrays in self.segments]
+
+        # Mesh the distance field
+        vertices, triangles = nmv.mesh.build_sdf_mesh_arrays(
+            points_1=points_1.reshape(-1, 3), points_2=points_2.reshape(-1, 3),
+            radii_1=radii_1, radii_2=radii_2,
+            voxel_size=self.options.mesh.sdf_voxel_size,
+            narrow_band=self.options.mesh.sdf_narrow_band,
+            smoothing=self.options.mesh.sdf_smoothing,
+            sections=sections,
+            block_size=nmv.consts.Meshing.SDF_BLOCK_SIZE,
+            number_workers=self.options.mesh.sdf_workers)
+        nmv.logger.info('Vertices [%d], Faces [%d]' % (len(vertices), len(triangles)))
+
+        # Create the mesh object in bulk
+        self.neuron_mesh = nmv.mesh.create_mesh_object_from_data(
+            vertices=vertices, faces_indices=triangles,
+            smooth_faces=numpy.full(
+                len(triangles), self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH),
+            name=self.options.morphology.label)
+
+    ################################################################################################
+    # @assign_material_to_mesh
+    ################################################################################################
+    def assign_material_to_mesh(self):
+
+        # Assign the material to the mesh
+        nmv.shading.set_material_to_object(self.neuron_mesh, self.soma_materials[0])
+
+        # Update the UV mapping
+        nmv.shading.adjust_material_uv(self.neuron_mesh)
+
+        # Activate the mesh object
+        nmv.scene.set_active_object(self.neuron_mesh)
+
+    ################################################################################################
+    # @reconstruct_mesh
+    ################################################################################################
+    def reconstruct_mesh(self):
+        """Reconstructs the neuronal mesh from the signed distance field of the morphology.
+        """
+
+        # Verify the morphology
+        self.verify_and_repair_morphology()
+
+        # Apply skeleton-based operation, if required, to slightly modify the skeleton
+        nmv.builders.common.modify_morphology_skeleton(builder=self)
+
+        # Collect the segments of the neuron
+        self.collect_segments()
+
+        # Build the mesh
+        self.build_sdf_mesh()
+
+        # Tessellation
+        nmv.builders.common.decimate_neuron_mesh(builder=self)
+
+        # Create the materials
+        nmv.builders.common.create_skeleton_materials(builder=self)
+
+        # Assign the material to the mesh
+        self.assign_material_to_mesh()
+
+        # Report the topology of the final mesh objects
+        nmv.builders.report_neuron_mesh_topology(builder=self)
+
+        # Transform to the global coordinates, if required
+        nmv.builders.transform_to_global_coordinates(builder=self)
+
+        # Release the spatial indices of the build
+        nmv.builders.release_spatial_indices(builder=self)
+
+        # Mission done
+        nmv.logger.header('Mesh Reconstruction Done!')
+
+        # Return a reference to the mesh
+        return self.neuron_mesh
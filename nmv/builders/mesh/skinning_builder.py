@@ -56,8 +56,9 @@ class SkinningBuilder:
             Loaded options from NeuroMorphoVis.
         """
 
-        # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        # Morphology, shared with the other builders until it is replaced by a preprocessed private
+        # copy when the morphology is verified
+        self.morphology = morphology
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -86,6 +87,7 @@ class SkinningBuilder:
     ################################################################################################
     # @verify_morphology_skeleton
     ################################################################################################
+    @nmv.utilities.profile_stage('skeleton.repair')
     def verify_morphology_skeleton(self):
         """Verifies and repairs the morphology if the contain any artifacts that would potentially
         affect the reconstruction quality of the mesh.
@@ -96,8 +98,7 @@ class SkinningBuilder:
 
         # Remove the internal samples, or the samples that intersect the soma at the first
         # section and each arbor
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology, nmv.skeleton.ops.remove_samples_inside_soma])
+        operations = [('remove_samples_inside_soma',)]
 
         # The arbors can be selected to be reconstructed with sharp edges or smooth ones. For the
         # sharp edges, we do NOT need to re-sample the morphology skeleton. However, if the smooth
@@ -108,17 +109,19 @@ class SkinningBuilder:
         if self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH:
 
             # Apply the re-sampling filter on the whole morphology skeleton
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_sections])
+            operations.append(('resample_sections', 2.5))
 
         # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
         # for example, an axon that is emanating from a dendrite or two intersecting dendrites
-        nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
 
         # Label the primary and secondary sections based on radii, skinning is agnostic
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology,
-              nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
+        operations.append(('label_sections_based_on_angles',))
+
+        # Apply the operations in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.morphology, operations)
 
     ################################################################################################
     # @update_section_samples_radii
@@ -330,6 +333,9 @@ class SkinningBuilder:
         # Apply the modifier
         bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Skin")
 
+        # The vertices of the object have changed, invalidate its spatial indices
+        nmv.geometry.invalidate_spatial_index(arbor_mesh)
+
         # Assign the material to the reconstructed arbor mesh
         nmv.shading.set_material_to_object(arbor_mesh, arbor_material)
 
@@ -360,9 +366,59 @@ class SkinningBuilder:
         # Return a reference to the arbor mesh
         return arbor_mesh
 
+    ################################################################################################
+    # @build_arbor_task
+    ################################################################################################
+    def build_arbor_task(self,
+                         section,
+                         task,
+                         materials):
+        """Builds the mesh of an arbor, in a worker or in this process.
+
+        :param section:
+            The root section of the arbor.
+        :param task:
+            The task of the arbor, with the parameters of the arbors.
+        :param materials:
+            The materials of the arbor.
+        :return:
+            A list with the mesh of the arbor.
+        """
+
+        return [self.create_arbor_mesh(
+            arbor=section, max_branching_order=task['max_branching_order'],
+            arbor_name=task['name'], arbor_material=materials[0],
+            connected_to_soma=task['parameters']['connected_to_soma'])]
+
+    ################################################################################################
+    # @build_arbors_in_workers
+    ################################################################################################
+    def build_arbors_in_workers(self,
+                                connected_to_soma=False):
+        """Builds the arbors of the neuron in several background processes, an arbor per task.
+
+        :param connected_to_soma:
+            If the arbor is connected to soma or not, by default False.
+        """
+
+        # The tasks of the workers
+        tasks, arbors = nmv.builders.get_arbors_tasks(
+            builder=self, parameters={'connected_to_soma': connected_to_soma},
+            number_workers=self.options.mesh.arbors_workers)
+
+        # Build the arbors
+        tasks_objects = nmv.builders.build_arbors_in_workers(
+            builder=self, tasks=tasks, arbors=arbors,
+            number_workers=self.options.mesh.arbors_workers)
+
+        # Add a reference to the mesh of every arbor
+        for task, mesh_objects in zip(tasks, tasks_objects):
+            arbors[task['arbor']].mesh = mesh_objects[0]
+
     ################################################################################################
     # @build_arbors
     ################################################################################################
+    @nmv.utilities.profile_stage('arbors')
     def build_arbors(self,
                      connected_to_soma=False):
         """Builds the arbors of the neuron as tubes and AT THE END converts them into meshes.
@@ -380,6 +436,11 @@ class SkinningBuilder:
         # Header
         nmv.logger.header('Building Arbors')
 
+        # Build the arbors in several processes
+        if self.options.mesh.arbors_workers > 1:
+            self.build_arbors_in_workers(connected_to_soma=connected_to_soma)
+            return
+
         # Draw the apical dendrite, if exists
         if not self.options.morphology.ignore_apical_dendrite:
             nmv.logger.info('Apical dendrite')
@@ -481,8 +542,14 @@ class SkinningBuilder:
         # Join all the objects into a single object
         nmv.builders.join_mesh_object_into_single_object(builder=self)
 
+        # Report the topology of the final mesh objects
+        nmv.builders.report_neuron_mesh_topology(builder=self)
+
         # Transform to the global coordinates, if required
         nmv.builders.transform_to_global_coordinates(builder=self)
 
+        # Release the spatial indices of the build
+        nmv.builders.release_spatial_indices(builder=self)
+
         # Done
         nmv.logger.header('Mesh Reconstruction Done!')
@@ -31,6 +31,7 @@ import nmv.mesh
 import nmv.shading
 import nmv.skeleton
 import nmv.scene
+import nmv.utilities
 
 
 ####################################################################################################
@@ -53,8 +54,9 @@ class UnionBuilder:
             Loaded options from NeuroMorphoVis.
         """
 
-        # Morphology
-        self.morphology = copy.deepcopy(morphology)
+        # Morphology, shared with the other builders until it is replaced by a preprocessed private
+        # copy when the morphology is verified
+        self.morphology = morphology
 
         # Loaded options from NeuroMorphoVis
         self.options = options
@@ -77,6 +79,7 @@ class UnionBuilder:
     ################################################################################################
     # @verify_morphology_skeleton
     ################################################################################################
+    @nmv.utilities.profile_stage('skeleton.repair')
     def verify_morphology_skeleton(self):
         """Verifies and repairs the morphology if the contain any artifacts that would potentially
         affect the reconstruction quality of the mesh.
@@ -87,8 +90,7 @@ class UnionBuilder:
 
         # Remove the internal samples, or the samples that intersect the soma at the first
         # section and each arbor
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[self.morphology, nmv.skeleton.ops.remove_samples_inside_soma])
+        operations = [('remove_samples_inside_soma',)]
 
         # The arbors can be selected to be reconstructed with sharp edges or smooth ones. For the
         # sharp edges, we do NOT need to re-sample the morphology skeleton. However, if the smooth
@@ -99,24 +101,26 @@ class UnionBuilder:
         if self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH:
 
             # Apply the re-sampling filter on the whole morphology skeleton
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_sections])
+            operations.append(('resample_sections', 2.5))
 
         # Verify the connectivity of the arbors to the soma to filter the disconnected arbors,
         # for example, an axon that is emanating from a dendrite or two intersecting dendrites
-        nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
+
+        # Apply the operations in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.morphology, operations)
 
         # Label the primary and secondary sections based on angles, and if does not work use
         # the radii as a fallback
         try:
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
+            nmv.skeleton.ops.preprocess_morphology(
+                self.morphology, [('label_sections_based_on_angles',)])
         except ValueError:
             nmv.logger.info('Labeling branches based on radii as a fallback')
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_radii])
+            nmv.skeleton.ops.preprocess_morphology(
+                self.morphology, [('label_sections_based_on_radii',)])
 
     ################################################################################################
     # @build_arbor
@@ -177,9 +181,8 @@ class UnionBuilder:
                 data=poly_line_data[0], name=poly_line_data[1], bevel_object=bevel_object,
                 caps=False if i == 0 else caps))
 
-        # Convert the section object (poly-lines or tubes) into meshes
-        for arbor_poly_line_object in arbor_poly_line_objects:
-            nmv.scene.ops.convert_object_to_mesh(arbor_poly_line_object)
+        # Convert the section objects (poly-lines or tubes) into meshes in a single pass
+        arbor_poly_line_objects = nmv.scene.ops.convert_objects_to_meshes(arbor_poly_line_objects)
 
         # Union all the mesh objects into a single object
         arbor.mesh = nmv.mesh.ops.union_mesh_objects_in_list(arbor_poly_line_objects)
@@ -270,6 +273,72 @@ class UnionBuilder:
                         material=self.basal_dendrites_materials[0],
                         connection_to_soma=connection_to_soma, soft=soft)
 
+    ################################################################################################
+    # @build_arbor_task
+    ################################################################################################
+    @staticmethod
+    def build_arbor_task(section,
+                         task,
+                         materials):
+        """Builds the mesh of an arbor, in a worker or in this process.
+
+        :param section:
+            The root section of the arbor.
+        :param task:
+            The task of the arbor, with the parameters of the arbors.
+        :param materials:
+            The materials of the arbor.
+        :return:
+            A list with the mesh of the arbor.
+        """
+
+        soft = task['parameters']['soft']
+
+        # The bevel object, with 4 sides for the smooth edges and 16 for the hard ones
+        if soft:
+            bevel_object = nmv.mesh.create_bezier_circle(
+                radius=1.0 * math.sqrt(2), vertices=4, name='soft_edges_arbors_bevel')
+        else:
+            bevel_object = nmv.mesh.create_bezier_circle(
+                radius=1.0, vertices=16, name='hard_edges_arbors_bevel')
+
+        # Build the arbor
+        UnionBuilder.build_arbor(
+            arbor=section, caps=True, bevel_object=bevel_object,
+            max_branching_order=task['max_branching_order'], name=task['name'],
+            material=materials[0],
+            connection_to_soma=task['parameters']['connection_to_soma'], soft=soft)
+
+        # Delete the bevel object
+        nmv.scene.ops.delete_object_in_scene(bevel_object)
+
+        # Return the mesh
+        return [section.mesh]
+
+    ################################################################################################
+    # @build_arbors_in_workers
+    ################################################################################################
+    def build_arbors_in_workers(self):
+        """Reconstruct the meshes of the arbors in several background processes, an arbor per task.
+        """
+
+        # The tasks of the workers
+        tasks, arbors = nmv.builders.get_arbors_tasks(
+            builder=self,
+            parameters={'soft': self.options.mesh.edges == nmv.enums.Meshing.Edges.SMOOTH,
+                        'connection_to_soma': self.options.mesh.soma_connection ==
+                        nmv.enums.Meshing.SomaConnection.CONNECTED},
+            number_workers=self.options.mesh.arbors_workers)
+
+        # Build the arbors
+        tasks_objects = nmv.builders.build_arbors_in_workers(
+            builder=self, tasks=tasks, arbors=arbors,
+            number_workers=self.options.mesh.arbors_workers)
+
+        # Add a reference to the mesh of every arbor
+        for task, mesh_objects in zip(tasks, tasks_objects):
+            arbors[task['arbor']].mesh = mesh_objects[0]
+
     ################################################################################################
     # @build_hard_edges_arbors
     ################################################################################################
@@ -322,6 +391,7 @@ class UnionBuilder:
     ################################################################################################
     # @reconstruct_arbors_meshes
     ################################################################################################
+    @nmv.utilities.profile_stage('arbors')
     def build_arbors(self):
         """Reconstruct the arbors.
 
@@ -334,8 +404,12 @@ class UnionBuilder:
 
         nmv.logger.header('Building arbors')
 
+        # Build the arbors in several processes
+        if self.options.mesh.arbors_workers > 1:
+            self.build_arbors_in_workers()
+
         # Hard edges (less samples per branch)
-        if self.options.mesh.edges == nmv.enums.Meshing.Edges.HARD:
+        elif self.options.mesh.edges == nmv.enums.Meshing.Edges.HARD:
             self.build_hard_edges_arbors()
 
         # Smooth edges (more samples per branch)
@@ -380,9 +454,15 @@ class UnionBuilder:
         # Join all the objects into a single object
         nmv.builders.join_mesh_object_into_single_object(builder=self)
 
+        # Report the topology of the final mesh objects
+        nmv.builders.report_neuron_mesh_topology(builder=self)
+
         # Transform to the global coordinates, if required
         nmv.builders.transform_to_global_coordinates(builder=self)
 
+        # Release the spatial indices of the build
+        nmv.builders.release_spatial_indices(builder=self)
+
         # Report
         nmv.logger.header('Mesh Reconstruction Done!')
 
@@ -70,16 +70,12 @@ class NucleusBuilder:
         self.nuclei_meshes = nmv.file.load_nuclei(nmv.consts.Paths.NUCLEI_MESHES_LQ_DIRECTORY)
         nmv.utilities.enable_std_output()
 
-        # Create the material
-        material = nmv.shading.create_material(
-            name='%nuclei_material', color=self.options.mesh.nucleus_color,
-            material_type=self.options.mesh.material)
+        # Get the material from the pool
+        material = nmv.shading.get_pooled_material(
+            color=self.options.mesh.nucleus_color, material_type=self.options.mesh.material)
 
-        # Apply the shader
-        for nucleus_object in self.nuclei_meshes:
-
-            # Apply the shader to each spine mesh
-            nmv.shading.set_material_to_object(nucleus_object, material)
+        # Apply the shader to all the nuclei meshes
+        nmv.shading.set_material_to_objects(self.nuclei_meshes, material)
 
     ################################################################################################
     # @add_nucleus_inside_soma
@@ -55,7 +55,10 @@ class SkeletonBuilder:
             A given morphology.
         """
 
-        # Morphology
+        # Morphology, shared with the other builders, from which the preprocessed copies are cached
+        self.shared_morphology = morphology
+
+        # Private copy of the morphology
         self.morphology = copy.deepcopy(morphology)
 
         # All the options of the project (an instance of MeshyOptions)
@@ -805,31 +808,33 @@ class SkeletonBuilder:
             A list of all the objects of the morphology that are already drawn.
         """
 
-        # Re-sample the morphology skeleton, if the repair is required
-        if repair_morphology:
-
-            # Remove the samples that intersect with the soma
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.remove_samples_inside_soma])
+        # The preprocessing operations of the skeleton
+        operations = list()
 
-            # Resample the sections
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology, nmv.skeleton.ops.resample_sections])
+        # Remove the samples that intersect with the soma and re-sample the sections, if the
+        # repair is required
+        if repair_morphology:
+            operations.append(('remove_samples_inside_soma',))
+            operations.append(('resample_sections', 2.5))
 
         # Verify the connectivity of the arbors of the morphology to the soma
-        nmv.skeleton.ops.update_arbors_connection_to_soma(morphology=self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
 
         # Update the branching
-        nmv.skeleton.ops.update_skeleton_branching(
-            morphology=self.morphology, branching_method=self.options.morphology.branching)
+        operations.extend(nmv.skeleton.ops.get_branching_operations(
+            self.options.morphology.branching))
 
         # Update the style of the arbors
-        nmv.skeleton.ops.update_arbors_style(
-            morphology=self.morphology, arbor_style=self.options.morphology.arbor_style)
+        operations.extend(nmv.skeleton.ops.get_style_operations(
+            self.options.morphology.arbor_style))
 
         # Update the radii of the arbors
-        nmv.skeleton.ops.update_arbors_radii(
-            morphology=self.morphology, morphology_options=self.options.morphology)
+        operations.extend(nmv.skeleton.ops.get_radii_operations(self.options.morphology))
+
+        # Apply the operations, fused in a single traversal per arbor between the connectivity
+        # verification, on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.shared_morphology, operations)
 
         # A list of objects (references to drawn segments) that compose the morphology
         morphology_objects = []
@@ -848,7 +853,7 @@ class SkeletonBuilder:
 
                     dendrite_prefix = '%s_%d' % (nmv.consts.Arbors.BASAL_DENDRITES_PREFIX, i)
                     nmv.skeleton.ops.draw_connected_sections(
-                        section=copy.deepcopy(basal_dendrite),
+                        section=basal_dendrite,
                         max_branching_level=self.options.morphology.basal_dendrites_branch_order,
                         name=dendrite_prefix,
                         material_list=self.basal_dendrites_materials,
@@ -874,7 +879,7 @@ class SkeletonBuilder:
                 # Draw the apical dendrite as a set connected sections
                 apical_dendrite_sections_objects = []
                 nmv.skeleton.ops.draw_connected_sections(
-                    section=copy.deepcopy(self.morphology.apical_dendrite),
+                    section=self.morphology.apical_dendrite,
                     max_branching_level=self.options.morphology.apical_dendrite_branch_order,
                     name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
                     material_list=self.apical_dendrite_materials,
@@ -900,7 +905,7 @@ class SkeletonBuilder:
                 # Draw the axon as a set connected sections
                 axon_sections_objects = []
                 nmv.skeleton.ops.draw_connected_sections(
-                    section=copy.deepcopy(self.morphology.axon),
+                    section=self.morphology.axon,
                     max_branching_level=self.options.morphology.axon_branch_order,
                     name=nmv.consts.Arbors.AXON_PREFIX, material_list=self.axon_materials,
                     bevel_object=bevel_object,
@@ -933,39 +938,38 @@ class SkeletonBuilder:
         :return: A list of all the objects of the morphology that are already drawn.
         """
 
+        # The preprocessing operations of the skeleton
+        operations = list()
+
         # Repair severe morphology artifacts if @repair_morphology is set
         if repair_morphology:
 
             # Repair the section which has single child only
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.repair_sections_with_single_child])
+            operations.append(('repair_sections_with_single_child',))
 
             # Remove duplicate samples
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.remove_duplicate_samples])
+            operations.append(('remove_duplicate_samples',))
 
             # Repair the short sections
             # morphology_repair_ops.repair_short_sections_of_morphology(self.morphology)
 
         # Verify the connectivity of the arbors of the morphology to the soma
-        nmv.skeleton.ops.update_arbors_connection_to_soma(self.morphology)
+        operations.append(('update_arbors_connection_to_soma',))
 
         # Primary and secondary branching
         if self.options.mesh.branching == nmv.enums.Skeletonization.Branching.ANGLES:
 
             # Label the primary and secondary sections based on angles
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
+            operations.append(('label_sections_based_on_angles',))
 
         else:
 
             # Label the primary and secondary sections based on radii
-            nmv.skeleton.ops.apply_operation_to_morphology(
-                *[self.morphology,
-                  nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_radii])
+            operations.append(('label_sections_based_on_radii',))
+
+        # Apply the operations on a private copy cached for the applied operations
+        self.morphology = nmv.skeleton.ops.get_preprocessed_morphology(
+            self.shared_morphology, operations)
 
         # A list of objects (references to drawn segments) that compose the morphology
         morphology_objects = []
@@ -974,7 +978,7 @@ class SkeletonBuilder:
         if not self.options.morphology.ignore_axon:
             axon_sections_objects = []
             nmv.skeleton.ops.draw_connected_sections(
-                section=copy.deepcopy(self.morphology.axon),
+                section=self.morphology.axon,
                 max_branching_level=self.options.morphology.axon_branch_order,
                 name=nmv.consts.Arbors.AXON_PREFIX,
                 material_list=self.axon_materials,
@@ -1004,7 +1008,7 @@ class SkeletonBuilder:
                     # Draw the basal dendrites as a set connected sections
                     dendrite_prefix = '%s_%d' % (nmv.consts.Arbors.BASAL_DENDRITES_PREFIX, i)
                     nmv.skeleton.ops.draw_connected_sections(
-                        section=copy.deepcopy(basal_dendrite),
+                        section=basal_dendrite,
                         max_branching_level=self.options.morphology.basal_dendrites_branch_order,
                         name=dendrite_prefix,
                         material_list=self.basal_dendrites_materials,
@@ -1025,7 +1029,7 @@ class SkeletonBuilder:
         if not self.options.morphology.ignore_apical_dendrite:
             apical_dendrite_sections_objects = []
             nmv.skeleton.ops.draw_connected_sections(
-                section=copy.deepcopy(self.morphology.apical_dendrite),
+                section=self.morphology.apical_dendrite,
                 max_branching_level=self.options.morphology.apical_dendrite_branch_order,
                 name=nmv.consts.Arbors.APICAL_DENDRITES_PREFIX,
                 material_list=self.apical_dendrite_materials,
@@ -25,6 +25,7 @@ import nmv
 import nmv.bmeshi
 import nmv.consts
 import nmv.enums
+import nmv.geometry
 import nmv.mesh
 import nmv.physics
 import nmv.scene
@@ -108,6 +109,9 @@ class SomaBuilder:
             vertex.co = vertex.co + (vertex.normal * random.uniform(-delta / 2.0, delta / 2.0))
             vertex.select = False
 
+        # The vertices of the object have changed, invalidate its spatial indices
+        nmv.geometry.invalidate_spatial_index(soma_mesh)
+
     ################################################################################################
     # @get_extrusion_scale
     ################################################################################################
@@ -353,10 +357,9 @@ class SomaBuilder:
         # and apply the material later.
         if apply_shader:
 
-            # Create the soma material and assign it to the ico-sphere
-            soma_material = nmv.shading.create_material(
-                name='soma_material', color=self.options.soma.soma_color,
-                material_type=self.options.soma.soma_material)
+            # Get the soma material from the pool and assign it to the ico-sphere
+            soma_material = nmv.shading.get_pooled_material(
+                color=self.options.soma.soma_color, material_type=self.options.soma.soma_material)
 
             # Apply the shader to the ico-sphere
             nmv.shading.set_material_to_object(
@@ -791,8 +794,8 @@ class SomaBuilder:
         # and apply the material later.
         if apply_shader:
 
-            # Create the soma material and assign it to the ico-sphere
-            soma_material = nmv.shading.create_material(name='soma',
+            # Get the soma material from the pool and assign it to the ico-sphere
+            soma_material = nmv.shading.get_pooled_material(
                 color=self.options.soma.soma_color, material_type=self.options.soma.soma_material)
 
             # Apply the shader to the ico-sphere
@@ -855,26 +858,30 @@ class SomaBuilder:
             A reference to the reconstructed mesh of the soma.
         """
 
-        # Build the soft body of the soma
-        soma_soft_body = self.build_soma_soft_body(apply_shader=apply_shader)
+        with nmv.logger.span('soma.softbody'):
 
-        # Update the frame based on the soft body simulation
-        for frame_index in range(nmv.consts.Simulation.MIN_FRAME, nmv.consts.Simulation.MAX_FRAME):
+            # Build the soft body of the soma
+            soma_soft_body = self.build_soma_soft_body(apply_shader=apply_shader)
 
-            # Set the frame index
-            bpy.context.scene.frame_set(frame_index)
+            # Update the frame based on the soft body simulation
+            for frame_index in range(nmv.consts.Simulation.MIN_FRAME,
+                                     nmv.consts.Simulation.MAX_FRAME):
 
-            # Update the progress shell
-            nmv.utilities.show_progress(
-                '* Simulation ', frame_index, nmv.consts.Simulation.MAX_FRAME)
+                # Set the frame index
+                bpy.context.scene.frame_set(frame_index)
 
-        # Report process done
-        nmv.utilities.show_progress(
-            '* Simulation ', nmv.consts.Simulation.MAX_FRAME, nmv.consts.Simulation.MAX_FRAME,
-            done=True)
+                # Update the progress shell
+                nmv.utilities.show_progress(
+                    '* Simulation ', frame_index, nmv.consts.Simulation.MAX_FRAME)
+
+            # Report process done
+            nmv.utilities.show_progress(
+                '* Simulation ', nmv.consts.Simulation.MAX_FRAME, nmv.consts.Simulation.MAX_FRAME,
+                done=True)
 
         # Build the soma mesh from the soft body object after deformation
-        reconstructed_soma_mesh = self.build_soma_mesh_from_soft_body_object(soma_soft_body)
+        with nmv.logger.span('soma.mesh'):
+            reconstructed_soma_mesh = self.build_soma_mesh_from_soft_body_object(soma_soft_body)
 
         # Add noise to the soma surface to make it more realistic
         self.add_noise_to_soma_surface(reconstructed_soma_mesh)
@@ -26,6 +26,7 @@ from mathutils import Matrix
 
 import nmv
 import nmv.consts
+import nmv.file
 import nmv.mesh
 import nmv.shading
 import nmv.skeleton
@@ -80,18 +81,14 @@ class CircuitSpineBuilder:
         nmv.utilities.enable_std_output()
 
         self.protrusion_mesh = \
-            nmv.file.import_obj_file(nmv.consts.Paths.SPINES_MESHES_LQ_DIRECTORY, 'tip.obj')
+            nmv.file.load_spine(nmv.consts.Paths.SPINES_MESHES_LQ_DIRECTORY, 'tip.obj')
 
-        # Create the material
-        material = nmv.shading.create_material(
-            name='%spine_material', color=self.options.mesh.spines_color,
-            material_type=self.options.mesh.material)
+        # Get the material from the pool
+        material = nmv.shading.get_pooled_material(
+            color=self.options.mesh.spines_color, material_type=self.options.mesh.material)
 
-        # Apply the shader
-        for spine_object in self.spine_meshes:
-            nmv.shading.set_material_to_object(spine_object, material)
-
-        nmv.shading.set_material_to_object(self.protrusion_mesh, material)
+        # Apply the shader to all the spine meshes and the protrusion
+        nmv.shading.set_material_to_objects(self.spine_meshes + [self.protrusion_mesh], material)
 
     ################################################################################################
     # @emanate_protrusion
@@ -191,8 +188,9 @@ class CircuitSpineBuilder:
         # Load the template spine meshes
         self.load_spine_meshes()
 
-        # Load the circuit, silently please
-        circuit = brain.Circuit(self.options.morphology.blue_config)
+        # Get the circuit from the session, it is opened only once per configuration
+        session = nmv.file.get_circuit_session(self.options.morphology.blue_config)
+        circuit = session.circuit
 
         # Get all the synapses for the corresponding gid.
         synapses = circuit.afferent_synapses({int(self.morphology.gid)})
@@ -210,10 +208,8 @@ class CircuitSpineBuilder:
         spines_list = list()
 
         # Get a BBP morphology object loaded from the circuit
-        gids_set = circuit.gids('a' + str(self.morphology.gid))
-        loaded = circuit.load_morphologies(gids_set, circuit.Coordinates.local)
-        uris_set = circuit.morphology_uris(gids_set)
-        morphology = brain.neuron.Morphology(uris_set[0])
+        uri = session.get_morphology_uris([int(self.morphology.gid)])[0]
+        morphology = brain.neuron.Morphology(uri)
 
         # Load the synapses from the file
         number_spines = len(synapses)
@@ -283,13 +279,11 @@ class CircuitSpineBuilder:
 
         # Link the spines to the scene in a single step
         nmv.logger.info('Linking spines to the scene')
-        for spine_object in spines_objects:
-            bpy.context.scene.objects.link(spine_object)
+        nmv.scene.ops.link_objects_to_scene(spines_objects)
 
         # Link the protrusions to the scene in a single step
         nmv.logger.info('Linking protrusions to the scene')
-        for protrusion_object in protrusion_objects:
-            bpy.context.scene.objects.link(protrusion_object)
+        nmv.scene.ops.link_objects_to_scene(protrusion_objects)
 
         # TODO: adjust
         return spines_objects, spines_list
@@ -121,16 +121,12 @@ class RandomSpineBuilder:
         self.spine_meshes = nmv.file.load_spines(nmv.consts.Paths.SPINES_MESHES_HQ_DIRECTORY)
         nmv.utilities.enable_std_output()
 
-        # Create the material
-        material = nmv.shading.create_material(
-            name='%spine_material', color=self.options.mesh.spines_color,
-            material_type=self.options.mesh.material)
+        # Get the material from the pool
+        material = nmv.shading.get_pooled_material(
+            color=self.options.mesh.spines_color, material_type=self.options.mesh.material)
 
-        # Apply the shader
-        for spine_object in self.spine_meshes:
-
-            # Apply the shader to each spine mesh
-            nmv.shading.set_material_to_object(spine_object, material)
+        # Apply the shader to all the spine meshes
+        nmv.shading.set_material_to_objects(self.spine_meshes, material)
 
     ################################################################################################
     # @emanate_spine
@@ -49,8 +49,8 @@ def load_spine(spines_directory,
         A reference to the loaded spine into the scene.
     """
 
-    # Load the spine into a blender object
-    spine_object = nmv.file.import_obj_file(spines_directory, spine_file)
+    # Create the spine from the spines library of the directory
+    spine_object = nmv.file.load_spine(spines_directory, spine_file)
 
     # Return a reference to it
     return spine_object
@@ -68,20 +68,8 @@ def load_spines(spines_directory):
         A list of all the loaded spines.
     """
 
-    # List all the obj files in the directory
-    spines_files = nmv.file.ops.get_files_in_directory(spines_directory, file_extension='.obj')
-
-    # Load the spines, one by one into a list
-    spines_objects_list = list()
-
-    # Load spine by spine
-    for spine_file in spines_files:
-
-        # Load the spine
-        spine_object = load_spine(spines_directory, spine_file)
-
-        # Append the spine to the list
-        spines_objects_list.append(spine_object)
+    # Load the spines from the spines library of the directory
+    spines_objects_list = nmv.file.load_spines(spines_directory)
 
     # Return the spines list
     return spines_objects_list
@@ -157,8 +145,9 @@ def build_circuit_spines(morphology,
     # Import brain
     import brain
 
-    # Load the circuit, silently please
-    circuit = brain.Circuit(blue_config)
+    # Get the circuit from the session, it is opened only once per configuration
+    session = nmv.file.get_circuit_session(blue_config)
+    circuit = session.circuit
 
     # Get all the synapses for the corresponding gid.
     synapses = circuit.afferent_synapses({int(gid)})
@@ -172,16 +161,8 @@ def build_circuit_spines(morphology,
         # Apply the shader to each spine mesh
         nmv.shading.set_material_to_object(spine_object, material)
 
-    # Get the local to global transforms
-    local_to_global_transform = circuit.transforms({int(gid)})[0]
-
-    # Local_to_global_transform
-    transformation_matrix = Matrix()
-    for i in range(4):
-        transformation_matrix[i][:] = local_to_global_transform[i]
-
-    # Invert the transformation matrix
-    transformation_matrix = transformation_matrix.inverted()
+    # Get the local to global transform, and invert it
+    transformation_matrix = session.get_transformation_matrix(gid).inverted()
 
     # Create a timer to report the performance
     building_timer = nmv.utilities.timer.Timer()
@@ -223,8 +204,7 @@ def build_circuit_spines(morphology,
 
     # Link the spines to the scene in a single step
     nmv.logger.info('Linking spines to the scene')
-    for i in spines_objects:
-        bpy.context.scene.objects.link(i)
+    nmv.scene.ops.link_objects_to_scene(spines_objects)
 
     # Report the time
     building_timer.end()
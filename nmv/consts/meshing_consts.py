@@ -53,3 +53,41 @@ class Meshing:
     # BLEND extension
     BLEND_EXTENSION = '.blend'
 
+    # The maximum number of the radius levels that are meshed separately by the adaptive meta
+    # builder, every level doubles the radius of the previous one
+    META_RESOLUTION_LEVELS = 4
+
+    # The default voxel size of the signed distance field meshing, in microns
+    SDF_VOXEL_SIZE = 0.25
+
+    # The default width of the narrow band of the signed distance field, in voxels
+    SDF_NARROW_BAND = 3.0
+
+    # The default radius of the smooth union of the sections in the signed distance field, in microns.
+    # The segments of the same section are not blended, so the radii of the sections are preserved
+    SDF_SMOOTHING = 0.5
+
+    # The number of voxels along every side of the blocks of the signed distance field
+    SDF_BLOCK_SIZE = 16
+
+    # Mesh cache extension
+    MESH_CACHE_EXTENSION = '.nmc'
+
+    # The first bytes of every mesh cache file
+    MESH_CACHE_MAGIC = b'NMVMESH1'
+
+    # The version of the mesh cache format
+    MESH_CACHE_VERSION = 1
+
+    # The alignment of the arrays in the mesh cache files, in bytes
+    MESH_CACHE_ALIGNMENT = 64
+
+    # The default decimation ratios of the levels of detail of the exported meshes
+    LOD_RATIOS = [1.0, 0.5, 0.1, 0.02]
+
+    # The suffix of the files of every level of detail
+    LOD_SUFFIX = '_lod%d'
+
+    # The extension of the index file of the levels of detail
+    LOD_INDEX_EXTENSION = '.lod.json'
+
@@ -59,6 +59,12 @@ class Paths:
     # The folder where SLURM log files will be generated
     SLURM_LOGS_FOLDER = '%s/logs' % SLURM_FOLDER
 
+    # The folder where the log files and the timing spans of the processes will be generated
+    LOGS_FOLDER = 'logs'
+
+    # The folder where the profiles of the reconstructions will be generated
+    PROFILES_FOLDER = 'profiles'
+
     # Keep a reference to the current directory
     current_directory = os.path.dirname(os.path.realpath(__file__))
 
@@ -112,6 +112,9 @@ class Meshing:
         # Meta objects-based meshing
         META_OBJECTS = 'MESHING_TECHNIQUE_META_OBJECTS'
 
+        # Signed distance field-based meshing
+        SDF = 'MESHING_TECHNIQUE_SDF'
+
         ############################################################################################
         # @__init__
         ############################################################################################
@@ -140,6 +143,14 @@ class Meshing:
             elif argument == 'extrusion':
                 return Meshing.Technique.EXTRUSION
 
+            # Meta objects
+            elif argument == 'meta-objects':
+                return Meshing.Technique.META_OBJECTS
+
+            # Signed distance field
+            elif argument == 'sdf':
+                return Meshing.Technique.SDF
+
             # By default use piecewise-watertight
             else:
                 return Meshing.Technique.PIECEWISE_WATERTIGHT
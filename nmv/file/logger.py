@@ -18,6 +18,102 @@
 # System imports
 import os, platform
 import datetime
+import time
+import json
+import socket
+import atexit
+import threading
+import collections
+
+
+####################################################################################################
+# @LogSpan
+####################################################################################################
+class LogSpan:
+    """A timed span of the execution, used as a context manager. When the span is closed, a JSON
+    record with its name, its parent span, its starting time and its duration is added to the
+    spans file of the logger.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 logger,
+                 name,
+                 fields):
+        """Constructor
+
+        :param logger:
+            The logger where the span is recorded.
+        :param name:
+            The name of the span, for example 'soma.softbody'.
+        :param fields:
+            A dictionary of extra fields added to the record. The fields can be updated while the
+            span is open.
+        """
+
+        # Logger
+        self.logger = logger
+
+        # Span name
+        self.name = name
+
+        # Extra fields
+        self.fields = fields
+
+        # The name of the enclosing span
+        self.parent = None
+
+        # Starting time
+        self.starting_time = 0.0
+
+        # Duration, in seconds
+        self.duration = 0.0
+
+    ################################################################################################
+    # @__enter__
+    ################################################################################################
+    def __enter__(self):
+        """Opens the span.
+        """
+
+        # Nest the span in the current one
+        if len(self.logger.spans_stack) > 0:
+            self.parent = self.logger.spans_stack[-1].name
+        self.logger.spans_stack.append(self)
+
+        # Start the clock
+        self.starting_time = time.time()
+        return self
+
+    ################################################################################################
+    # @__exit__
+    ################################################################################################
+    def __exit__(self,
+                 exception_type,
+                 exception_value,
+                 traceback):
+        """Closes the span and records it.
+        """
+
+        # Stop the clock
+        self.duration = time.time() - self.starting_time
+        self.logger.spans_stack.remove(self)
+
+        # Record the span
+        record = {'name': self.name,
+                  'parent': self.parent,
+                  'start': self.starting_time,
+                  'duration': self.duration,
+                  'host': self.logger.host_name,
+                  'pid': self.logger.process_id,
+                  'failed': exception_type is not None}
+        record.update(self.fields)
+        self.logger.add_span_record(record)
+
+        # Do not suppress the exceptions
+        return False
 
 
 ####################################################################################################
@@ -25,21 +121,44 @@ import datetime
 ####################################################################################################
 class Logger:
     """System logger
+
+    The messages are buffered and written to a log file that is kept open. Once the output
+    directory of the workflow is known, each process writes its own log file and its own spans
+    file in the logs directory, so the workers of a batch never share a file.
     """
 
+    # Log levels
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+    # The names of the log levels, as given to the command line interface
+    LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+
+    # The maximum number of the span records kept before an output directory is set, only the
+    # most recent ones are kept when the spans are never written (the add-on for example)
+    MAX_PENDING_SPANS = 4096
+
     ################################################################################################
     # @__init__
     ################################################################################################
     def __init__(self,
                  path=None,
-                 print_stdout=True):
+                 print_stdout=True,
+                 level=INFO,
+                 buffer_size=64):
         """Constructor
 
         :param path:
             Log file path, by default None. If the path is not given, the log file will be
-            created in the current directory.
+            created in the home directory, until an output directory is set.
         :param print_stdout:
             Print the messages to the standard output stream, True by default.
+        :param level:
+            The minimum level of the logged messages, INFO by default.
+        :param buffer_size:
+            The number of the messages that are buffered before being written to the log file.
         """
 
         # Use the current working directory if no path is given
@@ -58,30 +177,189 @@ class Logger:
         # Print to the standard output stream
         self.print_stdout = print_stdout
 
-        # Log file path
+        # Process identifiers, used to name the files and tag the spans
+        self.host_name = socket.gethostname()
+        self.process_id = os.getpid()
+
+        # Log file path, the file is opened on the first write
         self.log_file_path = '%s/nmv.log' % self.path
-        print('Log file [%s]' % self.log_file_path)
+        self.log_file = None
+
+        # Spans file path, the spans are only written once an output directory is set
+        self.spans_file_path = None
+        self.spans_file = None
+
+        # Log level
+        self.level = level
+
+        # A flag to guard the expensive messages in the hot paths
+        self.debug_enabled = level <= Logger.DEBUG
 
-        # Open the log file in the write mode for the first time only
-        log_file = open(self.log_file_path, 'w')
+        # The buffered messages and span records, guarded by a lock since the messages can be
+        # logged from the loading threads as well. The lock is re-entrant, because the buffers
+        # are flushed from the methods that fill them
+        self.buffer_lock = threading.RLock()
+        self.buffer_size = buffer_size
+        self.messages_buffer = list()
+        self.spans_buffer = collections.deque(maxlen=Logger.MAX_PENDING_SPANS)
+
+        # The stack of the open spans
+        self.spans_stack = list()
 
         # Starting message and time
-        log_file.write('NeuroMorphoVis - Marwan Abdellah (C) Blue Brain Project / EPFL \n')
-        log_file.write(datetime.datetime.now().strftime("%I:%M %p on %B %d, %Y\n"))
+        self.messages_buffer.append(
+            'NeuroMorphoVis - Marwan Abdellah (C) Blue Brain Project / EPFL ')
+        self.messages_buffer.append(datetime.datetime.now().strftime("%I:%M %p on %B %d, %Y"))
+
+        # Write the buffered messages when the process exits
+        atexit.register(self.close)
+
+    ################################################################################################
+    # @set_level
+    ################################################################################################
+    def set_level(self,
+                  level):
+        """Sets the minimum level of the logged messages.
+
+        :param level:
+            A log level, or its name ('debug', 'info', 'warning' or 'error').
+        """
+
+        if isinstance(level, str):
+            level = Logger.LEVELS[level.lower()]
+        self.level = level
+        self.debug_enabled = level <= Logger.DEBUG
+
+    ################################################################################################
+    # @is_enabled
+    ################################################################################################
+    def is_enabled(self,
+                   level):
+        """Checks if the messages of a given level are logged.
+
+        :param level:
+            A log level.
+        :return:
+            True if the messages are logged, otherwise False.
+        """
+
+        return level >= self.level
+
+    ################################################################################################
+    # @set_output_directory
+    ################################################################################################
+    def set_output_directory(self,
+                             output_directory):
+        """Moves the log of the current process to the logs directory of a given output directory.
+        The log file and the spans file are named after the host and the process ID.
+
+        :param output_directory:
+            The output directory of the workflow.
+        """
+
+        # Internal imports
+        import nmv.consts
+
+        # Create the logs directory
+        logs_directory = '%s/%s' % (output_directory, nmv.consts.Paths.LOGS_FOLDER)
+        if not os.path.exists(logs_directory):
+            try:
+                os.makedirs(logs_directory)
+            except OSError:
+                # Created by another worker in the meanwhile
+                pass
+
+        # If the current files are already open, complete and close them, otherwise the pending
+        # messages are written to the new files directly
+        if self.log_file is not None or self.spans_file is not None:
+            self.close()
+
+        # Per-process files
+        prefix = '%s/nmv_%s_%d' % (logs_directory, self.host_name, self.process_id)
+        self.log_file_path = '%s.log' % prefix
+        self.spans_file_path = '%s.spans.json' % prefix
+
+    ################################################################################################
+    # @flush
+    ################################################################################################
+    def flush(self):
+        """Writes the buffered messages and span records to their files.
+        """
+
+        with self.buffer_lock:
+
+            # Messages, the buffer is swapped before it is written
+            if len(self.messages_buffer) > 0:
+                messages, self.messages_buffer = self.messages_buffer, list()
+                if self.log_file is None:
+                    self.log_file = open(self.log_file_path, 'a')
+                self.log_file.write('\n'.join(messages) + '\n')
+                self.log_file.flush()
+
+            # Spans, one JSON record per line
+            if len(self.spans_buffer) > 0 and self.spans_file_path is not None:
+                records = self.spans_buffer
+                self.spans_buffer = collections.deque(maxlen=Logger.MAX_PENDING_SPANS)
+                if self.spans_file is None:
+                    self.spans_file = open(self.spans_file_path, 'a')
+                for record in records:
+                    self.spans_file.write(json.dumps(record) + '\n')
+                self.spans_file.flush()
+
+    ################################################################################################
+    # @close
+    ################################################################################################
+    def close(self):
+        """Writes the buffered data and closes the files.
+        """
 
-        # Close
-        log_file.close()
+        with self.buffer_lock:
+            self.flush()
+            if self.log_file is not None:
+                self.log_file.close()
+                self.log_file = None
+            if self.spans_file is not None:
+                self.spans_file.close()
+                self.spans_file = None
+
+    ################################################################################################
+    # @write
+    ################################################################################################
+    def write(self,
+              log_string,
+              level=INFO):
+        """Adds a message to the buffer and writes the buffer when it is full. The errors are
+        written immediately.
+
+        :param log_string:
+            The message.
+        :param level:
+            The level of the message.
+        """
+
+        with self.buffer_lock:
+            self.messages_buffer.append(log_string)
+            if len(self.messages_buffer) >= self.buffer_size or level >= Logger.ERROR:
+                self.flush()
 
     ################################################################################################
     # @log
     ################################################################################################
-    def log(self, *args):
+    def log(self,
+            *args,
+            level=INFO):
         """Logging and printing to stdout.
 
         :param args:
             Input arguments.
+        :param level:
+            The level of the message, INFO by default.
         """
 
+        # Ignore the messages below the log level
+        if level < self.level:
+            return
+
         # Make a string from the log args
         log_string = ' '.join(map(str, args))
 
@@ -89,14 +367,49 @@ class Logger:
         if self.print_stdout:
             print(log_string.replace('(\'', '').replace('\',)', ''))
 
-        # Open the log file in the append mode.
-        log_file = open(self.log_file_path, 'a')
+        # Append this message to the log
+        self.write(log_string, level)
+
+    ################################################################################################
+    # @debug
+    ################################################################################################
+    def debug(self,
+              *args):
+        """Log a debugging message. The messages of the hot paths should be guarded with the
+        debug_enabled flag to avoid formatting them when they are not logged.
+
+        :param args:
+            Input arguments.
+        """
+
+        if self.debug_enabled:
+            self.log(*args, level=Logger.DEBUG)
+
+    ################################################################################################
+    # @warning
+    ################################################################################################
+    def warning(self,
+                *args):
+        """Log a warning.
 
-        # Append this message to the log string
-        log_file.write(log_string + '\n')
+        :param args:
+            Input arguments.
+        """
 
-        # Close the log file
-        log_file.close()
+        self.log(*args, level=Logger.WARNING)
+
+    ################################################################################################
+    # @error
+    ################################################################################################
+    def error(self,
+              *args):
+        """Log an error, the error is written to the log file immediately.
+
+        :param args:
+            Input arguments.
+        """
+
+        self.log(*args, level=Logger.ERROR)
 
     ################################################################################################
     # @line
@@ -110,14 +423,8 @@ class Logger:
         if self.print_stdout:
             print(stars)
 
-        # Open the log file in the append mode.
-        log_file = open(self.log_file_path, 'a')
-
-        # Append this message to the log string
-        log_file.write(stars + '\n')
-
-        # Close the log file
-        log_file.close()
+        # Append this message to the log
+        self.write(stars)
 
     ################################################################################################
     # @header
@@ -168,3 +475,95 @@ class Logger:
 
         # Log the string
         self.log('\t\t* %s' % log_string)
+
+    ################################################################################################
+    # @span
+    ################################################################################################
+    def span(self,
+             name,
+             **fields):
+        """Returns a timed span to be used in a with statement, for example
+        with nmv.logger.span('soma.softbody'): ...
+
+        :param name:
+            The name of the span, the stages are separated with dots.
+        :param fields:
+            Extra fields added to the JSON record of the span.
+        :return:
+            A LogSpan context manager.
+        """
+
+        return LogSpan(self, name, fields)
+
+    ################################################################################################
+    # @add_span_record
+    ################################################################################################
+    def add_span_record(self,
+                        record):
+        """Adds the record of a closed span to the buffer. Until an output directory is set, the
+        buffer is bounded and drops its oldest records.
+
+        :param record:
+            A dictionary of the span data.
+        """
+
+        with self.buffer_lock:
+            self.spans_buffer.append(record)
+            if len(self.spans_buffer) >= self.buffer_size:
+                self.flush()
+
+
+####################################################################################################
+# @read_span_records
+####################################################################################################
+def read_span_records(logs_directory):
+    """Reads all the span records written by the processes of a batch into a logs directory.
+
+    :param logs_directory:
+        The logs directory of the batch.
+    :return:
+        A list of the span records.
+    """
+
+    records = list()
+    for file_name in sorted(os.listdir(logs_directory)):
+        if not file_name.endswith('.spans.json'):
+            continue
+        with open('%s/%s' % (logs_directory, file_name), 'r') as spans_file:
+            for line in spans_file:
+                line = line.strip()
+                if len(line) > 0:
+                    records.append(json.loads(line))
+    return records
+
+
+####################################################################################################
+# @aggregate_span_records
+####################################################################################################
+def aggregate_span_records(records):
+    """Aggregates the span records by their names.
+
+    :param records:
+        A list of the span records.
+    :return:
+        A dictionary keyed by the span names, each entry has the count, the total, the mean, the
+        minimum and the maximum durations of the span, in seconds.
+    """
+
+    aggregates = dict()
+    for record in records:
+        duration = record['duration']
+        entry = aggregates.get(record['name'])
+        if entry is None:
+            aggregates[record['name']] = {'count': 1, 'total': duration,
+                                          'min': duration, 'max': duration}
+        else:
+            entry['count'] += 1
+            entry['total'] += duration
+            entry['min'] = min(entry['min'], duration)
+            entry['max'] = max(entry['max'], duration)
+
+    # Compute the means
+    for entry in aggregates.values():
+        entry['mean'] = entry['total'] / entry['count']
+    return aggregates
@@ -146,6 +146,14 @@ def create_output_tree(output_directory):
     sequences_directory = '%s/%s' % (output_directory, Paths.SEQUENCES_FOLDER)
     clean_and_create_directory(sequences_directory)
 
+    # Logs directory
+    logs_directory = '%s/%s' % (output_directory, Paths.LOGS_FOLDER)
+    clean_and_create_directory(logs_directory)
+
+    # Profiles directory
+    profiles_directory = '%s/%s' % (output_directory, Paths.PROFILES_FOLDER)
+    clean_and_create_directory(profiles_directory)
+
 
 ####################################################################################################
 # @path_exists
@@ -16,3 +16,4 @@
 ####################################################################################################
 
 from .importers import *
+from .mesh_cache_reader import *
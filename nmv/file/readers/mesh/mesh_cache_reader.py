@@ -0,0 +1,216 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import numpy
+
+# Blender imports
+import bpy
+from mathutils import Matrix
+
+# Internal imports
+import nmv
+import nmv.consts
+
+
+####################################################################################################
+# @read_mesh_cache_file
+####################################################################################################
+def read_mesh_cache_file(file_path):
+    """Reads a mesh cache file. The arrays are memory-mapped, and they are only read from the disk
+    when they are used.
+
+    :param file_path:
+        The path to the mesh cache file.
+    :return:
+        A tuple (header, objects_arrays) with the header of the file and a list of dictionaries of
+        the arrays of every object, or None if the file is not a valid mesh cache file.
+    """
+
+    # Read the header
+    magic = nmv.consts.Meshing.MESH_CACHE_MAGIC
+    with open(file_path, 'rb') as cache_file:
+        if cache_file.read(len(magic)) != magic:
+            nmv.logger.log('ERROR: [%s] is not a mesh cache file' % file_path)
+            return None
+        header_size = int(numpy.frombuffer(cache_file.read(8), dtype='<u8')[0])
+        header = json.loads(cache_file.read(header_size).decode('utf-8'))
+
+    # Check the version
+    if header['version'] > nmv.consts.Meshing.MESH_CACHE_VERSION:
+        nmv.logger.log('ERROR: Unsupported mesh cache version [%d] in [%s]' %
+                       (header['version'], file_path))
+        return None
+
+    # Map the arrays of the objects
+    data_start = len(magic) + 8 + header_size
+    objects_arrays = list()
+    for object_header in header['objects']:
+        arrays = dict()
+        for name, array_header in object_header['arrays'].items():
+            shape = tuple(array_header['shape'])
+            if numpy.prod(shape) == 0:
+                arrays[name] = numpy.zeros(shape, dtype=array_header['dtype'])
+            else:
+                arrays[name] = numpy.memmap(
+                    file_path, dtype=array_header['dtype'], mode='r', shape=shape,
+                    offset=data_start + array_header['offset'])
+        objects_arrays.append(arrays)
+
+    # Return the header and the arrays
+    return header, objects_arrays
+
+
+####################################################################################################
+# @get_mesh_cache_material
+####################################################################################################
+def get_mesh_cache_material(material_header):
+    """Returns the material of a slot of a cached mesh. An existing material with the same name is
+    used, otherwise a new material is created with the cached color.
+
+    :param material_header:
+        The material entry of the header, or None for an empty slot.
+    :return:
+        A material, or None.
+    """
+
+    if material_header is None:
+        return None
+
+    # Use the existing material
+    material = bpy.data.materials.get(material_header['name'])
+    if material is not None:
+        return material
+
+    # Create a new one
+    material = bpy.data.materials.new(material_header['name'])
+    material.diffuse_color = material_header['color'][:3]
+    return material
+
+
+####################################################################################################
+# @create_mesh_object_from_cache_arrays
+####################################################################################################
+def create_mesh_object_from_cache_arrays(name,
+                                         arrays):
+    """Creates a mesh object in bulk from the arrays of a cached mesh and links it to the scene.
+
+    :param name:
+        The name of the object.
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A reference to the created mesh object.
+    """
+
+    vertices = arrays['vertices']
+    polygons_sizes = numpy.ascontiguousarray(arrays['polygons_sizes'], dtype=numpy.int32)
+    polygons_vertices = numpy.ascontiguousarray(arrays['polygons_vertices'], dtype=numpy.int32)
+
+    # Create the mesh
+    mesh = bpy.data.meshes.new(name)
+
+    # Vertices
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', numpy.ascontiguousarray(vertices, dtype=numpy.float32).ravel())
+
+    # Loops
+    mesh.loops.add(len(polygons_vertices))
+    mesh.loops.foreach_set('vertex_index', polygons_vertices)
+
+    # Polygons
+    mesh.polygons.add(len(polygons_sizes))
+    mesh.polygons.foreach_set('loop_start', numpy.cumsum(polygons_sizes) - polygons_sizes)
+    mesh.polygons.foreach_set('loop_total', polygons_sizes)
+    mesh.polygons.foreach_set('material_index', numpy.ascontiguousarray(
+        arrays['material_indices'], dtype=numpy.int32))
+    mesh.polygons.foreach_set('use_smooth', numpy.ascontiguousarray(
+        arrays['smooth'], dtype=numpy.bool_))
+
+    # Build the edges
+    mesh.update(calc_edges=True)
+
+    # Create the object and link it to the scene
+    mesh_object = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.objects.link(mesh_object)
+
+    # Return a reference to the object
+    return mesh_object
+
+
+####################################################################################################
+# @import_mesh_cache_file
+####################################################################################################
+def import_mesh_cache_file(input_directory,
+                           input_file_name,
+                           transform=False,
+                           transformation_matrix=None):
+    """Imports the objects of a mesh cache file into the scene.
+
+    :param input_directory:
+        The directory that is supposed to have the mesh.
+    :param input_file_name:
+        The name of the mesh file.
+    :param transform:
+        Place the objects in the global coordinates. The transformation is applied to the matrices
+        of the objects, the vertices are not modified.
+    :param transformation_matrix:
+        A local to global transformation matrix. If None, the matrix stored in the file is used.
+    :return:
+        A list of the imported objects, or None if the file cannot be loaded.
+    """
+
+    # File path
+    file_path = "%s/%s" % (input_directory, input_file_name)
+
+    # Issue an error message if failing
+    if not os.path.isfile(file_path):
+        nmv.logger.log('LOADING ERROR: cannot load [%s]' % file_path)
+        return None
+
+    # Read the file
+    nmv.logger.log('Loading [%s]' % file_path)
+    mesh_cache = read_mesh_cache_file(file_path)
+    if mesh_cache is None:
+        return None
+    header, objects_arrays = mesh_cache
+
+    # The transformation matrix of the neuron
+    if transformation_matrix is None:
+        transformation_matrix = Matrix(numpy.array(header['transform']).reshape(4, 4).tolist())
+
+    # Create the objects
+    mesh_objects = list()
+    for object_header, arrays in zip(header['objects'], objects_arrays):
+        mesh_object = create_mesh_object_from_cache_arrays(object_header['name'], arrays)
+
+        # Materials
+        for material_header in object_header['materials']:
+            mesh_object.data.materials.append(get_mesh_cache_material(material_header))
+
+        # Place the object
+        matrix = Matrix(numpy.array(object_header['matrix']).reshape(4, 4).tolist())
+        if transform:
+            matrix = transformation_matrix * matrix
+        mesh_object.matrix_world = matrix
+
+        mesh_objects.append(mesh_object)
+
+    # Return references to the objects
+    return mesh_objects
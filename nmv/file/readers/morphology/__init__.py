@@ -18,4 +18,6 @@
 from .h5_reader import *
 from .swc_reader import *
 from .bbp_reader import *
-from .morphology_reader import *
\ No newline at end of file
+from .morphology_reader import *
+from .circuit_session import *
+from .morphology_stream import *
\ No newline at end of file
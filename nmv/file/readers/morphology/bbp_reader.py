@@ -57,19 +57,14 @@ class BBPReader:
             A list of GIDs composing the target.
         """
 
-        # Import brain
+        # Get the circuit session, the circuit is opened only once
         try:
-            import brain
+            session = nmv.file.get_circuit_session(blue_config)
+            gids = session.get_gids(target)
         except ImportError:
             print('ERROR: Cannot import brain')
             return None
 
-        # Open a circuit with a given blue config
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphologies from these GIDs
-        gids = bbp_circuit.gids(target)
-
         # Return a list of all the GIDs
         return gids
 
@@ -96,17 +91,12 @@ class BBPReader:
             print('ERROR: Cannot import brain')
             return None
 
-        # Load the circuit
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphology corresponding to the given GID
-        gids_set = bbp_circuit.gids('a' + str(gid))
-
-        loaded = bbp_circuit.load_morphologies(gids_set, bbp_circuit.Coordinates.local)
-        uris_set = bbp_circuit.morphology_uris(gids_set)
+        # Get the URI of the morphology from the circuit session
+        session = nmv.file.get_circuit_session(blue_config)
+        uri = session.get_morphology_uris([int(gid)])[0]
 
         # Get a BBP morphology object loaded from the circuit
-        bbp_morphology_object = brain.neuron.Morphology(uris_set[0])
+        bbp_morphology_object = brain.neuron.Morphology(uri)
 
         # Return a reference to the morphology
         return bbp_morphology_object
@@ -124,27 +114,22 @@ class BBPReader:
         :param target:
             Input target
         :return:
-            A reference to all the BBP morphologies loaded from the target and their GIDs
+            A list of the morphology skeletons loaded from the target and their GIDs
         """
 
-        # Import brain
+        # Get the circuit session, the circuit is opened only once
         try:
-            import brain
+            session = nmv.file.get_circuit_session(blue_config)
+            gids = session.get_gids(target)
         except ImportError:
             print('ERROR: Cannot import brain')
             return None
 
-        # Open a circuit with a given blue config
-        bbp_circuit = brain.Circuit(blue_config)
-
-        # Create a GID-set and load the morphologies from these GIDs
-        gids = bbp_circuit.gids(target)
-        uris = bbp_circuit.morphology_uris(gids)[0]
-        brain.neuron.Morphology(uris)
-        bbp_morphologies = bbp_circuit.load_morphologies(gids, bbp_circuit.Coordinates.local)
+        # Load the morphologies, with a single query for their URIs
+        morphologies = session.load_morphologies(gids)
 
         # Return a reference to the morphologies and their GIDs
-        return bbp_morphologies, gids
+        return morphologies, gids
 
     ################################################################################################
     # @get_neuron_from_gid
@@ -204,12 +189,8 @@ class BBPReader:
             Cartesian coordinates of the position of the neuron (soma position)
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
-
-        # Return the position of the neuron
-        for data in neuron:
-            return data.position()
+        # Get the neuron data from the circuit session
+        return nmv.file.get_circuit_session(blue_config).get_neuron_data(gid)['position']
 
     ################################################################################################
     # @get_neuron_orientation_from_gid
@@ -227,12 +208,8 @@ class BBPReader:
             The orientation of the neuron.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
-
-        # Return the orientation of he neuron
-        for data in neuron:
-            return data.orientation()
+        # Get the neuron data from the circuit session
+        return nmv.file.get_circuit_session(blue_config).get_neuron_data(gid)['orientation']
 
     ################################################################################################
     # @get_neuron_mtype_name_from_gid
@@ -250,12 +227,8 @@ class BBPReader:
             Neuron morphological type name.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
-
-        # Return the mtype name
-        for data in neuron:
-            return data.morphology_type().name()
+        # Get the neuron data from the circuit session
+        return nmv.file.get_circuit_session(blue_config).get_neuron_data(gid)['mtype']
 
     ################################################################################################
     # @get_neuron_morphology_label_from_gid
@@ -273,12 +246,8 @@ class BBPReader:
             Neuron morphology label.
         """
 
-        # Load the neuron from the BBP-SDK
-        neuron = BBPReader.get_neuron_from_gid(blue_config, gid)
-
-        # Return morphology label
-        for data in neuron:
-            return data.morphology_label()
+        # Get the neuron data from the circuit session
+        return nmv.file.get_circuit_session(blue_config).get_neuron_data(gid)['label']
 
     ################################################################################################
     # @get_section_from_id
@@ -289,18 +258,38 @@ class BBPReader:
         """Return a BBP section from its ID.
 
         :param sections:
-            A list of BBP sections
+            A list of BBP sections, or a dictionary of the sections keyed by their IDs. The
+            dictionary should be used for repeated lookups, since the list is scanned linearly.
         :param id:
             A given section ID.
         :return:
             A BBP section.
         """
 
+        # Constant time lookup
+        if isinstance(sections, dict):
+            return sections.get(id)
+
         for section in sections:
             if section.id == id:
                 return section
         return None
 
+    ################################################################################################
+    # @get_sections_dictionary
+    ################################################################################################
+    @staticmethod
+    def get_sections_dictionary(sections):
+        """Returns a dictionary of a list of sections keyed by their IDs.
+
+        :param sections:
+            A list of sections.
+        :return:
+            A dictionary mapping each section ID to its section.
+        """
+
+        return {section.id: section for section in sections}
+
     ################################################################################################
     # @get_starting_sections_from_sections_list
     ################################################################################################
@@ -326,7 +315,7 @@ class BBPReader:
             if section.parent_id is None:
 
                 # Append it to the list
-                sections.append(BBPReader.get_section_from_id(sections_list, section.id))
+                sections.append(section)
 
         return sections
 
@@ -733,6 +722,10 @@ class BBPReader:
         """
 
         sections = []
+
+        # The converted sections keyed by their IDs, to find the parents in constant time
+        sections_by_id = dict()
+
         for bbp_morphology_section in bbp_morphology_sections:
 
             # Get the section ID
@@ -774,16 +767,12 @@ class BBPReader:
                 id=section_id, parent_id=parent_section_id, children_ids=children_ids, samples=samples,
                 type=section_type)
 
-            # Set the parenting
-            if parent_section_id is None:
-                section.parent = None
-
-            for i_section in sections:
-                if i_section.id == parent_section_id:
-                    section.parent = i_section.parent
+            # Set the parenting, the parent is None if it is not converted yet
+            section.parent = sections_by_id.get(parent_section_id)
 
             # Add the section to the list
             sections.append(section)
+            sections_by_id[section_id] = section
 
         # Return a list of the converted sections
         return sections
@@ -799,29 +788,35 @@ class BBPReader:
         :param root:
             The root of the unifying morphology.
         :param sections:
-            A list of input BBP sections to be added to this morphology skeleton.
+            A list of input BBP sections to be added to this morphology skeleton, or a dictionary
+            of these sections keyed by their IDs.
         :return:
             The root after integrating the input sections.
         """
 
-        # Get section parent and update the root
-        parent = BBPReader.get_section_from_id(sections, root.parent_id)
-        root.parent = parent
+        # Index the sections by their IDs once
+        if not isinstance(sections, dict):
+            sections = BBPReader.get_sections_dictionary(sections)
 
-        # Get section children and update the root
-        if len(root.children_ids) > 0:
+        # Link the sections without recursion, to support arbors of any depth
+        sections_stack = [root]
+        while len(sections_stack) > 0:
+            section = sections_stack.pop()
+
+            # Get section parent and update the section
+            section.parent = sections.get(section.parent_id)
 
             # Do it child by child
-            for child_id in root.children_ids:
+            for child_id in section.children_ids:
 
                 # Get the section based on its id
-                child = BBPReader.get_section_from_id(sections, child_id)
-
-                # Create morphology skeleton before adding it to the current branch
-                child = BBPReader.create_morphology_skeleton(child, sections)
+                child = sections.get(child_id)
+                if child is None:
+                    continue
 
                 # Add the child to the list of children in the parent branch
-                root.children.append(child)
+                section.children.append(child)
+                sections_stack.append(child)
 
         return root
 
@@ -908,13 +903,15 @@ class BBPReader:
 
         # Create the axon tree
         axon_root = BBPReader.get_starting_sections_from_sections_list(axon_list)[0]
-        axon = BBPReader.create_morphology_skeleton(axon_root, axon_list)
+        axon = BBPReader.create_morphology_skeleton(
+            axon_root, BBPReader.get_sections_dictionary(axon_list))
 
-        # Create the dendrites trees
+        # Create the dendrites trees, sharing a single dictionary of the sections
+        basal_dendrites_sections = BBPReader.get_sections_dictionary(basal_dendrites_list)
         dendrites_roots = BBPReader.get_starting_sections_from_sections_list(basal_dendrites_list)
         dendrites = []
         for dendrite_root in dendrites_roots:
-            dendrite = BBPReader.create_morphology_skeleton(dendrite_root, basal_dendrites_list)
+            dendrite = BBPReader.create_morphology_skeleton(dendrite_root, basal_dendrites_sections)
             dendrites.append(dendrite)
 
         # Create the apical dendrites tree, if exists
@@ -948,13 +945,8 @@ class BBPReader:
             A reference to a BBP morphology structure
         """
 
-        # Load the BBP morphology object
-        bbp_morphology_object = BBPReader.load_bbp_morphology_from_gid(
-            blue_config=blue_config, gid=gid)
-
-        # Convert the BBP morphology object to a skeleton
-        morphology_object = BBPReader.convert_morphology_to_skeleton(
-            gid=gid, bbp_morphology=bbp_morphology_object)
+        # Load the morphology through the circuit session, the circuit is opened only once
+        morphology_object = nmv.file.get_circuit_session(blue_config).load_morphology(gid)
 
         if morphology_object is not None:
 
@@ -0,0 +1,646 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import threading
+
+# Blender imports
+from mathutils import Matrix
+
+# Internal imports
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @CircuitBackend
+####################################################################################################
+class CircuitBackend:
+    """The interface of a circuit backend, i.e. the library that is used to access the circuit.
+
+    A backend is stateless, the opened circuit is returned by open() and given back to all the
+    other methods. The lists returned by the bulk methods are aligned with the given GIDs.
+    """
+
+    ################################################################################################
+    # @open
+    ################################################################################################
+    def open(self,
+             blue_config):
+        """Opens a circuit.
+
+        :param blue_config:
+            The circuit configuration file.
+        :return:
+            A handle to the opened circuit.
+        """
+        raise NotImplementedError
+
+    ################################################################################################
+    # @get_gids
+    ################################################################################################
+    def get_gids(self,
+                 circuit,
+                 target):
+        """Returns a sorted list of the GIDs of a given target.
+
+        :param circuit:
+            The opened circuit.
+        :param target:
+            Circuit target.
+        :return:
+            A list of GIDs.
+        """
+        raise NotImplementedError
+
+    ################################################################################################
+    # @get_morphology_uris
+    ################################################################################################
+    def get_morphology_uris(self,
+                            circuit,
+                            gids):
+        """Returns the URIs of the morphologies of a list of GIDs.
+
+        :param circuit:
+            The opened circuit.
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of the morphology URIs.
+        """
+        raise NotImplementedError
+
+    ################################################################################################
+    # @get_transforms
+    ################################################################################################
+    def get_transforms(self,
+                       circuit,
+                       gids):
+        """Returns the local to global transforms of a list of GIDs.
+
+        :param circuit:
+            The opened circuit.
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of 4x4 transforms, each given as four rows.
+        """
+        raise NotImplementedError
+
+    ################################################################################################
+    # @get_neuron_data
+    ################################################################################################
+    def get_neuron_data(self,
+                        circuit,
+                        blue_config,
+                        gid):
+        """Returns the data of a neuron.
+
+        :param circuit:
+            The opened circuit.
+        :param blue_config:
+            The circuit configuration file, needed by the libraries that open the circuit again.
+        :param gid:
+            Neuron GID.
+        :return:
+            A dictionary with the 'position', 'orientation', 'mtype' and 'label' of the neuron.
+        """
+        raise NotImplementedError
+
+    ################################################################################################
+    # @load_morphology
+    ################################################################################################
+    def load_morphology(self,
+                        circuit,
+                        uri,
+                        gid):
+        """Loads a morphology and converts it to a morphology skeleton.
+
+        :param circuit:
+            The opened circuit.
+        :param uri:
+            The URI of the morphology.
+        :param gid:
+            Neuron GID.
+        :return:
+            A morphology skeleton, or None if the morphology cannot be loaded.
+        """
+        raise NotImplementedError
+
+
+# The opened BBP-SDK experiments and their microcircuits, keyed by the real paths of the circuit
+# configurations
+BBP_EXPERIMENTS = dict()
+
+
+####################################################################################################
+# @BrainCircuitBackend
+####################################################################################################
+class BrainCircuitBackend(CircuitBackend):
+    """Circuit backend based on the 'brain' module of BBP, and the BBP-SDK for the neuron data.
+    """
+
+    ################################################################################################
+    # @open
+    ################################################################################################
+    def open(self,
+             blue_config):
+
+        # Import brain
+        try:
+            import brain
+        except ImportError:
+            raise ImportError('ERROR: Cannot import \'brain\'')
+
+        # Open the circuit
+        return brain.Circuit(blue_config)
+
+    ################################################################################################
+    # @get_gids
+    ################################################################################################
+    def get_gids(self,
+                 circuit,
+                 target):
+        return sorted([int(gid) for gid in circuit.gids(target)])
+
+    ################################################################################################
+    # @get_ordered_results
+    ################################################################################################
+    @staticmethod
+    def get_ordered_results(function,
+                            gids):
+        """Calls a brain function that takes a set of GIDs and returns results ordered by GID, and
+        aligns its results with the given list.
+
+        :param function:
+            A brain function.
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of the results, aligned with the given GIDs.
+        """
+
+        sorted_gids = sorted(set(int(gid) for gid in gids))
+        results = dict(zip(sorted_gids, function(set(sorted_gids))))
+        return [results[int(gid)] for gid in gids]
+
+    ################################################################################################
+    # @get_morphology_uris
+    ################################################################################################
+    def get_morphology_uris(self,
+                            circuit,
+                            gids):
+        return self.get_ordered_results(circuit.morphology_uris, gids)
+
+    ################################################################################################
+    # @get_transforms
+    ################################################################################################
+    def get_transforms(self,
+                       circuit,
+                       gids):
+        return self.get_ordered_results(circuit.transforms, gids)
+
+    ################################################################################################
+    # @get_bbp_microcircuit
+    ################################################################################################
+    @staticmethod
+    def get_bbp_microcircuit(blue_config):
+        """Returns the BBP-SDK microcircuit of a circuit. The experiment is opened once, on the
+        first call, and reused by all the following ones until the sessions are closed.
+
+        :param blue_config:
+            The circuit configuration file.
+        :return:
+            The BBP-SDK microcircuit.
+        """
+
+        # The neuron data is only available from the BBP-SDK
+        import bbp
+
+        # Open the experiment, and keep a reference to it as long as its microcircuit is used
+        key = os.path.realpath(blue_config)
+        if key not in BBP_EXPERIMENTS:
+            bbp_experiment = bbp.Experiment()
+            bbp_experiment.open(blue_config)
+            BBP_EXPERIMENTS[key] = (bbp_experiment, bbp_experiment.microcircuit())
+        return BBP_EXPERIMENTS[key][1]
+
+    ################################################################################################
+    # @get_neuron_data
+    ################################################################################################
+    def get_neuron_data(self,
+                        circuit,
+                        blue_config,
+                        gid):
+
+        # The neuron data is only available from the BBP-SDK
+        import bbp
+
+        # Load the neuron into the microcircuit of the experiment that is already opened
+        bbp_microcircuit = self.get_bbp_microcircuit(blue_config)
+        bbp_cell_target = bbp.Cell_Target()
+        bbp_cell_target.insert(int(gid))
+        bbp_microcircuit.load(bbp_cell_target, bbp.Loading_Flags.NEURONS)
+
+        # Extract the data, the microcircuit keeps the neurons that were loaded before
+        for neuron in bbp_microcircuit.neurons():
+            if int(neuron.gid()) == int(gid):
+                return {'position': neuron.position(),
+                        'orientation': neuron.orientation(),
+                        'mtype': neuron.morphology_type().name(),
+                        'label': neuron.morphology_label()}
+        return None
+
+    ################################################################################################
+    # @load_morphology
+    ################################################################################################
+    def load_morphology(self,
+                        circuit,
+                        uri,
+                        gid):
+
+        # Import brain
+        import brain
+
+        # Load the morphology and convert it
+        bbp_morphology = brain.neuron.Morphology(uri)
+        return nmv.file.BBPReader.convert_morphology_to_skeleton(
+            gid=gid, bbp_morphology=bbp_morphology)
+
+
+####################################################################################################
+# @LocalCircuitBackend
+####################################################################################################
+class LocalCircuitBackend(CircuitBackend):
+    """A file-based stand-in circuit, described by a .json file that lists the neurons with their
+    morphology files (.h5 or .swc) and their data, for example:
+
+        {
+            "morphologies_directory": "morphologies",
+            "targets": {"column": [1, 2]},
+            "neurons": {
+                "1": {"morphology": "neuron_1.h5",
+                      "transform": [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]],
+                      "position": [0, 0, 0], "orientation": [0, 0, 0, 1],
+                      "mtype": "L5_TTPC1", "label": "neuron_1"}
+            }
+        }
+
+    The relative paths are resolved with respect to the directory of the .json file, and the
+    targets with the form 'a<GID>' are resolved to a single GID, like in BBP circuits.
+    """
+
+    ################################################################################################
+    # @open
+    ################################################################################################
+    def open(self,
+             blue_config):
+
+        # Read the description
+        with open(blue_config, 'r') as circuit_file:
+            circuit = json.load(circuit_file)
+
+        # Resolve the morphologies directory
+        circuit_directory = os.path.dirname(os.path.realpath(blue_config))
+        circuit['morphologies_directory'] = os.path.join(
+            circuit_directory, circuit.get('morphologies_directory', '.'))
+
+        # Use integer GIDs
+        circuit['neurons'] = {int(gid): data for gid, data in circuit.get('neurons', {}).items()}
+        return circuit
+
+    ################################################################################################
+    # @get_gids
+    ################################################################################################
+    def get_gids(self,
+                 circuit,
+                 target):
+
+        # A single GID
+        if target.startswith('a') and target[1:].isdigit():
+            return [int(target[1:])] if int(target[1:]) in circuit['neurons'] else list()
+
+        # A named target
+        return sorted([int(gid) for gid in circuit.get('targets', {}).get(target, list())])
+
+    ################################################################################################
+    # @get_morphology_uris
+    ################################################################################################
+    def get_morphology_uris(self,
+                            circuit,
+                            gids):
+        return [os.path.join(circuit['morphologies_directory'],
+                             circuit['neurons'][int(gid)]['morphology']) for gid in gids]
+
+    ################################################################################################
+    # @get_transforms
+    ################################################################################################
+    def get_transforms(self,
+                       circuit,
+                       gids):
+        identity = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+        return [circuit['neurons'][int(gid)].get('transform', identity) for gid in gids]
+
+    ################################################################################################
+    # @get_neuron_data
+    ################################################################################################
+    def get_neuron_data(self,
+                        circuit,
+                        blue_config,
+                        gid):
+        data = circuit['neurons'][int(gid)]
+        return {'position': data.get('position', [0, 0, 0]),
+                'orientation': data.get('orientation', [0, 0, 0, 1]),
+                'mtype': data.get('mtype', None),
+                'label': data.get('label', os.path.splitext(data['morphology'])[0])}
+
+    ################################################################################################
+    # @load_morphology
+    ################################################################################################
+    def load_morphology(self,
+                        circuit,
+                        uri,
+                        gid):
+
+        # Load the morphology file
+        if uri.endswith('.h5'):
+            morphology = nmv.file.read_h5_morphology(uri)
+        elif uri.endswith('.swc'):
+            morphology = nmv.file.read_swc_morphology(uri)
+        else:
+            nmv.logger.log('ERROR: Unsupported morphology file [%s]' % uri)
+            return None
+
+        # Identify the morphology with its GID, like the morphologies loaded from a BBP circuit
+        if morphology is not None:
+            morphology.gid = gid
+            morphology.label = str(gid)
+            morphology.mtype = circuit['neurons'][int(gid)].get('mtype', None)
+        return morphology
+
+
+####################################################################################################
+# @get_circuit_backend
+####################################################################################################
+def get_circuit_backend(blue_config):
+    """Returns the default backend of a circuit configuration: the local backend for .json files
+    and the brain backend otherwise.
+
+    :param blue_config:
+        The circuit configuration file.
+    :return:
+        A circuit backend.
+    """
+
+    if blue_config.endswith('.json'):
+        return LocalCircuitBackend()
+    return BrainCircuitBackend()
+
+
+####################################################################################################
+# @CircuitSession
+####################################################################################################
+class CircuitSession:
+    """An opened circuit with cached queries, shared between all the GIDs loaded from the circuit.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 blue_config,
+                 backend=None):
+        """Constructor
+
+        :param blue_config:
+            The circuit configuration file.
+        :param backend:
+            The circuit backend. If None, the default backend of the configuration is used.
+        """
+
+        # Circuit configuration
+        self.blue_config = blue_config
+
+        # Circuit backend
+        self.backend = backend if backend is not None else get_circuit_backend(blue_config)
+
+        # The opened circuit, opened on the first query
+        self.opened_circuit = None
+
+        # Cached targets, morphology URIs, transforms and neurons data
+        self.targets = dict()
+        self.morphology_uris = dict()
+        self.transforms = dict()
+        self.neurons_data = dict()
+
+        # The circuit queries are serialized, since the morphologies could be streamed from a
+        # background thread while the main thread queries the same session
+        self.lock = threading.RLock()
+
+    ################################################################################################
+    # @circuit
+    ################################################################################################
+    @property
+    def circuit(self):
+        """The opened circuit, opened once for the session.
+        """
+
+        with self.lock:
+            if self.opened_circuit is None:
+                self.opened_circuit = self.backend.open(self.blue_config)
+            return self.opened_circuit
+
+    ################################################################################################
+    # @get_gids
+    ################################################################################################
+    def get_gids(self,
+                 target):
+        """Returns the GIDs of a given target.
+
+        :param target:
+            Circuit target.
+        :return:
+            A sorted list of GIDs.
+        """
+
+        with self.lock:
+            if target not in self.targets:
+                self.targets[target] = self.backend.get_gids(self.circuit, target)
+            return self.targets[target]
+
+    ################################################################################################
+    # @get_morphology_uris
+    ################################################################################################
+    def get_morphology_uris(self,
+                            gids):
+        """Returns the morphology URIs of a list of GIDs, querying the circuit once for all the GIDs
+        that are not cached yet.
+
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of URIs aligned with the GIDs.
+        """
+
+        with self.lock:
+            missing_gids = [int(gid) for gid in gids if int(gid) not in self.morphology_uris]
+            if len(missing_gids) > 0:
+                self.morphology_uris.update(zip(
+                    missing_gids, self.backend.get_morphology_uris(self.circuit, missing_gids)))
+            return [self.morphology_uris[int(gid)] for gid in gids]
+
+    ################################################################################################
+    # @get_transformation_matrices
+    ################################################################################################
+    def get_transformation_matrices(self,
+                                    gids):
+        """Returns the local to global transformation matrices of a list of GIDs, querying the
+        circuit once for all the GIDs that are not cached yet.
+
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of matrices aligned with the GIDs.
+        """
+
+        with self.lock:
+            missing_gids = [int(gid) for gid in gids if int(gid) not in self.transforms]
+            if len(missing_gids) > 0:
+                for gid, transform in zip(missing_gids,
+                                          self.backend.get_transforms(self.circuit, missing_gids)):
+
+                    # Fill the matrix row by row
+                    transformation_matrix = Matrix()
+                    for i in range(4):
+                        transformation_matrix[i][:] = transform[i]
+                    self.transforms[gid] = transformation_matrix
+
+            # Return copies to protect the cache from in-place edits
+            return [self.transforms[int(gid)].copy() for gid in gids]
+
+    ################################################################################################
+    # @get_transformation_matrix
+    ################################################################################################
+    def get_transformation_matrix(self,
+                                  gid):
+        """Returns the local to global transformation matrix of a neuron.
+
+        :param gid:
+            Neuron GID.
+        :return:
+            Transformation matrix.
+        """
+
+        return self.get_transformation_matrices([gid])[0]
+
+    ################################################################################################
+    # @get_neuron_data
+    ################################################################################################
+    def get_neuron_data(self,
+                        gid):
+        """Returns the data (position, orientation, mtype and label) of a neuron.
+
+        :param gid:
+            Neuron GID.
+        :return:
+            A dictionary of the neuron data.
+        """
+
+        with self.lock:
+            if int(gid) not in self.neurons_data:
+                self.neurons_data[int(gid)] = self.backend.get_neuron_data(
+                    self.circuit, self.blue_config, int(gid))
+            return self.neurons_data[int(gid)]
+
+    ################################################################################################
+    # @load_morphology
+    ################################################################################################
+    def load_morphology(self,
+                        gid):
+        """Loads the morphology of a neuron as a morphology skeleton.
+
+        :param gid:
+            Neuron GID.
+        :return:
+            A morphology skeleton, or None if the morphology cannot be loaded.
+        """
+
+        uri = self.get_morphology_uris([gid])[0]
+        return self.backend.load_morphology(self.circuit, uri, int(gid))
+
+    ################################################################################################
+    # @load_morphologies
+    ################################################################################################
+    def load_morphologies(self,
+                          gids):
+        """Loads the morphologies of a list of GIDs, with a single query for their URIs.
+
+        :param gids:
+            A list of GIDs.
+        :return:
+            A list of morphology skeletons aligned with the GIDs.
+        """
+
+        uris = self.get_morphology_uris(gids)
+        return [self.backend.load_morphology(self.circuit, uri, int(gid))
+                for gid, uri in zip(gids, uris)]
+
+
+# The opened circuit sessions, keyed by the real paths of the circuit configurations
+CIRCUIT_SESSIONS = dict()
+
+
+####################################################################################################
+# @get_circuit_session
+####################################################################################################
+def get_circuit_session(blue_config,
+                        backend=None):
+    """Returns the session of a given circuit, the session is created once per process.
+
+    :param blue_config:
+        The circuit configuration file.
+    :param backend:
+        An optional circuit backend. If given, and different from the backend of the existing
+        session, a new session is created with this backend.
+    :return:
+        A reference to the circuit session.
+    """
+
+    # Use the real path as a key
+    key = os.path.realpath(blue_config)
+
+    # Create the session
+    session = CIRCUIT_SESSIONS.get(key)
+    if session is None or (backend is not None and session.backend is not backend):
+        session = CircuitSession(blue_config, backend)
+        CIRCUIT_SESSIONS[key] = session
+
+    # Return a reference to the session
+    return session
+
+
+####################################################################################################
+# @close_circuit_sessions
+####################################################################################################
+def close_circuit_sessions():
+    """Closes all the circuit sessions and clears their caches.
+    """
+
+    CIRCUIT_SESSIONS.clear()
+    BBP_EXPERIMENTS.clear()
@@ -0,0 +1,282 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import threading
+import queue
+
+# Internal imports
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @MorphologyStream
+####################################################################################################
+class MorphologyStream:
+    """Streams the morphologies of a list of GIDs from a circuit session.
+
+    The morphologies are loaded in chunks, with a single circuit query per chunk, by a background
+    thread that fills a bounded prefetch queue. The consumer (the main thread, where all the
+    Blender operations must run) iterates over the stream and builds the meshes of the loaded
+    morphologies while the next ones are being read from the disk. An exception raised in the
+    loading thread is passed through the queue and raised again in the consumer.
+    """
+
+    # The item that marks the end of the stream
+    END_OF_STREAM = None
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 session,
+                 gids,
+                 chunk_size=16,
+                 prefetch_size=8):
+        """Constructor
+
+        :param session:
+            The circuit session used to load the morphologies.
+        :param gids:
+            A list of the GIDs of the streamed morphologies.
+        :param chunk_size:
+            The number of morphologies whose URIs are queried from the circuit at once.
+        :param prefetch_size:
+            The maximum number of loaded morphologies waiting to be consumed. It bounds the memory
+            used by the stream.
+        """
+
+        # Circuit session
+        self.session = session
+
+        # The GIDs of the stream
+        self.gids = [int(gid) for gid in gids]
+
+        # Loading parameters
+        self.chunk_size = max(1, chunk_size)
+
+        # The prefetch queue of (gid, morphology) tuples
+        self.prefetch_queue = queue.Queue(maxsize=max(1, prefetch_size))
+
+        # The loading thread, started on the first iteration
+        self.loading_thread = None
+
+        # Set to stop the loading thread before the end of the stream
+        self.stop_event = threading.Event()
+
+    ################################################################################################
+    # @load_morphologies
+    ################################################################################################
+    def load_morphologies(self):
+        """Loads the morphologies chunk by chunk and adds them to the prefetch queue. This function
+        runs in the loading thread.
+        """
+
+        try:
+            for i in range(0, len(self.gids), self.chunk_size):
+                chunk = self.gids[i:i + self.chunk_size]
+
+                # Query the URIs of the whole chunk at once, they are cached in the session
+                self.session.get_morphology_uris(chunk)
+
+                # Load the morphologies of the chunk one by one
+                for gid in chunk:
+
+                    # Stop requested by the consumer
+                    if self.stop_event.is_set():
+                        return
+
+                    # A morphology that cannot be loaded does not stop the stream
+                    try:
+                        morphology = self.session.load_morphology(gid)
+                    except Exception as exception:
+                        nmv.logger.log('ERROR: Cannot load the GID [%d]: %s' % (gid, exception))
+                        morphology = None
+
+                    # Wait for a free slot in the queue
+                    self.put((gid, morphology))
+
+        # Any other failure (the circuit query for example) ends the stream with the exception,
+        # which is raised in the consumer
+        except Exception as exception:
+            self.put(exception)
+            return
+
+        self.put(self.END_OF_STREAM)
+
+    ################################################################################################
+    # @put
+    ################################################################################################
+    def put(self,
+            item):
+        """Adds an item to the prefetch queue, waiting for a free slot unless the stream is stopped.
+
+        :param item:
+            A (gid, morphology) tuple, an exception raised in the loading thread or END_OF_STREAM.
+        """
+
+        while not self.stop_event.is_set():
+            try:
+                self.prefetch_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    ################################################################################################
+    # @start
+    ################################################################################################
+    def start(self):
+        """Starts loading the morphologies in the background.
+        """
+
+        if self.loading_thread is None:
+            self.loading_thread = threading.Thread(target=self.load_morphologies)
+            self.loading_thread.daemon = True
+            self.loading_thread.start()
+
+    ################################################################################################
+    # @stop
+    ################################################################################################
+    def stop(self):
+        """Stops the loading thread and discards the prefetched morphologies.
+        """
+
+        # Stop the thread
+        self.stop_event.set()
+        if self.loading_thread is not None:
+            self.loading_thread.join()
+
+        # Discard the prefetched morphologies
+        while not self.prefetch_queue.empty():
+            self.prefetch_queue.get_nowait()
+
+    ################################################################################################
+    # @__len__
+    ################################################################################################
+    def __len__(self):
+        """Returns the number of the streamed morphologies.
+        """
+
+        return len(self.gids)
+
+    ################################################################################################
+    # @__iter__
+    ################################################################################################
+    def __iter__(self):
+        """Starts loading the morphologies and returns the stream itself as an iterator over the
+        (gid, morphology) tuples in the order of the GIDs. The morphology is None if it could not
+        be loaded.
+        """
+
+        # Start loading
+        self.start()
+        return self
+
+    ################################################################################################
+    # @__next__
+    ################################################################################################
+    def __next__(self):
+        """Returns the next (gid, morphology) tuple of the stream.
+
+        :return:
+            The next (gid, morphology) tuple. StopIteration is raised at the end of the stream, and
+            the exception that stopped the loading thread is raised again here.
+        """
+
+        # The stream is already stopped, or ended
+        if self.stop_event.is_set():
+            raise StopIteration
+
+        # Start loading, if next() is called without iter()
+        self.start()
+
+        item = self.prefetch_queue.get()
+
+        # End of the stream
+        if item is self.END_OF_STREAM:
+            self.stop()
+            raise StopIteration
+
+        # The loading thread failed
+        if isinstance(item, Exception):
+            self.stop()
+            raise item
+
+        return item
+
+
+####################################################################################################
+# @get_worker_gids
+####################################################################################################
+def get_worker_gids(gids,
+                    worker_index=0,
+                    number_workers=1):
+    """Returns the share of a worker from a list of GIDs. The GIDs are dealt in a round-robin
+    fashion to balance the neurons of the different morphological types between the workers.
+
+    :param gids:
+        A list of GIDs.
+    :param worker_index:
+        The index of the worker, in [0, number_workers).
+    :param number_workers:
+        The total number of workers.
+    :return:
+        A list of the GIDs processed by the worker.
+    """
+
+    return list(gids)[worker_index::max(1, number_workers)]
+
+
+####################################################################################################
+# @stream_target_morphologies
+####################################################################################################
+def stream_target_morphologies(blue_config,
+                               target,
+                               worker_index=0,
+                               number_workers=1,
+                               chunk_size=16,
+                               prefetch_size=8,
+                               backend=None):
+    """Streams the morphologies of a circuit target, or the share of a single worker of it.
+
+    :param blue_config:
+        The circuit configuration file.
+    :param target:
+        Circuit target.
+    :param worker_index:
+        The index of the worker, in [0, number_workers).
+    :param number_workers:
+        The total number of workers processing the target.
+    :param chunk_size:
+        The number of morphologies whose URIs are queried from the circuit at once.
+    :param prefetch_size:
+        The maximum number of loaded morphologies waiting to be consumed.
+    :param backend:
+        An optional circuit backend, for example a local fixture of the circuit.
+    :return:
+        A MorphologyStream over the morphologies.
+    """
+
+    # All the morphologies are loaded through a single session
+    session = nmv.file.get_circuit_session(blue_config, backend)
+
+    # Expand the target and keep the share of the worker
+    gids = get_worker_gids(session.get_gids(target), worker_index, number_workers)
+
+    # Return the stream
+    return MorphologyStream(session, gids, chunk_size=chunk_size, prefetch_size=prefetch_size)
@@ -16,4 +16,5 @@
 # MA 02110-1301 USA.
 ####################################################################################################
 
-from .spines_reader import *
\ No newline at end of file
+from .spines_reader import *
+from .spines_library import *
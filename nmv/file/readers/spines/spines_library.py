@@ -0,0 +1,242 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This library is free software; you can redistribute it and/or modify it under the terms of the
+# GNU Lesser General Public License version 3.0 as published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this library;
+# if not, write to the Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301 USA.
+####################################################################################################
+
+# System imports
+import os
+
+# External imports
+import numpy
+
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @SpineTemplate
+####################################################################################################
+class SpineTemplate:
+    """A spine template mesh stored as compact vertex and face arrays.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 name,
+                 vertices,
+                 faces_indices,
+                 faces_sizes,
+                 smooth_faces):
+        """Constructor
+
+        :param name:
+            The name of the template, derived from the name of its file.
+        :param vertices:
+            An array of shape (N, 3) with the coordinates of the vertices.
+        :param faces_indices:
+            A flat array of the vertex indices of all the faces.
+        :param faces_sizes:
+            The number of vertices of each face.
+        :param smooth_faces:
+            A boolean flag per face indicating if it is smooth-shaded or not.
+        """
+
+        # Template name
+        self.name = name
+
+        # Vertices
+        self.vertices = vertices
+
+        # Faces, stored as flat indices and face sizes
+        self.faces_indices = faces_indices
+        self.faces_sizes = faces_sizes
+
+        # Shading flags
+        self.smooth_faces = smooth_faces
+
+
+####################################################################################################
+# @read_obj_geometry
+####################################################################################################
+def read_obj_geometry(file_path):
+    """Reads the geometry of an .OBJ file into a spine template without using Blender's importer.
+
+    The coordinates are converted from the Y-up convention of the .OBJ format to the Z-up
+    convention of Blender, exactly like the default settings of Blender's .OBJ importer.
+
+    :param file_path:
+        The path to the .OBJ file.
+    :return:
+        A SpineTemplate object containing the geometry of the file.
+    """
+
+    # Vertices and faces data
+    vertices = list()
+    faces_indices = list()
+    faces_sizes = list()
+    smooth_faces = list()
+
+    # Smooth shading state, updated by the 's' statements
+    smooth = False
+
+    # Parse the file
+    with open(file_path, 'r') as obj_file:
+        for line in obj_file:
+
+            # Vertex
+            if line.startswith('v '):
+                data = line.split()
+                vertices.append((float(data[1]), float(data[2]), float(data[3])))
+
+            # Face, the indices could be in the form of v, v/vt, v//vn or v/vt/vn
+            elif line.startswith('f '):
+                face = [int(token.split('/')[0]) for token in line.split()[1:]]
+
+                # Resolve the negative (relative) and one-based indices
+                face = [index - 1 if index > 0 else len(vertices) + index for index in face]
+                faces_indices.extend(face)
+                faces_sizes.append(len(face))
+                smooth_faces.append(smooth)
+
+            # Smoothing group
+            elif line.startswith('s '):
+                smooth = line.split()[1] not in ['off', '0']
+
+    # Convert from Y-up to Z-up
+    vertices = numpy.array(vertices, dtype=numpy.float32).reshape(-1, 3)
+    vertices = numpy.column_stack((vertices[:, 0], -vertices[:, 2], vertices[:, 1]))
+
+    # Return the template
+    return SpineTemplate(name=os.path.basename(file_path).split('.')[0],
+                         vertices=numpy.ascontiguousarray(vertices, dtype=numpy.float32),
+                         faces_indices=numpy.array(faces_indices, dtype=numpy.int32),
+                         faces_sizes=numpy.array(faces_sizes, dtype=numpy.int32),
+                         smooth_faces=numpy.array(smooth_faces, dtype=numpy.bool_))
+
+
+####################################################################################################
+# @SpinesLibrary
+####################################################################################################
+class SpinesLibrary:
+    """A library of the spine templates of a given directory, loaded once into memory.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 spines_directory):
+        """Constructor
+
+        :param spines_directory:
+            A given directory where the spines are located.
+        """
+
+        # Spines directory
+        self.spines_directory = spines_directory
+
+        # The signature of the directory when the library was loaded
+        self.signature = get_spines_directory_signature(spines_directory)
+
+        # A dictionary of all the templates, keyed by the file name
+        self.templates = dict()
+
+        # Load all the templates
+        for spine_file in sorted(self.signature):
+            self.templates[spine_file[0]] = read_obj_geometry(
+                '%s/%s' % (spines_directory, spine_file[0]))
+
+    ################################################################################################
+    # @is_valid
+    ################################################################################################
+    def is_valid(self):
+        """Checks if the library still matches the content of its directory.
+
+        :return:
+            True if the directory has not changed since the library was loaded, otherwise False.
+        """
+
+        return self.signature == get_spines_directory_signature(self.spines_directory)
+
+
+####################################################################################################
+# @get_spines_directory_signature
+####################################################################################################
+def get_spines_directory_signature(spines_directory):
+    """Computes a signature of the .OBJ files in a spines directory from their names, sizes and
+    modification times. The signature changes whenever a file is added, removed or modified.
+
+    :param spines_directory:
+        A given directory where the spines are located.
+    :return:
+        A frozen set of (file name, size, modification time) tuples.
+    """
+
+    # List all the obj files in the directory
+    spines_files = nmv.file.ops.get_files_in_directory(spines_directory, file_extension='.obj')
+
+    # Build the signature
+    signature = set()
+    for spine_file in spines_files:
+        file_stat = os.stat('%s/%s' % (spines_directory, spine_file))
+        signature.add((spine_file, file_stat.st_size, file_stat.st_mtime))
+
+    # Return the signature
+    return frozenset(signature)
+
+
+# The loaded spines libraries, keyed by the real paths of their directories. They are kept resident
+# for the lifetime of the process, so they are shared between all the neurons of a batch.
+SPINES_LIBRARIES = dict()
+
+
+####################################################################################################
+# @get_spines_library
+####################################################################################################
+def get_spines_library(spines_directory):
+    """Returns the spines library of a given directory. The library is loaded only once, and
+    reloaded only if the content of the directory changes.
+
+    :param spines_directory:
+        A given directory where the spines are located.
+    :return:
+        A reference to the SpinesLibrary of the directory.
+    """
+
+    # Use the real path as a key to avoid loading the same directory twice
+    key = os.path.realpath(spines_directory)
+
+    # Load the library, or reload it if it is outdated
+    library = SPINES_LIBRARIES.get(key)
+    if library is None or not library.is_valid():
+        nmv.logger.log('Loading spines library [%s]' % spines_directory)
+        library = SpinesLibrary(spines_directory)
+        SPINES_LIBRARIES[key] = library
+
+    # Return a reference to the library
+    return library
+
+
+####################################################################################################
+# @clear_spines_libraries
+####################################################################################################
+def clear_spines_libraries():
+    """Unloads all the spines libraries from memory.
+    """
+
+    SPINES_LIBRARIES.clear()
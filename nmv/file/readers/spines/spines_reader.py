@@ -21,6 +21,7 @@ import sys, os
 
 import nmv
 import nmv.file
+import nmv.mesh
 
 
 ####################################################################################################
@@ -30,6 +31,9 @@ def load_spine(spines_directory,
                spine_file):
     """Load a spine mesh to the scene from a given directory and returns a reference to it.
 
+    The geometry of the spine is taken from the spines library of the directory, which is parsed
+    only once per process, and the object is created directly from its arrays.
+
     :param spines_directory:
         A given directory of spines.
     :param spine_file:
@@ -38,8 +42,14 @@ def load_spine(spines_directory,
         A reference to the loaded spine into the scene.
     """
 
-    # Load the spine into a blender object
-    spine_object = nmv.file.import_obj_file(spines_directory, spine_file)
+    # Get the template from the library
+    template = nmv.file.get_spines_library(spines_directory).templates[spine_file]
+
+    # Create a blender object from the template
+    spine_object = nmv.mesh.create_mesh_object_from_data(
+        vertices=template.vertices, faces_indices=template.faces_indices,
+        faces_sizes=template.faces_sizes, smooth_faces=template.smooth_faces,
+        name=template.name)
 
     # Return a reference to it
     return spine_object
@@ -57,8 +67,8 @@ def load_spines(spines_directory):
         A list of all the loaded spines.
     """
 
-    # List all the obj files in the directory
-    spines_files = nmv.file.ops.get_files_in_directory(spines_directory, file_extension='.obj')
+    # List all the obj files in the directory, from the library
+    spines_files = sorted(nmv.file.get_spines_library(spines_directory).templates.keys())
 
     # Load the spines, one by one into a list
     spines_objects_list = list()
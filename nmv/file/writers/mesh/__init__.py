@@ -16,4 +16,6 @@
 ####################################################################################################
 
 from .exporters import *
+from .mesh_writers import *
+from .mesh_cache_writer import *
 
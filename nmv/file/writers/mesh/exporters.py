@@ -15,8 +15,14 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import os
+import json
+import numpy
+
 # Blender imports
 import bpy
+from mathutils import Vector
 
 # Internal modules
 import nmv
@@ -58,66 +64,84 @@ def export_scene_to_blend_file(output_directory,
 
 
 ####################################################################################################
-# @export_mesh_object_to_file
+# @get_mesh_file_path
 ####################################################################################################
-def export_mesh_object_to_file(mesh_object,
-                               output_directory,
-                               output_file_name,
-                               file_format=nmv.enums.Meshing.ExportFormat.PLY):
-    """Exports a mesh object to a file with a specific file format.
+def get_mesh_file_path(output_directory,
+                       output_file_name,
+                       file_format=nmv.enums.Meshing.ExportFormat.PLY,
+                       compress=False):
+    """Returns the path to the file of an exported mesh.
 
-    :param mesh_object:
-        A selected mesh object in the scene.
     :param output_directory:
         The output directory where the mesh will be saved.
     :param output_file_name:
         The name of the output mesh.
     :param file_format:
         The file format of the mesh.
+    :param compress:
+        If the file is compressed, a .gz extension is added.
+    :return:
+        The path to the file, or None if the format is unknown.
     """
 
-    # Deselect all the other objects in the scene
-    nmv.scene.ops.deselect_all()
-
-    # Select the target mesh and set it to be the only active object
-    nmv.scene.ops.set_active_object(mesh_object)
-
     if file_format == nmv.enums.Meshing.ExportFormat.PLY:
-        output_file_path = "%s/%s.%s" % (
-            output_directory, str(output_file_name), nmv.consts.Meshing.PLY_EXTENSION)
+        extension = nmv.consts.Meshing.PLY_EXTENSION
 
     elif file_format == nmv.enums.Meshing.ExportFormat.OBJ:
-        output_file_path = "%s/%s.%s" % (
-            output_directory, str(output_file_name), nmv.consts.Meshing.OBJ_EXTENSION)
+        extension = nmv.consts.Meshing.OBJ_EXTENSION
 
     elif file_format == nmv.enums.Meshing.ExportFormat.STL:
-        output_file_path = "%s/%s.%s" % (
-            output_directory, str(output_file_name), nmv.consts.Meshing.STL_EXTENSION)
+        extension = nmv.consts.Meshing.STL_EXTENSION
 
     else:
+        return None
+
+    # Compressed files
+    if compress:
+        extension += '.gz'
+
+    return '%s/%s%s' % (output_directory, str(output_file_name), extension)
+
+
+####################################################################################################
+# @export_mesh_object_to_file
+####################################################################################################
+def export_mesh_object_to_file(mesh_object,
+                               output_directory,
+                               output_file_name,
+                               file_format=nmv.enums.Meshing.ExportFormat.PLY,
+                               compress=False):
+    """Exports a mesh object to a file with a specific file format.
+
+    The geometry is read in bulk from the mesh and written with the writers of NeuroMorphoVis,
+    without the Blender exporters, so the selection of the scene is not changed.
+
+    :param mesh_object:
+        A mesh object in the scene.
+    :param output_directory:
+        The output directory where the mesh will be saved.
+    :param output_file_name:
+        The name of the output mesh.
+    :param file_format:
+        The file format of the mesh.
+    :param compress:
+        Compress the file with gzip.
+    """
+
+    # The path to the file
+    output_file_path = get_mesh_file_path(
+        output_directory, output_file_name, file_format, compress)
+    if output_file_path is None:
         nmv.logger.log('Error: Unknown mesh format')
         return
 
-    # Export the mesh object to an OBJ file
+    # Export the mesh object to the file
     nmv.logger.log('Exporting [%s]' % output_file_path)
     export_timer = nmv.utilities.Timer()
     export_timer.start()
 
-    if file_format == nmv.enums.Meshing.ExportFormat.PLY:
-        bpy.ops.export_mesh.ply(filepath=output_file_path, check_existing=True)
-
-    elif file_format == nmv.enums.Meshing.ExportFormat.OBJ:
-        bpy.ops.export_scene.obj(
-            filepath=output_file_path, check_existing=True, axis_forward='-Z', axis_up='Y',
-            use_selection=True, use_smooth_groups=True, use_smooth_groups_bitflags=False,
-            use_normals=True, use_triangles=True, path_mode='AUTO')
-
-    elif file_format == nmv.enums.Meshing.ExportFormat.STL:
-        bpy.ops.export_mesh.stl(
-            filepath=output_file_path, use_selection=True, check_existing=True, ascii=False)
-
-    else:
-        nmv.logger.log('Error: Unknown mesh format')
+    nmv.file.write_mesh_arrays_to_file(
+        nmv.file.get_mesh_arrays(mesh_object), output_file_path, file_format, compress)
 
     export_timer.end()
     nmv.logger.log('Exporting done in [%f] seconds' % export_timer.duration())
@@ -130,7 +154,9 @@ def export_mesh_objects_to_file(mesh_objects,
                                 output_directory,
                                 output_file_name,
                                 file_format=nmv.enums.Meshing.ExportFormat.PLY,
-                                export_individual_meshes=False):
+                                export_individual_meshes=False,
+                                compress=False,
+                                number_threads=None):
     """Exports a list of mesh objects as an individual mesh or separate objects.
 
     :param mesh_objects:
@@ -143,6 +169,10 @@ def export_mesh_objects_to_file(mesh_objects,
         The file format of the exported mesh.
     :param export_individual_meshes:
         Export the individual meshes in the list.
+    :param compress:
+        Compress the files with gzip.
+    :param number_threads:
+        The number of threads used to write the individual meshes, by default the number of cores.
     """
 
     # Blend files are exported once whatever the selection is
@@ -150,32 +180,42 @@ def export_mesh_objects_to_file(mesh_objects,
 
         # Export the cloned file
         export_scene_to_blend_file(output_directory, output_file_name)
+        return
 
     # Other file formats have the same approach
-    else:
+    if get_mesh_file_path(output_directory, output_file_name, file_format) is None:
+        nmv.logger.log('Error: Unknown mesh format')
+        return
 
-        # Export each component in the mesh
-        if export_individual_meshes:
+    # Read the geometry of all the objects from Blender in the main thread
+    export_timer = nmv.utilities.Timer()
+    export_timer.start()
+    mesh_arrays_list = [nmv.file.get_mesh_arrays(mesh_object) for mesh_object in mesh_objects]
 
-            # Create a directory with the name of the mesh
-            mesh_directory = '%s/%s' % (output_directory, output_file_name)
-            nmv.file.ops.clean_and_create_directory(mesh_directory)
+    # Export each component in the mesh
+    if export_individual_meshes:
 
-            # Export each mesh in the given list
-            for mesh_object in mesh_objects:
-                export_mesh_object_to_file(
-                    mesh_object, mesh_directory, mesh_object.name, file_format)
-        else:
+        # Create a directory with the name of the mesh
+        mesh_directory = '%s/%s' % (output_directory, output_file_name)
+        nmv.file.ops.clean_and_create_directory(mesh_directory)
 
-            # Clone all the mesh objects
-            joint_mesh_object = nmv.scene.ops.clone_mesh_objects_into_joint_mesh(mesh_objects)
+        # Write the meshes in parallel
+        file_paths = [get_mesh_file_path(mesh_directory, mesh_object.name, file_format, compress)
+                      for mesh_object in mesh_objects]
+        nmv.logger.log('Exporting [%d] meshes to [%s]' % (len(file_paths), mesh_directory))
+        nmv.file.write_mesh_arrays_to_files_in_parallel(
+            mesh_arrays_list, file_paths, file_format, compress, number_threads)
 
-            # Export the cloned file
-            export_mesh_object_to_file(
-                joint_mesh_object, output_directory, output_file_name, file_format)
+    # Otherwise, merge the geometry of all the objects into a single mesh
+    else:
+        output_file_path = get_mesh_file_path(
+            output_directory, output_file_name, file_format, compress)
+        nmv.logger.log('Exporting [%s]' % output_file_path)
+        nmv.file.write_mesh_arrays_to_file(
+            nmv.file.merge_mesh_arrays(mesh_arrays_list), output_file_path, file_format, compress)
 
-            # Delete the cloned object
-            nmv.scene.ops.delete_list_objects([joint_mesh_object])
+    export_timer.end()
+    nmv.logger.log('Exporting done in [%f] seconds' % export_timer.duration())
 
 
 ####################################################################################################
@@ -184,7 +224,8 @@ def export_mesh_objects_to_file(mesh_objects,
 def export_mesh_object(mesh_object,
                        output_directory,
                        file_name,
-                       obj=False, ply=False, stl=False, blend=False):
+                       obj=False, ply=False, stl=False, blend=False,
+                       cache=False, compress=False, transform=None):
     """Exports the mesh in one line in different file formats.
 
     :param mesh_object:
@@ -201,23 +242,140 @@ def export_mesh_object(mesh_object,
         Flag to export to .stl format.
     :param blend:
         Flag to export to .blend format.
+    :param cache:
+        Flag to export to a mesh cache .nmc file.
+    :param compress:
+        Compress the .obj, .ply and .stl files with gzip.
+    :param transform:
+        The local to global transformation matrix stored in the mesh cache file.
     """
 
     # To .obj format
     if obj:
         export_mesh_object_to_file(
-            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.OBJ)
+            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.OBJ,
+            compress)
 
     # To .ply format
     if ply:
         export_mesh_object_to_file(
-            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.PLY)
+            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.PLY,
+            compress)
 
     # .To stl format
     if stl:
         export_mesh_object_to_file(
-            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.STL)
+            mesh_object, output_directory, file_name, nmv.enums.Meshing.ExportFormat.STL,
+            compress)
 
     # To .blend format
     if blend:
         export_scene_to_blend_file(output_directory, file_name)
+
+    # To .nmc format
+    if cache:
+        nmv.file.write_mesh_cache_file([mesh_object], output_directory, file_name, transform)
+
+
+####################################################################################################
+# @export_mesh_object_lods
+####################################################################################################
+def export_mesh_object_lods(mesh_object,
+                            output_directory,
+                            file_name,
+                            ratios=nmv.consts.Meshing.LOD_RATIOS,
+                            obj=False, ply=False, stl=False,
+                            cache=False, compress=False, transform=None):
+    """Exports a ladder of decimated levels of detail of a mesh, with a suffix per level, and an
+    index file that lists the files, the sizes and the bounds of the levels.
+
+    The levels are decimated progressively on a single copy of the mesh, from the finest to the
+    coarsest, so every level is computed from the previous one and the mesh is not modified.
+
+    :param mesh_object:
+        An input mesh object to export to a file.
+    :param output_directory:
+        Output directory where the meshes will be saved.
+    :param file_name:
+        Mesh prefix.
+    :param ratios:
+        The decimation ratios of the levels, between 0.01 and 1.0.
+    :param obj:
+        Flag to export to .obj format.
+    :param ply:
+        Flag to export to .ply format.
+    :param stl:
+        Flag to export to .stl format.
+    :param cache:
+        Flag to export to a mesh cache .nmc file.
+    :param compress:
+        Compress the .obj, .ply and .stl files with gzip.
+    :param transform:
+        The local to global transformation matrix stored in the mesh cache file.
+    :return:
+        The path to the index file.
+    """
+
+    # The ratios of the levels, from the finest to the coarsest
+    ratios = sorted(set(ratio for ratio in ratios if 0.01 <= ratio <= 1.0), reverse=True)
+
+    # The bounding sphere of the mesh in the world, to select the levels by screen size
+    corners = numpy.array([list(mesh_object.matrix_world * Vector(corner))
+                           for corner in mesh_object.bound_box])
+    center = 0.5 * (corners.min(axis=0) + corners.max(axis=0))
+    radius = float(numpy.linalg.norm(corners - center, axis=1).max())
+    index = {'name': file_name,
+             'center': center.tolist(),
+             'radius': radius,
+             'levels': list()}
+
+    # A copy of the mesh that is decimated level by level
+    lod_object = nmv.scene.ops.duplicate_object(mesh_object, '%s_lod' % mesh_object.name)
+    current_ratio = 1.0
+
+    for level, ratio in enumerate(ratios):
+
+        # Decimate the copy relative to the previous level
+        if ratio < current_ratio:
+            nmv.mesh.ops.decimate_mesh_object(
+                mesh_object=lod_object, decimation_ratio=ratio / current_ratio)
+            current_ratio = ratio
+
+        # Export the level
+        level_file_name = file_name + nmv.consts.Meshing.LOD_SUFFIX % level
+        export_mesh_object(lod_object, output_directory, level_file_name,
+                           obj=obj, ply=ply, stl=stl, cache=cache, compress=compress,
+                           transform=transform)
+
+        # The files of the level
+        files = list()
+        for export, file_format in [(obj, nmv.enums.Meshing.ExportFormat.OBJ),
+                                    (ply, nmv.enums.Meshing.ExportFormat.PLY),
+                                    (stl, nmv.enums.Meshing.ExportFormat.STL)]:
+            if export:
+                files.append(os.path.basename(get_mesh_file_path(
+                    output_directory, level_file_name, file_format, compress)))
+        if cache:
+            files.append(level_file_name + nmv.consts.Meshing.MESH_CACHE_EXTENSION)
+
+        # Add the level to the index
+        index['levels'].append({'level': level,
+                                'ratio': ratio,
+                                'vertices': len(lod_object.data.vertices),
+                                'faces': len(lod_object.data.polygons),
+                                'files': files})
+        nmv.logger.info('LOD [%d]: Ratio [%f], Faces [%d]' %
+                        (level, ratio, len(lod_object.data.polygons)))
+
+    # Delete the copy
+    nmv.scene.ops.delete_object_in_scene(lod_object)
+
+    # Write the index
+    index_file_path = '%s/%s%s' % (
+        output_directory, file_name, nmv.consts.Meshing.LOD_INDEX_EXTENSION)
+    with open(index_file_path, 'w') as index_file:
+        json.dump(index, index_file, indent=2)
+    nmv.logger.log('Exporting [%s]' % index_file_path)
+
+    # Return the path to the index
+    return index_file_path
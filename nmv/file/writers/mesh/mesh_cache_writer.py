@@ -0,0 +1,164 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import json
+import numpy
+
+# Internal imports
+import nmv
+import nmv.consts
+import nmv.utilities
+
+
+####################################################################################################
+# @get_mesh_cache_arrays
+####################################################################################################
+def get_mesh_cache_arrays(mesh_object):
+    """Reads the geometry of a mesh object in bulk into the arrays of the mesh cache.
+
+    The vertices are kept in the local coordinates of the object, and the polygons are kept as
+    they are, with their materials and their shading.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A dictionary of the arrays of the mesh.
+    """
+
+    mesh = mesh_object.data
+
+    # Vertices
+    vertices = numpy.zeros(len(mesh.vertices) * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get('co', vertices)
+
+    # Polygons
+    number_polygons = len(mesh.polygons)
+    loops_start = numpy.zeros(number_polygons, dtype=numpy.int32)
+    loops_total = numpy.zeros(number_polygons, dtype=numpy.int32)
+    material_indices = numpy.zeros(number_polygons, dtype=numpy.int32)
+    smooth = numpy.zeros(number_polygons, dtype=numpy.bool_)
+    mesh.polygons.foreach_get('loop_start', loops_start)
+    mesh.polygons.foreach_get('loop_total', loops_total)
+    mesh.polygons.foreach_get('material_index', material_indices)
+    mesh.polygons.foreach_get('use_smooth', smooth)
+
+    # The vertices of the loops, reordered polygon by polygon
+    loops_vertices = numpy.zeros(len(mesh.loops), dtype=numpy.int32)
+    mesh.loops.foreach_get('vertex_index', loops_vertices)
+    first_loops = numpy.cumsum(loops_total) - loops_total
+    loops = numpy.arange(loops_total.sum()) - numpy.repeat(first_loops, loops_total) + \
+        numpy.repeat(loops_start, loops_total)
+
+    # Return the arrays
+    return {'vertices': vertices.reshape(-1, 3),
+            'polygons_sizes': loops_total,
+            'polygons_vertices': loops_vertices[loops],
+            'material_indices': material_indices.astype(numpy.int16),
+            'smooth': smooth.astype(numpy.uint8)}
+
+
+####################################################################################################
+# @write_mesh_cache_file
+####################################################################################################
+def write_mesh_cache_file(mesh_objects,
+                          output_directory,
+                          output_file_name,
+                          transform=None):
+    """Writes a list of mesh objects, for example the objects of a neuron, to a mesh cache file.
+
+    The file starts with the magic bytes, the size of a JSON header and the header itself, which
+    describes the objects, their materials and the offsets of their arrays. The arrays follow,
+    aligned to MESH_CACHE_ALIGNMENT bytes, so they can be memory-mapped when the file is loaded.
+
+    :param mesh_objects:
+        A list of mesh objects.
+    :param output_directory:
+        The output directory where the file will be saved.
+    :param output_file_name:
+        The name of the file, without extension.
+    :param transform:
+        The local to global transformation matrix of the neuron, identity by default.
+    :return:
+        The path to the file.
+    """
+
+    # The path to the file
+    output_file_path = '%s/%s%s' % (
+        output_directory, output_file_name, nmv.consts.Meshing.MESH_CACHE_EXTENSION)
+    nmv.logger.log('Exporting [%s]' % output_file_path)
+    export_timer = nmv.utilities.Timer()
+    export_timer.start()
+
+    # The header and the list of the arrays to write, with their offsets relative to the data
+    header = {'version': nmv.consts.Meshing.MESH_CACHE_VERSION,
+              'transform': numpy.array(transform if transform is not None else numpy.eye(4),
+                                       dtype=numpy.float64).ravel().tolist(),
+              'objects': list()}
+    arrays = list()
+    offset = 0
+
+    for mesh_object in mesh_objects:
+
+        # The object, its matrix and its materials
+        object_header = {'name': mesh_object.name,
+                         'matrix': numpy.array(mesh_object.matrix_world,
+                                               dtype=numpy.float64).ravel().tolist(),
+                         'materials': list(),
+                         'arrays': dict()}
+        for material in mesh_object.data.materials:
+            if material is None:
+                object_header['materials'].append(None)
+            else:
+                object_header['materials'].append(
+                    {'name': material.name, 'color': list(material.diffuse_color)})
+
+        # The arrays of the object, aligned
+        for name, array in sorted(get_mesh_cache_arrays(mesh_object).items()):
+            array = numpy.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+            object_header['arrays'][name] = {'dtype': array.dtype.str,
+                                             'shape': list(array.shape),
+                                             'offset': offset}
+            arrays.append((offset, array))
+            alignment = nmv.consts.Meshing.MESH_CACHE_ALIGNMENT
+            offset += (array.nbytes + alignment - 1) // alignment * alignment
+
+        header['objects'].append(object_header)
+
+    # The header, padded to keep the data aligned
+    alignment = nmv.consts.Meshing.MESH_CACHE_ALIGNMENT
+    header_bytes = json.dumps(header).encode('utf-8')
+    prefix_size = len(nmv.consts.Meshing.MESH_CACHE_MAGIC) + 8
+    header_size = (prefix_size + len(header_bytes) + alignment - 1) // alignment * alignment - \
+        prefix_size
+    header_bytes = header_bytes.ljust(header_size, b' ')
+
+    # Write the file
+    with open(output_file_path, 'wb') as cache_file:
+        cache_file.write(nmv.consts.Meshing.MESH_CACHE_MAGIC)
+        cache_file.write(numpy.array([header_size], dtype='<u8').tobytes())
+        cache_file.write(header_bytes)
+        data_start = cache_file.tell()
+        for array_offset, array in arrays:
+            cache_file.seek(data_start + array_offset)
+            cache_file.write(array.tobytes())
+
+    export_timer.end()
+    nmv.logger.log('Exporting done in [%f] seconds' % export_timer.duration())
+
+    # Return the path
+    return output_file_path
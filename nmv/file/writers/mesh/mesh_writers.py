@@ -0,0 +1,330 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import gzip
+import numpy
+from concurrent.futures import ThreadPoolExecutor
+
+# Blender imports
+import bpy
+
+# Internal imports
+import nmv
+import nmv.enums
+
+
+####################################################################################################
+# @get_mesh_arrays
+####################################################################################################
+def get_mesh_arrays(mesh_object,
+                    apply_modifiers=True):
+    """Gets the geometry of a mesh object in the world coordinates as numpy arrays.
+
+    The data is read in bulk with foreach_get and the polygons are triangulated as fans, so the
+    arrays can be written to any format without going back to Blender.
+
+    :param mesh_object:
+        A given mesh object.
+    :param apply_modifiers:
+        Apply the modifiers of the object to the exported geometry, as the Blender exporters do.
+    :return:
+        A tuple (vertices, normals, triangles) of arrays of shapes (N, 3), (N, 3) and (M, 3).
+    """
+
+    # Use a temporary mesh with the modifiers applied if the object has any
+    temporary_mesh = None
+    mesh = mesh_object.data
+    if apply_modifiers and len(mesh_object.modifiers) > 0:
+        temporary_mesh = mesh_object.to_mesh(bpy.context.scene, True, 'PREVIEW')
+        mesh = temporary_mesh
+
+    # Vertices and normals
+    number_vertices = len(mesh.vertices)
+    vertices = numpy.zeros(number_vertices * 3, dtype=numpy.float32)
+    normals = numpy.zeros(number_vertices * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get('co', vertices)
+    mesh.vertices.foreach_get('normal', normals)
+
+    # Polygons, as ranges of loops
+    number_polygons = len(mesh.polygons)
+    loops_start = numpy.zeros(number_polygons, dtype=numpy.int64)
+    loops_total = numpy.zeros(number_polygons, dtype=numpy.int64)
+    mesh.polygons.foreach_get('loop_start', loops_start)
+    mesh.polygons.foreach_get('loop_total', loops_total)
+    loops_vertices = numpy.zeros(len(mesh.loops), dtype=numpy.int64)
+    mesh.loops.foreach_get('vertex_index', loops_vertices)
+
+    # Release the temporary mesh
+    if temporary_mesh is not None:
+        bpy.data.meshes.remove(temporary_mesh)
+
+    # Triangulate the polygons as fans, the k-th triangle of a polygon uses the loops 0, k+1, k+2
+    triangles_per_polygon = numpy.maximum(loops_total - 2, 0)
+    polygons = numpy.repeat(numpy.arange(number_polygons), triangles_per_polygon)
+    first_triangles = numpy.cumsum(triangles_per_polygon) - triangles_per_polygon
+    k = numpy.arange(len(polygons)) - first_triangles[polygons]
+    first_loops = loops_start[polygons]
+    triangles = numpy.stack((loops_vertices[first_loops],
+                             loops_vertices[first_loops + k + 1],
+                             loops_vertices[first_loops + k + 2]), axis=1).astype(numpy.int32)
+
+    # Transform the vertices and the normals to the world coordinates
+    matrix = numpy.array(mesh_object.matrix_world, dtype=numpy.float64)
+    vertices = vertices.reshape(-1, 3).dot(matrix[:3, :3].T) + matrix[:3, 3]
+    normals = normals.reshape(-1, 3).dot(numpy.linalg.inv(matrix[:3, :3]))
+    normals /= numpy.maximum(numpy.linalg.norm(normals, axis=1), 1e-12)[:, None]
+
+    # Return the arrays
+    return vertices.astype(numpy.float32), normals.astype(numpy.float32), triangles
+
+
+####################################################################################################
+# @merge_mesh_arrays
+####################################################################################################
+def merge_mesh_arrays(mesh_arrays_list):
+    """Merges the arrays of several meshes into a single mesh.
+
+    :param mesh_arrays_list:
+        A list of (vertices, normals, triangles) tuples.
+    :return:
+        A single (vertices, normals, triangles) tuple.
+    """
+
+    # Offset the indices of the triangles of every mesh by the vertices of the previous ones
+    offsets = numpy.cumsum([0] + [len(arrays[0]) for arrays in mesh_arrays_list])
+    vertices = numpy.concatenate([arrays[0] for arrays in mesh_arrays_list])
+    normals = numpy.concatenate([arrays[1] for arrays in mesh_arrays_list])
+    triangles = numpy.concatenate([arrays[2] + offset
+                                   for arrays, offset in zip(mesh_arrays_list, offsets)])
+
+    # Return the merged arrays
+    return vertices, normals, triangles.astype(numpy.int32)
+
+
+####################################################################################################
+# @open_mesh_file
+####################################################################################################
+def open_mesh_file(file_path,
+                   mode,
+                   compress=False):
+    """Opens a mesh file for writing, optionally compressed with gzip.
+
+    :param file_path:
+        The path to the file.
+    :param mode:
+        'wb' for binary files, or 'w' for text files.
+    :param compress:
+        Compress the file with gzip.
+    :return:
+        A file object.
+    """
+
+    if compress:
+        return gzip.open(file_path, 'wt' if mode == 'w' else mode, compresslevel=6)
+    return open(file_path, mode)
+
+
+####################################################################################################
+# @write_ply_file
+####################################################################################################
+def write_ply_file(mesh_arrays,
+                   file_path,
+                   compress=False):
+    """Writes a mesh to a binary little-endian .PLY file with a single write.
+
+    :param mesh_arrays:
+        A (vertices, normals, triangles) tuple.
+    :param file_path:
+        The path to the file.
+    :param compress:
+        Compress the file with gzip.
+    """
+
+    vertices, normals, triangles = mesh_arrays
+
+    # The header
+    header = 'ply\n' \
+             'format binary_little_endian 1.0\n' \
+             'comment Created by NeuroMorphoVis\n' \
+             'element vertex %d\n' \
+             'property float x\nproperty float y\nproperty float z\n' \
+             'property float nx\nproperty float ny\nproperty float nz\n' \
+             'element face %d\n' \
+             'property list uchar int vertex_indices\n' \
+             'end_header\n' % (len(vertices), len(triangles))
+
+    # The vertices block, the positions and the normals of every vertex
+    vertices_block = numpy.concatenate((vertices, normals), axis=1).astype('<f4')
+
+    # The faces block, the number of vertices then the indices of every triangle
+    faces_block = numpy.zeros(len(triangles), dtype=[('count', 'u1'), ('indices', '<i4', (3,))])
+    faces_block['count'] = 3
+    faces_block['indices'] = triangles
+
+    # Write the file
+    with open_mesh_file(file_path, 'wb', compress) as ply_file:
+        ply_file.write(header.encode('ascii') + vertices_block.tobytes() + faces_block.tobytes())
+
+
+####################################################################################################
+# @write_stl_file
+####################################################################################################
+def write_stl_file(mesh_arrays,
+                   file_path,
+                   compress=False):
+    """Writes a mesh to a binary .STL file with a single write.
+
+    :param mesh_arrays:
+        A (vertices, normals, triangles) tuple.
+    :param file_path:
+        The path to the file.
+    :param compress:
+        Compress the file with gzip.
+    """
+
+    vertices, _, triangles = mesh_arrays
+
+    # The corners and the normals of the triangles
+    corners = vertices[triangles]
+    face_normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    face_normals /= numpy.maximum(numpy.linalg.norm(face_normals, axis=1), 1e-12)[:, None]
+
+    # The triangles block
+    triangles_block = numpy.zeros(len(triangles), dtype=[('normal', '<f4', (3,)),
+                                                         ('corners', '<f4', (3, 3)),
+                                                         ('attribute', '<u2')])
+    triangles_block['normal'] = face_normals
+    triangles_block['corners'] = corners
+
+    # The header, 80 bytes, and the number of triangles
+    header = b'Binary STL created by NeuroMorphoVis'.ljust(80, b' ')
+    count = numpy.array([len(triangles)], dtype='<u4').tobytes()
+
+    # Write the file
+    with open_mesh_file(file_path, 'wb', compress) as stl_file:
+        stl_file.write(header + count + triangles_block.tobytes())
+
+
+####################################################################################################
+# @write_obj_file
+####################################################################################################
+def write_obj_file(mesh_arrays,
+                   file_path,
+                   compress=False,
+                   object_name='mesh'):
+    """Writes a mesh to an .OBJ file with a single write. As with the Blender exporter, the mesh is
+    converted to the Y-up convention.
+
+    :param mesh_arrays:
+        A (vertices, normals, triangles) tuple.
+    :param file_path:
+        The path to the file.
+    :param compress:
+        Compress the file with gzip.
+    :param object_name:
+        The name of the object in the file.
+    """
+
+    vertices, normals, triangles = mesh_arrays
+
+    # Blender is Z-up, convert (x, y, z) to (x, z, -y)
+    vertices = numpy.stack((vertices[:, 0], vertices[:, 2], -vertices[:, 1]), axis=1)
+    normals = numpy.stack((normals[:, 0], normals[:, 2], -normals[:, 1]), axis=1)
+
+    # Format all the lines of every block at once, the indices are one-based
+    faces = numpy.repeat(triangles + 1, 2, axis=1)
+    obj_string = '# Created by NeuroMorphoVis\no %s\n' % object_name + \
+                 ('v %.6f %.6f %.6f\n' * len(vertices)) % tuple(vertices.ravel().tolist()) + \
+                 ('vn %.4f %.4f %.4f\n' * len(normals)) % tuple(normals.ravel().tolist()) + \
+                 ('f %d//%d %d//%d %d//%d\n' * len(faces)) % tuple(faces.ravel().tolist())
+
+    # Write the file
+    with open_mesh_file(file_path, 'w', compress) as obj_file:
+        obj_file.write(obj_string)
+
+
+####################################################################################################
+# @write_mesh_arrays_to_file
+####################################################################################################
+def write_mesh_arrays_to_file(mesh_arrays,
+                              file_path,
+                              file_format=nmv.enums.Meshing.ExportFormat.PLY,
+                              compress=False):
+    """Writes the arrays of a mesh to a file with a specific file format.
+
+    :param mesh_arrays:
+        A (vertices, normals, triangles) tuple.
+    :param file_path:
+        The path to the file.
+    :param file_format:
+        The file format of the mesh, PLY, OBJ or STL.
+    :param compress:
+        Compress the file with gzip.
+    """
+
+    if file_format == nmv.enums.Meshing.ExportFormat.PLY:
+        write_ply_file(mesh_arrays, file_path, compress)
+
+    elif file_format == nmv.enums.Meshing.ExportFormat.OBJ:
+        object_name = os.path.basename(file_path).split('.')[0]
+        write_obj_file(mesh_arrays, file_path, compress, object_name)
+
+    elif file_format == nmv.enums.Meshing.ExportFormat.STL:
+        write_stl_file(mesh_arrays, file_path, compress)
+
+    else:
+        nmv.logger.log('Error: Unknown mesh format')
+
+
+####################################################################################################
+# @write_mesh_arrays_to_files_in_parallel
+####################################################################################################
+def write_mesh_arrays_to_files_in_parallel(mesh_arrays_list,
+                                           file_paths,
+                                           file_format=nmv.enums.Meshing.ExportFormat.PLY,
+                                           compress=False,
+                                           number_threads=None):
+    """Writes the arrays of several meshes to their files in parallel threads.
+
+    The arrays must be read from Blender in the main thread before, only the formatting, the
+    compression and the writing are done in the threads.
+
+    :param mesh_arrays_list:
+        A list of (vertices, normals, triangles) tuples.
+    :param file_paths:
+        A list of the paths of the files.
+    :param file_format:
+        The file format of the meshes.
+    :param compress:
+        Compress the files with gzip.
+    :param number_threads:
+        The number of threads, by default the number of cores.
+    """
+
+    # The number of threads
+    if number_threads is None:
+        number_threads = os.cpu_count() or 1
+    number_threads = max(1, min(number_threads, len(file_paths)))
+
+    # Write the files, and raise the exceptions of the threads if any
+    with ThreadPoolExecutor(max_workers=number_threads) as executor:
+        futures = [executor.submit(write_mesh_arrays_to_file, arrays, path, file_format, compress)
+                   for arrays, path in zip(mesh_arrays_list, file_paths)]
+        for future in futures:
+            future.result()
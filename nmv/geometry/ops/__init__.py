@@ -18,4 +18,5 @@
 
 from .intersection import *
 from .line_ops import *
-from .sphere_ops import *
\ No newline at end of file
+from .sphere_ops import *
+from .spatial_index_ops import *
@@ -0,0 +1,398 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import itertools
+import numpy
+
+# Blender imports
+import mathutils.kdtree
+
+
+####################################################################################################
+# @SpatialIndex
+####################################################################################################
+class SpatialIndex:
+    """A KD-tree over a set of points in the three-dimensional space, with an optional list of
+    items (samples, faces, vertices, ...) that correspond to the points.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 points,
+                 items=None,
+                 signature=None):
+        """Constructor
+
+        :param points:
+            A list, or an array of shape (N, 3), of the points to be indexed.
+        :param items:
+            An optional list of the items that correspond to the points. If None, the queries
+            return the indices of the points.
+        :param signature:
+            An optional signature of the data the index was built from, used to invalidate it.
+        """
+
+        # The items that correspond to the points
+        self.items = items
+
+        # The signature of the indexed data
+        self.signature = signature
+
+        # The indexed points, also kept as an array for the queries on subsets
+        self.points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+
+        # Number of points
+        self.size = len(self.points)
+
+        # Build the KD-tree
+        self.kd_tree = mathutils.kdtree.KDTree(self.size)
+        for i, point in enumerate(self.points):
+            self.kd_tree.insert(point, i)
+        self.kd_tree.balance()
+
+    ################################################################################################
+    # @find_nearest
+    ################################################################################################
+    def find_nearest(self,
+                     point):
+        """Finds the nearest indexed item to a given point.
+
+        :param point:
+            A given point in the three-dimensional space.
+        :return:
+            A tuple of the nearest item (or its index if the index has no items) and its distance
+            to the point, or (None, None) if the index is empty.
+        """
+
+        # Empty index
+        if self.size == 0:
+            return None, None
+
+        # Query the tree
+        _, index, distance = self.kd_tree.find(point)
+
+        # Return the item
+        if self.items is None:
+            return index, distance
+        return self.items[index], distance
+
+    ################################################################################################
+    # @find_nearest_in_subset
+    ################################################################################################
+    def find_nearest_in_subset(self,
+                               point,
+                               indices):
+        """Finds the nearest item to a given point among a subset of the indexed points.
+
+        :param point:
+            A given point in the three-dimensional space.
+        :param indices:
+            A list of the indices of the points to be considered.
+        :return:
+            A tuple of the nearest item (or its index if the index has no items) and its distance
+            to the point, or (None, None) if the subset is empty.
+        """
+
+        # Empty subset
+        if len(indices) == 0:
+            return None, None
+
+        # Compute the distances to all the points in the subset in one step
+        indices = numpy.asarray(indices, dtype=numpy.int64)
+        distances = numpy.linalg.norm(self.points[indices] - numpy.array(point[:]), axis=1)
+        nearest = int(numpy.argmin(distances))
+        index = int(indices[nearest])
+
+        # Return the item
+        if self.items is None:
+            return index, float(distances[nearest])
+        return self.items[index], float(distances[nearest])
+
+    ################################################################################################
+    # @find_within_radius
+    ################################################################################################
+    def find_within_radius(self,
+                           point,
+                           radius):
+        """Finds all the indexed items located within a given radius from a point.
+
+        :param point:
+            A given point in the three-dimensional space.
+        :param radius:
+            The search radius.
+        :return:
+            A list of (item, distance) tuples sorted by distance.
+        """
+
+        # Empty index
+        if self.size == 0:
+            return list()
+
+        # Query the tree
+        results = self.kd_tree.find_range(point, radius)
+
+        # Return the items
+        if self.items is None:
+            return [(index, distance) for _, index, distance in results]
+        return [(self.items[index], distance) for _, index, distance in results]
+
+
+# The cached spatial indices, keyed by the identifiers of the indexed objects. Each entry keeps a
+# reference to the indexed Python object (bmesh or arbor) to guarantee that its id is not reused.
+# An index is built once per object and reused until the object is edited, the functions that
+# edit the indexed objects invalidate their indices explicitly. The cache is scoped to a single
+# build, it is cleared when the scene is cleared, when a mesh builder is done, and per object when
+# the indexed objects are deleted.
+SPATIAL_INDICES = dict()
+
+# The tokens that identify the mesh data-blocks of the cached indices. A token is stored in a
+# custom property of the mesh data, so a new mesh that is allocated at the address of a deleted
+# one has no token, and never reuses the index of the deleted mesh.
+SPATIAL_INDICES_TOKENS = itertools.count(1)
+
+
+####################################################################################################
+# @get_mesh_data_token
+####################################################################################################
+def get_mesh_data_token(mesh_data,
+                        name):
+    """Returns the token of a mesh data-block for a given kind of index, and assigns a new one if
+    the mesh data has no token yet.
+
+    :param mesh_data:
+        A given mesh data-block.
+    :param name:
+        The name of the custom property of the token.
+    :return:
+        The token of the mesh data.
+    """
+
+    # Reading the token costs a single lookup of a custom property
+    token = mesh_data.get(name)
+    if token is None:
+        token = next(SPATIAL_INDICES_TOKENS)
+        mesh_data[name] = token
+    return token
+
+
+####################################################################################################
+# @get_cached_spatial_index
+####################################################################################################
+def get_cached_spatial_index(key,
+                             owner,
+                             signature,
+                             build_function):
+    """Returns a cached spatial index, or builds a new one if the index does not exist or if its
+    signature does not match the current signature of the indexed data.
+
+    :param key:
+        A unique key identifying the indexed data.
+    :param owner:
+        The indexed object, kept alive with the index, or None for Blender data-blocks.
+    :param signature:
+        The current signature of the indexed data.
+    :param build_function:
+        A function that takes no arguments and returns (points, items) for the index.
+    :return:
+        A reference to the spatial index.
+    """
+
+    # Look up the cache
+    entry = SPATIAL_INDICES.get(key)
+    if entry is not None and entry[1].signature == signature:
+        return entry[1]
+
+    # Build a new index
+    points, items = build_function()
+    spatial_index = SpatialIndex(points, items, signature)
+    SPATIAL_INDICES[key] = (owner, spatial_index)
+
+    # Return a reference to the index
+    return spatial_index
+
+
+####################################################################################################
+# @invalidate_spatial_index
+####################################################################################################
+def invalidate_spatial_index(indexed_object):
+    """Invalidates the spatial indices of a given object after it has been edited.
+
+    :param indexed_object:
+        A mesh object, a bmesh object or an arbor whose spatial indices should be rebuilt.
+    """
+
+    # Mesh objects are identified by the pointers of their mesh data, other objects by their ids
+    if hasattr(indexed_object, 'data') and hasattr(indexed_object.data, 'as_pointer'):
+        pointer = indexed_object.data.as_pointer()
+        keys = [('mesh_faces', pointer), ('mesh_vertices', pointer)]
+    else:
+        keys = [('bmesh_faces', id(indexed_object)), ('arbor_samples', id(indexed_object))]
+
+    # Remove all the entries of the object
+    for key in keys:
+        SPATIAL_INDICES.pop(key, None)
+
+
+####################################################################################################
+# @clear_spatial_indices
+####################################################################################################
+def clear_spatial_indices():
+    """Removes all the cached spatial indices.
+    """
+
+    SPATIAL_INDICES.clear()
+
+
+####################################################################################################
+# @get_mesh_faces_spatial_index
+####################################################################################################
+def get_mesh_faces_spatial_index(mesh_object):
+    """Returns a spatial index over the centers of the faces of a mesh object.
+
+    The index is built once and reused until the mesh is edited, the edits that move, add or
+    remove vertices or faces must call invalidate_spatial_index.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A spatial index whose queries return face indices.
+    """
+
+    # The mesh data
+    mesh_data = mesh_object.data
+
+    ################################################################################################
+    # @build_function
+    ################################################################################################
+    def build_function():
+
+        # Get all the face centers in bulk
+        centers = numpy.zeros(len(mesh_data.polygons) * 3, dtype=numpy.float32)
+        mesh_data.polygons.foreach_get('center', centers)
+        return centers.reshape(-1, 3).tolist(), None
+
+    # Return the index
+    return get_cached_spatial_index(
+        key=('mesh_faces', mesh_data.as_pointer()), owner=None,
+        signature=get_mesh_data_token(mesh_data, 'nmv_faces_index'),
+        build_function=build_function)
+
+
+####################################################################################################
+# @get_mesh_vertices_spatial_index
+####################################################################################################
+def get_mesh_vertices_spatial_index(mesh_object):
+    """Returns a spatial index over the vertices of a mesh object.
+
+    The index is built once and reused until the mesh is edited, the edits that move, add or
+    remove vertices must call invalidate_spatial_index.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A spatial index whose queries return vertex indices.
+    """
+
+    # The mesh data
+    mesh_data = mesh_object.data
+
+    ################################################################################################
+    # @build_function
+    ################################################################################################
+    def build_function():
+
+        # Get all the vertices in bulk
+        vertices = numpy.zeros(len(mesh_data.vertices) * 3, dtype=numpy.float32)
+        mesh_data.vertices.foreach_get('co', vertices)
+        return vertices.reshape(-1, 3).tolist(), None
+
+    # Return the index
+    return get_cached_spatial_index(
+        key=('mesh_vertices', mesh_data.as_pointer()), owner=None,
+        signature=get_mesh_data_token(mesh_data, 'nmv_vertices_index'),
+        build_function=build_function)
+
+
+####################################################################################################
+# @get_bmesh_faces_spatial_index
+####################################################################################################
+def get_bmesh_faces_spatial_index(bmesh_object):
+    """Returns a spatial index over the median centers of the faces of a bmesh object.
+
+    The index is built once and reused until the bmesh is edited. The bmesh operations that
+    move, add or remove vertices or faces invalidate the index, and the index is rebuilt lazily by
+    the next query, so a batch of edits, such as the extrusions of a section, costs a single
+    rebuild.
+
+    :param bmesh_object:
+        A given bmesh object.
+    :return:
+        A spatial index whose queries return face indices.
+    """
+
+    ################################################################################################
+    # @build_function
+    ################################################################################################
+    def build_function():
+
+        # The faces are indexed by their positions in the sequence of faces
+        return [face.calc_center_median() for face in bmesh_object.faces], None
+
+    # Return the index
+    return get_cached_spatial_index(
+        key=('bmesh_faces', id(bmesh_object)), owner=bmesh_object, signature=None,
+        build_function=build_function)
+
+
+####################################################################################################
+# @get_arbor_samples_spatial_index
+####################################################################################################
+def get_arbor_samples_spatial_index(arbor):
+    """Returns a spatial index over all the samples of an arbor, i.e. the samples of a given root
+    section and of all its children.
+
+    The index is built once and reused until the arbor is edited. The preprocessing operations
+    that modify the samples invalidate the indices of the arbors, and the other edits of the
+    samples must call invalidate_spatial_index.
+
+    :param arbor:
+        The root section of a given arbor.
+    :return:
+        A spatial index whose queries return samples.
+    """
+
+    ################################################################################################
+    # @build_function
+    ################################################################################################
+    def build_function():
+
+        # Collect the samples of the arbor, section by section
+        samples = list()
+        sections = [arbor]
+        while sections:
+            section = sections.pop()
+            samples.extend(section.samples)
+            sections.extend(section.children)
+        return [sample.point for sample in samples], samples
+
+    # Return the index
+    return get_cached_spatial_index(
+        key=('arbor_samples', id(arbor)), owner=arbor, signature=None,
+        build_function=build_function)
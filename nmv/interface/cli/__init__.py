@@ -21,4 +21,5 @@ from .morphology_analysis import *
 from .neuron_mesh_reconstruction import *
 from .neuron_morphology_reconstruction import *
 from .soma_reconstruction import *
+from .morphology_loader import *
 from .options_parser import *
@@ -170,6 +170,24 @@ class Args:
     # Mesh tessellation level
     MESH_TESSELLATION_LEVEL = '--tessellation-level'
 
+    # Mesh the meta objects with a resolution adapted to the local radii
+    ADAPTIVE_META_RESOLUTION = '--adaptive-meta-resolution'
+
+    # The voxel size of the signed distance field meshing
+    SDF_VOXEL_SIZE = '--sdf-voxel-size'
+
+    # The width of the narrow band of the signed distance field, in voxels
+    SDF_NARROW_BAND = '--sdf-narrow-band'
+
+    # The radius of the smooth union of the signed distance field
+    SDF_SMOOTHING = '--sdf-smoothing'
+
+    # The number of threads of the signed distance field meshing
+    SDF_WORKERS = '--sdf-workers'
+
+    # The number of processes that build the arbors of the neuron mesh
+    ARBORS_WORKERS = '--arbors-workers'
+
     # Export the meshes to the global coordinates
     MESH_GLOBAL_COORDINATES = '--global-coordinates'
 
@@ -224,6 +242,18 @@ class Args:
     # Export the neuron mesh as .BLEND
     EXPORT_BLEND_NEURON = '--export-neuron-mesh-blend'
 
+    # Export the neuron mesh to a mesh cache file
+    EXPORT_CACHE_NEURON = '--export-neuron-mesh-cache'
+
+    # Compress the exported .PLY, .OBJ and .STL meshes
+    COMPRESS_MESHES = '--compress-meshes'
+
+    # Export the levels of detail of the neuron mesh
+    EXPORT_LODS = '--export-lods'
+
+    # The decimation ratios of the levels of detail
+    LOD_RATIOS = '--lod-ratios'
+
     ################################################################################################
     # Rendering arguments
     ################################################################################################
@@ -275,6 +305,12 @@ class Args:
     # Scale factor for increasing the resolution of the to-scale images
     RESOLUTION_SCALE_FACTOR = '--resolution-scale-factor'
 
+    # Number of the local processes used to render the 360 sequences
+    RENDERING_WORKERS = '--rendering-workers'
+
+    # Resume the rendering of the 360 sequences from the frames that exist on the disk
+    RESUME_RENDERING = '--resume-rendering'
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -287,6 +323,30 @@ class Args:
     # Job granularity
     JOB_GRANULARITY = '--job-granularity'
 
+    # The minimum level of the logged messages
+    LOG_LEVEL = '--log-level'
+
+    # Profile the stages of the reconstruction
+    PROFILE = '--profile'
+
+    # Dump the cProfile statistics of the profiled stages
+    PROFILE_CPROFILE = '--profile-cprofile'
+
+    # Process a target in batches through a single circuit session per worker
+    TARGET_BATCH = '--target-batch'
+
+    # Number of the workers processing a target
+    BATCH_WORKERS = '--batch-workers'
+
+    # The index of the worker, set by the launcher of the workers
+    WORKER_INDEX = '--worker-index'
+
+    # Number of the morphologies queried from the circuit at once
+    BATCH_CHUNK_SIZE = '--batch-chunk-size'
+
+    # Maximum number of the loaded morphologies waiting to be processed
+    PREFETCH_SIZE = '--prefetch-size'
+
     ################################################################################################
     # Analysis arguments
     ################################################################################################
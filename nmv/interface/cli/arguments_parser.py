@@ -391,7 +391,7 @@ def parse_command_line_arguments():
         help=arg_help)
 
     # Meshing algorithm
-    arg_options = ['(piecewise-watertight)', 'union', 'bridging']
+    arg_options = ['(piecewise-watertight)', 'union', 'bridging', 'meta-objects', 'sdf']
     arg_help = 'Meshing algorithm. \n' \
                'Options: %s' % arg_options
     meshing_args.add_argument(
@@ -435,6 +435,60 @@ def parse_command_line_arguments():
         action='store', type=float, default=1.0,
         help=arg_help)
 
+    # Adaptive resolution of the meta objects
+    arg_help = 'Mesh the parts of the neuron with meta objects of different resolutions, based on ' \
+               'their local radii. \n' \
+               'Valid only for the meta-objects meshing algorithm.'
+    meshing_args.add_argument(
+        Args.ADAPTIVE_META_RESOLUTION,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Voxel size of the signed distance field
+    arg_help = 'The voxel size of the signed distance field in microns. \n' \
+               'Valid only for the sdf meshing algorithm. \n' \
+               'Default 0.25.'
+    meshing_args.add_argument(
+        Args.SDF_VOXEL_SIZE,
+        action='store', type=float, default=0.25,
+        help=arg_help)
+
+    # Narrow band of the signed distance field
+    arg_help = 'The width of the narrow band of the signed distance field in voxels. \n' \
+               'Valid only for the sdf meshing algorithm. \n' \
+               'Default 3.0.'
+    meshing_args.add_argument(
+        Args.SDF_NARROW_BAND,
+        action='store', type=float, default=3.0,
+        help=arg_help)
+
+    # Smooth union of the signed distance field
+    arg_help = 'The radius of the smooth union of the segments in microns, 0 for a sharp union. \n' \
+               'Valid only for the sdf meshing algorithm. \n' \
+               'Default 0.5.'
+    meshing_args.add_argument(
+        Args.SDF_SMOOTHING,
+        action='store', type=float, default=0.5,
+        help=arg_help)
+
+    # Threads of the signed distance field
+    arg_help = 'The number of threads that build the signed distance field mesh. \n' \
+               'Valid only for the sdf meshing algorithm. \n' \
+               'Default, all the cores.'
+    meshing_args.add_argument(
+        Args.SDF_WORKERS,
+        action='store', type=int, default=None,
+        help=arg_help)
+
+    # Processes of the arbors
+    arg_help = 'The number of background processes that build the arbors of the neuron mesh. \n' \
+               'Valid only for the piecewise-watertight, union and skinning algorithms. \n' \
+               'Default 1, the arbors are built serially.'
+    meshing_args.add_argument(
+        Args.ARBORS_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
     # Export the mesh at global coordinates
     arg_help = 'Export the mesh at global coordinates. \n' \
                'Valid only for BBP circuits.'
@@ -508,6 +562,14 @@ def parse_command_line_arguments():
         action='store_true', default=False,
         help=arg_help)
 
+    # Export the neuron mesh to a mesh cache file
+    arg_help = 'Exports the neuron mesh to a mesh cache file (.NMC) that can be loaded in bulk ' \
+               'for rendering large scenes.'
+    export_args.add_argument(
+        Args.EXPORT_CACHE_NEURON,
+        action='store_true', default=False,
+        help=arg_help)
+
     # Export the soma mesh in .PLY format
     arg_help = 'Exports the soma mesh to a (.PLY) file.'
     export_args.add_argument(
@@ -536,6 +598,29 @@ def parse_command_line_arguments():
         action='store_true', default=False,
         help=arg_help)
 
+    # Compress the exported meshes
+    arg_help = 'Compresses the exported .PLY, .OBJ and .STL meshes with gzip (.gz).'
+    export_args.add_argument(
+        Args.COMPRESS_MESHES,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Export the levels of detail
+    arg_help = 'Exports a ladder of decimated levels of detail of the neuron mesh, with a suffix \n' \
+               'per level and a (.lod.json) index file, in the selected formats.'
+    export_args.add_argument(
+        Args.EXPORT_LODS,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # The ratios of the levels of detail
+    arg_help = 'Comma-separated decimation ratios of the levels of detail, between 0.01 and 1.0. \n' \
+               'Implies --export-lods. Default 1.0,0.5,0.1,0.02'
+    export_args.add_argument(
+        Args.LOD_RATIOS,
+        action='store', default=None,
+        help=arg_help)
+
     ################################################################################################
     # Rendering arguments
     ################################################################################################
@@ -664,6 +749,22 @@ def parse_command_line_arguments():
         action='store', type=float, default=1.0,
         help=arg_help)
 
+    # Rendering workers
+    arg_help = 'Number of the local Blender processes used to render the 360 sequences. \n' \
+               'Default 1.'
+    rendering_args.add_argument(
+        Args.RENDERING_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # Resume the rendering
+    arg_help = 'Resume the rendering of the 360 sequences from the frames that already exist ' \
+               'in the sequences directory.'
+    rendering_args.add_argument(
+        Args.RESUME_RENDERING,
+        action='store_true', default=False,
+        help=arg_help)
+
     ################################################################################################
     # Execution arguments
     ################################################################################################
@@ -695,6 +796,72 @@ def parse_command_line_arguments():
         action='store', default='low',
         help=arg_help)
 
+    # Log level
+    arg_options = ['debug', '(info)', 'warning', 'error']
+    arg_help = 'The minimum level of the logged messages, each process logs to its own file ' \
+               'in the logs directory. \n' \
+               'Options: %s' % arg_options
+    execution_args.add_argument(
+        Args.LOG_LEVEL,
+        action='store', default='info',
+        help=arg_help)
+
+    # Profiling
+    arg_help = 'Profile the stages of the reconstruction of each neuron and write the wall ' \
+               'time, the memory and the geometry statistics of each stage to a JSON file in ' \
+               'the profiles directory.'
+    execution_args.add_argument(
+        Args.PROFILE,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # cProfile
+    arg_help = 'Dump the cProfile statistics of each profiled stage, requires --profile.'
+    execution_args.add_argument(
+        Args.PROFILE_CPROFILE,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Target batch mode
+    arg_help = 'Process a target in batches, each worker loads its share of the morphologies ' \
+               'in chunks through a single circuit session instead of running a job per GID.'
+    execution_args.add_argument(
+        Args.TARGET_BATCH,
+        action='store_true', default=False,
+        help=arg_help)
+
+    # Batch workers
+    arg_help = 'Number of the workers (Blender processes or cluster jobs) processing a target. \n' \
+               'Default 1.'
+    execution_args.add_argument(
+        Args.BATCH_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # Worker index
+    arg_help = 'The index of the current worker, set automatically by the launcher. \n' \
+               'Default 0.'
+    execution_args.add_argument(
+        Args.WORKER_INDEX,
+        action='store', type=int, default=0,
+        help=arg_help)
+
+    # Chunk size
+    arg_help = 'Number of the morphologies whose paths are queried from the circuit at once. \n' \
+               'Default 16.'
+    execution_args.add_argument(
+        Args.BATCH_CHUNK_SIZE,
+        action='store', type=int, default=16,
+        help=arg_help)
+
+    # Prefetch size
+    arg_help = 'Maximum number of the morphologies loaded in advance while the current one is ' \
+               'processed. \nDefault 8.'
+    execution_args.add_argument(
+        Args.PREFETCH_SIZE,
+        action='store', type=int, default=8,
+        help=arg_help)
+
     ################################################################################################
     # Analysis and meta-data generation
     ################################################################################################
@@ -850,6 +1017,42 @@ def get_arguments_string_for_individual_gid(arguments,
     return arguments_string
 
 
+####################################################################################################
+# @get_arguments_string_for_worker
+####################################################################################################
+def get_arguments_string_for_worker(arguments,
+                                    worker_index):
+    """Get the arguments string for a worker that processes its share of a target in batch mode by
+    updating the --worker-index option.
+
+    :param arguments:
+        Parsed arguments
+    :param worker_index:
+        The index of the worker.
+    :return:
+        A string of the updated arguments.
+    """
+
+    # Get the arguments string list
+    arguments_string_list = get_arguments_string_as_list(arguments=arguments)
+
+    # Replace the --worker-index argument, and make sure that the workers use the batch mode
+    for i, argument in enumerate(arguments_string_list):
+        if '--worker-index=' in argument:
+            arguments_string_list[i] = '--worker-index=%d ' % worker_index
+        elif '--target-batch' in argument:
+            arguments_string_list[i] = ''
+    arguments_string_list.append('--target-batch ')
+
+    # Compose the arguments string
+    arguments_string = ''
+    for string in arguments_string_list:
+        arguments_string += ' ' + string
+
+    # Return the arguments string
+    return arguments_string
+
+
 ####################################################################################################
 # @create_shell_commands
 ####################################################################################################
@@ -972,4 +1175,24 @@ def create_executable_for_single_gid(arguments,
     return create_shell_commands(arguments=arguments, arguments_string=arguments_string)
 
 
+####################################################################################################
+# @create_executable_for_worker
+####################################################################################################
+def create_executable_for_worker(arguments,
+                                 worker_index):
+    """Create an EXECUTABLE command for a worker that processes its share of a target in batch
+    mode.
 
+    :param arguments:
+        Command line arguments.
+    :param worker_index:
+        The index of the worker.
+    :return:
+        An executable shell command to call NeuroMorphoVis for the share of the worker.
+    """
+
+    # Format a string with blender arguments
+    arguments_string = get_arguments_string_for_worker(arguments, worker_index)
+
+    # Create the shell commands and return it
+    return create_shell_commands(arguments=arguments, arguments_string=arguments_string)
@@ -0,0 +1,108 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Internal imports
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @load_cli_morphologies
+####################################################################################################
+def load_cli_morphologies(arguments,
+                          cli_options):
+    """Loads the morphologies given to the command line interface (CLI) one by one.
+
+    A GID or a morphology file gives a single morphology. A target gives the share of the current
+    worker of the target, streamed in chunks through a single circuit session, and the morphology
+    options (GID and label) are updated before each morphology is returned.
+
+    :param arguments:
+        Command line arguments.
+    :param cli_options:
+        System options parsed from the command line interface (CLI).
+    :return:
+        A generator of the loaded morphologies.
+    """
+
+    # If the input is a GID, then open the circuit and read it
+    if arguments.input == 'gid':
+
+        # Load the morphology from the file
+        loading_flag, cli_morphology = nmv.file.BBPReader.load_morphology_from_circuit(
+            blue_config=cli_options.morphology.blue_config,
+            gid=cli_options.morphology.gid)
+
+        if not loading_flag:
+            nmv.logger.log('ERROR: Cannot load the GID [%s] from the circuit [%s]' %
+                           (str(cli_options.morphology.gid), cli_options.morphology.blue_config))
+            exit(0)
+
+        yield cli_morphology
+
+    # If the input is a morphology file, then use the parser to load it directly
+    elif arguments.input == 'file':
+
+        # Read the morphology file
+        loading_flag, cli_morphology = nmv.file.read_morphology_from_file(options=cli_options)
+
+        if not loading_flag:
+            nmv.logger.log('ERROR: Cannot load the morphology file [%s]' %
+                           str(cli_options.morphology.morphology_file_path))
+            exit(0)
+
+        yield cli_morphology
+
+    # If the input is a target, then stream the share of this worker
+    elif arguments.input == 'target':
+
+        # The whole target is processed by a single worker, unless running in batch mode
+        number_workers = arguments.batch_workers if arguments.target_batch else 1
+
+        # Stream the morphologies
+        cli_options.morphology.blue_config = arguments.blue_config
+        morphology_stream = nmv.file.stream_target_morphologies(
+            blue_config=arguments.blue_config, target=arguments.target,
+            worker_index=arguments.worker_index, number_workers=number_workers,
+            chunk_size=arguments.batch_chunk_size, prefetch_size=arguments.prefetch_size)
+
+        nmv.logger.log('Worker [%d/%d]: [%d] morphologies in target [%s]' %
+                       (arguments.worker_index + 1, number_workers, len(morphology_stream),
+                        arguments.target))
+
+        # Stop the loading thread if the consumer stops before the end of the stream
+        try:
+            for i, (gid, cli_morphology) in enumerate(morphology_stream):
+
+                # Skip the morphologies that cannot be loaded
+                if cli_morphology is None:
+                    nmv.logger.log('ERROR: Cannot load the GID [%d], skipping it' % gid)
+                    continue
+
+                # Update the morphology options
+                cli_options.morphology.gid = gid
+                cli_options.morphology.label = 'neuron_' + str(gid)
+
+                nmv.logger.log('Morphology [%d/%d]: GID [%d]' %
+                               (i + 1, len(morphology_stream), gid))
+                yield cli_morphology
+        finally:
+            morphology_stream.stop()
+
+    else:
+        nmv.logger.log('ERROR: Invalid input option')
+        exit(0)
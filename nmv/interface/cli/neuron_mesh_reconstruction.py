@@ -41,6 +41,7 @@ import nmv.interface
 import nmv.options
 import nmv.rendering
 import nmv.scene
+import nmv.utilities
 
 
 ####################################################################################################
@@ -78,6 +79,16 @@ def reconstruct_neuron_mesh(cli_morphology,
         nmv.logger.log('Builder: Piecewise Watertight')
         neuron_mesh_builder = nmv.builders.PiecewiseBuilder(cli_morphology, cli_options)
 
+    # MetaBuilder
+    elif cli_options.mesh.meshing_technique == nmv.enums.Meshing.Technique.META_OBJECTS:
+        nmv.logger.log('Builder: Meta Objects')
+        neuron_mesh_builder = nmv.builders.MetaBuilder(cli_morphology, cli_options)
+
+    # SDFBuilder
+    elif cli_options.mesh.meshing_technique == nmv.enums.Meshing.Technique.SDF:
+        nmv.logger.log('Builder: Signed Distance Field')
+        neuron_mesh_builder = nmv.builders.SDFBuilder(cli_morphology, cli_options)
+
     # Unknown, kill NeuroMorphoVis
     else:
 
@@ -113,11 +124,36 @@ def save_neuron_mesh(neuron_mesh,
     # Update the file prefix
     neuron_mesh_file_name = '%s' % cli_options.morphology.label
 
+    # The mesh cache stores the transformation of the circuit neurons that are kept local
+    transform = None
+    if cli_options.mesh.export_cache and not cli_options.mesh.global_coordinates and \
+       cli_options.morphology.gid is not None and cli_options.morphology.blue_config is not None:
+        transform = nmv.skeleton.ops.get_transformation_matrix(
+            blue_config=cli_options.morphology.blue_config, gid=cli_options.morphology.gid)
+
+    # Export the levels of detail of the neuron mesh
+    if cli_options.mesh.export_lods:
+        nmv.file.export_mesh_object_lods(
+            neuron_mesh, cli_options.io.meshes_directory, neuron_mesh_file_name,
+            ratios=cli_options.mesh.lod_ratios, ply=cli_options.mesh.export_ply,
+            obj=cli_options.mesh.export_obj, stl=cli_options.mesh.export_stl,
+            cache=cli_options.mesh.export_cache,
+            compress=cli_options.mesh.compress_exported_meshes, transform=transform)
+
+        # The .blend file stores the whole scene once
+        if cli_options.mesh.export_blend:
+            nmv.file.export_scene_to_blend_file(
+                cli_options.io.meshes_directory, neuron_mesh_file_name)
+        return
+
     # Export the neuron mesh
     nmv.file.export_mesh_object(neuron_mesh, cli_options.io.meshes_directory,
                                 neuron_mesh_file_name, ply=cli_options.mesh.export_ply,
                                 obj=cli_options.mesh.export_obj, stl=cli_options.mesh.export_stl,
-                                blend=cli_options.mesh.export_blend)
+                                blend=cli_options.mesh.export_blend,
+                                cache=cli_options.mesh.export_cache,
+                                compress=cli_options.mesh.compress_exported_meshes,
+                                transform=transform)
 
 
 ####################################################################################################
@@ -228,37 +264,37 @@ def render_neuron_mesh_360(neuron_mesh,
         bounding_box_360 = nmv.bbox.compute_360_bounding_box(bounding_box,
                                                              cli_morphology.soma.centroid)
 
-        # Create a specific directory for this mesh
+        # The directory of the sequence
         output_directory = '%s/%s_mesh_360' % (
             cli_options.io.sequences_directory, cli_options.morphology.label)
-        nmv.file.ops.clean_and_create_directory(output_directory)
 
-        # Render 360
-        for i in range(360):
+        # Create the camera and the render settings once for the whole sequence
+        sequence_renderer = nmv.rendering.SequenceRenderer('MeshCamera_360')
 
-            # Set the frame name
-            image_name = '%s/%s' % (output_directory, '{0:05d}'.format(i))
+        # Render at a specific resolution
+        if cli_options.mesh.resolution_basis == \
+                nmv.enums.Meshing.Rendering.Resolution.FIXED_RESOLUTION:
+            sequence_renderer.setup_camera(
+                bounding_box=bounding_box_360, camera_view=nmv.enums.Camera.View.FRONT_360,
+                image_resolution=cli_options.mesh.full_view_resolution)
 
-            # Render at a specific resolution
-            if cli_options.mesh.resolution_basis == \
-                    nmv.enums.Meshing.Rendering.Resolution.FIXED_RESOLUTION:
+        # Render at a specific scale factor
+        else:
+            sequence_renderer.setup_camera(
+                bounding_box=bounding_box_360, camera_view=nmv.enums.Camera.View.FRONT_360,
+                image_scale_factor=cli_options.mesh.resolution_scale_factor)
 
-                # Render the image
-                nmv.rendering.NeuronMeshRenderer.render_at_angle(
-                    mesh_objects=[neuron_mesh], angle=i, bounding_box=bounding_box_360,
-                    camera_view=nmv.enums.Camera.View.FRONT_360,
-                    image_resolution=cli_options.mesh.full_view_resolution,
-                    image_name=image_name)
+        # Rotate the mesh one degree per frame
+        sequence_renderer.keyframe_rotation([neuron_mesh], frame_start=0, frame_end=359)
 
-            # Render at a specific scale factor
-            else:
+        # Render the 360 frames as a single animation
+        sequence_renderer.render_sequence(
+            output_directory=output_directory, frame_start=0, frame_end=359,
+            number_workers=cli_options.mesh.rendering_workers,
+            resume=cli_options.mesh.resume_rendering)
 
-                # Render the image
-                nmv.rendering.NeuronMeshRenderer.render_at_angle_to_scale(
-                    mesh_objects=[neuron_mesh], angle=i, bounding_box=bounding_box_360,
-                    camera_view=nmv.enums.Camera.View.FRONT_360,
-                    image_scale_factor=cli_options.mesh.resolution_scale_factor,
-                    image_name=image_name)
+        # Clear the animation and the camera
+        sequence_renderer.clear()
 
 
 ####################################################################################################
@@ -286,56 +322,42 @@ if __name__ == "__main__":
     # Convert the CLI arguments to system options
     cli_options.consume_arguments(arguments=arguments)
 
-    # Read the morphology
-    cli_morphology = None
-
-    # If the input is a GID, then open the circuit and read it
-    if arguments.input == 'gid':
-
-        # Load the morphology from the file
-        loading_flag, cli_morphology = nmv.file.BBPReader.load_morphology_from_circuit(
-            blue_config=cli_options.morphology.blue_config,
-            gid=cli_options.morphology.gid)
-
-        if not loading_flag:
-            nmv.logger.log('ERROR: Cannot load the GID [%s] from the circuit [%s]' %
-                           cli_options.morphology.blue_config, str(cli_options.morphology.gid))
-            exit(0)
-
-    # If the input is a morphology file, then use the parser to load it directly
-    elif arguments.input == 'file':
-
-        # Read the morphology file
-        loading_flag, cli_morphology = nmv.file.read_morphology_from_file(options=cli_options)
-
-        if not loading_flag:
-            nmv.logger.log('ERROR: Cannot load the morphology file [%s]' %
-                           str(cli_options.morphology.morphology_file_path))
-            exit(0)
-
-    else:
-        nmv.logger.log('ERROR: Invalid input option')
-        exit(0)
-
-    # Soma mesh reconstruction and visualization
-    neuron_mesh = reconstruct_neuron_mesh(cli_morphology=cli_morphology, cli_options=cli_options)
-
-    # Saving the mesh
-    if cli_options.mesh.export_ply or cli_options.mesh.export_obj or \
-       cli_options.mesh.export_stl or cli_options.mesh.export_blend:
-
-        # Save the neuron mesh
-        save_neuron_mesh(neuron_mesh=neuron_mesh, cli_options=cli_options)
-
-    # Render the mesh
-    if cli_options.mesh.render:
-        render_neuron_mesh_to_static_frame(neuron_mesh=neuron_mesh, cli_options=cli_options,
-                                           cli_morphology=cli_morphology)
-
-    # Render 360 of the mesh
-    if cli_options.mesh.render_360:
-        render_neuron_mesh_360(neuron_mesh=neuron_mesh, cli_options=cli_options,
-                               cli_morphology=cli_morphology)
+    # Process the morphologies one by one, a target is streamed while the meshes are built
+    for cli_morphology in nmv.interface.cli.load_cli_morphologies(arguments, cli_options):
+
+        # Start the profile of the neuron, if the profiling is enabled
+        nmv.utilities.profiler.begin(cli_options.morphology.label)
+
+        # Soma mesh reconstruction and visualization
+        neuron_mesh = reconstruct_neuron_mesh(cli_morphology=cli_morphology,
+                                              cli_options=cli_options)
+
+        # Saving the mesh
+        if cli_options.mesh.export_ply or cli_options.mesh.export_obj or \
+           cli_options.mesh.export_stl or cli_options.mesh.export_blend or \
+           cli_options.mesh.export_cache:
+
+            # Save the neuron mesh
+            with nmv.utilities.profiler.stage('export'):
+                save_neuron_mesh(neuron_mesh=neuron_mesh, cli_options=cli_options)
+
+        # Render the mesh
+        if cli_options.mesh.render:
+            with nmv.utilities.profiler.stage('rendering'):
+                render_neuron_mesh_to_static_frame(
+                    neuron_mesh=neuron_mesh, cli_options=cli_options,
+                    cli_morphology=cli_morphology)
+
+        # Render 360 of the mesh
+        if cli_options.mesh.render_360:
+            with nmv.utilities.profiler.stage('rendering.360'):
+                render_neuron_mesh_360(neuron_mesh=neuron_mesh, cli_options=cli_options,
+                                       cli_morphology=cli_morphology)
+
+        # Write the profile of the neuron
+        profile_file_path = nmv.utilities.profiler.end()
+        if profile_file_path is not None:
+            nmv.logger.log('Profile [%s]' % profile_file_path)
 
     # Rendering the mesh
     nmv.logger.log('NMV Done')
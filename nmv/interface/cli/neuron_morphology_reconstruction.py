@@ -158,42 +158,14 @@ if __name__ == "__main__":
     # Convert the CLI arguments to system options
     cli_options.consume_arguments(arguments=arguments)
 
-    # Read the morphology
-    cli_morphology = None
-
-    # If the input is a GID, then open the circuit and read it
-    if arguments.input == 'gid':
-
-        # Load the morphology from the file
-        loading_flag, cli_morphology = nmv.file.BBPReader.load_morphology_from_circuit(
-            blue_config=cli_options.morphology.blue_config,
-            gid=cli_options.morphology.gid)
-
-        if not loading_flag:
-            nmv.logger.log('ERROR: Cannot load the GID [%s] from the circuit [%s]' %
-                           cli_options.morphology.blue_config, str(cli_options.morphology.gid))
-            exit(0)
-
-    # If the input is a morphology file, then use the parser to load it directly
-    elif arguments.input == 'file':
-
-        # Read the morphology file
-        loading_flag, cli_morphology = nmv.file.read_morphology_from_file(options=cli_options)
-
-        if not loading_flag:
-            nmv.logger.log('ERROR: Cannot load the morphology file [%s]' %
-                           str(cli_options.morphology.morphology_file_path))
-            exit(0)
-
-    else:
-        nmv.logger.log('ERROR: Invalid input option')
-        exit(0)
-
     # TODO: Implement the render_soma_two_dimensional_profile() function
     # render_soma_two_dimensional_profile(cli_morphology=cli_morphology, cli_options=cli_options)
 
-    # Neuron morphology reconstruction and visualization
-    reconstruct_neuron_morphology(cli_morphology=cli_morphology, cli_options=cli_options)
+    # Process the morphologies one by one, a target is streamed while they are reconstructed
+    for cli_morphology in nmv.interface.cli.load_cli_morphologies(arguments, cli_options):
+
+        # Neuron morphology reconstruction and visualization
+        reconstruct_neuron_morphology(cli_morphology=cli_morphology, cli_options=cli_options)
     nmv.logger.log('NMV Done')
 
 
@@ -28,6 +28,7 @@ import nmv
 import nmv.edit
 import nmv.interface
 import nmv.scene
+import nmv.skeleton
 import nmv.consts
 
 # Globals
@@ -241,6 +242,9 @@ class UpdateMorphologyCoordinates(bpy.types.Operator):
             # Update the morphology skeleton
             morphology_editor.update_skeleton_coordinates()
 
+            # The derived preprocessing results of the edited skeleton must be re-computed
+            nmv.skeleton.ops.invalidate_preprocessing_state(nmv.interface.ui_morphology)
+
             global is_skeleton_edited
             is_skeleton_edited = False
 
@@ -217,7 +217,8 @@ class MeshPanel(bpy.types.Panel):
                     spines_color_row.prop(context.scene, 'SpinesMeshColor')
                     nmv.interface.ui_options.mesh.spines_color = context.scene.SpinesMeshColor
 
-        elif context.scene.MeshingTechnique == nmv.enums.Meshing.Technique.META_OBJECTS:
+        elif context.scene.MeshingTechnique == nmv.enums.Meshing.Technique.META_OBJECTS or \
+                context.scene.MeshingTechnique == nmv.enums.Meshing.Technique.SDF:
 
             neuron_color_row = layout.row()
             neuron_color_row.prop(context.scene, 'NeuronMeshColor')
@@ -314,6 +315,40 @@ class MeshPanel(bpy.types.Panel):
             Panel context.
         """
 
+        # Adaptive resolution
+        adaptive_resolution_row = self.layout.row()
+        adaptive_resolution_row.prop(context.scene, 'AdaptiveMetaResolution')
+
+        # Pass options from UI to system
+        nmv.interface.ui_options.mesh.adaptive_meta_resolution = \
+            context.scene.AdaptiveMetaResolution
+
+        # Tessellation options
+        self.draw_tessellation_options(context)
+
+    ################################################################################################
+    # @draw_sdf_meshing_options
+    ################################################################################################
+    def draw_sdf_meshing_options(self,
+                                 context):
+        """Draws the options when the signed distance field meshing technique is selected.
+
+        :param context:
+            Panel context.
+        """
+
+        # Voxel size
+        voxel_size_row = self.layout.row()
+        voxel_size_row.prop(context.scene, 'SDFVoxelSize')
+
+        # Smoothing
+        smoothing_row = self.layout.row()
+        smoothing_row.prop(context.scene, 'SDFSmoothing')
+
+        # Pass options from UI to system
+        nmv.interface.ui_options.mesh.sdf_voxel_size = context.scene.SDFVoxelSize
+        nmv.interface.ui_options.mesh.sdf_smoothing = context.scene.SDFSmoothing
+
         # Tessellation options
         self.draw_tessellation_options(context)
 
@@ -431,6 +466,8 @@ class MeshPanel(bpy.types.Panel):
             self.draw_skinning_meshing_options(context)
         elif context.scene.MeshingTechnique == nmv.enums.Meshing.Technique.UNION:
             self.draw_union_meshing_options(context)
+        elif context.scene.MeshingTechnique == nmv.enums.Meshing.Technique.SDF:
+            self.draw_sdf_meshing_options(context)
         else:
             pass
 
@@ -679,6 +716,12 @@ class ReconstructNeuronMesh(bpy.types.Operator):
                 morphology=nmv.interface.ui_morphology, options=nmv.interface.ui_options)
             nmv.interface.ui_reconstructed_mesh = mesh_builder.reconstruct_mesh()
 
+        # Signed distance field
+        elif meshing_technique == nmv.enums.Meshing.Technique.SDF:
+            mesh_builder = nmv.builders.SDFBuilder(
+                morphology=nmv.interface.ui_morphology, options=nmv.interface.ui_options)
+            nmv.interface.ui_reconstructed_mesh = mesh_builder.reconstruct_mesh()
+
         else:
 
             # Invalid method
@@ -52,7 +52,11 @@ bpy.types.Scene.MeshingTechnique = EnumProperty(
             'Meta Balls',
             'Creates watertight mesh models using meta balls. This approach is extremely slow if '
             'the axons are generated, so it is always recommended to use a first order branching '
-            'level for the axons when using this technique.')],
+            'level for the axons when using this technique.'),
+           (nmv.enums.Meshing.Technique.SDF,
+            'Distance Field',
+            'Creates watertight manifold mesh models from the signed distance field of the '
+            'segments of the morphology. The resolution of the mesh is set by the voxel size.')],
     name='Meshing Method', default=nmv.enums.Meshing.Technique.PIECEWISE_WATERTIGHT)
 
 # Skeleton style
@@ -206,6 +210,25 @@ bpy.types.Scene.FixMorphologyArtifacts = BoolProperty(
     description='Fixes the morphology artifacts during the mesh reconstruction process',
     default=True)
 
+# Adaptive resolution of the meta objects
+bpy.types.Scene.AdaptiveMetaResolution = BoolProperty(
+    name='Adaptive Resolution',
+    description='Mesh the parts of the neuron with different resolutions based on their radii',
+    default=False)
+
+# Voxel size of the signed distance field
+bpy.types.Scene.SDFVoxelSize = FloatProperty(
+    name='Voxel Size',
+    description='The voxel size of the signed distance field in microns, smaller voxels give '
+                'more detailed meshes',
+    default=nmv.consts.Meshing.SDF_VOXEL_SIZE, min=0.05, max=5.0)
+
+# Smooth union of the signed distance field
+bpy.types.Scene.SDFSmoothing = FloatProperty(
+    name='Smoothing',
+    description='The radius of the smooth union of the segments in microns, 0 for a sharp union',
+    default=nmv.consts.Meshing.SDF_SMOOTHING, min=0.0, max=5.0)
+
 # Mesh tessellation flag
 bpy.types.Scene.TessellateMesh = BoolProperty(
     name='Tessellation',
@@ -17,4 +17,7 @@
 
 from .mesh_face_ops import *
 from .mesh_object_ops import *
-from .mesh_vertex_ops import *
\ No newline at end of file
+from .mesh_vertex_ops import *
+from .mesh_union_ops import *
+from .mesh_sdf_ops import *
+from .mesh_topology_ops import *
\ No newline at end of file
@@ -15,6 +15,9 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Blender imports
 import bpy
 from mathutils import Vector, Matrix
@@ -23,6 +26,7 @@ from mathutils import Vector, Matrix
 import nmv
 import nmv.scene
 import nmv.mesh
+import nmv.geometry
 
 
 ####################################################################################################
@@ -65,6 +69,9 @@ def rotate_face_in_object_towards_point(mesh_object,
         vertex = mesh_object.data.vertices[index]
         vertex.co = matrix_object * vertex.co
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+
 
 ####################################################################################################
 # @rotate_face_towards_point
@@ -134,6 +141,9 @@ def convert_face_to_circle(mesh_object,
         # Compute the mapping point along that direction and set the vertex coordinates to it
         vertex.co = face.center + direction * face_radius
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+
 
 ####################################################################################################
 # @map_face_to_circle
@@ -166,6 +176,9 @@ def map_face_to_circle(mesh_object,
                 nearest_vertex = vertex
         vertices[vertex_index].co = nearest_vertex.co
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+
 
 ####################################################################################################
 # @extrude_face_to_face
@@ -294,16 +307,12 @@ def get_index_of_nearest_face_to_point_in_faces(mesh_object,
         The index of the nearest face in the list.
     """
 
-    nearest_face_index = -1
-    shortest_distance = 10000000000
-    for face_index in faces_indices:
-        face = mesh_object.data.polygons[face_index]
-        face_center = Vector((face.center[0], face.center[1], face.center[2]))
-        distance = (face_center - point).length
-        if distance < shortest_distance:
-            shortest_distance = distance
-            nearest_face_index = face.index
-    return nearest_face_index
+    # Query the spatial index of the faces of the mesh
+    nearest_face_index, _ = nmv.geometry.get_mesh_faces_spatial_index(
+        mesh_object).find_nearest_in_subset(point, faces_indices)
+
+    # Return the face index, or -1 if the list is empty
+    return -1 if nearest_face_index is None else nearest_face_index
 
 
 ####################################################################################################
@@ -321,15 +330,12 @@ def get_index_of_nearest_face_to_point(mesh_object,
         The index of the nearest face in the given mesh object to the point.
     """
 
-    nearest_face_index = -1
-    shortest_distance = 10000000000
-    for face in mesh_object.data.polygons:
-        face_center = Vector((face.center[0], face.center[1], face.center[2]))
-        distance = (face_center - point).length
-        if distance < shortest_distance:
-            shortest_distance = distance
-            nearest_face_index = face.index
-    return nearest_face_index
+    # Query the spatial index of the faces of the mesh
+    nearest_face_index, _ = nmv.geometry.get_mesh_faces_spatial_index(mesh_object).find_nearest(
+        point)
+
+    # Return the face index, or -1 if the mesh has no faces
+    return -1 if nearest_face_index is None else nearest_face_index
 
 
 ####################################################################################################
@@ -350,20 +356,19 @@ def get_indices_of_nearest_faces_to_point_within_delta(mesh_object,
         A list of indices of faces.
     """
 
-    nearest_face_index = get_index_of_nearest_face_to_point(mesh_object, point)
-
-    indices = list()
+    # Get the spatial index of the faces of the mesh
+    faces_spatial_index = nmv.geometry.get_mesh_faces_spatial_index(mesh_object)
 
     # Compute the distance between the nearest face and the given point
-    x_distance = (mesh_object.data.polygons[nearest_face_index].center - point).length + delta
+    nearest_face_index, nearest_distance = faces_spatial_index.find_nearest(point)
+    if nearest_face_index is None:
+        return list()
+    x_distance = nearest_distance + delta
 
-    # Get the faces
-    for face in mesh_object.data.polygons:
-        face_center = Vector((face.center[0], face.center[1], face.center[2]))
-        distance = (face_center - point).length
-
-        if distance < x_distance:
-            indices.append(face.index)
+    # Get the faces within the range, ordered by their indices
+    indices = [face_index for face_index, _ in
+               faces_spatial_index.find_within_radius(point, x_distance)]
+    indices.sort()
 
     return indices
 
@@ -410,24 +415,19 @@ def subdivide_faces(mesh_object,
 def close_open_faces(mesh_object):
     """Close all the open faces of a mesh object.
 
+    The boundary loops are capped on the arrays of the mesh, without going through the edit mode.
+
     :param mesh_object:
         A given mesh object.
     """
 
-    # Select all the vertices of a mesh object
-    nmv.mesh.ops.select_all_vertices(mesh_object)
+    # Cap the boundary loops of the mesh
+    arrays, number_caps = nmv.mesh.ops.cap_boundary_loops(
+        nmv.mesh.ops.get_mesh_topology_arrays(mesh_object))
 
-    # Toggle the mesh object to the edit/object mode
-    bpy.ops.object.editmode_toggle()
-
-    # Add new faces for the selected vertices if there are any open faces
-    bpy.ops.mesh.edge_face_add()
-
-    # Switch back to the edit more
-    bpy.ops.object.editmode_toggle()
-
-    # Deselect all the vertices again for the other side
-    nmv.mesh.ops.deselect_all_vertices(mesh_object)
+    # Update the mesh if there are any open faces
+    if number_caps > 0:
+        nmv.mesh.ops.set_mesh_topology_arrays(mesh_object, arrays)
 
 
 ####################################################################################################
@@ -441,23 +441,8 @@ def try_to_close_open_faces(mesh_object):
         A given mesh object.
     """
 
-    # Select all the vertices of a mesh object
-    nmv.mesh.ops.select_all_vertices(mesh_object)
-
-    # Toggle the mesh object to the edit/object mode
-    bpy.ops.object.editmode_toggle()
-
-    # Add new faces for the selected vertices if there are any open faces
-    try:
-        bpy.ops.mesh.edge_face_add()
-    except:
-        pass
-
-    # Switch back to the edit more
-    bpy.ops.object.editmode_toggle()
-
-    # Deselect all the vertices again for the other side
-    nmv.mesh.ops.deselect_all_vertices(mesh_object)
+    # Capping the boundary loops on the arrays of the mesh does not fail
+    close_open_faces(mesh_object)
 
 
 ####################################################################################################
@@ -541,20 +526,14 @@ def remove_first_face_of_quad_mesh_object(mesh_object):
         A quad mesh object.
     """
 
-    # Deselect all the vertices of the mesh object
-    nmv.mesh.ops.deselect_all_vertices(mesh_object)
-
-    # Select the first and last four vertices
-    vertices_indices = [0, 1, 2, 3]
-
-    # Select the vertices
-    nmv.mesh.ops.select_vertices(mesh_object, vertices_indices)
-
-    # Switch to edit mode
-    bpy.ops.object.editmode_toggle()
+    # The mesh arrays
+    arrays = nmv.mesh.ops.get_mesh_topology_arrays(mesh_object)
 
-    # Delete the face
-    bpy.ops.mesh.delete(type='FACE')
+    # The number of vertices of every face beyond the first four vertices
+    loops_polygons, _ = nmv.mesh.ops.get_polygons_loops(arrays['polygons_sizes'])
+    outside = numpy.bincount(loops_polygons[arrays['polygons_vertices'] > 3],
+                             minlength=len(arrays['polygons_sizes']))
 
-    # Switch back to the edit more
-    bpy.ops.object.editmode_toggle()
+    # Delete the faces that only use the first four vertices
+    nmv.mesh.ops.set_mesh_topology_arrays(
+        mesh_object, nmv.mesh.ops.remove_polygons(arrays, outside == 0))
@@ -21,6 +21,7 @@ import bpy, bmesh
 # Internal imports
 import nmv
 import nmv.scene
+import nmv.geometry
 import nmv.mesh
 import nmv.utilities
 
@@ -76,6 +77,9 @@ def smooth_object(mesh_object,
     # Apply the smoothing modifier
     bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Subsurf")
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+
 
 ####################################################################################################
 # @triangulate_mesh
@@ -198,6 +202,9 @@ def decimate_mesh_object(mesh_object,
     # apply the modifier
     bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Decimate")
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+
 
 ####################################################################################################
 # @smooth_object
@@ -283,6 +290,9 @@ def clip_mesh_object(primary_object,
     # Apply the union operator
     bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(primary_object)
+
     # Return the final mesh object, 'a reference to mesh_object1'
     return primary_object
 
@@ -300,12 +310,11 @@ def transform_mesh(mesh_object,
         Transformation matrix.
     """
 
-    # Get all the vertices of the mesh object
-    vertices = mesh_object.data.vertices[:]
+    # Apply the transformation to all the vertices of the mesh object in bulk
+    mesh_object.data.transform(transformation_matrix)
 
-    # Apply the transformation vertex by vertex
-    for vertex in vertices:
-        vertex.co = transformation_matrix * vertex.co
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
 
 
 ####################################################################################################
@@ -453,6 +462,9 @@ def union_mesh_objects(mesh_object_1,
     # apply the union operator
     bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object_1)
+
     # return the final mesh object, 'a reference to mesh_object1'
     return mesh_object_1
 
@@ -462,10 +474,15 @@ def union_mesh_objects(mesh_object_1,
 ####################################################################################################
 def union_mesh_objects_in_list(mesh_objects_list):
     """Union a list of mesh objects into a single mesh.
+
+    The objects are first grouped into sets of overlapping objects. The objects of each set are
+    unioned with a balanced pairwise reduction tree, and the disjoint sets are simply joined
+    together. The duplicate vertices are removed and the normals are fixed once at the end.
+
     :param mesh_objects_list:
         A list of mesh objects to be merged into a single mesh relying on the union operator.
     :return:
-        The final mesh resulting from the union operator.
+        The final mesh resulting from the union operator, a reference to the first mesh object.
     """
 
     # Use the first mesh in the list to be the primary one
@@ -475,29 +492,28 @@ def union_mesh_objects_in_list(mesh_objects_list):
     if len(mesh_objects_list) == 1:
         return mesh_object_1
 
-    # Apply the union operator on all the other meshes in the list
-    for i in range(1, len(mesh_objects_list)):
+    # Find the groups of overlapping objects
+    groups = nmv.mesh.ops.find_overlapping_mesh_objects(mesh_objects_list)
+
+    # Union each group with a reduction tree
+    group_meshes = list()
+    for i, group in enumerate(groups):
 
         # Show progress
-        nmv.utilities.time_line.show_iteration_progress('Union', i, len(mesh_objects_list))
+        nmv.utilities.time_line.show_iteration_progress('Union', i, len(groups))
 
-        # Union the ith mesh object
-        mesh_object_1 = union_mesh_objects(mesh_object_1, mesh_objects_list[i])
+        group_meshes.append(nmv.mesh.ops.union_mesh_objects_in_tree(
+            [mesh_objects_list[j] for j in group]))
 
-        # Switch to edit mode to REMOVE THE DOUBLES
-        # TODO: Use the remove doubles function
-        bpy.ops.object.editmode_toggle()
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles()
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.editmode_toggle()
+    # Report the progress
+    nmv.utilities.time_line.show_iteration_progress('Union', len(groups), len(groups), done=True)
 
-        # Delete the other mesh
-        nmv.scene.ops.delete_list_objects([mesh_objects_list[i]])
+    # The groups do not overlap, so they are joined without any boolean operations
+    if len(group_meshes) > 1:
+        mesh_object_1 = join_mesh_objects(group_meshes, name=mesh_object_1.name)
 
-    # Report the progress
-    nmv.utilities.time_line.show_iteration_progress(
-        'Union', len(mesh_objects_list), len(mesh_objects_list), done=True)
+    # Remove the doubles and fix the normals once
+    nmv.mesh.ops.clean_union_mesh_object(mesh_object_1)
 
     # TODO: handle the case when this operation fails.
 
@@ -538,6 +554,9 @@ def intersect_mesh_objects(mesh_object1,
     # Apply the intersection operator
     bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object1)
+
     # Return the final mesh object, 'a reference to mesh_object1'
     return mesh_object1
 
@@ -563,7 +582,7 @@ def join_mesh_objects(mesh_list,
 
     # If the input list contains only one mesh, return a reference to it
     if len(mesh_list) == 1:
-        return mesh_list[1]
+        return mesh_list[0]
 
     # Deselect everything in the scene
     nmv.scene.ops.deselect_all()
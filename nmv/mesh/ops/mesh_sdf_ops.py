@@ -0,0 +1,636 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import numpy
+from concurrent.futures import ThreadPoolExecutor
+
+
+# The corners of a grid cell, indexed by the bits (x, y, z) of the corner
+SDF_CELL_CORNERS = numpy.array([[(corner >> axis) & 1 for axis in range(3)]
+                                for corner in range(8)], dtype=numpy.int64)
+
+# The six tetrahedra of the Kuhn split of a cell around its diagonal (0, 7). The split is the same
+# in every cell, so the faces shared by neighbouring cells are split along the same diagonals
+SDF_CELL_TETRAHEDRA = numpy.array([[0, 1, 3, 7],
+                                   [0, 3, 2, 7],
+                                   [0, 2, 6, 7],
+                                   [0, 6, 4, 7],
+                                   [0, 4, 5, 7],
+                                   [0, 5, 1, 7]], dtype=numpy.int64)
+
+
+####################################################################################################
+# @get_tetrahedra_cases_tables
+####################################################################################################
+def get_tetrahedra_cases_tables():
+    """Builds the tables of the cases of a tetrahedron cut by the iso-surface. The case of a
+    tetrahedron is a 4-bit mask of its inside vertices.
+
+    :return:
+        A tuple of two tables. The first one gives, for the cases with a single triangle, the vertex
+        that is alone on its side followed by the three other vertices. The second one gives, for
+        the cases with a quad, the two inside vertices followed by the two outside vertices.
+    """
+
+    triangles_table = numpy.zeros((16, 4), dtype=numpy.int64)
+    quads_table = numpy.zeros((16, 4), dtype=numpy.int64)
+    for case in range(16):
+        inside = [vertex for vertex in range(4) if (case >> vertex) & 1]
+        outside = [vertex for vertex in range(4) if not (case >> vertex) & 1]
+
+        # A single triangle around the vertex that is alone
+        if len(inside) == 1:
+            triangles_table[case] = inside + outside
+        elif len(inside) == 3:
+            triangles_table[case] = outside + inside
+
+        # A quad between the two sides
+        elif len(inside) == 2:
+            quads_table[case] = inside + outside
+
+    # Return the tables
+    return triangles_table, quads_table
+
+
+# The tables of the cases of the tetrahedra
+SDF_TRIANGLES_TABLE, SDF_QUADS_TABLE = get_tetrahedra_cases_tables()
+
+# The number of inside vertices of every case
+SDF_INSIDE_COUNTS = numpy.array([bin(case).count('1') for case in range(16)], dtype=numpy.int64)
+
+
+####################################################################################################
+# @get_sdf_grid
+####################################################################################################
+def get_sdf_grid(points_1,
+                 points_2,
+                 radii,
+                 voxel_size,
+                 narrow_band,
+                 block_size):
+    """Computes a grid that encloses the capsules with their narrow band. The grid is made of
+    blocks of block_size cells that share their boundary points.
+
+    :param points_1:
+        An array of the first points of the capsules.
+    :param points_2:
+        An array of the second points of the capsules.
+    :param radii:
+        An array of the largest radius of every capsule.
+    :param voxel_size:
+        The size of the voxels of the grid.
+    :param narrow_band:
+        The width of the narrow band around the surface, in the same units of the voxel size.
+    :param block_size:
+        The number of cells along every side of a block.
+    :return:
+        A tuple (origin, number_blocks) of the origin of the grid and the number of blocks along
+        every axis.
+    """
+
+    # The bounding box of the capsules, with the narrow band and a voxel on every side
+    margin = radii[:, None] + narrow_band + voxel_size
+    p_min = numpy.minimum(points_1, points_2) - margin
+    p_max = numpy.maximum(points_1, points_2) + margin
+    origin = p_min.min(axis=0)
+    extent = p_max.max(axis=0) - origin
+
+    # The number of blocks along every axis
+    number_blocks = numpy.ceil(extent / (voxel_size * block_size)).astype(numpy.int64)
+    number_blocks = numpy.maximum(number_blocks, 1)
+
+    # Return the grid
+    return origin, number_blocks
+
+
+####################################################################################################
+# @hash_capsules_into_blocks
+####################################################################################################
+def hash_capsules_into_blocks(points_1,
+                              points_2,
+                              radii,
+                              origin,
+                              number_blocks,
+                              voxel_size,
+                              narrow_band,
+                              block_size):
+    """Hashes the capsules into the blocks of the grid. A capsule is added to every block that
+    intersects its bounding box extended by the narrow band, so a block gets all the capsules that
+    can be within the narrow band of any of its points.
+
+    :param points_1:
+        An array of the first points of the capsules.
+    :param points_2:
+        An array of the second points of the capsules.
+    :param radii:
+        An array of the largest radius of every capsule.
+    :param origin:
+        The origin of the grid.
+    :param number_blocks:
+        The number of blocks along every axis.
+    :param voxel_size:
+        The size of the voxels of the grid.
+    :param narrow_band:
+        The width of the narrow band around the surface.
+    :param block_size:
+        The number of cells along every side of a block.
+    :return:
+        A tuple (blocks_keys, blocks_offsets, blocks_capsules) of the keys (x, y, z) of the
+        non-empty blocks, the offsets of the capsules of every block and the indices of the
+        capsules of all the blocks.
+    """
+
+    # The range of the blocks that every capsule covers, with half a voxel of tolerance for the
+    # points on the boundaries of the blocks
+    margin = radii[:, None] + narrow_band + 0.5 * voxel_size
+    block_length = voxel_size * block_size
+    first_blocks = numpy.floor(
+        (numpy.minimum(points_1, points_2) - margin - origin) / block_length).astype(numpy.int64)
+    last_blocks = numpy.floor(
+        (numpy.maximum(points_1, points_2) + margin - origin) / block_length).astype(numpy.int64)
+    first_blocks = numpy.clip(first_blocks, 0, number_blocks - 1)
+    last_blocks = numpy.clip(last_blocks, 0, number_blocks - 1)
+
+    # Enumerate the pairs of capsules and blocks
+    extents = last_blocks - first_blocks + 1
+    counts = extents.prod(axis=1)
+    capsules = numpy.repeat(numpy.arange(len(points_1)), counts)
+    local_indices = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    extents = extents[capsules]
+    keys = first_blocks[capsules] + numpy.stack(
+        [local_indices // (extents[:, 1] * extents[:, 2]),
+         (local_indices // extents[:, 2]) % extents[:, 1],
+         local_indices % extents[:, 2]], axis=1)
+
+    # Group the capsules by block
+    blocks_ids = (keys[:, 0] * number_blocks[1] + keys[:, 1]) * number_blocks[2] + keys[:, 2]
+    order = numpy.argsort(blocks_ids, kind='mergesort')
+    blocks_ids = blocks_ids[order]
+    unique_ids, first_pairs = numpy.unique(blocks_ids, return_index=True)
+    blocks_keys = keys[order][first_pairs]
+    blocks_offsets = numpy.append(first_pairs, len(blocks_ids))
+
+    # Return the hash
+    return blocks_keys, blocks_offsets, capsules[order]
+
+
+####################################################################################################
+# @get_block_points
+####################################################################################################
+def get_block_points(block_key,
+                     number_blocks,
+                     block_size):
+    """Returns the grid indices and the global ids of the points of a block, including the points
+    it shares with the next blocks.
+
+    :param block_key:
+        The key (x, y, z) of the block.
+    :param number_blocks:
+        The number of blocks along every axis.
+    :param block_size:
+        The number of cells along every side of a block.
+    :return:
+        A tuple (indices, ids) of an array of shape (block_size + 1) ^ 3 x 3 of the grid indices of
+        the points and an array of their global ids, in the x, y, z order.
+    """
+
+    # The grid indices of the points
+    local = numpy.arange(block_size + 1)
+    x, y, z = numpy.meshgrid(local, local, local, indexing='ij')
+    indices = numpy.stack([x.ravel(), y.ravel(), z.ravel()], axis=1) + \
+        numpy.asarray(block_key, dtype=numpy.int64) * block_size
+
+    # The global ids of the points
+    dimensions = number_blocks * block_size + 1
+    ids = (indices[:, 0] * dimensions[1] + indices[:, 1]) * dimensions[2] + indices[:, 2]
+
+    # Return the points
+    return indices, ids
+
+
+####################################################################################################
+# @compute_capsules_distances
+####################################################################################################
+def compute_capsules_distances(points,
+                               points_1,
+                               points_2,
+                               radii_1,
+                               radii_2):
+    """Computes the signed distances between a set of points and a set of capsules with linearly
+    interpolated radii. The distance to a capsule is the distance to the closest point on its axis
+    minus the radius at that point.
+
+    :param points:
+        An array of N points.
+    :param points_1:
+        An array of the first points of M capsules.
+    :param points_2:
+        An array of the second points of the capsules.
+    :param radii_1:
+        An array of the first radii of the capsules.
+    :param radii_2:
+        An array of the second radii of the capsules.
+    :return:
+        An N x M array of the signed distances.
+    """
+
+    # The axes of the capsules, a sphere has a null axis
+    axes = points_2 - points_1
+    lengths = numpy.einsum('ij,ij->i', axes, axes)
+    lengths[lengths == 0] = 1.0
+
+    # The closest points on the axes
+    relative = points[:, None, :] - points_1[None, :, :]
+    t = numpy.clip(numpy.einsum('ijk,jk->ij', relative, axes) / lengths, 0.0, 1.0)
+    relative -= t[:, :, None] * axes[None, :, :]
+
+    # The signed distances
+    return numpy.sqrt(numpy.einsum('ijk,ijk->ij', relative, relative)) - \
+        (radii_1 + t * (radii_2 - radii_1))
+
+
+####################################################################################################
+# @get_nearest_sections_distances
+####################################################################################################
+def get_nearest_sections_distances(distances,
+                                   sections,
+                                   narrow_band):
+    """Returns the distance to the nearest capsule of every point, the section of this capsule and
+    the distance to the nearest capsule of any other section.
+
+    :param distances:
+        An N x M array of the signed distances between N points and M capsules.
+    :param sections:
+        An array of the sections of the M capsules.
+    :param narrow_band:
+        The width of the narrow band, the distances are clamped to it.
+    :return:
+        A tuple (nearest, nearest_sections, other) of arrays of N elements.
+    """
+
+    # The nearest capsule
+    nearest_capsules = distances.argmin(axis=1)
+    nearest = numpy.minimum(distances[numpy.arange(len(distances)), nearest_capsules], narrow_band)
+    nearest_sections = sections[nearest_capsules]
+
+    # The nearest capsule of another section
+    other = numpy.where(sections[None, :] != nearest_sections[:, None], distances, narrow_band)
+    other = numpy.minimum(other.min(axis=1), narrow_band)
+
+    return nearest, nearest_sections, other
+
+
+####################################################################################################
+# @evaluate_sdf_block
+####################################################################################################
+def evaluate_sdf_block(points,
+                       capsules,
+                       narrow_band,
+                       smoothing,
+                       batch_size=64):
+    """Evaluates the smooth union of the distance fields of a set of capsules on the points of a
+    block.
+
+    The union is the polynomial smooth minimum of the distance to the nearest capsule and the
+    distance to the nearest capsule of another section, min(a, b) - h^2 k / 4 with
+    h = max(k - |a - b|, 0) / k. The consecutive capsules of the same section are never blended,
+    so the radii along the sections are exact, and the union is exact wherever the two distances
+    differ by more than the smoothing radius k. Both distances do not depend on the order of the
+    capsules, and they are accumulated over batches of capsules to bound the memory. The field is
+    clamped to the narrow band, so a point that is far from all the capsules is always outside.
+
+    :param points:
+        An array of the points of the block.
+    :param capsules:
+        A tuple (points_1, points_2, radii_1, radii_2, sections) of the arrays of the capsules of
+        the block, where sections are the ids of the sections of the capsules.
+    :param narrow_band:
+        The width of the narrow band around the surface.
+    :param smoothing:
+        The radius of the smooth union. If zero, the union is the exact minimum.
+    :param batch_size:
+        The number of capsules that are evaluated at once.
+    :return:
+        An array of the values of the field on the points.
+    """
+
+    points_1, points_2, radii_1, radii_2, sections = capsules
+
+    # The distance to the nearest capsule, its section and the distance to the nearest capsule of
+    # another section
+    nearest = numpy.full(len(points), narrow_band, dtype=numpy.float64)
+    nearest_sections = numpy.full(len(points), -1, dtype=numpy.int64)
+    other = numpy.full(len(points), narrow_band, dtype=numpy.float64)
+
+    for i in range(0, len(points_1), batch_size):
+        batch = slice(i, i + batch_size)
+        distances = compute_capsules_distances(
+            points, points_1[batch], points_2[batch], radii_1[batch], radii_2[batch])
+
+        # Exact union
+        if smoothing <= 0:
+            nearest = numpy.minimum(nearest, distances.min(axis=1))
+            continue
+
+        # Merge the nearest capsules of the batch with the running ones
+        batch_nearest, batch_sections, batch_other = get_nearest_sections_distances(
+            distances, sections[batch], narrow_band)
+        closer = batch_nearest < nearest
+        other = numpy.where(
+            closer,
+            numpy.minimum(batch_other,
+                          numpy.where(nearest_sections != batch_sections, nearest, other)),
+            numpy.minimum(other,
+                          numpy.where(batch_sections != nearest_sections, batch_nearest,
+                                      batch_other)))
+        nearest = numpy.where(closer, batch_nearest, nearest)
+        nearest_sections = numpy.where(closer, batch_sections, nearest_sections)
+
+    # The values of the field
+    values = nearest.copy()
+    if smoothing > 0:
+        h = numpy.maximum(smoothing - numpy.abs(other - nearest), 0.0) / smoothing
+        values -= h * h * smoothing * 0.25
+    values = numpy.minimum(values, narrow_band)
+
+    # The surface must not go through the points, otherwise the vertices of the triangles would
+    # collapse on them
+    values[values == 0] = 1e-9 * narrow_band
+
+    # Return the field
+    return values
+
+
+####################################################################################################
+# @march_sdf_block
+####################################################################################################
+def march_sdf_block(values,
+                    ids,
+                    block_size):
+    """Extracts the iso-surface of a block with marching tetrahedra. Every cell is split into six
+    tetrahedra, and every tetrahedron that is cut by the surface gives a triangle or a quad.
+
+    The vertices of the triangles are identified by the edges of the grid they lie on, with a key
+    8 * id + direction, where id is the global id of the lower point of the edge and the direction
+    is the corner bits (x, y, z) of its upper point, so the vertices of the neighbouring blocks
+    are merged later by their keys.
+
+    :param values:
+        An array of the values of the field on the (block_size + 1) ^ 3 points of the block.
+    :param ids:
+        An array of the global ids of the points.
+    :param block_size:
+        The number of cells along every side of a block.
+    :return:
+        An array T x 3 of the keys of the vertices of the triangles, ordered counter-clockwise
+        when seen from the outside of the surface.
+    """
+
+    # The values and the ids of the corners of the cells
+    side = block_size + 1
+    values = values.reshape(side, side, side)
+    ids = ids.reshape(side, side, side)
+    cells_values = numpy.stack(
+        [values[dx:dx + block_size, dy:dy + block_size, dz:dz + block_size].ravel()
+         for dx, dy, dz in SDF_CELL_CORNERS], axis=1)
+    cells_ids = numpy.stack(
+        [ids[dx:dx + block_size, dy:dy + block_size, dz:dz + block_size].ravel()
+         for dx, dy, dz in SDF_CELL_CORNERS], axis=1)
+
+    # Only the cells that are cut by the surface
+    cut = (cells_values.min(axis=1) < 0) & (cells_values.max(axis=1) > 0)
+    cells_values = cells_values[cut]
+    cells_ids = cells_ids[cut]
+
+    # The tetrahedra of the cells, with the corners of their vertices in the cell
+    tetrahedra_corners = numpy.tile(SDF_CELL_TETRAHEDRA, (len(cells_values), 1))
+    tetrahedra_cells = numpy.repeat(numpy.arange(len(cells_values)), len(SDF_CELL_TETRAHEDRA))
+    tetrahedra_values = cells_values[tetrahedra_cells[:, None], tetrahedra_corners]
+    cases = ((tetrahedra_values < 0) * numpy.array([1, 2, 4, 8])).sum(axis=1)
+
+    # The key of the vertex on the edge between two corners of the tetrahedra
+    def get_edge_keys(selection, corners_1, corners_2):
+        lower_corners = corners_1 & corners_2
+        lower_ids = cells_ids[tetrahedra_cells[selection], lower_corners]
+        return lower_ids * 8 + (corners_1 ^ corners_2)
+
+    # The orientation of the tetrahedra (v0, v1, v2, v3), the sign of det(v1 - v0, v2 - v0, v3 - v0)
+    def get_orientations(vertices):
+        corners = SDF_CELL_CORNERS[vertices]
+        return numpy.linalg.det((corners[:, 1:] - corners[:, :1]).astype(numpy.float64)) > 0
+
+    # The vertices of the selected tetrahedra, reordered with a table of the cases
+    def get_cases_vertices(selection, table):
+        return tetrahedra_corners[selection[:, None], table[cases[selection]]]
+
+    triangles = list()
+
+    # The tetrahedra with a single triangle around a vertex. The triangle faces away from the
+    # vertex if the tetrahedron is positively oriented, so it faces the outside if the vertex is
+    # inside, and it is flipped otherwise
+    selection = numpy.where(SDF_INSIDE_COUNTS[cases] % 2 == 1)[0]
+    vertices = get_cases_vertices(selection, SDF_TRIANGLES_TABLE)
+    single_triangles = numpy.stack(
+        [get_edge_keys(selection, vertices[:, 0], vertices[:, k]) for k in (1, 2, 3)], axis=1)
+    flipped = get_orientations(vertices) != (SDF_INSIDE_COUNTS[cases[selection]] == 1)
+    single_triangles[flipped] = single_triangles[flipped][:, ::-1]
+    triangles.append(single_triangles)
+
+    # The tetrahedra with a quad (ac, ad, bd, bc) between the inside vertices a and b and the
+    # outside vertices c and d, split into two triangles. The quad faces the outside if the
+    # tetrahedron (a, b, c, d) is positively oriented, and it is flipped otherwise
+    selection = numpy.where(SDF_INSIDE_COUNTS[cases] == 2)[0]
+    vertices = get_cases_vertices(selection, SDF_QUADS_TABLE)
+    a_c = get_edge_keys(selection, vertices[:, 0], vertices[:, 2])
+    a_d = get_edge_keys(selection, vertices[:, 0], vertices[:, 3])
+    b_d = get_edge_keys(selection, vertices[:, 1], vertices[:, 3])
+    b_c = get_edge_keys(selection, vertices[:, 1], vertices[:, 2])
+    quads_triangles = numpy.concatenate([numpy.stack([a_c, a_d, b_d], axis=1),
+                                         numpy.stack([a_c, b_d, b_c], axis=1)])
+    flipped = numpy.tile(~get_orientations(vertices), 2)
+    quads_triangles[flipped] = quads_triangles[flipped][:, ::-1]
+    triangles.append(quads_triangles)
+
+    # Return the triangles of the block
+    return numpy.concatenate(triangles)
+
+
+####################################################################################################
+# @run_on_blocks
+####################################################################################################
+def run_on_blocks(function,
+                  arguments,
+                  number_workers):
+    """Runs a function on the blocks of the grid in a pool of threads. NumPy releases the GIL in
+    its heavy operations, so the blocks are processed in parallel.
+
+    :param function:
+        The function to run on every block.
+    :param arguments:
+        A list of the tuples of the arguments of the function for every block.
+    :param number_workers:
+        The number of threads. If None, a thread per core is used.
+    :return:
+        A list of the results of the function, in the order of the blocks.
+    """
+
+    # The number of threads
+    if number_workers is None or number_workers < 1:
+        number_workers = os.cpu_count() or 1
+    number_workers = max(1, min(number_workers, len(arguments)))
+
+    # Serial
+    if number_workers == 1:
+        return [function(*block_arguments) for block_arguments in arguments]
+
+    # Parallel, and raise the exceptions of the threads if any
+    with ThreadPoolExecutor(max_workers=number_workers) as executor:
+        futures = [executor.submit(function, *block_arguments) for block_arguments in arguments]
+        return [future.result() for future in futures]
+
+
+####################################################################################################
+# @build_sdf_mesh_arrays
+####################################################################################################
+def build_sdf_mesh_arrays(points_1,
+                          points_2,
+                          radii_1,
+                          radii_2,
+                          voxel_size,
+                          narrow_band,
+                          smoothing,
+                          sections=None,
+                          block_size=16,
+                          number_workers=None):
+    """Builds a mesh of the smooth union of a set of capsules, for example the segments of a
+    neuron, from their signed distance field.
+
+    The field is only evaluated in the blocks of the grid that are within the narrow band of any
+    capsule, where every block is hashed to the capsules that can reach it. The surface is then
+    extracted with marching tetrahedra, which gives a closed 2-manifold mesh since the cells are
+    split consistently, and the vertices are shared between the blocks by their grid edges.
+
+    NOTE: The radii are clamped to the voxel size, otherwise the thin branches could fall between
+    the points of the grid and the mesh would be disconnected.
+
+    :param points_1:
+        An array of the first points of the capsules.
+    :param points_2:
+        An array of the second points of the capsules. A sphere has the same two points.
+    :param radii_1:
+        An array of the first radii of the capsules.
+    :param radii_2:
+        An array of the second radii of the capsules.
+    :param voxel_size:
+        The size of the voxels of the grid.
+    :param narrow_band:
+        The width of the narrow band around the surface, in voxels.
+    :param smoothing:
+        The radius of the smooth union of the capsules.
+    :param sections:
+        An array of the ids of the sections of the capsules. The capsules of the same section are
+        not blended together. If None, every run of consecutive capsules, where each capsule starts
+        at the end of the previous one, is a section.
+    :param block_size:
+        The number of cells along every side of a block.
+    :param number_workers:
+        The number of threads that process the blocks. If None, a thread per core is used.
+    :return:
+        A tuple (vertices, triangles) of an array of the vertices of the mesh and an array T x 3 of
+        the indices of the vertices of its triangles.
+    """
+
+    # The capsules
+    points_1 = numpy.asarray(points_1, dtype=numpy.float64).reshape(-1, 3)
+    points_2 = numpy.asarray(points_2, dtype=numpy.float64).reshape(-1, 3)
+    radii_1 = numpy.maximum(numpy.asarray(radii_1, dtype=numpy.float64).ravel(), voxel_size)
+    radii_2 = numpy.maximum(numpy.asarray(radii_2, dtype=numpy.float64).ravel(), voxel_size)
+    radii = numpy.maximum(radii_1, radii_2)
+    narrow_band = max(narrow_band, 2.0) * voxel_size
+
+    # The smooth union can only pull the surface inwards to the points that are closer than k / 4
+    # to a capsule, and it needs the distances up to k beyond them, so the narrow band must cover
+    # them, otherwise the clamped distances would be blended as well
+    narrow_band = max(narrow_band, 1.25 * smoothing + voxel_size)
+    if sections is None:
+        continued = numpy.concatenate(
+            [[False], numpy.all(points_2[:-1] == points_1[1:], axis=1)])
+        sections = numpy.cumsum(~continued)
+    sections = numpy.asarray(sections, dtype=numpy.int64).ravel()
+
+    # The grid and the hash of the capsules into its blocks
+    origin, number_blocks = get_sdf_grid(
+        points_1, points_2, radii, voxel_size, narrow_band, block_size)
+    blocks_keys, blocks_offsets, blocks_capsules = hash_capsules_into_blocks(
+        points_1, points_2, radii, origin, number_blocks, voxel_size, narrow_band, block_size)
+
+    # Evaluate the field on the points of every block
+    def evaluate_block(i):
+        indices, ids = get_block_points(blocks_keys[i], number_blocks, block_size)
+        capsules = blocks_capsules[blocks_offsets[i]:blocks_offsets[i + 1]]
+        values = evaluate_sdf_block(
+            origin + indices * voxel_size,
+            (points_1[capsules], points_2[capsules], radii_1[capsules], radii_2[capsules],
+             sections[capsules]),
+            narrow_band, smoothing)
+        return ids, values
+
+    blocks_fields = run_on_blocks(
+        evaluate_block, [(i,) for i in range(len(blocks_keys))], number_workers)
+
+    # The blocks share their boundary points, but they have different capsules, so a single value
+    # is kept for every point to get the same surface on both sides of a boundary
+    all_ids = numpy.concatenate([ids for ids, _ in blocks_fields])
+    all_values = numpy.concatenate([values for _, values in blocks_fields])
+    all_ids, first_points = numpy.unique(all_ids, return_index=True)
+    all_values = all_values[first_points]
+
+    # March the blocks with the shared values
+    def march_block(i):
+        ids = blocks_fields[i][0]
+        return march_sdf_block(
+            all_values[numpy.searchsorted(all_ids, ids)], ids, block_size)
+
+    blocks_triangles = run_on_blocks(
+        march_block, [(i,) for i in range(len(blocks_keys))], number_workers)
+    triangles = numpy.concatenate(blocks_triangles)
+
+    # Merge the vertices of the triangles by their edges
+    vertices_keys, triangles = numpy.unique(triangles, return_inverse=True)
+    triangles = triangles.reshape(-1, 3)
+
+    # The points at both ends of the edges of the vertices
+    dimensions = number_blocks * block_size + 1
+    lower_ids = vertices_keys // 8
+    lower_indices = numpy.stack(
+        [lower_ids // (dimensions[1] * dimensions[2]),
+         (lower_ids // dimensions[2]) % dimensions[1],
+         lower_ids % dimensions[2]], axis=1)
+    upper_indices = lower_indices + SDF_CELL_CORNERS[vertices_keys % 8]
+    upper_ids = (upper_indices[:, 0] * dimensions[1] + upper_indices[:, 1]) * dimensions[2] + \
+        upper_indices[:, 2]
+
+    # Interpolate the vertices along the edges
+    lower_values = all_values[numpy.searchsorted(all_ids, lower_ids)]
+    upper_values = all_values[numpy.searchsorted(all_ids, upper_ids)]
+    t = lower_values / (lower_values - upper_values)
+    vertices = origin + (lower_indices + t[:, None] * (upper_indices - lower_indices)) * voxel_size
+
+    # Return the mesh
+    return vertices, triangles
@@ -0,0 +1,722 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal imports
+import nmv
+import nmv.geometry
+
+
+####################################################################################################
+# @get_mesh_topology_arrays
+####################################################################################################
+def get_mesh_topology_arrays(mesh_object):
+    """Reads the geometry of a mesh object in bulk into the arrays of the topology operations.
+
+    The vertices are kept in the local coordinates of the object, and the vertices of the polygons
+    are ordered polygon by polygon.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A dictionary of the arrays of the mesh, 'vertices', 'polygons_sizes', 'polygons_vertices',
+        'material_indices' and 'smooth'.
+    """
+
+    mesh = mesh_object.data
+
+    # Vertices
+    vertices = numpy.zeros(len(mesh.vertices) * 3, dtype=numpy.float64)
+    mesh.vertices.foreach_get('co', vertices)
+
+    # Polygons
+    number_polygons = len(mesh.polygons)
+    loops_start = numpy.zeros(number_polygons, dtype=numpy.int64)
+    loops_total = numpy.zeros(number_polygons, dtype=numpy.int64)
+    material_indices = numpy.zeros(number_polygons, dtype=numpy.int32)
+    smooth = numpy.zeros(number_polygons, dtype=numpy.bool_)
+    mesh.polygons.foreach_get('loop_start', loops_start)
+    mesh.polygons.foreach_get('loop_total', loops_total)
+    mesh.polygons.foreach_get('material_index', material_indices)
+    mesh.polygons.foreach_get('use_smooth', smooth)
+
+    # The vertices of the loops, reordered polygon by polygon
+    loops_vertices = numpy.zeros(len(mesh.loops), dtype=numpy.int64)
+    mesh.loops.foreach_get('vertex_index', loops_vertices)
+    first_loops = numpy.cumsum(loops_total) - loops_total
+    loops = numpy.arange(loops_total.sum()) - numpy.repeat(first_loops, loops_total) + \
+        numpy.repeat(loops_start, loops_total)
+
+    # Return the arrays
+    return {'vertices': vertices.reshape(-1, 3),
+            'polygons_sizes': loops_total,
+            'polygons_vertices': loops_vertices[loops],
+            'material_indices': material_indices,
+            'smooth': smooth}
+
+
+####################################################################################################
+# @set_mesh_topology_arrays
+####################################################################################################
+def set_mesh_topology_arrays(mesh_object,
+                             arrays):
+    """Replaces the geometry of a mesh object with the arrays of the topology operations, in bulk
+    and without going through the edit mode. The materials and the texture space are kept.
+
+    The arrays do not map the new vertices and loops to the old ones, so the UV layers, the vertex
+    colors and the weights of the vertex groups cannot be carried over. The meshes of the builders
+    have none of them, and a mesh with any of them is rejected rather than silently stripped.
+
+    :param mesh_object:
+        A given mesh object, without UV layers, vertex colors or vertex groups.
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    """
+
+    old_mesh = mesh_object.data
+
+    # The layers that would be lost with the old mesh
+    assert len(old_mesh.uv_layers) == 0, \
+        'Mesh [%s]: The UV layers cannot be carried over' % old_mesh.name
+    assert len(old_mesh.vertex_colors) == 0, \
+        'Mesh [%s]: The vertex colors cannot be carried over' % old_mesh.name
+    assert len(mesh_object.vertex_groups) == 0, \
+        'Mesh [%s]: The vertex groups cannot be carried over' % old_mesh.name
+
+    name = old_mesh.name
+    polygons_sizes = numpy.ascontiguousarray(arrays['polygons_sizes'], dtype=numpy.int32)
+
+    # Create the mesh
+    mesh = bpy.data.meshes.new(name)
+
+    # Vertices
+    mesh.vertices.add(len(arrays['vertices']))
+    mesh.vertices.foreach_set('co', numpy.ascontiguousarray(
+        arrays['vertices'], dtype=numpy.float32).ravel())
+
+    # Loops
+    mesh.loops.add(int(polygons_sizes.sum()))
+    mesh.loops.foreach_set('vertex_index', numpy.ascontiguousarray(
+        arrays['polygons_vertices'], dtype=numpy.int32))
+
+    # Polygons
+    mesh.polygons.add(len(polygons_sizes))
+    mesh.polygons.foreach_set('loop_start', numpy.cumsum(polygons_sizes) - polygons_sizes)
+    mesh.polygons.foreach_set('loop_total', polygons_sizes)
+    mesh.polygons.foreach_set('material_index', numpy.ascontiguousarray(
+        arrays['material_indices'], dtype=numpy.int32))
+    mesh.polygons.foreach_set('use_smooth', numpy.ascontiguousarray(
+        arrays['smooth'], dtype=numpy.bool_))
+
+    # Build the edges
+    mesh.update(calc_edges=True)
+
+    # Keep the materials and the texture space
+    for material in old_mesh.materials:
+        mesh.materials.append(material)
+    mesh.use_auto_texspace = old_mesh.use_auto_texspace
+    mesh.texspace_location = old_mesh.texspace_location
+    mesh.texspace_size = old_mesh.texspace_size
+
+    # Replace the mesh of the object, the spatial indices of the old mesh are not valid anymore
+    nmv.geometry.invalidate_spatial_index(mesh_object)
+    mesh_object.data = mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+        mesh.name = name
+
+
+####################################################################################################
+# @get_polygons_loops
+####################################################################################################
+def get_polygons_loops(polygons_sizes):
+    """Returns the polygon of every loop and the index of the next loop in the same polygon.
+
+    :param polygons_sizes:
+        The number of vertices of every polygon.
+    :return:
+        A tuple (loops_polygons, next_loops) of arrays.
+    """
+
+    polygons_sizes = numpy.asarray(polygons_sizes, dtype=numpy.int64)
+    first_loops = numpy.cumsum(polygons_sizes) - polygons_sizes
+    loops_polygons = numpy.repeat(numpy.arange(len(polygons_sizes)), polygons_sizes)
+
+    # The next loop, wrapping around at the last loop of every polygon
+    next_loops = numpy.arange(int(polygons_sizes.sum())) + 1
+    non_empty = polygons_sizes > 0
+    next_loops[(first_loops + polygons_sizes - 1)[non_empty]] = first_loops[non_empty]
+
+    return loops_polygons, next_loops
+
+
+####################################################################################################
+# @get_half_edges
+####################################################################################################
+def get_half_edges(arrays):
+    """Returns the directed edges of the polygons of a mesh, a half-edge per loop.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A tuple (starts, ends, polygons) of the first vertices, the second vertices and the
+        polygons of the half-edges.
+    """
+
+    loops_polygons, next_loops = get_polygons_loops(arrays['polygons_sizes'])
+    polygons_vertices = arrays['polygons_vertices']
+    return polygons_vertices, polygons_vertices[next_loops], loops_polygons
+
+
+####################################################################################################
+# @get_edges
+####################################################################################################
+def get_edges(starts,
+              ends,
+              number_vertices):
+    """Groups the half-edges of a mesh into undirected edges.
+
+    :param starts:
+        The first vertices of the half-edges.
+    :param ends:
+        The second vertices of the half-edges.
+    :param number_vertices:
+        The number of vertices of the mesh.
+    :return:
+        A tuple (keys, inverse, counts) of the keys of the edges, the edge of every half-edge and
+        the number of half-edges of every edge.
+    """
+
+    keys = numpy.minimum(starts, ends).astype(numpy.int64) * max(number_vertices, 1) + \
+        numpy.maximum(starts, ends)
+    return numpy.unique(keys, return_inverse=True, return_counts=True)
+
+
+####################################################################################################
+# @get_fan_triangles
+####################################################################################################
+def get_fan_triangles(arrays):
+    """Triangulates the polygons of a mesh as fans, to compute areas and volumes.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A tuple (triangles, polygons) of the vertices of the triangles and their polygons.
+    """
+
+    polygons_sizes = numpy.asarray(arrays['polygons_sizes'], dtype=numpy.int64)
+    first_loops = numpy.cumsum(polygons_sizes) - polygons_sizes
+
+    # The k-th triangle of a polygon uses the loops 0, k+1, k+2
+    triangles_per_polygon = numpy.maximum(polygons_sizes - 2, 0)
+    polygons = numpy.repeat(numpy.arange(len(polygons_sizes)), triangles_per_polygon)
+    first_triangles = numpy.cumsum(triangles_per_polygon) - triangles_per_polygon
+    k = numpy.arange(int(triangles_per_polygon.sum())) - first_triangles[polygons]
+    first = first_loops[polygons]
+    polygons_vertices = arrays['polygons_vertices']
+    triangles = numpy.stack([polygons_vertices[first],
+                             polygons_vertices[first + k + 1],
+                             polygons_vertices[first + k + 2]], axis=1)
+    return triangles, polygons
+
+
+####################################################################################################
+# @get_boundary_loops
+####################################################################################################
+def get_boundary_loops(arrays):
+    """Finds the closed loops of the boundary edges of a mesh, i.e. its holes.
+
+    Every loop starts along the direction of a boundary half-edge, so a polygon with the reversed
+    loop closes the hole with the orientation of the polygon next to that half-edge.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A tuple (loops, loops_polygons) of a list of arrays of the vertices of the loops and the
+        list of the polygons next to every loop.
+    """
+
+    starts, ends, polygons = get_half_edges(arrays)
+    _, inverse, counts = get_edges(starts, ends, len(arrays['vertices']))
+
+    # The boundary half-edges have no twin
+    boundary = counts[inverse] == 1
+    boundary_starts = starts[boundary].tolist()
+    boundary_ends = ends[boundary].tolist()
+    boundary_polygons = polygons[boundary].tolist()
+
+    # The boundary edges of every vertex, the loops are walked without relying on the orientation
+    # of the polygons, which may be inconsistent
+    incident = dict()
+    for i, (start, end) in enumerate(zip(boundary_starts, boundary_ends)):
+        incident.setdefault(start, list()).append(i)
+        incident.setdefault(end, list()).append(i)
+
+    # Walk along the boundary edges
+    used = [False] * len(boundary_starts)
+    loops = list()
+    loops_polygons = list()
+    for i in range(len(boundary_starts)):
+        if used[i]:
+            continue
+        used[i] = True
+        loop = [boundary_starts[i]]
+        vertex = boundary_ends[i]
+        while vertex != loop[0]:
+            candidates = [j for j in incident[vertex] if not used[j]]
+            if not candidates:
+                break
+            used[candidates[0]] = True
+            loop.append(vertex)
+            vertex = boundary_starts[candidates[0]] if boundary_ends[candidates[0]] == vertex \
+                else boundary_ends[candidates[0]]
+
+        # Only the closed loops are holes
+        if vertex == loop[0] and len(loop) > 2:
+            loops.append(numpy.array(loop, dtype=numpy.int64))
+            loops_polygons.append(boundary_polygons[i])
+
+    return loops, loops_polygons
+
+
+####################################################################################################
+# @cap_boundary_loops
+####################################################################################################
+def cap_boundary_loops(arrays):
+    """Closes the holes of a mesh with a polygon per boundary loop, as the edge_face_add operator
+    does, without going through the edit mode. Every cap takes the material and the shading of a
+    polygon next to it.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A tuple (arrays, number_caps) of the arrays of the capped mesh and the number of caps.
+    """
+
+    loops, loops_polygons = get_boundary_loops(arrays)
+    if not loops:
+        return arrays, 0
+
+    # The caps, with the reversed loops
+    caps = dict(arrays)
+    caps['polygons_sizes'] = numpy.concatenate(
+        [arrays['polygons_sizes'], [len(loop) for loop in loops]]).astype(numpy.int64)
+    caps['polygons_vertices'] = numpy.concatenate(
+        [arrays['polygons_vertices']] + [loop[::-1] for loop in loops]).astype(numpy.int64)
+    caps['material_indices'] = numpy.concatenate(
+        [arrays['material_indices'], arrays['material_indices'][loops_polygons]])
+    caps['smooth'] = numpy.concatenate([arrays['smooth'], arrays['smooth'][loops_polygons]])
+
+    return caps, len(loops)
+
+
+####################################################################################################
+# @remove_polygons
+####################################################################################################
+def remove_polygons(arrays,
+                    removed_polygons):
+    """Removes a set of polygons from a mesh, the vertices are kept.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :param removed_polygons:
+        A boolean mask of the removed polygons.
+    :return:
+        The arrays of the mesh without the polygons.
+    """
+
+    loops_polygons, _ = get_polygons_loops(arrays['polygons_sizes'])
+    kept = ~numpy.asarray(removed_polygons, dtype=numpy.bool_)
+
+    result = dict(arrays)
+    result['polygons_sizes'] = arrays['polygons_sizes'][kept]
+    result['polygons_vertices'] = arrays['polygons_vertices'][kept[loops_polygons]]
+    result['material_indices'] = arrays['material_indices'][kept]
+    result['smooth'] = arrays['smooth'][kept]
+    return result
+
+
+####################################################################################################
+# @remove_unused_vertices
+####################################################################################################
+def remove_unused_vertices(arrays):
+    """Removes the vertices that are not used by any polygon, the order of the others is kept.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        The arrays of the mesh without the unused vertices.
+    """
+
+    used = numpy.zeros(len(arrays['vertices']), dtype=numpy.bool_)
+    used[arrays['polygons_vertices']] = True
+    new_indices = numpy.cumsum(used) - 1
+
+    result = dict(arrays)
+    result['vertices'] = arrays['vertices'][used]
+    result['polygons_vertices'] = new_indices[arrays['polygons_vertices']]
+    return result
+
+
+####################################################################################################
+# @get_close_vertices_pairs
+####################################################################################################
+def get_close_vertices_pairs(vertices,
+                             distance):
+    """Returns the pairs of vertices that are closer than a given distance to each other.
+
+    The vertices are hashed into grids of cells that are three times the distance in size, and
+    shifted by half a cell along each axis. Two vertices within the distance fall in the same cell
+    of at least one of the eight grids, so only the vertices that share a cell are compared, with
+    their actual distance.
+
+    :param vertices:
+        An array of the coordinates of the vertices.
+    :param distance:
+        The maximum distance between two vertices of a pair.
+    :return:
+        A tuple (first, second) of the arrays of the indices of the vertices of the pairs.
+    """
+
+    first = [numpy.zeros(0, dtype=numpy.int64)]
+    second = [numpy.zeros(0, dtype=numpy.int64)]
+    cell_size = 3.0 * distance
+    for shift in numpy.ndindex(2, 2, 2):
+
+        # Hash the vertices into the cells of the shifted grid, and sort them cell by cell. The
+        # cells that collide in the hash are only compared in vain, since the distances are checked
+        keys = numpy.floor(
+            (vertices + numpy.array(shift) * 0.5 * cell_size) / cell_size).astype(numpy.int64)
+        hashes = (keys[:, 0] * 73856093) ^ (keys[:, 1] * 19349663) ^ (keys[:, 2] * 83492791)
+        order = numpy.argsort(hashes)
+        sorted_hashes = hashes[order]
+        same_cell = sorted_hashes[1:] == sorted_hashes[:-1]
+
+        # Compare every vertex with the following vertices of its cell
+        offset = 1
+        candidates = numpy.nonzero(same_cell)[0]
+        while len(candidates) > 0:
+            pairs_first = order[candidates]
+            pairs_second = order[candidates + offset]
+            close = numpy.sum((vertices[pairs_first] - vertices[pairs_second]) ** 2, axis=1) <= \
+                distance * distance
+            first.append(pairs_first[close])
+            second.append(pairs_second[close])
+
+            # The vertices that have another vertex in their cell after the next one
+            offset += 1
+            candidates = candidates[candidates + offset - 1 < len(same_cell)]
+            candidates = candidates[same_cell[candidates + offset - 1]]
+
+    return numpy.concatenate(first), numpy.concatenate(second)
+
+
+####################################################################################################
+# @weld_vertices
+####################################################################################################
+def weld_vertices(arrays,
+                  distance=0.0001):
+    """Welds the vertices of a mesh that are closer than a given distance to each other, like the
+    remove_doubles operator, and removes the polygons that collapse.
+
+    The close vertices are chained into groups, every group of welded vertices is replaced by its
+    first vertex, the repeated consecutive vertices of the polygons are removed, and the polygons
+    with less than three vertices, or that still visit a vertex twice, like [a, b, a, c], are
+    deleted.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :param distance:
+        The merging distance, by default the same as the edit mode.
+    :return:
+        A tuple (arrays, number_welded) of the arrays of the welded mesh and the number of
+        removed vertices.
+    """
+
+    vertices = arrays['vertices']
+    if len(vertices) == 0:
+        return arrays, 0
+
+    # The pairs of the vertices that must be welded
+    first, second = get_close_vertices_pairs(vertices, distance)
+    if len(first) == 0:
+        return arrays, 0
+
+    # Chain the pairs into groups, every vertex is labeled with the first vertex of its group
+    welded = numpy.arange(len(vertices))
+    while True:
+        labels = numpy.minimum(welded[first], welded[second])
+        updated = welded.copy()
+        numpy.minimum.at(updated, first, labels)
+        numpy.minimum.at(updated, second, labels)
+        updated = updated[updated]
+        if numpy.array_equal(updated, welded):
+            break
+        welded = updated
+    number_welded = len(vertices) - int(numpy.count_nonzero(welded == numpy.arange(len(vertices))))
+    if number_welded == 0:
+        return arrays, 0
+
+    # Remove the repeated consecutive vertices of the polygons
+    polygons_vertices = welded[arrays['polygons_vertices']]
+    loops_polygons, next_loops = get_polygons_loops(arrays['polygons_sizes'])
+    kept_loops = polygons_vertices != polygons_vertices[next_loops]
+    polygons_sizes = numpy.bincount(
+        loops_polygons[kept_loops], minlength=len(arrays['polygons_sizes']))
+
+    result = dict(arrays)
+    result['polygons_sizes'] = polygons_sizes
+    result['polygons_vertices'] = polygons_vertices[kept_loops]
+
+    # The polygons that visit a vertex more than once, found as repeated (polygon, vertex) keys
+    loops_polygons = loops_polygons[kept_loops]
+    keys = numpy.sort(loops_polygons * len(vertices) + result['polygons_vertices'])
+    repeated = numpy.zeros(len(polygons_sizes), dtype=numpy.bool_)
+    repeated[keys[1:][keys[1:] == keys[:-1]] // len(vertices)] = True
+
+    # Remove the degenerate polygons and the vertices that are not used anymore
+    result = remove_polygons(result, (polygons_sizes < 3) | repeated)
+    result = remove_unused_vertices(result)
+
+    return result, number_welded
+
+
+####################################################################################################
+# @orient_polygons_consistently
+####################################################################################################
+def orient_polygons_consistently(arrays):
+    """Orients the polygons of every connected component of a mesh consistently with each other
+    and outwards, like the normals_make_consistent operator.
+
+    The orientation is propagated across the manifold edges, where the two polygons must traverse
+    the edge in opposite directions, and every closed component is flipped if its signed volume is
+    negative.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A tuple (arrays, number_flipped) of the arrays of the oriented mesh and the number of
+        flipped polygons.
+    """
+
+    number_polygons = len(arrays['polygons_sizes'])
+    if number_polygons == 0:
+        return arrays, 0
+
+    # The pairs of polygons across the manifold edges, and if they must be flipped relatively
+    starts, ends, polygons = get_half_edges(arrays)
+    _, inverse, counts = get_edges(starts, ends, len(arrays['vertices']))
+    manifold = numpy.nonzero(counts[inverse] == 2)[0]
+    manifold = manifold[numpy.argsort(inverse[manifold], kind='mergesort')]
+    first, second = manifold[0::2], manifold[1::2]
+    parities = (starts[first] == starts[second]).astype(numpy.int8)
+
+    # The adjacency of the polygons, in a compressed format
+    sources = numpy.concatenate([polygons[first], polygons[second]])
+    targets = numpy.concatenate([polygons[second], polygons[first]])
+    parities = numpy.concatenate([parities, parities])
+    order = numpy.argsort(sources, kind='mergesort')
+    targets = targets[order].tolist()
+    parities = parities[order].tolist()
+    offsets = numpy.searchsorted(sources[order], numpy.arange(number_polygons + 1)).tolist()
+
+    # Propagate the orientation component by component
+    flips = [0] * number_polygons
+    components = [-1] * number_polygons
+    number_components = 0
+    for seed in range(number_polygons):
+        if components[seed] >= 0:
+            continue
+        components[seed] = number_components
+        stack = [seed]
+        while stack:
+            polygon = stack.pop()
+            for k in range(offsets[polygon], offsets[polygon + 1]):
+                neighbour = targets[k]
+                if components[neighbour] < 0:
+                    components[neighbour] = number_components
+                    flips[neighbour] = flips[polygon] ^ parities[k]
+                    stack.append(neighbour)
+        number_components += 1
+    flips = numpy.array(flips, dtype=numpy.bool_)
+    components = numpy.array(components, dtype=numpy.int64)
+
+    # The signed volume of every component, with the propagated orientation
+    triangles, triangles_polygons = get_fan_triangles(arrays)
+    vertices = arrays['vertices']
+    volumes = numpy.einsum('ij,ij->i', vertices[triangles[:, 0]], numpy.cross(
+        vertices[triangles[:, 1]], vertices[triangles[:, 2]])) / 6.0
+    volumes[flips[triangles_polygons]] *= -1.0
+    components_volumes = numpy.bincount(
+        components[triangles_polygons], weights=volumes, minlength=number_components)
+
+    # Flip the components that point inwards
+    flips ^= components_volumes[components] < 0
+    number_flipped = int(flips.sum())
+    if number_flipped == 0:
+        return arrays, 0
+
+    # Reverse the loops of the flipped polygons
+    polygons_sizes = numpy.asarray(arrays['polygons_sizes'], dtype=numpy.int64)
+    first_loops = numpy.cumsum(polygons_sizes) - polygons_sizes
+    loops_polygons, _ = get_polygons_loops(polygons_sizes)
+    loops = numpy.arange(len(loops_polygons))
+    reversed_loops = 2 * first_loops[loops_polygons] + polygons_sizes[loops_polygons] - 1 - loops
+    result = dict(arrays)
+    result['polygons_vertices'] = arrays['polygons_vertices'][
+        numpy.where(flips[loops_polygons], reversed_loops, loops)]
+
+    return result, number_flipped
+
+
+####################################################################################################
+# @get_mesh_topology_statistics
+####################################################################################################
+def get_mesh_topology_statistics(arrays):
+    """Computes the manifold and watertightness statistics of a mesh.
+
+    :param arrays:
+        A dictionary of the arrays of the mesh.
+    :return:
+        A dictionary of the statistics of the mesh.
+    """
+
+    number_vertices = len(arrays['vertices'])
+    number_polygons = len(arrays['polygons_sizes'])
+
+    # The edges and the number of polygons of every edge
+    starts, ends, _ = get_half_edges(arrays)
+    _, inverse, counts = get_edges(starts, ends, number_vertices)
+
+    # The manifold edges whose polygons traverse them in the same direction
+    manifold = numpy.nonzero(counts[inverse] == 2)[0]
+    manifold = manifold[numpy.argsort(inverse[manifold], kind='mergesort')]
+    inconsistent_edges = int(numpy.count_nonzero(starts[manifold[0::2]] == starts[manifold[1::2]]))
+
+    # The unused vertices and the degenerate polygons
+    used = numpy.zeros(number_vertices, dtype=numpy.bool_)
+    used[arrays['polygons_vertices']] = True
+
+    # The area and the signed volume
+    triangles, _ = get_fan_triangles(arrays)
+    vertices = arrays['vertices']
+    v0, v1, v2 = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    area = 0.5 * numpy.linalg.norm(numpy.cross(v1 - v0, v2 - v0), axis=1).sum()
+    volume = numpy.einsum('ij,ij->i', v0, numpy.cross(v1, v2)).sum() / 6.0
+
+    boundary_edges = int(numpy.count_nonzero(counts == 1))
+    non_manifold_edges = int(numpy.count_nonzero(counts > 2))
+    return {'vertices': number_vertices,
+            'edges': len(counts),
+            'polygons': number_polygons,
+            'boundary_edges': boundary_edges,
+            'boundary_loops': len(get_boundary_loops(arrays)[0]) if boundary_edges > 0 else 0,
+            'non_manifold_edges': non_manifold_edges,
+            'inconsistent_edges': inconsistent_edges,
+            'unused_vertices': int(number_vertices - used.sum()),
+            'degenerate_polygons': int(numpy.count_nonzero(arrays['polygons_sizes'] < 3)),
+            'euler_characteristic': number_vertices - len(counts) + number_polygons,
+            'manifold': non_manifold_edges == 0,
+            'watertight': boundary_edges == 0 and non_manifold_edges == 0,
+            'consistent': inconsistent_edges == 0,
+            'area': float(area),
+            'volume': float(volume)}
+
+
+####################################################################################################
+# @repair_mesh_topology
+####################################################################################################
+def repair_mesh_topology(mesh_object,
+                         distance=0.0001,
+                         close_holes=True,
+                         orient_polygons=True):
+    """Welds the duplicate vertices of a mesh object, caps its holes and orients its polygons
+    consistently, reading and writing the mesh only once.
+
+    :param mesh_object:
+        A given mesh object.
+    :param distance:
+        The distance used to weld the vertices, zero to keep them.
+    :param close_holes:
+        Cap the boundary loops of the mesh.
+    :param orient_polygons:
+        Orient the polygons consistently and outwards.
+    :return:
+        The topology statistics of the repaired mesh.
+    """
+
+    arrays = get_mesh_topology_arrays(mesh_object)
+    modified = False
+
+    # Weld the vertices
+    if distance > 0:
+        arrays, number_welded = weld_vertices(arrays, distance)
+        modified |= number_welded > 0
+
+    # Cap the holes
+    if close_holes:
+        arrays, number_caps = cap_boundary_loops(arrays)
+        modified |= number_caps > 0
+
+    # Orient the polygons
+    if orient_polygons:
+        arrays, number_flipped = orient_polygons_consistently(arrays)
+        modified |= number_flipped > 0
+
+    # Write the mesh back only if it has changed
+    if modified:
+        set_mesh_topology_arrays(mesh_object, arrays)
+
+    # Return the statistics of the repaired mesh
+    return get_mesh_topology_statistics(arrays)
+
+
+####################################################################################################
+# @report_mesh_topology
+####################################################################################################
+def report_mesh_topology(mesh_object,
+                         statistics=None):
+    """Logs the quality report of the topology of a mesh object.
+
+    :param mesh_object:
+        A given mesh object.
+    :param statistics:
+        The statistics of the mesh if they are already computed.
+    :return:
+        The topology statistics of the mesh.
+    """
+
+    if statistics is None:
+        statistics = get_mesh_topology_statistics(get_mesh_topology_arrays(mesh_object))
+
+    nmv.logger.info('Mesh [%s]: Vertices [%d], Polygons [%d], Euler [%d], %s, %s, %s' % (
+        mesh_object.name, statistics['vertices'], statistics['polygons'],
+        statistics['euler_characteristic'],
+        'Watertight' if statistics['watertight'] else
+        'Open [%d boundary edges, %d holes]' % (statistics['boundary_edges'],
+                                                statistics['boundary_loops']),
+        'Manifold' if statistics['manifold'] else
+        'Non-manifold [%d edges]' % statistics['non_manifold_edges'],
+        'Consistent' if statistics['consistent'] else
+        'Inconsistent [%d edges]' % statistics['inconsistent_edges']))
+
+    return statistics
@@ -0,0 +1,245 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+import bpy, bmesh
+from mathutils import bvhtree
+
+# Internal imports
+import nmv
+import nmv.scene
+
+
+####################################################################################################
+# @get_mesh_object_world_bounding_box
+####################################################################################################
+def get_mesh_object_world_bounding_box(mesh_object):
+    """Computes the axis-aligned bounding box of a mesh object in the world coordinates.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A tuple of two arrays (p_min, p_max), or None if the mesh has no vertices.
+    """
+
+    # Get the vertices in bulk
+    number_vertices = len(mesh_object.data.vertices)
+    if number_vertices == 0:
+        return None
+    vertices = numpy.zeros(number_vertices * 3, dtype=numpy.float64)
+    mesh_object.data.vertices.foreach_get('co', vertices)
+    vertices = vertices.reshape(-1, 3)
+
+    # Transform the vertices to the world coordinates
+    matrix = numpy.array(mesh_object.matrix_world, dtype=numpy.float64)
+    vertices = vertices.dot(matrix[:3, :3].T) + matrix[:3, 3]
+
+    # Return the bounding box
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+####################################################################################################
+# @create_mesh_object_bvh_tree
+####################################################################################################
+def create_mesh_object_bvh_tree(mesh_object):
+    """Creates a BVH tree of a mesh object in the world coordinates.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        A BVH tree of the faces of the mesh.
+    """
+
+    # Create a bmesh from the mesh and transform it to the world coordinates
+    mesh_bmesh = bmesh.new()
+    mesh_bmesh.from_mesh(mesh_object.data)
+    mesh_bmesh.transform(mesh_object.matrix_world)
+
+    # Build the tree
+    tree = bvhtree.BVHTree.FromBMesh(mesh_bmesh)
+    mesh_bmesh.free()
+
+    # Return the tree
+    return tree
+
+
+####################################################################################################
+# @find_overlapping_mesh_objects
+####################################################################################################
+def find_overlapping_mesh_objects(mesh_objects):
+    """Groups a list of mesh objects into sets of objects that overlap each other.
+
+    The candidate pairs are found with a sweep over the bounding boxes along the x-axis, and only
+    the pairs with intersecting bounding boxes are tested with BVH trees. Two objects belong to the
+    same group if they are connected with a chain of overlapping objects. The objects of different
+    groups do not overlap, and they can be simply joined without a boolean operator.
+
+    :param mesh_objects:
+        A list of mesh objects.
+    :return:
+        A list of groups, each group is a list of indices of the objects ordered with a
+        breadth-first traversal of the overlaps, so that consecutive objects tend to overlap. The
+        groups are sorted by their first index, and the first index of each group is its smallest.
+    """
+
+    # Number of objects
+    number_objects = len(mesh_objects)
+
+    # Bounding boxes, the empty meshes get an empty box that does not overlap anything
+    p_min = numpy.full((number_objects, 3), numpy.inf)
+    p_max = numpy.full((number_objects, 3), -numpy.inf)
+    for i, mesh_object in enumerate(mesh_objects):
+        bounding_box = get_mesh_object_world_bounding_box(mesh_object)
+        if bounding_box is not None:
+            p_min[i], p_max[i] = bounding_box
+
+    # The BVH trees are only built for the objects that have candidate pairs
+    bvh_trees = dict()
+
+    # The overlaps graph
+    neighbours = [list() for _ in range(number_objects)]
+
+    # Sweep along the x-axis
+    order = numpy.argsort(p_min[:, 0])
+    for n, i in enumerate(order):
+        for j in order[n + 1:]:
+
+            # All the next boxes start after the end of this box
+            if p_min[j, 0] > p_max[i, 0]:
+                break
+
+            # The boxes do not intersect along y or z
+            if numpy.any(p_min[j] > p_max[i]) or numpy.any(p_min[i] > p_max[j]):
+                continue
+
+            # Test the faces
+            for k in (i, j):
+                if k not in bvh_trees:
+                    bvh_trees[k] = create_mesh_object_bvh_tree(mesh_objects[k])
+            if len(bvh_trees[i].overlap(bvh_trees[j])) > 0:
+                neighbours[i].append(int(j))
+                neighbours[j].append(int(i))
+
+    # Connected components with a breadth-first traversal
+    groups = list()
+    visited = [False] * number_objects
+    for i in range(number_objects):
+        if visited[i]:
+            continue
+        visited[i] = True
+        group = [i]
+        n = 0
+        while n < len(group):
+            for j in sorted(neighbours[group[n]]):
+                if not visited[j]:
+                    visited[j] = True
+                    group.append(j)
+            n += 1
+        groups.append(group)
+
+    # Return the groups
+    return groups
+
+
+####################################################################################################
+# @apply_boolean_union
+####################################################################################################
+def apply_boolean_union(mesh_object_1,
+                        mesh_object_2):
+    """Applies a boolean union of the second mesh object to the first one, and deletes the second.
+
+    Unlike union_mesh_objects, the modifier is applied through the data API, so this function does
+    not change the selection or the active object of the scene.
+
+    :param mesh_object_1:
+        A reference to the first mesh object that will contain the union.
+    :param mesh_object_2:
+        A reference to the second mesh object, deleted after the union.
+    :return:
+        A reference to the first mesh object.
+    """
+
+    # Add a boolean modifier
+    modifier = mesh_object_1.modifiers.new(name='Boolean', type='BOOLEAN')
+    modifier.object = mesh_object_2
+    modifier.operation = 'UNION'
+
+    # Evaluate the modifier into a new mesh data
+    union_mesh = mesh_object_1.to_mesh(bpy.context.scene, True, 'PREVIEW')
+    mesh_object_1.modifiers.remove(modifier)
+
+    # Replace the data of the first object
+    old_mesh = mesh_object_1.data
+    mesh_object_1.data = union_mesh
+    union_mesh.name = old_mesh.name
+    nmv.scene.ops.remove_orphan_data([old_mesh])
+
+    # Delete the second object
+    nmv.scene.ops.delete_objects([mesh_object_2])
+
+    # Return a reference to the first mesh object
+    return mesh_object_1
+
+
+####################################################################################################
+# @union_mesh_objects_in_tree
+####################################################################################################
+def union_mesh_objects_in_tree(mesh_objects):
+    """Unions a list of mesh objects with a balanced pairwise reduction tree. At each level, the
+    objects are unioned two by two, so every object is involved in log(N) unions of meshes of
+    similar sizes, instead of N unions with an accumulator that keeps growing.
+
+    :param mesh_objects:
+        A list of mesh objects, consecutive objects should preferably overlap.
+    :return:
+        A reference to the first object of the list, that contains the union.
+    """
+
+    # Reduce level by level
+    level = list(mesh_objects)
+    while len(level) > 1:
+        next_level = list()
+        for i in range(0, len(level) - 1, 2):
+            next_level.append(apply_boolean_union(level[i], level[i + 1]))
+
+        # An odd object goes to the next level as is
+        if len(level) % 2 == 1:
+            next_level.append(level[-1])
+        level = next_level
+
+    # Return a reference to the union
+    return level[0]
+
+
+####################################################################################################
+# @clean_union_mesh_object
+####################################################################################################
+def clean_union_mesh_object(mesh_object,
+                            distance=0.0001):
+    """Removes the duplicate vertices of a mesh resulting from union operations and makes its
+    normals consistent, on the arrays of the mesh without going through the edit mode.
+
+    :param mesh_object:
+        A given mesh object.
+    :param distance:
+        The distance used to merge the duplicate vertices, by default the same as the edit mode.
+    """
+
+    nmv.mesh.ops.repair_mesh_topology(mesh_object, distance=distance, close_holes=False)
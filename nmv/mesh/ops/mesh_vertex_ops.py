@@ -23,6 +23,7 @@ from mathutils import Vector, Matrix
 import nmv
 import nmv.scene
 import nmv.mesh
+import nmv.geometry
 
 
 ####################################################################################################
@@ -517,27 +518,12 @@ def get_index_of_nearest_vertex_to_point(mesh_object,
         The index of the nearest vertex in the mesh to the given point.
     """
 
-    # Initialize the nearest face index to -1
-    nearest_vertex_index = -1
+    # Query the spatial index of the vertices of the mesh
+    nearest_vertex_index, _ = nmv.geometry.get_mesh_vertices_spatial_index(
+        mesh_object).find_nearest(point)
 
-    # Initialize the shortest distance to infinity
-    shortest_distance = 10000000000
-
-    # Iterate over all the vertices in the mesh
-    for vertex in mesh_object.data.vertices:
-
-        # Compute the distance between the point and the vertex
-        distance = (vertex.co - point).length
-
-        # Check the distance
-        if distance < shortest_distance:
-
-            # Update
-            shortest_distance = distance
-            nearest_vertex_index = vertex.index
-
-    # Return the nearest vertex index
-    return nearest_vertex_index
+    # Return the nearest vertex index, or -1 if the mesh has no vertices
+    return -1 if nearest_vertex_index is None else nearest_vertex_index
 
 
 ####################################################################################################
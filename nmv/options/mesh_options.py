@@ -55,6 +55,24 @@ class MeshOptions:
         # Meshing technique
         self.meshing_technique = nmv.enums.Meshing.Technique.PIECEWISE_WATERTIGHT
 
+        # Mesh the meta objects with a resolution per part of the neuron, based on its radii
+        self.adaptive_meta_resolution = False
+
+        # The voxel size of the signed distance field meshing, in microns
+        self.sdf_voxel_size = nmv.consts.Meshing.SDF_VOXEL_SIZE
+
+        # The width of the narrow band of the signed distance field, in voxels
+        self.sdf_narrow_band = nmv.consts.Meshing.SDF_NARROW_BAND
+
+        # The radius of the smooth union of the segments in the signed distance field, in microns
+        self.sdf_smoothing = nmv.consts.Meshing.SDF_SMOOTHING
+
+        # The number of threads that build the signed distance field mesh, None for all the cores
+        self.sdf_workers = None
+
+        # The number of background processes that build the arbors, 1 to build them serially
+        self.arbors_workers = 1
+
         # Export in circuit coordinates, by default no unless there is a circuit file given
         self.global_coordinates = False
 
@@ -143,6 +161,12 @@ class MeshOptions:
         # The scale factor used to scale the morphology rendering frame, default 1.0
         self.resolution_scale_factor = 1.0
 
+        # Number of the local processes used to render the 360 sequence, default 1
+        self.rendering_workers = 1
+
+        # Resume the rendering of the 360 sequence from the frames that exist on the disk
+        self.resume_rendering = False
+
         # MESH EXPORT ##############################################################################
         # Save the reconstructed mesh as a .ply file to the output directory
         self.export_ply = False
@@ -155,3 +179,15 @@ class MeshOptions:
 
         # Save the reconstructed mesh as a .blend file to the output directory
         self.export_blend = False
+
+        # Save the reconstructed mesh as a mesh cache .nmc file to the output directory
+        self.export_cache = False
+
+        # Compress the exported .ply, .obj and .stl files with gzip
+        self.compress_exported_meshes = False
+
+        # Export a ladder of decimated levels of detail of the reconstructed mesh
+        self.export_lods = False
+
+        # The decimation ratios of the levels of detail
+        self.lod_ratios = list(nmv.consts.Meshing.LOD_RATIOS)
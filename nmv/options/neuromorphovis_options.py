@@ -72,6 +72,15 @@ class NeuroMorphoVisOptions:
         # Main output directory
         self.io.output_directory = arguments.output_directory
 
+        # Log into a file per process in the logs directory, at the requested level
+        nmv.logger.set_output_directory(arguments.output_directory)
+        nmv.logger.set_level(arguments.log_level)
+
+        # Profile the stages of the reconstruction, if requested
+        nmv.utilities.profiler.configure(enabled=arguments.profile,
+                                         output_directory=arguments.output_directory,
+                                         cprofile=arguments.profile_cprofile)
+
         # Images directory
         self.io.images_directory = '%s/%s' % (arguments.output_directory,
                                               nmv.consts.Paths.IMAGES_FOLDER)
@@ -302,6 +311,18 @@ class NeuroMorphoVisOptions:
         self.mesh.meshing_technique = nmv.enums.Meshing.Technique.get_enum(
             arguments.meshing_algorithm)
 
+        # Adaptive resolution of the meta objects
+        self.mesh.adaptive_meta_resolution = arguments.adaptive_meta_resolution
+
+        # Signed distance field meshing
+        self.mesh.sdf_voxel_size = arguments.sdf_voxel_size
+        self.mesh.sdf_narrow_band = arguments.sdf_narrow_band
+        self.mesh.sdf_smoothing = arguments.sdf_smoothing
+        self.mesh.sdf_workers = arguments.sdf_workers
+
+        # The number of processes that build the arbors
+        self.mesh.arbors_workers = arguments.arbors_workers
+
         # Spines (source)
         self.mesh.spines = nmv.enums.Meshing.Spines.Source.get_enum(arguments.spines)
 
@@ -338,6 +359,12 @@ class NeuroMorphoVisOptions:
         # Resolution scale factor
         self.mesh.resolution_scale_factor = arguments.resolution_scale_factor
 
+        # Number of the local processes used to render the 360 sequence
+        self.mesh.rendering_workers = arguments.rendering_workers
+
+        # Resume the rendering of the 360 sequence
+        self.mesh.resume_rendering = arguments.resume_rendering
+
         # Full view image resolution
         self.mesh.full_view_resolution = arguments.full_view_resolution
 
@@ -382,6 +409,17 @@ class NeuroMorphoVisOptions:
         # Save the reconstructed mesh as a .BLEND file to the meshes directory
         self.mesh.export_blend = arguments.export_neuron_mesh_blend
 
+        # Save the reconstructed mesh as a mesh cache .NMC file to the meshes directory
+        self.mesh.export_cache = arguments.export_neuron_mesh_cache
+
+        # Compress the exported meshes
+        self.mesh.compress_exported_meshes = arguments.compress_meshes
+
+        # Export the levels of detail of the mesh, with the default ratios if not given
+        self.mesh.export_lods = arguments.export_lods or arguments.lod_ratios is not None
+        if arguments.lod_ratios is not None:
+            self.mesh.lod_ratios = [float(ratio) for ratio in arguments.lod_ratios.split(',')]
+
         # Export the reconstructed mesh to the global coordinates of the circuit
         self.mesh.global_coordinates = arguments.global_coordinates
 
@@ -17,6 +17,7 @@
 
 # System imports
 import math
+import numpy
 
 # Blender imports
 import bpy
@@ -216,6 +217,86 @@ class Camera:
         # Return a vector for the camera position for XYZ locations
         return [camera_location_x, camera_location_y, camera_location_z]
 
+    ################################################################################################
+    # @get_projected_sizes
+    ################################################################################################
+    @staticmethod
+    def get_projected_sizes(bounding_box,
+                            centers,
+                            radii,
+                            camera_view=nmv.enums.Camera.View.FRONT,
+                            camera_projection=nmv.enums.Camera.Projection.ORTHOGRAPHIC,
+                            image_resolution=512,
+                            fov=45):
+        """Computes the projected diameters, in pixels, of a list of bounding spheres in the image
+        of a camera that would be created by render_scene for the bounding box, without creating
+        the camera, to select the detail of the objects before they are loaded.
+
+        :param bounding_box:
+            The bounding box that is rendered.
+        :param centers:
+            An array of the centers of the spheres.
+        :param radii:
+            An array of the radii of the spheres.
+        :param camera_view:
+            The view of the camera: TOP, FRONT, or SIDE, by default FRONT.
+        :param camera_projection:
+            Camera projection either orthographic or perspective.
+        :param image_resolution:
+            The 'base' resolution of the image, by default 512.
+        :param fov:
+            Camera field of view of the perspective projection, by default 45 degrees.
+        :return:
+            An array of the projected diameters of the spheres in pixels, zero for the spheres
+            outside the view frustum.
+        """
+
+        centers = numpy.array(centers, dtype=numpy.float64).reshape(-1, 3)
+        radii = numpy.array(radii, dtype=numpy.float64)
+        bounds = bounding_box.bounds
+
+        # The axes of the image, the depth axis and the location of the camera as in
+        # setup_camera_for_scene
+        if camera_projection == nmv.enums.Camera.Projection.PERSPECTIVE:
+            camera_locations = Camera.get_camera_positions_for_perspective_projection(
+                bounding_box=bounding_box, fov=fov)
+        else:
+            camera_locations = Camera.get_camera_positions(bounding_box=bounding_box)
+        if camera_view == nmv.enums.Camera.View.SIDE:
+            u, v, w = 2, 1, 0
+        elif camera_view == nmv.enums.Camera.View.TOP:
+            u, v, w = 0, 2, 1
+        else:
+            u, v, w = 0, 1, 2
+        location = numpy.array(camera_locations[w])
+
+        # The extent of the image and its size in pixels as in update_camera_resolution
+        extent = numpy.array([bounds[u], bounds[v]])
+        orthographic_scale = max(extent.max(), 1e-6)
+        image_size = 2.0 * image_resolution
+
+        # The offsets of the spheres from the axis of the camera
+        offsets = numpy.abs(centers[:, [u, v]] - location[[u, v]]) - radii[:, None]
+
+        # Orthographic projection, the scale is fixed
+        if camera_projection != nmv.enums.Camera.Projection.PERSPECTIVE:
+            visible = numpy.all(offsets <= 0.5 * extent, axis=1)
+            sizes = 2.0 * radii * image_size / orthographic_scale
+
+        # Perspective projection, the scale decreases with the depth, and the spheres around the
+        # camera fill the image
+        else:
+            tangent = math.tan(math.radians(0.5 * fov))
+            depths = location[w] - centers[:, w]
+            half_extents = depths[:, None] * tangent * extent / orthographic_scale
+            visible = (depths + radii > 0) & numpy.all(offsets <= half_extents, axis=1)
+            sizes = numpy.where(depths > radii,
+                                radii * image_size / (numpy.maximum(depths, 1e-6) * tangent),
+                                image_size)
+
+        # Return the sizes of the visible spheres
+        return numpy.where(visible, sizes, 0.0)
+
     ################################################################################################
     # @update_camera_resolution
     ################################################################################################
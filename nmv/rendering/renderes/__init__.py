@@ -19,3 +19,4 @@ from .renderer import *
 from .soma_renderer import *
 from .skeleton_renderer import *
 from .mesh_renderer import *
+from .sequence_renderer import *
@@ -0,0 +1,352 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import subprocess
+
+# Blender imports
+import bpy
+
+# Internal imports
+import nmv
+import nmv.enums
+import nmv.file
+import nmv.rendering
+import nmv.scene
+
+
+####################################################################################################
+# @SequenceRenderer
+####################################################################################################
+class SequenceRenderer:
+    """Renders a rotating sequence (for example 360 frames) as a single animation job.
+
+    The camera and the render settings are created once for the whole sequence, the rotation of the
+    objects is keyframed and the frames are rendered with bpy.ops.render.render(animation=True).
+    The frame range can be split across several local Blender processes, and the rendering can be
+    resumed from the frames that already exist on the disk.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 name='SequenceCamera'):
+        """Constructor
+
+        :param name:
+            The name of the camera used to render the sequence.
+        """
+
+        # The camera, created once for the whole sequence
+        self.camera = nmv.rendering.Camera(name)
+
+        # The objects that have their rotation keyframed, with their rotations around the y-axis
+        # before the sequence, as (object, rotation) tuples
+        self.animated_objects = list()
+
+    ################################################################################################
+    # @setup_camera
+    ################################################################################################
+    def setup_camera(self,
+                     bounding_box,
+                     camera_view=nmv.enums.Camera.View.FRONT_360,
+                     image_resolution=512,
+                     image_scale_factor=None):
+        """Creates the camera and adjusts the render settings once for the whole sequence.
+
+        :param bounding_box:
+            The bounding box of the view requested to be rendered.
+        :param camera_view:
+            The view of the camera, by default FRONT_360.
+        :param image_resolution:
+            The resolution of the image, by default 512. Ignored if a scale factor is given.
+        :param image_scale_factor:
+            If given, the frames are rendered to scale with this factor.
+        """
+
+        # Setup the camera
+        self.camera.setup_camera_for_scene(bounding_box, camera_view)
+
+        # Update the camera resolution
+        if image_scale_factor is None:
+            self.camera.update_camera_resolution(
+                resolution=image_resolution, camera_view=camera_view, bounds=bounding_box.bounds)
+        else:
+            self.camera.update_camera_resolution_to_scale(
+                scale_factor=image_scale_factor, camera_view=camera_view,
+                bounds=bounding_box.bounds)
+
+        # Activate the camera for rendering
+        self.camera.set_active()
+
+        # Use the cycles engine
+        bpy.context.scene.render.engine = 'CYCLES'
+
+        # The frames are written as .PNG images
+        bpy.context.scene.render.image_settings.file_format = 'PNG'
+        bpy.context.scene.render.use_file_extension = True
+
+        # Never overwrite the frames that are already rendered, and reserve each frame with a
+        # placeholder before rendering it, this allows the workers to share the same frame range
+        bpy.context.scene.render.use_overwrite = False
+        bpy.context.scene.render.use_placeholder = True
+
+        # Deselect all the object in the scene
+        nmv.scene.ops.deselect_all()
+
+    ################################################################################################
+    # @keyframe_rotation
+    ################################################################################################
+    def keyframe_rotation(self,
+                          scene_objects,
+                          frame_start=0,
+                          frame_end=359):
+        """Keyframes the rotation of the given objects around the y-axis, one degree per frame, as
+        if they are a single object.
+
+        :param scene_objects:
+            A list of the objects to be rotated.
+        :param frame_start:
+            The first frame of the sequence, rendered at angle zero.
+        :param frame_end:
+            The last frame of the sequence.
+        """
+
+        for scene_object in scene_objects:
+
+            # Keep a reference to the object and its original rotation to restore them later, an
+            # object that is keyframed again keeps the rotation it had before the first sequence
+            if scene_object not in [animated[0] for animated in self.animated_objects]:
+                self.animated_objects.append((scene_object, scene_object.rotation_euler[1]))
+
+            # A keyframe for each angle, to get exactly the same angles of a frame by frame rendering
+            for frame in range(frame_start, frame_end + 1):
+                scene_object.rotation_euler[1] = (frame - frame_start) * 2 * 3.14 / 360.0
+                scene_object.keyframe_insert(data_path='rotation_euler', index=1, frame=frame)
+
+        # Update the frame range of the scene
+        bpy.context.scene.frame_start = frame_start
+        bpy.context.scene.frame_end = frame_end
+
+    ################################################################################################
+    # @get_frame_path
+    ################################################################################################
+    @staticmethod
+    def get_frame_path(output_directory,
+                       frame):
+        """Returns the path of a given frame in the output directory.
+
+        :param output_directory:
+            The directory of the sequence.
+        :param frame:
+            The frame number.
+        :return:
+            The path of the .PNG image of the frame.
+        """
+
+        return '%s/%s.png' % (output_directory, '{0:05d}'.format(frame))
+
+    ################################################################################################
+    # @get_missing_frames
+    ################################################################################################
+    @staticmethod
+    def get_missing_frames(output_directory,
+                           frame_start,
+                           frame_end):
+        """Returns the frames of a given range that are not rendered yet.
+
+        The empty placeholders that were left by an interrupted rendering are removed, so that
+        these frames are rendered again.
+
+        :param output_directory:
+            The directory of the sequence.
+        :param frame_start:
+            The first frame of the range.
+        :param frame_end:
+            The last frame of the range.
+        :return:
+            A list of the missing frames.
+        """
+
+        missing_frames = list()
+        for frame in range(frame_start, frame_end + 1):
+            frame_path = SequenceRenderer.get_frame_path(output_directory, frame)
+
+            # The frame exists and is not a placeholder
+            if os.path.isfile(frame_path) and os.path.getsize(frame_path) > 0:
+                continue
+
+            # Remove the placeholder
+            if os.path.isfile(frame_path):
+                os.remove(frame_path)
+            missing_frames.append(frame)
+
+        # Return the list
+        return missing_frames
+
+    ################################################################################################
+    # @split_frame_range
+    ################################################################################################
+    @staticmethod
+    def split_frame_range(frames,
+                          number_workers):
+        """Splits a list of frames into contiguous ranges, at most one range per worker.
+
+        :param frames:
+            A sorted list of the frames to be rendered.
+        :param number_workers:
+            Number of the worker processes.
+        :return:
+            A list of (frame_start, frame_end) tuples.
+        """
+
+        # No frames to render
+        if len(frames) == 0:
+            return list()
+
+        # Split the frames into chunks of equal sizes
+        number_workers = max(1, min(number_workers, len(frames)))
+        chunk_size = (len(frames) + number_workers - 1) // number_workers
+
+        # Each chunk is rendered as a single range, the already rendered frames in between are
+        # skipped by Blender since the overwriting is disabled
+        return [(frames[i], frames[min(i + chunk_size, len(frames)) - 1])
+                for i in range(0, len(frames), chunk_size)]
+
+    ################################################################################################
+    # @render_sequence
+    ################################################################################################
+    def render_sequence(self,
+                        output_directory,
+                        frame_start=0,
+                        frame_end=359,
+                        number_workers=1,
+                        resume=False):
+        """Renders the frames of the sequence to an output directory as a single animation job.
+
+        :param output_directory:
+            The directory where the frames will be written, as 00000.png, 00001.png, etc.
+        :param frame_start:
+            The first frame of the sequence.
+        :param frame_end:
+            The last frame of the sequence.
+        :param number_workers:
+            Number of the local Blender processes used to render the sequence. If one, the
+            sequence is rendered in the current process.
+        :param resume:
+            If True, the frames that already exist in the output directory are not rendered again,
+            otherwise the directory is cleaned before the rendering.
+        """
+
+        # Prepare the output directory
+        if resume and os.path.isdir(output_directory):
+            frames = self.get_missing_frames(output_directory, frame_start, frame_end)
+            nmv.logger.info('Resuming the sequence, [%d] frames are already rendered' %
+                            (frame_end - frame_start + 1 - len(frames)))
+        else:
+            nmv.file.ops.clean_and_create_directory(output_directory)
+            frames = list(range(frame_start, frame_end + 1))
+
+        # Nothing to render
+        if len(frames) == 0:
+            return
+
+        # The output path, the frame number replaces the '#' characters
+        output_path = '%s/#####' % output_directory
+        bpy.context.scene.render.filepath = output_path
+
+        # Render the sequence in this process
+        if number_workers < 2:
+            bpy.context.scene.frame_start = frames[0]
+            bpy.context.scene.frame_end = frames[-1]
+            bpy.ops.render.render(animation=True)
+
+        # Split the sequence across several local processes
+        else:
+            self.render_sequence_with_workers(output_directory, output_path, frames, number_workers)
+
+        # Restore the frame range of the sequence
+        bpy.context.scene.frame_start = frame_start
+        bpy.context.scene.frame_end = frame_end
+
+    ################################################################################################
+    # @render_sequence_with_workers
+    ################################################################################################
+    def render_sequence_with_workers(self,
+                                     output_directory,
+                                     output_path,
+                                     frames,
+                                     number_workers):
+        """Renders the given frames with several background Blender processes running on the
+        local machine. The scene is saved once to a .blend file that is loaded by each worker.
+
+        :param output_directory:
+            The directory where the frames will be written.
+        :param output_path:
+            The output path of the frames, including the '#' characters of the frame numbers.
+        :param frames:
+            A sorted list of the frames to be rendered.
+        :param number_workers:
+            Number of the worker processes.
+        """
+
+        # Save a copy of the scene, the current file of the session is not changed
+        scene_file = '%s/sequence_scene.blend' % output_directory
+        bpy.ops.wm.save_as_mainfile(filepath=scene_file, copy=True)
+
+        # Launch a process per frame range
+        workers = list()
+        for worker_start, worker_end in self.split_frame_range(frames, number_workers):
+            nmv.logger.info('Rendering frames [%d - %d] in a worker process' %
+                            (worker_start, worker_end))
+            workers.append(subprocess.Popen(
+                [bpy.app.binary_path, '-b', scene_file, '-o', output_path,
+                 '-s', str(worker_start), '-e', str(worker_end), '-a'],
+                stdout=subprocess.DEVNULL))
+
+        # Wait for all the workers
+        for worker in workers:
+            if worker.wait() != 0:
+                nmv.logger.log('WARNING: A rendering worker failed, run again with the resume '
+                               'option to render the missing frames')
+
+        # Clean the scene file
+        os.remove(scene_file)
+
+    ################################################################################################
+    # @clear
+    ################################################################################################
+    def clear(self,
+              keep_camera_in_scene=False):
+        """Removes the animation of the objects and the camera used to render the sequence.
+
+        :param keep_camera_in_scene:
+            Keep the camera in the scene after the rendering.
+        """
+
+        # Clear the keyframes, and restore the rotation that the objects had before the sequence
+        for scene_object, rotation in self.animated_objects:
+            scene_object.animation_data_clear()
+            scene_object.rotation_euler[1] = rotation
+        self.animated_objects = list()
+
+        # Delete the camera
+        if not keep_camera_in_scene and self.camera.camera is not None:
+            nmv.scene.ops.delete_object_in_scene(self.camera.camera)
+            self.camera.camera = None
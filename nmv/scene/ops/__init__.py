@@ -16,3 +16,4 @@
 ####################################################################################################
 
 from .scene_ops import *
+from .scene_batch_ops import *
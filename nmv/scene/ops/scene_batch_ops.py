@@ -0,0 +1,233 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Blender imports
+import bpy
+
+# Internal imports
+import nmv
+import nmv.geometry
+import nmv.utilities
+
+
+####################################################################################################
+# @link_objects_to_scene
+####################################################################################################
+def link_objects_to_scene(scene_objects,
+                          scene=None):
+    """Links a list of objects to the scene in a single pass, without changing the selection.
+
+    :param scene_objects:
+        A list of objects that are not linked to the scene yet.
+    :param scene:
+        The scene where the objects will be linked, by default the current scene.
+    """
+
+    # Use the current scene by default
+    if scene is None:
+        scene = bpy.context.scene
+
+    # Link the objects, ignoring those that are already in the scene. The scenes of every object
+    # are checked instead of looking up the objects of the scene, which is linear in their number
+    for scene_object in scene_objects:
+        if scene not in scene_object.users_scene:
+            scene.objects.link(scene_object)
+
+
+####################################################################################################
+# @unlink_objects_from_scene
+####################################################################################################
+def unlink_objects_from_scene(scene_objects,
+                              scene=None):
+    """Unlinks a list of objects from the scene without deleting their data.
+
+    :param scene_objects:
+        A list of objects that are linked to the scene.
+    :param scene:
+        The scene where the objects are linked, by default the current scene.
+    """
+
+    # Use the current scene by default
+    if scene is None:
+        scene = bpy.context.scene
+
+    # Unlink the objects, ignoring those that are not in the scene
+    for scene_object in scene_objects:
+        if scene in scene_object.users_scene:
+            scene.objects.unlink(scene_object)
+
+
+####################################################################################################
+# @remove_orphan_data
+####################################################################################################
+def remove_orphan_data(data_blocks):
+    """Removes the data-blocks (meshes and curves) that are no longer used by any object.
+
+    :param data_blocks:
+        A list of mesh or curve data-blocks.
+    """
+
+    # Remove each data-block from its collection if it has no users
+    for data_block in data_blocks:
+        if data_block is None or data_block.users > 0:
+            continue
+        if isinstance(data_block, bpy.types.Mesh):
+            bpy.data.meshes.remove(data_block, do_unlink=True)
+        elif isinstance(data_block, bpy.types.Curve):
+            bpy.data.curves.remove(data_block, do_unlink=True)
+
+
+####################################################################################################
+# @delete_objects
+####################################################################################################
+def delete_objects(scene_objects,
+                   remove_data=True):
+    """Deletes a list of objects from the scene and from the blend data in a single pass.
+
+    Unlike bpy.ops.object.delete, this function does not depend on the selection, so its cost is
+    proportional to the number of the deleted objects and not to the number of objects in the scene.
+
+    :param scene_objects:
+        A list of objects to be deleted.
+    :param remove_data:
+        If True, the mesh and curve data of the objects are also removed if they are not used by
+        any other object.
+    """
+
+    # Collect the data of the objects before removing them
+    data_blocks = list()
+
+    # Remove the objects, the same object could be listed more than once
+    removed_objects = set()
+    for scene_object in scene_objects:
+        if scene_object is None:
+            continue
+        pointer = scene_object.as_pointer()
+        if pointer in removed_objects:
+            continue
+        removed_objects.add(pointer)
+        data_blocks.append(scene_object.data)
+        nmv.geometry.invalidate_spatial_index(scene_object)
+        bpy.data.objects.remove(scene_object, do_unlink=True)
+
+    # Remove the orphan data
+    if remove_data:
+        remove_orphan_data(data_blocks)
+
+
+####################################################################################################
+# @convert_objects_to_meshes
+####################################################################################################
+@nmv.utilities.profile_stage('arbors.conversion')
+def convert_objects_to_meshes(scene_objects,
+                              scene=None):
+    """Converts a list of objects (curves, poly-lines or meshes with modifiers) into mesh objects
+    in a single pass, without going through bpy.ops.object.convert and the selection.
+
+    The modifiers, bevels and materials of each object are applied to a new mesh data-block.
+    Curve objects are replaced by new mesh objects that have the same names and transformations,
+    while mesh objects keep their identity and only get their data replaced.
+
+    NOTE: The references to the converted curve objects become invalid after the conversion, the
+    returned list must be used instead.
+
+    :param scene_objects:
+        A list of objects to be converted.
+    :param scene:
+        The scene used to evaluate the objects, by default the current scene.
+    :return:
+        A list of the mesh objects, in the same order of the given objects.
+    """
+
+    # Use the current scene by default
+    if scene is None:
+        scene = bpy.context.scene
+
+    # The converted mesh objects
+    mesh_objects = list()
+
+    # The old data-blocks that will be removed after the conversion
+    data_blocks = list()
+
+    for scene_object in scene_objects:
+
+        # Mesh objects without modifiers are already converted
+        if scene_object.type == 'MESH' and len(scene_object.modifiers) == 0:
+            mesh_objects.append(scene_object)
+            continue
+
+        # Evaluate the object into a new mesh data-block
+        mesh_data = scene_object.to_mesh(scene, True, 'PREVIEW')
+
+        # Mesh objects keep their identity, the modifiers are already applied to the data
+        if scene_object.type == 'MESH':
+            data_blocks.append(scene_object.data)
+            scene_object.modifiers.clear()
+            scene_object.data = mesh_data
+            mesh_objects.append(scene_object)
+            continue
+
+        # Other objects are replaced by a new mesh object with the same name and transformation
+        name = scene_object.name
+        matrix_world = scene_object.matrix_world.copy()
+        data_blocks.append(scene_object.data)
+        bpy.data.objects.remove(scene_object, do_unlink=True)
+
+        # Create the mesh object
+        mesh_object = bpy.data.objects.new(name, mesh_data)
+        mesh_data.name = name
+        mesh_object.matrix_world = matrix_world
+        mesh_objects.append(mesh_object)
+
+    # Link the new objects to the scene in a single pass
+    link_objects_to_scene(mesh_objects, scene=scene)
+
+    # Remove the old data that is no longer used
+    remove_orphan_data(data_blocks)
+
+    # Return the mesh objects
+    return mesh_objects
+
+
+####################################################################################################
+# @clear_blend_data
+####################################################################################################
+def clear_blend_data():
+    """Removes all the objects, meshes, curves and materials from the blend data in a single pass
+    over each collection, without using the selection.
+    """
+
+    # The cached spatial indices refer to the removed data, release them with the data
+    nmv.geometry.clear_spatial_indices()
+
+    # Objects, unlinked from all the scenes in the same step
+    for scene_object in list(bpy.data.objects):
+        bpy.data.objects.remove(scene_object, do_unlink=True)
+
+    # Meshes
+    for scene_mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(scene_mesh, do_unlink=True)
+
+    # Curves
+    for scene_curve in list(bpy.data.curves):
+        bpy.data.curves.remove(scene_curve, do_unlink=True)
+
+    # Materials, the pooled materials and the shader templates are kept for the next scenes
+    for scene_material in list(bpy.data.materials):
+        if scene_material.use_fake_user:
+            continue
+        bpy.data.materials.remove(scene_material, do_unlink=True)
@@ -25,6 +25,7 @@ from mathutils import Vector
 # Internal impots
 import nmv
 import nmv.bbox
+import nmv.geometry
 import nmv.mesh
 
 
@@ -57,41 +58,13 @@ def clear_scene():
     NOTE: This function targets clearing meshes, curve, objects and materials.
     """
 
-    # Adjust the clipping planes in case of perspective projection
-    bpy.context.space_data.clip_start = 0.01
-    bpy.context.space_data.clip_end = 10000
+    # Adjust the clipping planes in case of perspective projection, only if there is a 3D view
+    if bpy.context.space_data is not None:
+        bpy.context.space_data.clip_start = 0.01
+        bpy.context.space_data.clip_end = 10000
 
-    # Select each object in the scene
-    for scene_object in bpy.context.scene.objects:
-        scene_object.select = True
-
-    # Delete all the objects
-    bpy.ops.object.delete()
-
-    # Unlink all the objects in all the layers
-    for scene in bpy.data.scenes:
-        for scene_object in scene.objects:
-            scene.objects.unlink(scene_object)
-
-    # Select all the meshes, unlink them and clear their data
-    for scene_mesh in bpy.data.meshes:
-        scene_mesh.user_clear()
-        bpy.data.meshes.remove(scene_mesh)
-
-    # Select all the curves, unlink them and clear their data
-    for scene_curve in bpy.data.curves:
-        scene_curve.user_clear()
-        bpy.data.curves.remove(scene_curve)
-
-    # Select all the scene objects, unlink them and clear their data
-    for scene_object in bpy.data.objects:
-        scene_object.user_clear()
-        bpy.data.objects.remove(scene_object)
-
-    # Select all the scene materials, unlink them and clear their data
-    for scene_material in bpy.data.materials:
-        scene_material.user_clear()
-        bpy.data.materials.remove(scene_material)
+    # Remove all the objects and their data directly from the blend data, without the selection
+    nmv.scene.ops.clear_blend_data()
 
 
 ####################################################################################################
@@ -317,14 +290,8 @@ def delete_object_in_scene(scene_object):
         A given object to be deleted from the scene.
     """
 
-    # Deselect all the other objects in the scene
-    deselect_all()
-
-    # Select this particular object, to highlight it
-    scene_object.select = True
-
-    # Delete the selected object
-    bpy.ops.object.delete(use_global=False)
+    # Delete the object directly from the blend data
+    nmv.scene.ops.delete_objects([scene_object])
 
 
 ####################################################################################################
@@ -337,17 +304,8 @@ def delete_list_objects(object_list):
         A list of objects to be deleted from the scene.
     """
 
-    # Deselects all objects in the scene
-    deselect_all()
-
-    # Delete object by object from the list
-    for scene_object in object_list:
-
-        # Select this particular object, to highlight it
-        scene_object.select = True
-
-        # Delete the selected object
-        bpy.ops.object.delete(use_global=False)
+    # Delete all the objects in a single pass
+    nmv.scene.ops.delete_objects(object_list)
 
 
 ####################################################################################################
@@ -357,17 +315,8 @@ def delete_all():
     """Delete all the objects in the scene.
     """
 
-    # Deselect all the objects in the scene
-    deselect_all()
-
-    # Delete object by object from the scene
-    for scene_object in bpy.context.scene.objects:
-
-        # Select this particular object, to highlight it
-        scene_object.select = True
-
-        # Delete the selected object
-        bpy.ops.object.delete(use_global=False)
+    # Delete all the objects in the scene in a single pass
+    nmv.scene.ops.delete_objects(list(bpy.context.scene.objects))
 
 
 ####################################################################################################
@@ -585,6 +534,9 @@ def center_mesh_object(scene_object):
     for vertex in scene_object.data.vertices:
         vertex.co = vertex.co - bbox_center
 
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(scene_object)
+
 
 ####################################################################################################
 # @rotate_object_towards_target
@@ -661,10 +613,6 @@ def duplicate_object(original_object,
         A reference to the duplicated object.
     """
 
-    # Deselect all the objects in the scene
-    for scene_object in bpy.context.scene.objects:
-        scene_object.select = False
-
     # Duplicate the object
     duplicated_object = original_object.copy()
 
@@ -681,9 +629,8 @@ def duplicate_object(original_object,
     if link_to_scene:
         bpy.context.scene.objects.link(duplicated_object)
 
-        # Deselect all the objects in the scene
-        for scene_object in bpy.context.scene.objects:
-            scene_object.select = False
+        # The duplicate is not selected, to keep the selection of the scene unchanged
+        duplicated_object.select = False
 
     # Return a reference to the duplicate object
     return duplicated_object
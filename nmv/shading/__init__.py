@@ -18,3 +18,5 @@
 
 from .illumination import *
 from .materials import *
+from .material_pool import *
+from .object_colors import *
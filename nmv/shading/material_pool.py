@@ -0,0 +1,180 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This library is free software; you can redistribute it and/or modify it under the terms of the
+# GNU Lesser General Public License version 3.0 as published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this library;
+# if not, write to the Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301 USA.
+####################################################################################################
+
+# System imports
+import os
+
+# Blender imports
+import bpy
+
+# Internal imports
+import nmv
+import nmv.enums
+
+
+# The materials of the shaders of the library that are loaded in the session, by shader name
+SHADER_TEMPLATES = dict()
+
+# The pooled materials, keyed by the material type and the quantized color
+MATERIAL_POOL = dict()
+
+
+####################################################################################################
+# @get_existing_material
+####################################################################################################
+def get_existing_material(material):
+    """Returns a given material if it still exists in the blend data, otherwise None.
+
+    :param material:
+        A reference to a material, or None.
+    :return:
+        The material if it exists, otherwise None.
+    """
+
+    if material is None:
+        return None
+
+    # The reference of a removed material is not valid anymore
+    try:
+        material_name = material.name
+    except ReferenceError:
+        return None
+
+    # Make sure that it is the same material
+    if bpy.data.materials.get(material_name) != material:
+        return None
+    return material
+
+
+####################################################################################################
+# @load_shader_template
+####################################################################################################
+def load_shader_template(shader_name):
+    """Loads a shader from the NeuroMorphoVis shading library once per session.
+
+    The loaded material is kept with a fake user, so it is not removed when the scene is cleared,
+    and it is only used as a template to copy the materials from.
+
+    :param shader_name:
+        The name of the shader file in the library.
+    :return:
+        A reference to the template material of the shader.
+    """
+
+    # Use the loaded template
+    template = get_existing_material(SHADER_TEMPLATES.get(shader_name))
+    if template is not None:
+        return template
+
+    # Get the path of the library
+    current_file = os.path.dirname(os.path.realpath(__file__))
+    shaders_directory = '%s/shaders/%s.blend/Material' % (current_file, shader_name)
+
+    # Import the material, it is renamed by Blender if the name is already used
+    existing_materials = set(bpy.data.materials)
+    bpy.ops.wm.append(filename='material', directory=shaders_directory)
+    template = [material for material in bpy.data.materials
+                if material not in existing_materials][0]
+
+    # Keep the template in the session
+    template.name = 'shader_template_%s' % shader_name
+    template.use_fake_user = True
+    SHADER_TEMPLATES[shader_name] = template
+
+    # Return a reference to the template
+    return template
+
+
+####################################################################################################
+# @quantize_color
+####################################################################################################
+def quantize_color(color,
+                   levels=255):
+    """Quantizes a color to a number of levels per channel, so the close colors share a material.
+
+    :param color:
+        An RGB color.
+    :param levels:
+        The number of the levels per channel, 8-bit colors by default.
+    :return:
+        A tuple of the quantized channels as integers.
+    """
+
+    return tuple(int(round(min(max(channel, 0.0), 1.0) * levels)) for channel in color[0:3])
+
+
+####################################################################################################
+# @get_pooled_material
+####################################################################################################
+def get_pooled_material(color,
+                        material_type,
+                        levels=255):
+    """Returns a material of a given type and color from the material pool. The material is
+    created once per session and shared by all the objects that use the same type and color, so
+    it must not be modified by the callers.
+
+    :param color:
+        Material color.
+    :param material_type:
+        Material type.
+    :param levels:
+        The number of the levels per channel used to quantize the color.
+    :return:
+        A reference to the material.
+    """
+
+    # The key of the material
+    quantized_color = quantize_color(color, levels)
+    key = (str(material_type), levels, quantized_color)
+
+    # Use the pooled material
+    material = get_existing_material(MATERIAL_POOL.get(key))
+    if material is not None:
+        return material
+
+    # Create a new material with the quantized color
+    material = nmv.shading.create_material(
+        name='pool', color=[channel / float(levels) for channel in quantized_color],
+        material_type=material_type)
+
+    # Keep it in the pool, it is kept across the scenes of the session
+    material.name = 'pool_%s_%s' % (str(material_type),
+                                    '_'.join(str(channel) for channel in quantized_color))
+    material.use_fake_user = True
+    MATERIAL_POOL[key] = material
+
+    # Return a reference to the material
+    return material
+
+
+####################################################################################################
+# @clear_material_pool
+####################################################################################################
+def clear_material_pool():
+    """Removes all the pooled materials and the shader templates from the session.
+    """
+
+    for material in list(MATERIAL_POOL.values()) + list(SHADER_TEMPLATES.values()):
+        material = get_existing_material(material)
+        if material is not None:
+            material.use_fake_user = False
+            bpy.data.materials.remove(material, do_unlink=True)
+
+    # Clear the dictionaries
+    MATERIAL_POOL.clear()
+    SHADER_TEMPLATES.clear()
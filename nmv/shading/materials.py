@@ -16,9 +16,6 @@
 # MA 02110-1301 USA.
 ####################################################################################################
 
-# System imports
-import os 
-
 # Blender imports
 import bpy
 
@@ -35,21 +32,18 @@ import nmv.scene
 def import_shader(shader_name):
     """Import a shader from  the NeuroMorphoVis shading library.
 
+    The shader file is only appended once per session, and every call returns a copy of the
+    loaded template with its own node tree.
+
     :param shader_name:
         The name of the shader file in the library.
     :return:
         A reference to the shader after being loaded into blender.
     """
 
-    # Get the path of this file
-    current_file = os.path.dirname(os.path.realpath(__file__))
-    shaders_directory = '%s/shaders/%s.blend/Material' % (current_file, shader_name)
-
-    # Import the material
-    bpy.ops.wm.append(filename='material', directory=shaders_directory)
-
-    # Get a reference to the material
-    material_reference = bpy.data.materials['material']
+    # Copy the template of the shader
+    material_reference = nmv.shading.load_shader_template(shader_name).copy()
+    material_reference.use_fake_user = False
 
     # Return a reference to the material
     return material_reference
@@ -546,6 +540,36 @@ def set_material_to_object(mesh_object,
     mesh_object.data.materials.append(material_reference)
 
 
+####################################################################################################
+# @set_material_to_objects
+####################################################################################################
+def set_material_to_objects(mesh_objects,
+                            material_reference):
+    """Assign the given material to a list of mesh objects in a single pass.
+
+    The mesh data that is shared between several objects is only updated once.
+
+    :param mesh_objects:
+        A list of surface mesh objects.
+    :param material_reference:
+        The material to be assigned to the objects.
+    """
+
+    # The pointers of the mesh data that were already updated
+    updated_data = set()
+
+    for mesh_object in mesh_objects:
+
+        # Skip the objects that share their data with an updated object
+        pointer = mesh_object.data.as_pointer()
+        if pointer in updated_data:
+            continue
+        updated_data.add(pointer)
+
+        # Assign the material
+        set_material_to_object(mesh_object, material_reference)
+
+
 ####################################################################################################
 # @adjust_material_uv
 ####################################################################################################
@@ -576,12 +600,13 @@ def adjust_material_uv(mesh_object,
 def create_materials(material_type,
                      name,
                      color):
-    """Creates just two materials of the mesh on the input parameters of the user.
+    """Returns the two materials of the mesh based on the input parameters of the user. Both are
+    the same material from the material pool, so they are shared between the builders.
 
     :param material_type:
         The type of the material.
     :param name:
-        The name of the material/color.
+        The name of the material/color, the pooled materials are named after their type and color.
     :param color:
         The code of the given colors.
     :return:
@@ -589,16 +614,8 @@ def create_materials(material_type,
         sections or segments.
     """
 
-    # A list of the created materials
-    materials_list = []
-    for i in range(2):
-
-        # Create the material
-        material = nmv.shading.create_material(name='%s_color_%d' % (name, i), color=color,
-                                               material_type=material_type)
-
-        # Append the material to the materials list
-        materials_list.append(material)
+    # Both elements use the same material from the pool
+    material = nmv.shading.get_pooled_material(color=color, material_type=material_type)
 
     # Return the list
-    return materials_list
+    return [material, material]
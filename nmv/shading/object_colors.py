@@ -0,0 +1,156 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This library is free software; you can redistribute it and/or modify it under the terms of the
+# GNU Lesser General Public License version 3.0 as published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along with this library;
+# if not, write to the Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301 USA.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import nmv
+import nmv.consts
+
+
+####################################################################################################
+# @link_object_color
+####################################################################################################
+def link_object_color(material_reference):
+    """Makes a white material read its color from the color of the objects that use it.
+
+    With Cycles, the color of the object is read from an Object Info node. It replaces the RGB node
+    of the shader, or multiplies the output of the color ramp of the shader. Otherwise, the object
+    color option of the material is used.
+
+    :param material_reference:
+        A material created with a white color.
+    """
+
+    # Blender internal materials
+    if material_reference.node_tree is None:
+        material_reference.use_object_color = True
+        return
+
+    # The nodes of the shader
+    node_tree = material_reference.node_tree
+    object_info = node_tree.nodes.new('ShaderNodeObjectInfo')
+
+    # Multiply the output of the color ramp by the color of the object
+    if 'ColorRamp' in node_tree.nodes:
+        color_output = node_tree.nodes['ColorRamp'].outputs['Color']
+        for link in list(color_output.links):
+            multiply = node_tree.nodes.new('ShaderNodeMixRGB')
+            multiply.blend_type = 'MULTIPLY'
+            multiply.inputs['Fac'].default_value = 1.0
+            node_tree.links.new(color_output, multiply.inputs['Color1'])
+            node_tree.links.new(object_info.outputs['Color'], multiply.inputs['Color2'])
+            node_tree.links.new(multiply.outputs['Color'], link.to_socket)
+            node_tree.links.remove(link)
+
+    # Replace the RGB node by the color of the object
+    elif 'RGB' in node_tree.nodes:
+        color_output = node_tree.nodes['RGB'].outputs[0]
+        for link in list(color_output.links):
+            node_tree.links.new(object_info.outputs['Color'], link.to_socket)
+            node_tree.links.remove(link)
+
+
+####################################################################################################
+# @get_object_color_material
+####################################################################################################
+def get_object_color_material(material_type):
+    """Returns the material of a given type that reads its color from the objects. The material is
+    created once per session and shared by all the objects of this type, whatever their colors,
+    so the number of the materials of a scene does not depend on the number of the objects.
+
+    :param material_type:
+        Material type.
+    :return:
+        A reference to the material.
+    """
+
+    # The key of the material in the pool
+    key = (str(material_type), 'object_color')
+
+    # Use the pooled material
+    material = nmv.shading.get_existing_material(nmv.shading.MATERIAL_POOL.get(key))
+    if material is not None:
+        return material
+
+    # Create a white material and link its color to the objects
+    material = nmv.shading.create_material(
+        name='pool', color=nmv.consts.Color.WHITE, material_type=material_type)
+    link_object_color(material)
+
+    # Keep it in the pool
+    material.name = 'pool_%s_object_color' % str(material_type)
+    material.use_fake_user = True
+    nmv.shading.MATERIAL_POOL[key] = material
+
+    # Return a reference to the material
+    return material
+
+
+####################################################################################################
+# @set_objects_colors
+####################################################################################################
+def set_objects_colors(objects,
+                       colors):
+    """Sets the colors of a list of objects that use object color materials.
+
+    :param objects:
+        A list of objects.
+    :param colors:
+        A list or an array of RGB or RGBA colors, one per object.
+    """
+
+    # The colors, RGBA with an opaque alpha by default
+    colors = numpy.asarray(colors, dtype=numpy.float32).reshape(len(objects), -1)
+    rgba_colors = numpy.ones((len(objects), 4), dtype=numpy.float32)
+    rgba_colors[:, 0:colors.shape[1]] = colors[:, 0:4]
+
+    # Set the colors
+    for scene_object, color in zip(objects, rgba_colors.tolist()):
+        scene_object.color = color
+
+
+####################################################################################################
+# @apply_object_color_materials
+####################################################################################################
+def apply_object_color_materials(objects,
+                                 colors,
+                                 material_types):
+    """Colors a population of objects with a material per material type and a color per object.
+
+    :param objects:
+        A list of mesh objects.
+    :param colors:
+        A list of RGB colors, one per object.
+    :param material_types:
+        A list of the material types, one per object.
+    """
+
+    # Group the objects by material type
+    groups = dict()
+    for scene_object, color, material_type in zip(objects, colors, material_types):
+        group = groups.setdefault(material_type, ([], []))
+        group[0].append(scene_object)
+        group[1].append(color[0:3])
+
+    # Apply the shared material of every group and set the colors of its objects
+    for material_type, (group_objects, group_colors) in groups.items():
+        material = get_object_color_material(material_type)
+        nmv.shading.set_material_to_objects(group_objects, material)
+        set_objects_colors(group_objects, group_colors)
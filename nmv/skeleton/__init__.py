@@ -17,3 +17,4 @@
 
 from .structure import *
 from .ops import *
+from .synthesis import *
@@ -24,6 +24,7 @@ from .skeleton_drawing_ops import *
 from .skeleton_geometry_ops import *
 from .skeleton_intersection_ops import *
 from .skeleton_polylines_ops import *
+from .skeleton_preprocessing_ops import *
 from .skeleton_repair_ops import *
 from .skeleton_resampling_ops import *
 from .skeleton_generic_ops import *
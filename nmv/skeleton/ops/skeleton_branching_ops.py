@@ -35,18 +35,7 @@ def update_skeleton_branching(morphology,
         * nmv.enums.Skeletonization.Branching.RADII: based on radii.
     """
 
-    # Primary and secondary branching
-    if branching_method == nmv.enums.Skeletonization.Branching.ANGLES:
-
-        # Label the primary and secondary sections based on angles
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_angles])
-    else:
-
-        # Label the primary and secondary sections based on radii
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.label_primary_and_secondary_sections_based_on_radii])
-
-    # Update the branching orders
-    nmv.skeleton.ops.apply_operation_to_morphology(
-        *[morphology, nmv.skeleton.ops.update_branching_order_section])
+    # Label the primary and secondary sections and update the branching orders in one pass
+    nmv.skeleton.ops.preprocess_morphology(
+        morphology=morphology,
+        operations=nmv.skeleton.ops.get_branching_operations(branching_method))
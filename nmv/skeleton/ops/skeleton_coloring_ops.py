@@ -60,31 +60,30 @@ def create_skeleton_materials(name,
             color_vector.y = random.uniform(0.0, 1.0)
             color_vector.z = random.uniform(0.0, 1.0)
 
-            # Create the material and append it to the list
-            material = nmv.shading.create_material(
-                name='%s_random_%d' % (name, i), color=color_vector, material_type=material_type)
+            # Get the material from the pool and append it to the list
+            material = nmv.shading.get_pooled_material(
+                color=color_vector, material_type=material_type)
             materials_list.append(material)
 
     # If set to black / white
     elif color.x == 0 and color.y == -1 and color.z == 0:
 
-        # Create the material and append it to the list
-        material = nmv.shading.create_material(
-            name='%s_bw_0' % name, color=nmv.consts.Color.MATT_BLACK , material_type=material_type)
+        # Get the material from the pool and append it to the list
+        material = nmv.shading.get_pooled_material(
+            color=nmv.consts.Color.MATT_BLACK, material_type=material_type)
         materials_list.append(material)
 
-        # Create the material and append it to the list
-        material = nmv.shading.create_material(
-            name='%s_bw_1' % name, color=nmv.consts.Color.WHITE, material_type=material_type)
+        # Get the material from the pool and append it to the list
+        material = nmv.shading.get_pooled_material(
+            color=nmv.consts.Color.WHITE, material_type=material_type)
         materials_list.append(material)
 
     # Specified colors
     else:
         for i in range(2):
 
-            # Create the material and append it to the list
-            material = nmv.shading.create_material(
-                name='%s_color_%d' % (name, i), color=color, material_type=material_type)
+            # Get the material from the pool and append it to the list
+            material = nmv.shading.get_pooled_material(color=color, material_type=material_type)
             materials_list.append(material)
 
     # Return the list
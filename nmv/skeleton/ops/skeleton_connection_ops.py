@@ -409,6 +409,9 @@ def find_nearest_sample_along_section(point,
                                       nearest_sample_found=None):
     """Find the nearest sample along the given section to the given point.
 
+    The search covers the section and all its children through the spatial index of the samples,
+    which is built once and reused until the section is invalidated.
+
     :param point:
         A given point in the three-dimensional space.
     :param section:
@@ -419,30 +422,17 @@ def find_nearest_sample_along_section(point,
         The nearest sample found along the section.
     """
 
-    # If @nearest_sample_found is None, then set the initial sample along the section to it till
-    # further notice
-    if nearest_sample_found is None:
-        nearest_sample_found = section.samples[0]
-
-    for sample in section.samples:
-
-        # Compute the distance between the point and the sample
-        current_sample_to_point_distance = (point - sample.point).length
-
-        # Compute the distance between the point and the @nearest_sample_found
-        nearest_sample_to_point_distance = (point - nearest_sample_found.point).length
-
-        # Compare
-        if current_sample_to_point_distance < nearest_sample_to_point_distance:
-
-            # Update the nearest sample
-            nearest_sample_found = sample
+    # Query the spatial index of all the samples along the section and its children
+    nearest_sample, distance = nmv.geometry.get_arbor_samples_spatial_index(section).find_nearest(
+        point)
 
-    # Iterate over the children
-    for child in section.children:
+    # If @nearest_sample_found is None, then use the sample found along the section
+    if nearest_sample_found is None:
+        return nearest_sample
 
-        # Find the nearest sample recursively
-        nearest_sample_found = find_nearest_sample_along_section(point, child, nearest_sample_found)
+    # Otherwise, keep the nearest of the two samples
+    if nearest_sample is not None and distance < (point - nearest_sample_found.point).length:
+        return nearest_sample
 
     # Return a reference to the nearest sample
     return nearest_sample_found
@@ -644,6 +634,9 @@ def verify_axon_connection_to_soma(morphology):
         # The sample should have a smaller radius to avoid the extrusion artifacts
         morphology.axon.samples[0].radius = nearest_sample.radius * 0.5
 
+        # The axon has been edited, invalidate its spatial index
+        nmv.geometry.invalidate_spatial_index(morphology.axon)
+
         # The axon is found not connected to the soma
         return
 
@@ -681,6 +674,9 @@ def verify_axon_connection_to_soma(morphology):
             # The sample should have a smaller radius to avoid the extrusion artifacts
             morphology.axon.samples[0].radius = nearest_sample.radius * 0.5
 
+            # The axon has been edited, invalidate its spatial index
+            nmv.geometry.invalidate_spatial_index(morphology.axon)
+
             # The axon is found to be intersecting with the apical dendrite
             return
 
@@ -712,6 +708,9 @@ def verify_axon_connection_to_soma(morphology):
         # The sample should have a smaller radius to avoid the extrusion artifacts
         morphology.axon.samples[0].radius = nearest_sample.radius * 0.5
 
+        # The axon has been edited, invalidate its spatial index
+        nmv.geometry.invalidate_spatial_index(morphology.axon)
+
         # The axon is found to be intersecting with the apical dendrite
         return
 
@@ -783,6 +782,9 @@ def verify_basal_dendrites_connection_to_soma(morphology):
             basal_dendrite.samples[0].point = \
                 basal_dendrite.samples[0].point.normalized() * maximum_arbor_distance
 
+            # The basal dendrite has been edited, invalidate its spatial index
+            nmv.geometry.invalidate_spatial_index(basal_dendrite)
+
             # Mark the basal dendrite CONNECTED from the soma
             basal_dendrite.connected_to_soma = True
 
@@ -833,6 +835,12 @@ def update_arbors_connection_to_soma(morphology):
         A given morphology skeleton.
     """
 
+    # The arbors could have been edited since any previous verification, so their spatial indices
+    # are rebuilt for this pass
+    for arbor in [morphology.apical_dendrite, morphology.axon] + (morphology.dendrites or []):
+        if arbor is not None:
+            nmv.geometry.invalidate_spatial_index(arbor)
+
     # If the apical dendrite exists, then set its connectivity to True directly
     if morphology.apical_dendrite is not None:
         morphology.apical_dendrite.connected_to_soma = True
@@ -266,14 +266,18 @@ def extrude_connected_sections(section,
 
 
 def get_connected_sections_poly_line_recursively(section,
-                                                 poly_lines_data=[],
-                                                 poly_line_data=[],
+                                                 poly_lines_data,
+                                                 poly_line_data=None,
                                                  branching_level=0,
                                                  max_branching_level=nmv.consts.Math.INFINITY):
     # Ignore the drawing if the section is None
     if section is None:
         return
 
+    # A new poly-line for the first section
+    if poly_line_data is None:
+        poly_line_data = list()
+
     # Increment the branching level
     branching_level += 1
 
@@ -289,8 +293,9 @@ def get_connected_sections_poly_line_recursively(section,
         # Polyline name
         poly_line_name = '%s_%d' % (section.get_type_prefix(), section.id)
 
-        # Append the polyline to the list, and copy the data before clearing the list
-        poly_lines_data.append([copy.deepcopy(poly_line_data), poly_line_name])
+        # Append the polyline to the list, and copy the data before clearing the list. The samples
+        # of the poly-line are new lists that are never modified, so a shallow copy is enough
+        poly_lines_data.append([list(poly_line_data), poly_line_name])
 
         # Clean @poly_line_data to collect the data from the remaining sections
         poly_line_data[:] = []
@@ -338,9 +343,9 @@ def draw_connected_sections_poly_lines(arbor,
 # @draw_connected_sections
 ####################################################################################################
 def draw_connected_sections(section, name,
-                            poly_line_data=[],
-                            sections_objects=[],
-                            secondary_sections=[],
+                            poly_line_data=None,
+                            sections_objects=None,
+                            secondary_sections=None,
                             branching_level=0,
                             max_branching_level=nmv.consts.Math.INFINITY,
                             material_list=None,
@@ -356,6 +361,9 @@ def draw_connected_sections(section, name,
                             roots_connection=nmv.enums.Arbors.Roots.DISCONNECTED_FROM_SOMA):
     """Draw a list of sections connected together as a poly-line.
 
+    The sections are only read, so the arbors of the morphology can be given directly without
+    copying them.
+
     :param section:
         Section root.
     :param poly_line_data:
@@ -398,6 +406,14 @@ def draw_connected_sections(section, name,
     if section is None:
         return
 
+    # New lists for the first section of the arbor
+    if poly_line_data is None:
+        poly_line_data = list()
+    if sections_objects is None:
+        sections_objects = list()
+    if secondary_sections is None:
+        secondary_sections = list()
+
     # Increment the branching level
     branching_level += 1
 
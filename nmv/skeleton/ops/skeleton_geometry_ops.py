@@ -24,6 +24,7 @@ from mathutils import Vector, Matrix
 # Internal imports
 import nmv
 import nmv.bbox
+import nmv.geometry
 import nmv.skeleton
 
 
@@ -185,26 +186,9 @@ def get_transformation_matrix(blue_config,
         Transformation matrix.
 
     """
-    # To load the circuit, 'brain' must be imported
-    try:
-        import brain
-    except ImportError:
-        raise ImportError('ERROR: Cannot import \'brain\'')
-
-    # Load the circuit data from the blue configuration
-    circuit = brain.Circuit(blue_config)
-
-    # Get the local to global transformation
-    origin_to_circuit_transform = circuit.transforms({int(gid)})[0]
-
-    # Initialize the transformation matrix to I
-    transformation_matrix = Matrix()
-
-    # Fill the matrix row by row
-    for i in range(4):
-        transformation_matrix[i][:] = origin_to_circuit_transform[i]
-
-    return transformation_matrix
+    # The circuit is opened once per configuration and the transforms are cached in the session
+    import nmv.file
+    return nmv.file.get_circuit_session(blue_config).get_transformation_matrix(gid)
 
 
 ####################################################################################################
@@ -229,11 +213,11 @@ def transform_to_local_coordinates(mesh_object,
     # Invert the transformation matrix
     transformation_matrix = transformation_matrix.inverted()
 
-    # Apply the transformation operation vertex by vertex
-    for vertex in mesh_object.data.vertices:
+    # Apply the transformation operation to all the vertices in bulk
+    mesh_object.data.transform(transformation_matrix)
 
-        # Update the vertex coordinates
-        vertex.co = transformation_matrix * vertex.co
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
 
 
 ####################################################################################################
@@ -257,11 +241,11 @@ def transform_to_global_coordinates(mesh_object,
     # Get the transformation matrix
     transformation_matrix = get_transformation_matrix(blue_config=blue_config, gid=gid)
 
-    # Apply the transformation operation vertex by vertex
-    for vertex in mesh_object.data.vertices:
+    # Apply the transformation operation to all the vertices in bulk
+    mesh_object.data.transform(transformation_matrix)
 
-        # Update the vertex coordinates
-        vertex.co = transformation_matrix * vertex.co
+    # The vertices of the object have changed, invalidate its spatial indices
+    nmv.geometry.invalidate_spatial_index(mesh_object)
 
 
 ####################################################################################################
@@ -261,6 +261,8 @@ def get_connected_sections_poly_line(section,
     """Get the poly-line list or a series of points that reflect the skeleton of a group of
     connected sections along a single arbor.
 
+    The poly-line is built from new lists, the samples of the section are not modified.
+
     :param section:
         The geometry of the section.
     :param roots_connection:
@@ -444,8 +446,8 @@ def poly_lines_intersect(poly_line_1,
     poly_line_2_duplicate = nmv.scene.ops.duplicate_object(poly_line_2)
 
     # Convert them to meshes
-    nmv.scene.ops.convert_object_to_mesh(poly_line_1_duplicate)
-    nmv.scene.ops.convert_object_to_mesh(poly_line_2_duplicate)
+    poly_line_1_duplicate, poly_line_2_duplicate = nmv.scene.ops.convert_objects_to_meshes(
+        [poly_line_1_duplicate, poly_line_2_duplicate])
 
     # Create a new bmesh from the meshes
     poly_line_1_bmesh = bmesh.new()
@@ -496,7 +498,7 @@ def poly_line_intersect_mesh(poly_line,
     poly_line_duplicate = nmv.scene.ops.duplicate_object(poly_line)
 
     # Convert them to meshes
-    nmv.scene.ops.convert_object_to_mesh(poly_line_duplicate)
+    poly_line_duplicate = nmv.scene.ops.convert_objects_to_meshes([poly_line_duplicate])[0]
 
     # Create a new bmesh from the meshes
     poly_line_1_bmesh = bmesh.new()
@@ -0,0 +1,441 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import copy
+
+# Internal imports
+import nmv
+import nmv.enums
+import nmv.geometry
+import nmv.skeleton
+
+
+####################################################################################################
+# The preprocessing operations that can be applied to a morphology skeleton before drawing it or
+# building its mesh. Every operation has:
+#   * function: the name of the function in nmv.skeleton.ops that applies the operation.
+#   * scope: how the function is applied,
+#       - 'section': to every section of the arbors, the section is the first argument.
+#       - 'arbor': once per arbor, the list of the sections of the arbor is the first argument.
+#       - 'root': once per arbor, the root section of the arbor is the first argument.
+#       - 'tree': recursively to every arbor, it can change the sections of the arbor.
+#       - 'morphology': once to the whole morphology, it is a barrier between the arbor passes.
+#   * reads: the aspects of the skeleton that the operation reads.
+#   * writes: the aspects of the skeleton that the operation modifies.
+#   * derived: True if the result of the operation is derived from the skeleton, in which case the
+#     operation is re-applied when an aspect that it reads is modified. The other operations modify
+#     the skeleton, and they are not applied twice with the same parameters unless a later
+#     operation has overwritten what they wrote.
+####################################################################################################
+PREPROCESSING_OPERATIONS = {
+
+    # Remove the samples that intersect the soma at the first section of each arbor
+    'remove_samples_inside_soma': {
+        'function': 'remove_samples_inside_soma',
+        'scope': 'section', 'reads': {'samples'}, 'writes': {'samples'}, 'derived': False},
+
+    # Merge the sections that have a single child with their children
+    'repair_sections_with_single_child': {
+        'function': 'repair_sections_with_single_child',
+        'scope': 'tree', 'reads': {'topology'}, 'writes': {'samples', 'topology'},
+        'derived': False},
+
+    # Remove the duplicate samples along the sections
+    'remove_duplicate_samples': {
+        'function': 'remove_duplicate_samples',
+        'scope': 'section', 'reads': {'samples'}, 'writes': {'samples', 'radii'},
+        'derived': False},
+
+    # Resample all the sections of the arbor at once
+    'resample_sections': {
+        'function': 'resample_sections_in_one_pass',
+        'scope': 'arbor', 'reads': {'samples'}, 'writes': {'samples', 'radii'}, 'derived': False},
+
+    # Verify the connectivity of the arbors to the soma
+    'update_arbors_connection_to_soma': {
+        'function': 'update_arbors_connection_to_soma',
+        'scope': 'morphology', 'reads': {'samples', 'topology'}, 'writes': {'connection'},
+        'derived': True},
+
+    # Label the primary and secondary sections based on angles
+    'label_sections_based_on_angles': {
+        'function': 'label_primary_and_secondary_sections_based_on_angles',
+        'scope': 'section', 'reads': {'samples', 'topology'}, 'writes': {'labels'},
+        'derived': True},
+
+    # Label the primary and secondary sections based on radii
+    'label_sections_based_on_radii': {
+        'function': 'label_primary_and_secondary_sections_based_on_radii',
+        'scope': 'section', 'reads': {'radii', 'topology'}, 'writes': {'labels'},
+        'derived': True},
+
+    # Update the branching orders of the sections, the function traverses the arbor itself
+    'update_branching_order': {
+        'function': 'update_branching_order_section',
+        'scope': 'root', 'reads': {'topology'}, 'writes': {'orders'}, 'derived': True},
+
+    # Taper the sections
+    'taper_sections': {
+        'function': 'taper_section',
+        'scope': 'section', 'reads': {'radii'}, 'writes': {'radii'}, 'derived': False},
+
+    # Zigzag the sections
+    'zigzag_sections': {
+        'function': 'zigzag_section',
+        'scope': 'section', 'reads': {'samples'}, 'writes': {'samples'}, 'derived': False},
+
+    # Simplify the sections to straight lines
+    'simplify_sections_to_straight_lines': {
+        'function': 'simplify_section_to_straight_line',
+        'scope': 'section', 'reads': {'samples'}, 'writes': {'samples', 'radii'},
+        'derived': False},
+
+    # Fix the radii of the sections to a given value
+    'fix_sections_radii': {
+        'function': 'fix_section_radii',
+        'scope': 'section', 'reads': set(), 'writes': {'radii'}, 'derived': False},
+
+    # Scale the radii of the sections by a given factor
+    'scale_sections_radii': {
+        'function': 'scale_section_radii',
+        'scope': 'section', 'reads': {'radii'}, 'writes': {'radii'}, 'derived': False},
+}
+
+
+# The preprocessed private copies of a morphology, keyed by the id of the morphology and the list
+# of the applied operations. Every entry keeps a reference to its source morphology to guarantee
+# that its id is not reused. Only the copies of the last preprocessed morphology are kept, and they
+# are dropped when the morphology is edited, see invalidate_preprocessing_state.
+PREPROCESSED_MORPHOLOGIES = dict()
+
+
+####################################################################################################
+# @release_preprocessed_morphologies
+####################################################################################################
+def release_preprocessed_morphologies(morphology):
+    """Removes the cached preprocessed copies of a given morphology after it has been modified.
+
+    :param morphology:
+        A given morphology skeleton.
+    """
+
+    for key in [key for key in PREPROCESSED_MORPHOLOGIES if key[0] == id(morphology)]:
+        PREPROCESSED_MORPHOLOGIES.pop(key)
+
+
+####################################################################################################
+# @get_morphology_arbors
+####################################################################################################
+def get_morphology_arbors(morphology):
+    """Returns the root sections of the arbors of a given morphology, in the same order that is
+    used by apply_operation_to_morphology.
+
+    :param morphology:
+        A given morphology skeleton.
+    :return:
+        A list of the root sections of the arbors.
+    """
+
+    arbors = list()
+
+    # Apical dendrite
+    if morphology.apical_dendrite is not None:
+        arbors.append(morphology.apical_dendrite)
+
+    # Basal dendrites
+    if morphology.dendrites is not None:
+        arbors.extend([dendrite for dendrite in morphology.dendrites if dendrite is not None])
+
+    # Axon
+    if morphology.axon is not None:
+        arbors.append(morphology.axon)
+
+    return arbors
+
+
+####################################################################################################
+# @get_arbor_sections
+####################################################################################################
+def get_arbor_sections(arbor):
+    """Returns the sections of a given arbor in a pre-order, parents before their children.
+
+    :param arbor:
+        The root section of a given arbor.
+    :return:
+        A list of the sections of the arbor.
+    """
+
+    sections = list()
+    sections_stack = [arbor]
+    while sections_stack:
+        section = sections_stack.pop()
+        sections.append(section)
+        if section.children is not None:
+            sections_stack.extend(reversed(section.children))
+
+    return sections
+
+
+####################################################################################################
+# @invalidate_preprocessing_state
+####################################################################################################
+def invalidate_preprocessing_state(morphology,
+                                   modified_aspects=('samples', 'radii', 'topology')):
+    """Invalidates the derived preprocessing operations that were applied to a morphology if an
+    aspect that they read was modified, for example when the skeleton is edited. These operations
+    are re-applied the next time they are requested.
+
+    :param morphology:
+        A given morphology skeleton.
+    :param modified_aspects:
+        The modified aspects of the skeleton.
+    """
+
+    morphology.preprocessing_state = [
+        state for state in morphology.preprocessing_state
+        if not (PREPROCESSING_OPERATIONS[state[0]]['derived'] and
+                PREPROCESSING_OPERATIONS[state[0]]['reads'] & set(modified_aspects))]
+
+    # The preprocessed copies of the morphology are not valid anymore
+    release_preprocessed_morphologies(morphology)
+
+    # The spatial indices of the edited arbors are not valid anymore
+    if {'samples', 'topology'} & set(modified_aspects):
+        for arbor in get_morphology_arbors(morphology):
+            nmv.geometry.invalidate_spatial_index(arbor)
+
+
+####################################################################################################
+# @apply_preprocessing_stage
+####################################################################################################
+def apply_preprocessing_stage(morphology,
+                              operations):
+    """Applies a list of per-arbor preprocessing operations to a morphology in a single traversal
+    of every arbor.
+
+    :param morphology:
+        A given morphology skeleton.
+    :param operations:
+        A list of (name, parameters) tuples of operations that are not at the morphology scope.
+    """
+
+    for arbor in get_morphology_arbors(morphology):
+
+        # Collect the sections of the arbor only once for all the operations
+        sections = get_arbor_sections(arbor)
+
+        for name, parameters in operations:
+            operation = PREPROCESSING_OPERATIONS[name]
+            function = getattr(nmv.skeleton.ops, operation['function'])
+
+            # Apply the operation with its scope
+            if operation['scope'] == 'section':
+                for section in sections:
+                    function(section, *parameters)
+            elif operation['scope'] == 'arbor':
+                function(sections, *parameters)
+            elif operation['scope'] == 'root':
+                function(arbor, *parameters)
+            else:
+                nmv.skeleton.ops.apply_operation_to_arbor(*([arbor, function] + list(parameters)))
+
+                # The sections of the arbor could have been changed
+                sections = get_arbor_sections(arbor)
+
+        # The samples of the arbor have changed, invalidate its spatial index
+        if any(PREPROCESSING_OPERATIONS[name]['writes'] & {'samples', 'topology'}
+               for name, _ in operations):
+            nmv.geometry.invalidate_spatial_index(arbor)
+
+
+####################################################################################################
+# @preprocess_morphology
+####################################################################################################
+def preprocess_morphology(morphology,
+                          operations):
+    """Applies a list of preprocessing operations to a morphology skeleton.
+
+    The consecutive per-arbor operations are fused and applied in a single traversal per arbor,
+    and the operations at the morphology scope are applied between them. The applied operations
+    are recorded in the preprocessing state of the morphology, and the operations that were
+    already applied with the same parameters, and whose results were not overwritten since then,
+    are skipped.
+
+    :param morphology:
+        A given morphology skeleton.
+    :param operations:
+        A list of operations, where each operation is a tuple of its name, in
+        PREPROCESSING_OPERATIONS, followed by its parameters.
+    """
+
+    # The stages of the operations, separated by the operations at the morphology scope
+    stages = [list()]
+
+    # The expected state of the morphology after applying the operations
+    state = list(morphology.preprocessing_state)
+
+    for operation in operations:
+        name, parameters = operation[0], tuple(operation[1:])
+
+        # Skip the operation if it was already applied with the same parameters
+        if (name, parameters) in state:
+            continue
+
+        # The applied operations whose results are overwritten by this operation, and the derived
+        # operations that read what this operation writes, are not valid anymore
+        writes = PREPROCESSING_OPERATIONS[name]['writes']
+        state = [(applied_name, applied_parameters)
+                 for applied_name, applied_parameters in state
+                 if not (PREPROCESSING_OPERATIONS[applied_name]['writes'] & writes or
+                         (PREPROCESSING_OPERATIONS[applied_name]['derived'] and
+                          PREPROCESSING_OPERATIONS[applied_name]['reads'] & writes))]
+        state.append((name, parameters))
+
+        # Add the operation to its stage
+        if PREPROCESSING_OPERATIONS[name]['scope'] == 'morphology':
+            stages.append((name, parameters))
+            stages.append(list())
+        else:
+            stages[-1].append((name, parameters))
+
+    # Apply the stages
+    for stage in stages:
+        if isinstance(stage, tuple):
+            function = getattr(nmv.skeleton.ops, PREPROCESSING_OPERATIONS[stage[0]]['function'])
+            function(morphology, *stage[1])
+        elif len(stage) > 0:
+            apply_preprocessing_stage(morphology, stage)
+
+    # Update the state of the morphology after all the operations are applied
+    morphology.preprocessing_state = state
+
+    # The morphology has been modified, its preprocessed copies are not valid anymore
+    if any(len(stage) > 0 for stage in stages):
+        release_preprocessed_morphologies(morphology)
+
+
+####################################################################################################
+# @get_preprocessed_morphology
+####################################################################################################
+def get_preprocessed_morphology(morphology,
+                                operations):
+    """Returns a private copy of a morphology with a list of preprocessing operations applied.
+
+    The builders never modify the shared morphology, they work on private copies. The operations
+    are applied once to a cached copy of the morphology, and every builder that requests the same
+    operations on the same morphology gets a copy of the cached one, without applying them again.
+
+    :param morphology:
+        A given morphology skeleton, shared between the builders and never modified.
+    :param operations:
+        A list of operations, see preprocess_morphology.
+    :return:
+        A private copy of the morphology with the operations applied.
+    """
+
+    key = (id(morphology), tuple(tuple(operation) for operation in operations))
+
+    # Preprocess a new copy if the operations were not applied yet to this morphology
+    entry = PREPROCESSED_MORPHOLOGIES.get(key)
+    if entry is None or entry[0] is not morphology:
+
+        # Only the copies of a single morphology are kept
+        for stale_key in [stale_key for stale_key, stale_entry in PREPROCESSED_MORPHOLOGIES.items()
+                          if stale_entry[0] is not morphology]:
+            PREPROCESSED_MORPHOLOGIES.pop(stale_key)
+
+        # The operations are recorded in the state of the copy
+        preprocessed_morphology = copy.deepcopy(morphology)
+        preprocess_morphology(preprocessed_morphology, operations)
+        entry = (morphology, preprocessed_morphology)
+        PREPROCESSED_MORPHOLOGIES[key] = entry
+
+    # Return a private copy, the builder can modify it further
+    return copy.deepcopy(entry[1])
+
+
+####################################################################################################
+# @get_branching_operations
+####################################################################################################
+def get_branching_operations(branching_method):
+    """Returns the preprocessing operations that label the primary and secondary sections of the
+    skeleton based on a selected method and update the branching orders.
+
+    :param branching_method:
+        A selected branching method.
+        * nmv.enums.Skeletonization.Branching.ANGLES: based on angles.
+        * nmv.enums.Skeletonization.Branching.RADII: based on radii.
+    :return:
+        A list of preprocessing operations.
+    """
+
+    if branching_method == nmv.enums.Skeletonization.Branching.ANGLES:
+        return [('label_sections_based_on_angles',), ('update_branching_order',)]
+    return [('label_sections_based_on_radii',), ('update_branching_order',)]
+
+
+####################################################################################################
+# @get_style_operations
+####################################################################################################
+def get_style_operations(arbor_style):
+    """Returns the preprocessing operations that apply a given style to the arbors.
+
+    :param arbor_style:
+        A given style to be applied on the arbors of the morphology skeleton.
+    :return:
+        A list of preprocessing operations.
+    """
+
+    operations = list()
+
+    # Taper the sections
+    if arbor_style == nmv.enums.Arbors.Style.TAPERED or \
+       arbor_style == nmv.enums.Arbors.Style.TAPERED_ZIGZAG:
+        operations.append(('taper_sections',))
+
+    # Zigzag the sections
+    if arbor_style == nmv.enums.Arbors.Style.ZIGZAG or \
+       arbor_style == nmv.enums.Arbors.Style.TAPERED_ZIGZAG:
+        operations.append(('zigzag_sections',))
+
+    # Straight
+    if arbor_style == nmv.enums.Arbors.Style.STRAIGHT:
+        operations.append(('simplify_sections_to_straight_lines',))
+
+    return operations
+
+
+####################################################################################################
+# @get_radii_operations
+####################################################################################################
+def get_radii_operations(morphology_options):
+    """Returns the preprocessing operations that update the radii of the arbors.
+
+    :param morphology_options:
+        Morphology options.
+    :return:
+        A list of preprocessing operations.
+    """
+
+    if morphology_options.arbors_radii == nmv.enums.Skeletonization.ArborsRadii.FIXED:
+        return [('fix_sections_radii', morphology_options.sections_fixed_radii_value)]
+
+    elif morphology_options.arbors_radii == nmv.enums.Skeletonization.ArborsRadii.SCALED:
+        return [('scale_sections_radii', morphology_options.sections_radii_scale)]
+
+    return list()
@@ -17,6 +17,10 @@
 
 # System imports
 import os, copy, math
+import numpy
+
+# Blender imports
+from mathutils import Vector
 
 # Internal import
 import nmv
@@ -157,18 +161,90 @@ def update_samples_indices_per_morphology(morphology_object,
 
 
 ####################################################################################################
-# @resample_section
+# @compute_segments_resampling
 ####################################################################################################
-def resample_sections(section,
-                      resampling_distance=2.5):
+def compute_segments_resampling(starts,
+                                ends,
+                                starts_radii,
+                                ends_radii,
+                                resampling_distance=2.5):
+    """Computes, in one vectorized step, the auxiliary samples that must be inserted along a list
+    of segments to resample them at a given distance.
+
+    Each segment that is longer than twice the resampling distance is split by successive
+    auxiliary samples located (almost) at the resampling distance from each other, and the
+    remaining part is split at its middle if it is still longer than the resampling distance.
+    The radius of each auxiliary sample is the average of the radii of the previous sample and the
+    end of the segment.
+
+    :param starts:
+        An array of shape (N, 3) of the first points of the segments.
+    :param ends:
+        An array of shape (N, 3) of the last points of the segments.
+    :param starts_radii:
+        An array of the radii of the first points of the segments.
+    :param ends_radii:
+        An array of the radii of the last points of the segments.
+    :param resampling_distance:
+        The distance, where a new sample will be added to the section.
+    :return:
+        A tuple of three arrays: the number of auxiliary samples per segment, and the points and
+        radii of all the auxiliary samples ordered segment by segment.
     """
-    Resample a given section at a certain resampling distance.
-    NOTE: Use a default value of 2.5 microns to resample the section.
+
+    # Segments lengths and directions
+    vectors = ends - starts
+    lengths = numpy.linalg.norm(vectors, axis=1)
+    directions = vectors / numpy.maximum(lengths, nmv.consts.Math.LITTLE_EPSILON)[:, None]
+
+    # The step between the successive samples, use epsilon for floating point comparison
+    step = resampling_distance * nmv.consts.Math.EPSILON
+
+    # Number of the samples added at the step distance, until the remaining part is not longer
+    # than the DOUBLE of the resampling distance
+    number_steps = numpy.where(
+        lengths > resampling_distance * 2,
+        numpy.ceil((lengths - resampling_distance * 2) / step), 0).astype(numpy.int64)
+
+    # The remaining part gets a sample at its middle if it is longer than the resampling distance
+    remainders = lengths - number_steps * step
+    has_middle = (remainders > resampling_distance) & (remainders < resampling_distance * 2)
+
+    # Number of auxiliary samples per segment
+    counts = number_steps + has_middle
+
+    # The segment and the local (one-based) index of each auxiliary sample
+    segments = numpy.repeat(numpy.arange(len(counts)), counts)
+    offsets = numpy.cumsum(counts) - counts
+    local_indices = numpy.arange(len(segments)) - offsets[segments] + 1
+    is_middle = local_indices > number_steps[segments]
+
+    # Distances of the auxiliary samples from the start of their segments
+    distances = numpy.where(is_middle,
+                            number_steps[segments] * step + remainders[segments] * 0.5,
+                            local_indices * step)
+
+    # Points
+    points = starts[segments] + directions[segments] * distances[:, None]
+
+    # Radii, each radius is the average of the previous one and the radius of the segment end
+    radii = ends_radii[segments] + \
+        (starts_radii[segments] - ends_radii[segments]) * numpy.power(0.5, local_indices)
+
+    # Return the counts, points and radii
+    return counts, points, radii
+
+
+####################################################################################################
+# @verify_section_for_resampling
+####################################################################################################
+def verify_section_for_resampling(section):
+    """Verifies that a given section can be re-sampled and reports the issues of the section.
 
     :param section:
         A given section to resample.
-    :param resampling_distance:
-        The distance, where a new sample will be added to the section.
+    :return:
+        True if the section can be re-sampled, otherwise False.
     """
 
     # If the section has no samples, report this as an error and ignore this filter
@@ -178,7 +254,7 @@ def resample_sections(section,
         nmv.logger.log('\t\t* ERROR: Section [%s: %d] has NO samples, cannot be re-sampled' %
               (section.get_type_string(), section.id))
 
-        return
+        return False
 
     # If the section has ONLY one sample, report this as an error and ignore this filter
     elif len(section.samples) == 1:
@@ -187,7 +263,7 @@ def resample_sections(section,
         nmv.logger.log('\t* ERROR: Section [%s: %d] has only ONE sample, cannot be re-sampled' %
               (section.get_type_string(), section.id))
 
-        return
+        return False
 
     # If the section has ONLY two sample, report this as a warning
     elif len(section.samples) == 2:
@@ -198,80 +274,161 @@ def resample_sections(section,
         # Compute the combined diameters of the samples
         diameters = (section.samples[1].radius + section.samples[0].radius) * 2
 
-        # Report the warning
-        nmv.logger.log('\t* WARNING: Section [%s: %d] has only TWO samples: length [%f], '
-                       'diameters [%f]' %
-              (section.get_type_string(), section.id, section_length, diameters))
+        # Report the warning, only in debugging mode since it is reported for every section
+        if nmv.logger.debug_enabled:
+            nmv.logger.debug('\t* WARNING: Section [%s: %d] has only TWO samples: length [%f], '
+                             'diameters [%f]' %
+                             (section.get_type_string(), section.id, section_length, diameters))
 
-        if section_length < diameters:
-            nmv.logger.log('\t\t* BAD SECTION')
+            if section_length < diameters:
+                nmv.logger.debug('\t\t* BAD SECTION')
 
-    # An index that will be used to keep track on the samples list
-    i = 0
-    while True:
+    # The section can be re-sampled
+    return True
 
-        # Break at the last sample
-        if i == len(section.samples) - 1:
-            break
 
-        # Compute the distance between the two samples
-        distance = (section.samples[i + 1].point - section.samples[i].point).length
+####################################################################################################
+# @resample_sections_in_one_pass
+####################################################################################################
+def resample_sections_in_one_pass(sections,
+                                  resampling_distance=2.5):
+    """Resamples a list of sections together at a certain resampling distance.
 
-        # If the distance is greater than the DOUBLE of the resampling distance, then add the new
-        # samples at the exact distance
-        if distance > resampling_distance * 2:
+    The segments of all the sections are gathered into arrays and the auxiliary samples are
+    computed for all of them at once, then the samples lists of the sections are rebuilt in a
+    single pass without any restarts.
 
-            # Compute the direction
-            direction = (section.samples[i + 1].point - section.samples[i].point).normalized()
+    :param sections:
+        A list of sections to resample.
+    :param resampling_distance:
+        The distance, where a new sample will be added to the section.
+    """
 
-            # Compute the auxiliary sample point, use epsilon for floating point comparison
-            sample_point = section.samples[i].point + \
-                           (direction * resampling_distance * nmv.consts.Math.EPSILON)
+    # Only consider the valid sections
+    sections = [section for section in sections if verify_section_for_resampling(section)]
+    if len(sections) == 0:
+        return
 
-            # Compute the auxiliary sample radius based on the previous and next samples
-            sample_radius = (section.samples[i + 1].radius + section.samples[i].radius) * 0.5
+    # Gather the points and radii of all the segments
+    points = numpy.array([sample.point[:] for section in sections for sample in section.samples],
+                         dtype=numpy.float64)
+    radii = numpy.array([sample.radius for section in sections for sample in section.samples],
+                        dtype=numpy.float64)
+
+    # The last sample of each section does not start a segment
+    number_samples = numpy.array([len(section.samples) for section in sections])
+    is_segment_start = numpy.ones(len(points), dtype=numpy.bool_)
+    is_segment_start[numpy.cumsum(number_samples) - 1] = False
+    starts = numpy.flatnonzero(is_segment_start)
+
+    # Compute all the auxiliary samples in one step
+    counts, auxiliary_points, auxiliary_radii = compute_segments_resampling(
+        points[starts], points[starts + 1], radii[starts], radii[starts + 1], resampling_distance)
+    auxiliary_points = auxiliary_points.tolist()
+    auxiliary_radii = auxiliary_radii.tolist()
+    counts = counts.tolist()
+
+    # Rebuild the samples lists of the sections
+    segment_index = 0
+    auxiliary_index = 0
+    for section in sections:
+
+        # The new samples list
+        samples = list()
+        for i in range(len(section.samples) - 1):
+
+            # Add the original sample
+            samples.append(section.samples[i])
+
+            # Add the auxiliary samples, the id of the sample is set to -1 (auxiliary sample)
+            for _ in range(counts[segment_index]):
+                samples.append(nmv.skeleton.Sample(
+                    point=Vector(auxiliary_points[auxiliary_index]),
+                    radius=auxiliary_radii[auxiliary_index], id=-1, section=section,
+                    type=section.samples[i].type))
+                auxiliary_index += 1
+            segment_index += 1
+
+        # Add the last sample
+        samples.append(section.samples[-1])
+
+        # Update the samples list
+        section.samples = samples
+
+        # After resampling the section, update the logical indexes of the samples
+        section.reorder_samples()
 
-            # Add the auxiliary sample, the id of the sample is set to -1 (auxiliary sample)
-            auxiliary_sample = nmv.skeleton.Sample(
-                point=sample_point, radius=sample_radius, id=-1, section=section,
-                type=section.samples[i].type)
 
-            # Update the samples list
-            section.samples.insert(i + 1, auxiliary_sample)
+####################################################################################################
+# @resample_section
+####################################################################################################
+def resample_sections(section,
+                      resampling_distance=2.5):
+    """
+    Resample a given section at a certain resampling distance.
+    NOTE: Use a default value of 2.5 microns to resample the section.
 
-            # Reset the index to start from the beginning
-            i = 0
+    :param section:
+        A given section to resample.
+    :param resampling_distance:
+        The distance, where a new sample will be added to the section.
+    """
 
-        # If the distance is greater than the resampling distance, then add a new sample midway
-        elif distance > resampling_distance and (distance < resampling_distance * 2):
+    # Resample the section in a single pass
+    resample_sections_in_one_pass([section], resampling_distance)
 
-            # Compute the direction
-            direction = (section.samples[i + 1].point - section.samples[i].point).normalized()
 
-            # Compute the auxiliary sample point at the middle between the two samples
-            sample_point = section.samples[i].point + (direction * distance * 0.5)
+####################################################################################################
+# @resample_arbor
+####################################################################################################
+def resample_arbor(arbor,
+                   resampling_distance=2.5):
+    """Resamples all the sections of a given arbor at once at a certain resampling distance.
 
-            # Compute the auxiliary sample radius
-            sample_radius = (section.samples[i + 1].radius + section.samples[i].radius) * 0.5
+    :param arbor:
+        The root section of a given arbor.
+    :param resampling_distance:
+        The distance, where a new sample will be added to the section.
+    """
 
-            # Add the auxiliary sample, the id of the sample is set to -1
-            auxiliary_sample = nmv.skeleton.Sample(
-                point=sample_point, radius=sample_radius, id=-1, section=section,
-                type=section.samples[i].type)
+    # Collect all the sections of the arbor
+    sections = list()
+    sections_stack = [arbor]
+    while sections_stack:
+        section = sections_stack.pop()
+        sections.append(section)
+        sections_stack.extend(section.children)
 
-            # Update the samples list
-            section.samples.insert(i + 1, auxiliary_sample)
+    # Resample them all together
+    resample_sections_in_one_pass(sections, resampling_distance)
 
-            # Reset the index to start from the beginning
-            i = 0
 
-        else:
+####################################################################################################
+# @resample_morphology
+####################################################################################################
+def resample_morphology(morphology,
+                        resampling_distance=2.5):
+    """Resamples all the arbors of a given morphology at a certain resampling distance, arbor by
+    arbor.
 
-            # Increment the counter to proceed along the section
-            i += 1
+    :param morphology:
+        A given morphology skeleton.
+    :param resampling_distance:
+        The distance, where a new sample will be added to the section.
+    """
 
-    # After resampling the section, update the logical indexes of the samples
-    section.reorder_samples()
+    # Apical dendrite
+    if morphology.apical_dendrite is not None:
+        resample_arbor(morphology.apical_dendrite, resampling_distance)
+
+    # Basal dendrites
+    if morphology.dendrites is not None:
+        for dendrite in morphology.dendrites:
+            resample_arbor(dendrite, resampling_distance)
+
+    # Axon
+    if morphology.axon is not None:
+        resample_arbor(morphology.axon, resampling_distance)
 
 
 ####################################################################################################
@@ -287,15 +444,11 @@ def resample_section_based_on_smallest_segment(section):
     # Large value
     smallest_segment_length = 1e3
 
-    # Iterate on all the segments
-    for i in range(len(section.samples) - 1):
-
-        # Compute its length
-        segment_length = (section.samples[i + 1].point - section.samples[i].point).length
-
-        # Validate
-        if segment_length < smallest_segment_length:
-            smallest_segment_length = segment_length
+    # Compute the lengths of all the segments at once
+    if len(section.samples) > 1:
+        points = numpy.array([sample.point[:] for sample in section.samples])
+        segments_lengths = numpy.linalg.norm(points[1:] - points[:-1], axis=1)
+        smallest_segment_length = min(smallest_segment_length, float(segments_lengths.min()))
 
     # Resample the section
     if smallest_segment_length > 0.5:
@@ -353,27 +506,22 @@ def remove_duplicate_samples(section,
         A threshold distance, by default 1.0 micron.
     """
 
-    # Iterate over all the samples along the section
-    for i, sample in enumerate(list(section.samples)):
-
-        # Ensure that we don't exceed the section length
-        if i == len(section.samples) - 2:
-            break
-
-        # Compute the distance between the two samples
-        distance = (section.samples[i + 1].point - section.samples[i].point).length
+    # Nothing to remove if the section has two samples or less
+    if len(section.samples) < 3:
+        return
 
-        # If the distance is lower than the threshold
-        if distance < threshold:
+    # The first and last samples are always kept, and every other sample is kept only if it is
+    # far enough from the previous kept sample
+    samples = [section.samples[0]]
+    for sample in section.samples[1:-1]:
 
-            # Then remove the duplicate sample
-            section.samples.remove(section.samples[i + 1])
+        # If the distance is lower than the threshold, then drop the duplicate sample
+        if (sample.point - samples[-1].point).length >= threshold:
+            samples.append(sample)
+    samples.append(section.samples[-1])
 
-            # Repeat the process
-            remove_duplicate_samples(section=section, threshold=threshold)
-
-            # Due to the recursive call of the function, there are no more samples to process,
-            break
+    # Update the samples list
+    section.samples = samples
 
 
 ####################################################################################################
@@ -432,8 +580,8 @@ def remove_samples_inside_soma(section):
         if sample_1.point.length < sample_0.point.length:
 
             # Report the repair
-            nmv.logger.log('\t\t* REPAIRING: Removing internal sample, section [%s: %d]' %
-                  (section.get_type_string(), section.id))
+            nmv.logger.debug('\t\t* REPAIRING: Removing internal sample, section [%s: %d]' %
+                             (section.get_type_string(), section.id))
 
             # Flip the samples
             section.samples[0] = sample_1
@@ -445,29 +593,28 @@ def remove_samples_inside_soma(section):
         # Compute the minimal distance at which the samples with smaller distances will be filtered
         minimal_distance = section.samples[0].point.length
 
-        # Iterate over the next samples
-        for i, sample in enumerate(list(section.samples)):
-
-            # Ignore the first sample
-            if i == 0:
-                continue
-
-            # Compare the distance between the sample and the origin to the minimal distance
-            if sample.point.length < minimal_distance:
-
-                # Remove the sample
-                section.samples.remove(sample)
+        # Compute the distances between all the samples and the origin at once
+        distances = numpy.linalg.norm(
+            numpy.array([sample.point[:] for sample in section.samples]), axis=1)
+        is_internal = distances < minimal_distance
+        is_internal[0] = False
+        number_internal_samples = int(numpy.count_nonzero(is_internal))
 
-                # Report the repair
-                nmv.logger.log('\t\t* REPAIRING: Removing internal sample, section [%s: %d]' %
-                      (section.get_type_string(), section.id))
+        # Report the repair
+        if nmv.logger.debug_enabled:
+            for _ in range(number_internal_samples):
+                nmv.logger.debug('\t\t* REPAIRING: Removing internal sample, section [%s: %d]' %
+                                 (section.get_type_string(), section.id))
 
-                # After removing this sample, the section might have two samples only, so we
-                # recursively call this function and break afterwards.
-                remove_samples_inside_soma(section=section)
+        # If the section keeps at least two samples, simply remove the internal samples
+        if len(section.samples) - number_internal_samples >= 2:
+            section.samples = [sample for sample, internal in
+                               zip(section.samples, is_internal.tolist()) if not internal]
 
-                # Break
-                break
+        # Otherwise, all the samples except the first are internal, then keep the last one only
+        # and flip the remaining two samples
+        elif number_internal_samples > 0:
+            section.samples = [section.samples[-1], section.samples[0]]
 
 
 ####################################################################################################
@@ -509,8 +656,8 @@ def remove_samples_within_extent(section,
     if len(section.samples) == 2:
 
         # Report the error
-        nmv.logger.log('\t\t* WARNING: Section [%s: %d] has TWO samples, cannot be re-sampled' %
-              (section.get_type_string(), section.id))
+        nmv.logger.debug('\t\t* WARNING: Section [%s: %d] has TWO samples, cannot be re-sampled' %
+                         (section.get_type_string(), section.id))
 
         # Return
         return 0
@@ -555,7 +702,7 @@ def resample_section_front(section):
     """
 
     # TODO: Report the resampling operation to identify any issues till further notice
-    nmv.logger.log('\t\t* RESAMPLING: Section [%s] front' % (str(section.id)))
+    nmv.logger.debug('\t\t* RESAMPLING: Section [%s] front' % (str(section.id)))
 
     # The re-sampling distance of the primary section is computed based on the section radius
     resampling_distance = section.samples[0].radius * math.sqrt(2)
@@ -570,7 +717,7 @@ def resample_section_front(section):
 
     # Report the number of removed samples
     if number_removed_sampled > 0:
-        nmv.logger.log('\t\t\t* Removing [%d] samples on the front side' % number_removed_sampled)
+        nmv.logger.debug('\t\t\t* Removing [%d] samples on the front side' % number_removed_sampled)
 
     # Compute the section direction after the re-sampling operation to add an auxiliary sample
     # after the first sample
@@ -611,7 +758,7 @@ def resample_section_rear(section):
     section.samples = list(reversed(section.samples))
 
     # TODO: Report the resampling operation to identify any issues till further notice
-    nmv.logger.log('\t\t* RESAMPLING: Primary section [%s]' % (str(section.id)))
+    nmv.logger.debug('\t\t* RESAMPLING: Primary section [%s]' % (str(section.id)))
 
     # The re-sampling distance of the primary section is computed based on the section radius
     resampling_distance = section.samples[0].radius * math.sqrt(2)
@@ -626,7 +773,7 @@ def resample_section_rear(section):
 
     # Report the number of removed samples
     if number_removed_sampled > 0:
-        nmv.logger.log('\t\t* Removing [%d] samples on the rear side' % number_removed_sampled)
+        nmv.logger.debug('\t\t* Removing [%d] samples on the rear side' % number_removed_sampled)
 
     # Compute the section direction after the re-sampling operation to add an auxiliary sample
     # after the first sample
@@ -34,22 +34,10 @@ def update_arbors_style(morphology,
         A given style to be applied on the arbors of the morphology skeleton.
     """
 
-    # Taper the sections
-    if arbor_style == nmv.enums.Arbors.Style.TAPERED or \
-       arbor_style == nmv.enums.Arbors.Style.TAPERED_ZIGZAG:
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.taper_section])
-
-    # Zigzag the sections
-    if arbor_style == nmv.enums.Arbors.Style.ZIGZAG or \
-       arbor_style == nmv.enums.Arbors.Style.TAPERED_ZIGZAG:
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.zigzag_section])
-
-    # Straight
-    if arbor_style == nmv.enums.Arbors.Style.STRAIGHT:
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.simplify_section_to_straight_line])
+    # Apply the style operations in one pass
+    nmv.skeleton.ops.preprocess_morphology(
+        morphology=morphology,
+        operations=nmv.skeleton.ops.get_style_operations(arbor_style))
 
 
 ####################################################################################################
@@ -71,14 +59,7 @@ def update_arbors_radii(morphology,
     #        *[morphology, nmv.skeleton.ops.filter_section_sub_threshold,
     #          morphology_options.threshold_radius])
 
-    if morphology_options.arbors_radii == nmv.enums.Skeletonization.ArborsRadii.FIXED:
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.fix_section_radii,
-              morphology_options.sections_fixed_radii_value])
-
-    elif morphology_options.arbors_radii == nmv.enums.Skeletonization.ArborsRadii.SCALED:
-        nmv.skeleton.ops.apply_operation_to_morphology(
-            *[morphology, nmv.skeleton.ops.scale_section_radii,
-              morphology_options.sections_radii_scale])
-    else:
-        pass
+    # Apply the radii operations in one pass
+    nmv.skeleton.ops.preprocess_morphology(
+        morphology=morphology,
+        operations=nmv.skeleton.ops.get_radii_operations(morphology_options))
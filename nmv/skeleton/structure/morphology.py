@@ -84,15 +84,6 @@ class Morphology:
         # A linear list of all the samples of the apical, used to query radii based on distance
         self.apical_dendrite_samples = list()
 
-        # A copy of the original axon, needed for comparison
-        self.original_axon = copy.deepcopy(axon)
-
-        # A copy of the original basal dendrites list, needed for comparison
-        self.original_dendrites = copy.deepcopy(dendrites)
-
-        # A copy of the original apical dendrite, needed for comparison
-        self.origin_apical_dendrite = copy.deepcopy(apical_dendrite)
-
         # Morphology GID
         self.gid = gid
 
@@ -110,6 +101,10 @@ class Morphology:
         # Morphology unified bounding box
         self.unified_bounding_box = None
 
+        # A list of the (name, parameters) of the preprocessing operations that were applied to
+        # the skeleton, see nmv.skeleton.ops.preprocess_morphology
+        self.preprocessing_state = list()
+
         # Update the bounding boxes
         self.compute_bounding_box()
 
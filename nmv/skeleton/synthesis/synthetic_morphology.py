@@ -0,0 +1,668 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import math
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal imports
+import nmv
+import nmv.consts
+import nmv.skeleton
+
+
+####################################################################################################
+# @SyntheticMorphologyGenerator
+####################################################################################################
+class SyntheticMorphologyGenerator:
+    """Generates synthetic morphologies for scaling and stress tests.
+
+    Each arbor is a binary tree with a fixed branching depth and a fixed number of samples per
+    section. All the sections of a branching level are generated at once with numpy, and the whole
+    morphology is stored in an array that follows the layout of the SWC files, so million-sample
+    morphologies are generated and written in a few seconds. The generation is deterministic for a
+    given seed.
+    """
+
+    # Radius profiles
+    # The same radius along the whole arbor
+    CONSTANT_RADIUS = 'constant'
+
+    # The radius decays exponentially with the branching order
+    TAPERED_RADIUS = 'tapered'
+
+    # A tapered radius with uniform noise
+    NOISY_RADIUS = 'noisy'
+
+    # Pathological cases
+    # A fraction of the samples have zero radii
+    ZERO_RADII = 'zero-radii'
+
+    # A fraction of the samples are duplicates of their parents
+    DUPLICATE_SAMPLES = 'duplicate-samples'
+
+    # Some arbors are moved away from the soma
+    DISCONNECTED_ARBORS = 'disconnected-arbors'
+
+    # The axon emanates from a basal dendrite instead of the soma
+    AXON_FROM_DENDRITE = 'axon-from-dendrite'
+
+    # All the pathological cases
+    PATHOLOGIES = [ZERO_RADII, DUPLICATE_SAMPLES, DISCONNECTED_ARBORS, AXON_FROM_DENDRITE]
+
+    # The number of the profile points of the soma
+    NUMBER_SOMA_PROFILE_POINTS = 12
+
+    # The radius of every arbor type relative to the root radius, indexed by the SWC type
+    ARBOR_RADIUS_SCALES = numpy.array([0.0, 0.0, 0.5, 1.0, 1.5])
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 seed=0,
+                 number_basal_dendrites=6,
+                 apical_dendrite=True,
+                 axon=True,
+                 branching_depth=5,
+                 samples_per_section=20,
+                 step_length=1.0,
+                 tortuosity=0.3,
+                 branching_spread=0.6,
+                 soma_radius=6.0,
+                 root_radius=1.0,
+                 radius_decay=0.8,
+                 radius_profile=TAPERED_RADIUS,
+                 pathologies=None,
+                 pathology_rate=0.01,
+                 label='synthetic'):
+        """Constructor
+
+        :param seed:
+            The seed of the random generator.
+        :param number_basal_dendrites:
+            The number of the basal dendrites.
+        :param apical_dendrite:
+            Add an apical dendrite.
+        :param axon:
+            Add an axon.
+        :param branching_depth:
+            The branching order of the terminal sections, 0 for arbors with a single section.
+        :param samples_per_section:
+            The number of the samples of every section, excluding the branching point.
+        :param step_length:
+            The distance between two consecutive samples, in microns.
+        :param tortuosity:
+            The amount of noise added to the direction of every step.
+        :param branching_spread:
+            The angular spread of the children sections with respect to their parent.
+        :param soma_radius:
+            The radius of the soma, in microns.
+        :param root_radius:
+            The radius of the first sample of the basal dendrites, in microns.
+        :param radius_decay:
+            The ratio between the radii of a child section and its parent.
+        :param radius_profile:
+            The radius profile, CONSTANT_RADIUS, TAPERED_RADIUS or NOISY_RADIUS.
+        :param pathologies:
+            A list of the pathological cases added to the morphology, from PATHOLOGIES.
+        :param pathology_rate:
+            The fraction of the samples or the arbors affected by every pathological case.
+        :param label:
+            The label of the morphology, and the prefix of its files.
+        """
+
+        # Generation parameters
+        self.seed = seed
+        self.number_basal_dendrites = number_basal_dendrites
+        self.apical_dendrite = apical_dendrite
+        self.axon = axon
+        self.branching_depth = max(0, branching_depth)
+        self.samples_per_section = max(2, samples_per_section)
+        self.step_length = step_length
+        self.tortuosity = tortuosity
+        self.branching_spread = branching_spread
+        self.soma_radius = soma_radius
+        self.root_radius = root_radius
+        self.radius_decay = radius_decay
+        self.radius_profile = radius_profile
+        self.pathologies = pathologies if pathologies is not None else list()
+        self.pathology_rate = pathology_rate
+        self.label = label
+
+        # The samples of the morphology in the SWC layout, a row per sample with the index, type,
+        # x, y, z, radius and parent index. The soma centroid and its profile points come first
+        self.samples = None
+
+        # The sections of the morphology, a row per section with the index of its first sample
+        # in the samples array, its type and the index of its parent section, or -1 for the roots
+        self.sections = None
+
+    ################################################################################################
+    # @get_number_soma_samples
+    ################################################################################################
+    def get_number_soma_samples(self):
+        """Returns the number of the samples of the soma, the centroid and the profile points.
+
+        :return:
+            The number of the samples of the soma.
+        """
+
+        return 1 + self.NUMBER_SOMA_PROFILE_POINTS
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the number of the samples of the arbors of the generated morphology.
+
+        :return:
+            The number of the samples of the arbors.
+        """
+
+        if self.samples is None:
+            return 0
+        return len(self.samples) - self.get_number_soma_samples()
+
+    ################################################################################################
+    # @get_arbors_types
+    ################################################################################################
+    def get_arbors_types(self):
+        """Returns the SWC types of the arbors, the axon first, then the apical dendrite and the
+        basal dendrites.
+
+        :return:
+            A numpy array of the types of the arbors.
+        """
+
+        types = list()
+        if self.axon:
+            types.append(nmv.consts.Arbors.SWC_AXON_SAMPLE_TYPE)
+        if self.apical_dendrite:
+            types.append(nmv.consts.Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE)
+        types.extend([nmv.consts.Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE] *
+                     self.number_basal_dendrites)
+        return numpy.array(types, dtype=numpy.int64)
+
+    ################################################################################################
+    # @get_radii
+    ################################################################################################
+    def get_radii(self,
+                  random_generator,
+                  types,
+                  level):
+        """Computes the radii of the samples of all the sections of a branching level.
+
+        :param random_generator:
+            The random generator.
+        :param types:
+            The types of the sections.
+        :param level:
+            The branching level.
+        :return:
+            An array of the radii, with a row per section.
+        """
+
+        # The radius of the root sample of every arbor
+        root_radii = self.root_radius * self.ARBOR_RADIUS_SCALES[types]
+
+        # Constant radius
+        if self.radius_profile == self.CONSTANT_RADIUS:
+            return numpy.repeat(root_radii[:, None], self.samples_per_section, axis=1)
+
+        # Tapered radius, interpolated along the section to the radius of the children
+        steps = numpy.arange(1, self.samples_per_section + 1) / float(self.samples_per_section)
+        radii = (root_radii * self.radius_decay ** level)[:, None] * \
+            (self.radius_decay ** steps)[None, :]
+
+        # Add the noise
+        if self.radius_profile == self.NOISY_RADIUS:
+            radii *= 1.0 + 0.3 * random_generator.uniform(-1.0, 1.0, size=radii.shape)
+
+        # Return the radii
+        return radii
+
+    ################################################################################################
+    # @generate
+    ################################################################################################
+    def generate(self):
+        """Generates the samples and the sections of the morphology.
+
+        :return:
+            A reference to the generator.
+        """
+
+        # The random generator, all the random numbers are drawn in a fixed order
+        random_generator = numpy.random.RandomState(self.seed)
+        number_samples = self.samples_per_section
+
+        # The types of the arbors
+        types = self.get_arbors_types()
+        number_arbors = len(types)
+
+        # The basal dendrites start in random directions, the apical dendrite goes up and the axon
+        # goes down
+        directions = random_generator.normal(size=(number_arbors, 3))
+        directions[types == nmv.consts.Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE] += (0.0, 4.0, 0.0)
+        directions[types == nmv.consts.Arbors.SWC_AXON_SAMPLE_TYPE] += (0.0, -4.0, 0.0)
+        directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+
+        # The root sections start on the surface of the soma
+        starts = directions * self.soma_radius
+        parents = numpy.full(number_arbors, -1, dtype=numpy.int64)
+        arbors = numpy.arange(number_arbors)
+
+        # The points, radii, types, parents and arbors of the sections, level by level
+        points_list, radii_list, types_list, parents_list, arbors_list = [], [], [], [], []
+        number_sections = 0
+        for level in range(self.branching_depth + 1):
+            number_level_sections = len(directions)
+
+            # The steps along every section, with some noise for the tortuosity
+            steps = directions[:, None, :] + self.tortuosity * random_generator.normal(
+                size=(number_level_sections, number_samples, 3))
+            steps *= self.step_length / numpy.linalg.norm(steps, axis=2)[:, :, None]
+
+            # The root sections start exactly at their starting points
+            if level == 0:
+                steps[:, 0, :] = 0.0
+            points = starts[:, None, :] + numpy.cumsum(steps, axis=1)
+
+            # Add the level
+            points_list.append(points)
+            radii_list.append(self.get_radii(random_generator, types, level))
+            types_list.append(types)
+            parents_list.append(parents)
+            arbors_list.append(arbors)
+
+            # The children sections are branching from the last samples of the level in two
+            # directions, around their parent direction
+            if level < self.branching_depth:
+                perpendiculars = random_generator.normal(size=(number_level_sections, 3))
+                perpendiculars -= numpy.sum(perpendiculars * directions, axis=1)[:, None] * \
+                    directions
+                perpendiculars /= numpy.linalg.norm(perpendiculars, axis=1)[:, None] + 1e-12
+                spread = self.branching_spread * perpendiculars
+                directions = numpy.stack((directions + spread, directions - spread), axis=1)
+                directions = directions.reshape(-1, 3)
+                directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+                starts = numpy.repeat(points[:, -1, :], 2, axis=0)
+                parents = numpy.repeat(
+                    number_sections + numpy.arange(number_level_sections), 2)
+                types = numpy.repeat(types, 2)
+                arbors = numpy.repeat(arbors, 2)
+
+            number_sections += number_level_sections
+
+        # Flatten the levels
+        points = numpy.concatenate(points_list).reshape(-1, 3)
+        radii = numpy.concatenate(radii_list).reshape(-1)
+        section_types = numpy.concatenate(types_list)
+        section_parents = numpy.concatenate(parents_list)
+        section_arbors = numpy.concatenate(arbors_list)
+        sample_sections = numpy.repeat(numpy.arange(number_sections), number_samples)
+
+        # Add the pathological cases
+        self.add_pathologies(random_generator, points, radii, section_types, section_parents,
+                             section_arbors, sample_sections)
+
+        # Order the sections by their depth from the soma, so every parent section, and therefore
+        # every parent sample, comes before its children. The sections are already in this order,
+        # unless the axon is grafted onto a deeper section of a dendrite
+        depths = numpy.zeros(number_sections, dtype=numpy.int64)
+        while True:
+            updated = numpy.where(section_parents >= 0, depths[section_parents] + 1, 0)
+            if numpy.array_equal(updated, depths):
+                break
+            depths = updated
+        order = numpy.argsort(depths, kind='mergesort')
+        new_indices = numpy.argsort(order)
+        points = points.reshape(number_sections, number_samples, 3)[order].reshape(-1, 3)
+        radii = radii.reshape(number_sections, number_samples)[order].reshape(-1)
+        section_types = section_types[order]
+        section_parents = numpy.where(
+            section_parents >= 0, new_indices[section_parents], -1)[order]
+
+        # The soma centroid at the origin and its profile points on a circle in the XY plane
+        number_soma_samples = self.get_number_soma_samples()
+        angles = numpy.linspace(0.0, 2.0 * math.pi, self.NUMBER_SOMA_PROFILE_POINTS,
+                                endpoint=False)
+        soma_points = numpy.zeros((number_soma_samples, 3))
+        soma_points[1:, 0] = self.soma_radius * numpy.cos(angles)
+        soma_points[1:, 1] = self.soma_radius * numpy.sin(angles)
+
+        # The rows of the first samples of the sections
+        first_rows = number_soma_samples + numpy.arange(number_sections) * number_samples
+
+        # The SWC parent indices, every sample is connected to the previous one, the first samples
+        # of the root sections to the soma and the others to the last samples of their parents
+        parent_indices = numpy.arange(number_soma_samples, len(points) + number_soma_samples)
+        parent_indices = parent_indices.reshape(number_sections, number_samples)
+        parent_indices[:, 0] = numpy.where(
+            section_parents >= 0,
+            first_rows[section_parents] + number_samples, 1)
+
+        # Build the samples array in the SWC layout
+        self.samples = numpy.zeros((number_soma_samples + len(points), 7))
+        self.samples[:, 0] = numpy.arange(1, len(self.samples) + 1)
+        self.samples[:number_soma_samples, 1] = nmv.consts.Arbors.SWC_SOMA_SAMPLE_TYPE
+        self.samples[:number_soma_samples, 2:5] = soma_points
+        self.samples[0, 5] = self.soma_radius
+        self.samples[1:number_soma_samples, 5] = 1.0
+        self.samples[0, 6] = nmv.consts.Arbors.SWC_NO_PARENT_SAMPLE_TYPE
+        self.samples[1:number_soma_samples, 6] = 1
+        self.samples[number_soma_samples:, 1] = section_types[sample_sections]
+        self.samples[number_soma_samples:, 2:5] = points
+        self.samples[number_soma_samples:, 5] = radii
+        self.samples[number_soma_samples:, 6] = parent_indices.reshape(-1)
+
+        # Build the sections array
+        self.sections = numpy.stack((first_rows, section_types, section_parents), axis=1)
+
+        # Return a reference to the generator
+        return self
+
+    ################################################################################################
+    # @add_pathologies
+    ################################################################################################
+    def add_pathologies(self,
+                        random_generator,
+                        points,
+                        radii,
+                        section_types,
+                        section_parents,
+                        section_arbors,
+                        sample_sections):
+        """Adds the requested pathological cases to the generated arrays in place.
+
+        :param random_generator:
+            The random generator.
+        :param points:
+            The points of the samples of the arbors.
+        :param radii:
+            The radii of the samples of the arbors.
+        :param section_types:
+            The types of the sections.
+        :param section_parents:
+            The parent sections of the sections.
+        :param section_arbors:
+            The arbors of the sections.
+        :param sample_sections:
+            The sections of the samples.
+        """
+
+        number_samples = self.samples_per_section
+        number_arbors = int(section_arbors.max()) + 1 if len(section_arbors) > 0 else 0
+
+        # Move some arbors away from the soma, along the direction of their root sections
+        if self.DISCONNECTED_ARBORS in self.pathologies and number_arbors > 0:
+            number_disconnected = max(1, int(round(self.pathology_rate * number_arbors)))
+            disconnected = random_generator.choice(
+                number_arbors, min(number_disconnected, number_arbors), replace=False)
+            for arbor in disconnected:
+                root_points = points[arbor * number_samples:(arbor + 1) * number_samples]
+                direction = root_points[-1] - root_points[0]
+                direction /= numpy.linalg.norm(direction) + 1e-12
+                points[section_arbors[sample_sections] == arbor] += \
+                    direction * 2.0 * self.soma_radius
+
+        # Connect the axon to the last sample of a section of a basal dendrite
+        if self.AXON_FROM_DENDRITE in self.pathologies and self.axon and \
+                self.number_basal_dendrites > 0:
+
+            # The candidate sections are the non-root basal sections, or the roots if there are none
+            candidates = section_parents >= 0 if self.branching_depth > 0 else section_parents < 0
+            candidates = numpy.nonzero(
+                candidates & (section_types == nmv.consts.Arbors.SWC_BASAL_DENDRITE_SAMPLE_TYPE))[0]
+            parent = int(candidates[random_generator.randint(len(candidates))])
+
+            # The axon is the first arbor, and its root is the first section
+            fork_point = points[(parent + 1) * number_samples - 1]
+            axon_samples = section_arbors[sample_sections] == 0
+            points[axon_samples] += fork_point - points[0] + (points[1] - points[0])
+            section_parents[0] = parent
+
+        # Duplicate a fraction of the samples, except the first samples of the sections
+        if self.DUPLICATE_SAMPLES in self.pathologies:
+            duplicates = random_generator.uniform(size=len(points)) < self.pathology_rate
+            duplicates[::number_samples] = False
+            indices = numpy.nonzero(duplicates)[0]
+            points[indices] = points[indices - 1]
+            radii[indices] = radii[indices - 1]
+
+        # Set the radii of a fraction of the samples to zero
+        if self.ZERO_RADII in self.pathologies:
+            radii[random_generator.uniform(size=len(radii)) < self.pathology_rate] = 0.0
+
+    ################################################################################################
+    # @write_swc_file
+    ################################################################################################
+    def write_swc_file(self,
+                       output_directory):
+        """Writes the generated morphology to an .SWC file labeled with the morphology label.
+
+        :param output_directory:
+            The directory where the file will be written.
+        :return:
+            The path to the written file.
+        """
+
+        # Generate the morphology if not done yet
+        if self.samples is None:
+            self.generate()
+
+        # Write the samples array directly
+        file_path = '%s/%s.swc' % (output_directory, self.label)
+        numpy.savetxt(file_path, self.samples, fmt='%d %d %f %f %f %f %d',
+                      header='Synthetic morphology generated by NeuroMorphoVis, seed [%d]' %
+                             self.seed)
+
+        # Return the path
+        return file_path
+
+    ################################################################################################
+    # @write_h5_file
+    ################################################################################################
+    def write_h5_file(self,
+                      output_directory):
+        """Writes the generated morphology to an .H5 file labeled with the morphology label.
+
+        As in the .H5 format, the first point of every non-root section is a copy of the last point
+        of its parent section and the diameters are stored instead of the radii.
+
+        :param output_directory:
+            The directory where the file will be written.
+        :return:
+            The path to the written file, or None if the h5py module is not available.
+        """
+
+        # Import the h5py module to write the .H5 file
+        try:
+            import h5py
+        except ImportError:
+            nmv.logger.log('ERROR: Cannot find a compatible \'h5py\' version!')
+            return None
+
+        # Generate the morphology if not done yet
+        if self.samples is None:
+            self.generate()
+
+        number_soma_samples = self.get_number_soma_samples()
+        number_samples = self.samples_per_section
+        first_rows = self.sections[:, 0]
+        parents = self.sections[:, 2]
+
+        # The rows of the points of every section, prefixed by the last row of the parent section
+        rows = first_rows[:, None] + numpy.arange(number_samples)[None, :]
+        parent_rows = numpy.where(parents >= 0, first_rows[parents] + number_samples - 1, -1)
+        rows = numpy.concatenate((parent_rows[:, None], rows), axis=1)
+        rows = rows[rows >= 0]
+
+        # The points, starting with the profile points of the soma
+        points_rows = numpy.concatenate((numpy.arange(1, number_soma_samples), rows))
+        points = numpy.zeros((len(points_rows), 4))
+        points[:, 0:3] = self.samples[points_rows, 2:5]
+        points[:, 3] = 2.0 * self.samples[points_rows, 5]
+
+        # The structure, the offset, the type and the parent of every section, the soma first
+        section_sizes = number_samples + (parents >= 0)
+        offsets = number_soma_samples - 1 + numpy.concatenate(
+            ([0], numpy.cumsum(section_sizes)[:-1]))
+        structure = numpy.zeros((len(self.sections) + 1, 3), dtype=numpy.int32)
+        structure[0] = (0, nmv.consts.Arbors.SWC_SOMA_SAMPLE_TYPE, -1)
+        structure[1:, 0] = offsets
+        structure[1:, 1] = self.sections[:, 1]
+        structure[1:, 2] = parents + 1
+
+        # Write the file
+        file_path = '%s/%s.h5' % (output_directory, self.label)
+        with h5py.File(file_path, 'w') as h5_file:
+            h5_file.create_dataset(nmv.consts.Arbors.H5_POINTS_DIRECTORY, data=points)
+            h5_file.create_dataset(nmv.consts.Arbors.H5_STRUCTURE_DIRECTORY, data=structure)
+
+        # Return the path
+        return file_path
+
+    ################################################################################################
+    # @build_morphology
+    ################################################################################################
+    def build_morphology(self):
+        """Builds a NeuroMorphoVis morphology from the generated samples.
+
+        As with the morphology readers, the first sample of every non-root section is a copy of the
+        last sample of its parent section, and an arbor that emanates from an arbor of another type
+        is a separate tree.
+
+        :return:
+            A reference to the morphology skeleton.
+        """
+
+        # Generate the morphology if not done yet
+        if self.samples is None:
+            self.generate()
+
+        number_soma_samples = self.get_number_soma_samples()
+        number_samples = self.samples_per_section
+
+        # Python lists are much faster to index than numpy arrays
+        samples_data = self.samples.tolist()
+        sections_data = self.sections.tolist()
+
+        ############################################################################################
+        # @create_sample
+        ############################################################################################
+        def create_sample(row):
+            data = samples_data[row]
+            return nmv.skeleton.Sample(
+                point=Vector((data[2], data[3], data[4])), radius=data[5], id=int(data[0]),
+                morphology_id=0, type=int(data[1]), parent_id=int(data[6]))
+
+        # Build the sections
+        sections = list()
+        for i, (first_row, section_type, parent_id) in enumerate(sections_data):
+
+            # The samples of the section
+            samples = list()
+            if parent_id >= 0:
+                samples.append(create_sample(sections_data[parent_id][0] + number_samples - 1))
+            for row in range(first_row, first_row + number_samples):
+                samples.append(create_sample(row))
+
+            # The section
+            section = nmv.skeleton.Section(
+                id=i, parent_id=parent_id, samples=samples, type=section_type)
+            sections.append(section)
+
+            # Link the section to its parent if they have the same type
+            if parent_id >= 0 and sections_data[parent_id][1] == section_type:
+                section.parent = sections[parent_id]
+                section.parent.children.append(section)
+                section.parent.children_ids.append(i)
+            else:
+                section.parent_id = None
+
+        # Group the arbors by type, extra axons and apical dendrites are added to the basals
+        axons, apical_dendrites, basal_dendrites = list(), list(), list()
+        for section in sections:
+            if section.parent is not None:
+                continue
+            if section.type == nmv.consts.Arbors.SWC_AXON_SAMPLE_TYPE:
+                axons.append(section)
+            elif section.type == nmv.consts.Arbors.SWC_APICAL_DENDRITE_SAMPLE_TYPE:
+                apical_dendrites.append(section)
+            else:
+                basal_dendrites.append(section)
+        basal_dendrites.extend(axons[1:] + apical_dendrites[1:])
+
+        # Build the soma
+        roots = axons + apical_dendrites + basal_dendrites
+        soma = nmv.skeleton.Soma(
+            centroid=Vector(samples_data[0][2:5]), mean_radius=self.soma_radius,
+            profile_points=[Vector(samples_data[row][2:5])
+                            for row in range(1, number_soma_samples)],
+            arbors_profile_points=[root.samples[0].point for root in roots])
+
+        # Construct the morphology skeleton
+        return nmv.skeleton.Morphology(
+            soma=soma, axon=axons[0] if len(axons) > 0 else None, dendrites=basal_dendrites,
+            apical_dendrite=apical_dendrites[0] if len(apical_dendrites) > 0 else None,
+            label=self.label)
+
+
+####################################################################################################
+# @create_synthetic_morphology_generator
+####################################################################################################
+def create_synthetic_morphology_generator(number_samples,
+                                          seed=0,
+                                          pathologies=None,
+                                          label=None):
+    """Creates a generator of a morphology with approximately a given number of samples, with an
+    axon, an apical dendrite and six basal dendrites. The branching depth is selected to keep
+    around twenty samples per section.
+
+    :param number_samples:
+        The requested number of samples of the arbors.
+    :param seed:
+        The seed of the random generator.
+    :param pathologies:
+        A list of the pathological cases added to the morphology.
+    :param label:
+        The label of the morphology, synthetic_<number_samples> by default.
+    :return:
+        A SyntheticMorphologyGenerator.
+    """
+
+    # Eight arbors with twenty samples per section
+    number_arbors = 8
+    samples_per_section = 20
+
+    # The branching depth, then the samples per section to match the requested number of samples
+    sections_per_arbor = max(1.0, number_samples / float(number_arbors * samples_per_section))
+    branching_depth = max(0, int(math.ceil(math.log(sections_per_arbor + 1, 2))) - 1)
+    sections_per_arbor = 2 ** (branching_depth + 1) - 1
+    samples_per_section = max(
+        2, int(round(number_samples / float(number_arbors * sections_per_arbor))))
+
+    # Create the generator
+    return SyntheticMorphologyGenerator(
+        seed=seed, number_basal_dendrites=number_arbors - 2, apical_dendrite=True, axon=True,
+        branching_depth=branching_depth, samples_per_section=samples_per_section,
+        pathologies=pathologies,
+        label=label if label is not None else 'synthetic_%d' % number_samples)
@@ -16,7 +16,7 @@
 ####################################################################################################
 
 # System imports
-import sys, os, subprocess, time
+import sys, os, subprocess, time, getpass
 
 # Add other modules
 sys.path.append("%s/../consts" % os.path.dirname(os.path.realpath(__file__)))
@@ -261,6 +261,53 @@ def create_batch_job_script_for_multiple_gids(arguments,
     file_ops.write_batch_job_string_to_file(slurm_jobs_directory, script_id, batch_job_config_string)
 
 
+####################################################################################################
+# @create_batch_job_script_for_worker
+####################################################################################################
+def create_batch_job_script_for_worker(arguments,
+                                       worker_index):
+    """Create a batch job file for a worker that processes its share of a target in batch mode.
+
+    :param arguments:
+        Command line arguments.
+    :param worker_index:
+        The index of the worker.
+    """
+
+    # Create slurm configuration
+    slurm_config = slurm_configuration.SlurmConfiguration()
+
+    # Update slurm configuration data
+    # Job number should match the worker
+    slurm_config.job_number = worker_index
+
+    # Execution directory, same as output directory
+    slurm_config.execution_directory = '%s' % arguments.output_directory
+
+    # Log directory
+    slurm_config.logs_directory = '%s/%s' % (arguments.output_directory,
+                                             paths_consts.Paths.SLURM_LOGS_FOLDER)
+
+    # Generate the batch job configuration string
+    batch_job_config_string = create_batch_job_config_string(slurm_config)
+
+    # Setup the shell command
+    shell_commands = arguments_parser.create_executable_for_worker(arguments, worker_index)
+
+    shell_command = ''
+    for command in shell_commands:
+        shell_command += command + '\n'
+
+    # Add the command to the batch job config string
+    batch_job_config_string += shell_command
+
+    # Write the batch job script to file in the slurm jobs directory
+    slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
+                                      paths_consts.Paths.SLURM_JOBS_FOLDER)
+    file_ops.write_batch_job_string_to_file(
+        slurm_jobs_directory, 'worker_%d' % worker_index, batch_job_config_string)
+
+
 ####################################################################################################
 # @create_batch_job_script_for_morphology_file
 ####################################################################################################
@@ -395,11 +442,32 @@ def run_gid_jobs_on_cluster(arguments,
         # Create the batch jobs for the all the GIDs in the target
         create_batch_job_script_for_gid(arguments=arguments, gid=gid)
 
-    # Submit the jobs
-    # TODO: Add an option for the user
+    # Submit the jobs as the current user
+    slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
+                                      paths_consts.Paths.SLURM_JOBS_FOLDER)
+    submit_batch_jobs(user_name=getpass.getuser(), slurm_jobs_directory=slurm_jobs_directory)
+
+
+####################################################################################################
+# @run_target_batch_jobs_on_cluster
+####################################################################################################
+def run_target_batch_jobs_on_cluster(arguments):
+    """Runs a target in batch mode on the cluster, with a job per worker instead of a job per GID.
+    Each job opens the circuit once and streams its share of the morphologies of the target.
+
+    :param arguments:
+        Input arguments.
+    """
+
+    for worker_index in range(max(1, arguments.batch_workers)):
+
+        # Create the batch jobs for all the workers
+        create_batch_job_script_for_worker(arguments=arguments, worker_index=worker_index)
+
+    # Submit the jobs as the current user
     slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
                                       paths_consts.Paths.SLURM_JOBS_FOLDER)
-    submit_batch_jobs(user_name='abdellah', slurm_jobs_directory=slurm_jobs_directory)
+    submit_batch_jobs(user_name=getpass.getuser(), slurm_jobs_directory=slurm_jobs_directory)
 
 
 ####################################################################################################
@@ -420,8 +488,7 @@ def run_morphology_files_jobs_on_cluster(arguments,
         create_batch_job_script_for_morphology_file(
             arguments=arguments, morphology_file=morphology_file)
 
-    # Submit the jobs
-    # TODO: Add an option for the user
+    # Submit the jobs as the current user
     slurm_jobs_directory = '%s/%s' % (arguments.output_directory,
                                       paths_consts.Paths.SLURM_JOBS_FOLDER)
-    submit_batch_jobs(user_name='abdellah', slurm_jobs_directory=slurm_jobs_directory)
+    submit_batch_jobs(user_name=getpass.getuser(), slurm_jobs_directory=slurm_jobs_directory)
@@ -22,3 +22,5 @@ from .time_line import *
 from .timer import *
 from .version import *
 
+
+from .profiling import *
\ No newline at end of file
@@ -0,0 +1,397 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os, sys
+import time
+import json
+import functools
+import cProfile
+
+# Internal imports
+import nmv
+
+
+####################################################################################################
+# @get_peak_rss
+####################################################################################################
+def get_peak_rss():
+    """Returns the peak resident set size of the process.
+
+    :return:
+        The peak RSS in megabytes, or None if it is not available on this platform.
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # The peak RSS is reported in bytes on MAC and in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak_rss / (1024.0 * 1024.0)
+    return peak_rss / 1024.0
+
+
+####################################################################################################
+# @get_current_rss
+####################################################################################################
+def get_current_rss():
+    """Returns the current resident set size of the process.
+
+    :return:
+        The current RSS in megabytes, or None if it is not available on this platform.
+    """
+
+    try:
+        with open('/proc/self/statm', 'r') as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+    except (IOError, OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+####################################################################################################
+# @get_scene_statistics
+####################################################################################################
+def get_scene_statistics():
+    """Counts the objects in the scene and the vertices and faces of the mesh objects.
+
+    :return:
+        A dictionary with the number of objects, vertices and faces.
+    """
+
+    # Blender imports
+    import bpy
+
+    # Count the geometry of the mesh objects
+    number_vertices = 0
+    number_faces = 0
+    for scene_object in bpy.context.scene.objects:
+        if scene_object.type == 'MESH':
+            number_vertices += len(scene_object.data.vertices)
+            number_faces += len(scene_object.data.polygons)
+
+    # Return the statistics
+    return {'objects': len(bpy.context.scene.objects),
+            'vertices': number_vertices,
+            'faces': number_faces}
+
+
+####################################################################################################
+# @ProfileStage
+####################################################################################################
+class ProfileStage:
+    """A stage of the profiled pipeline, used as a context manager.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 profiler,
+                 name):
+        """Constructor
+
+        :param profiler:
+            The profiler where the stage is recorded.
+        :param name:
+            The name of the stage.
+        """
+
+        # Profiler
+        self.profiler = profiler
+
+        # Stage name
+        self.name = name
+
+        # Starting time
+        self.starting_time = 0.0
+
+        # The cProfile profile of the stage, only for the top level stages
+        self.profile = None
+
+        # The timing span of the logger
+        self.span = None
+
+    ################################################################################################
+    # @__enter__
+    ################################################################################################
+    def __enter__(self):
+        """Starts the stage.
+        """
+
+        # Only the top level stages are profiled with cProfile, since the profiles cannot be nested
+        if self.profiler.cprofile and len(self.profiler.stages_stack) == 0:
+            self.profile = cProfile.Profile()
+
+        # Push the stage
+        self.profiler.stages_stack.append(self)
+
+        # Start the logger span and the clock
+        self.span = nmv.logger.span('mesh.%s' % self.name, label=self.profiler.label)
+        self.span.__enter__()
+        self.starting_time = time.time()
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+
+    ################################################################################################
+    # @__exit__
+    ################################################################################################
+    def __exit__(self,
+                 exception_type,
+                 exception_value,
+                 traceback):
+        """Ends the stage and records it.
+        """
+
+        # Stop the clock
+        if self.profile is not None:
+            self.profile.disable()
+        wall_time = time.time() - self.starting_time
+        self.span.__exit__(exception_type, exception_value, traceback)
+
+        # Pop the stage
+        self.profiler.stages_stack.remove(self)
+        parent = self.profiler.stages_stack[-1].name if len(self.profiler.stages_stack) > 0 \
+            else None
+
+        # Record the stage
+        record = {'name': self.name,
+                  'parent': parent,
+                  'wall_time': wall_time,
+                  'peak_rss_mb': get_peak_rss(),
+                  'rss_mb': get_current_rss()}
+        record.update(get_scene_statistics())
+        self.profiler.stages.append(record)
+
+        # Dump the cProfile statistics of the stage
+        if self.profile is not None:
+            self.profile.dump_stats('%s/%s.%s.prof' % (
+                self.profiler.get_profiles_directory(), self.profiler.label, self.name))
+
+        # Do not suppress the exceptions
+        return False
+
+
+####################################################################################################
+# @NoProfileStage
+####################################################################################################
+class NoProfileStage:
+    """An empty stage, returned when the profiler is disabled.
+    """
+
+    ################################################################################################
+    # @__enter__
+    ################################################################################################
+    def __enter__(self):
+        return self
+
+    ################################################################################################
+    # @__exit__
+    ################################################################################################
+    def __exit__(self,
+                 exception_type,
+                 exception_value,
+                 traceback):
+        return False
+
+
+####################################################################################################
+# @Profiler
+####################################################################################################
+class Profiler:
+    """Profiles the stages of the reconstruction of a neuron, and writes a JSON profile per neuron
+    with the wall time, the memory and the scene statistics of each stage.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        """Constructor
+        """
+
+        # Disabled by default
+        self.enabled = False
+
+        # Dump cProfile statistics per stage
+        self.cprofile = False
+
+        # The output directory of the workflow
+        self.output_directory = None
+
+        # The label of the current neuron
+        self.label = None
+
+        # The starting time of the current neuron
+        self.starting_time = 0.0
+
+        # The recorded stages of the current neuron
+        self.stages = list()
+
+        # The stack of the running stages
+        self.stages_stack = list()
+
+    ################################################################################################
+    # @configure
+    ################################################################################################
+    def configure(self,
+                  enabled,
+                  output_directory,
+                  cprofile=False):
+        """Configures the profiler.
+
+        :param enabled:
+            Enable the profiler.
+        :param output_directory:
+            The output directory of the workflow, the profiles are written to its profiles
+            directory.
+        :param cprofile:
+            Dump cProfile statistics for each top level stage.
+        """
+
+        self.enabled = enabled
+        self.output_directory = output_directory
+        self.cprofile = enabled and cprofile
+
+    ################################################################################################
+    # @get_profiles_directory
+    ################################################################################################
+    def get_profiles_directory(self):
+        """Returns the profiles directory, and creates it if it does not exist.
+
+        :return:
+            The path to the profiles directory.
+        """
+
+        # Internal imports
+        import nmv.consts
+
+        profiles_directory = '%s/%s' % (self.output_directory, nmv.consts.Paths.PROFILES_FOLDER)
+        if not os.path.exists(profiles_directory):
+            try:
+                os.makedirs(profiles_directory)
+            except OSError:
+                # Created by another worker in the meanwhile
+                pass
+        return profiles_directory
+
+    ################################################################################################
+    # @begin
+    ################################################################################################
+    def begin(self,
+              label):
+        """Starts the profile of a neuron.
+
+        :param label:
+            The label of the neuron.
+        """
+
+        self.label = label
+        self.stages = list()
+        self.stages_stack = list()
+        self.starting_time = time.time()
+
+    ################################################################################################
+    # @end
+    ################################################################################################
+    def end(self):
+        """Ends the profile of the current neuron and writes it to a JSON file.
+
+        :return:
+            The path to the profile file, or None if the profiler is disabled.
+        """
+
+        if not self.enabled or self.label is None:
+            return None
+
+        # The profile of the neuron
+        profile = {'label': self.label,
+                   'host': nmv.logger.host_name,
+                   'pid': nmv.logger.process_id,
+                   'total_time': time.time() - self.starting_time,
+                   'peak_rss_mb': get_peak_rss(),
+                   'stages': self.stages}
+
+        # Write it
+        profile_file_path = '%s/%s.profile.json' % (self.get_profiles_directory(), self.label)
+        with open(profile_file_path, 'w') as profile_file:
+            json.dump(profile, profile_file, indent=2)
+
+        # Reset
+        self.label = None
+        self.stages = list()
+
+        # Return the path
+        return profile_file_path
+
+    ################################################################################################
+    # @stage
+    ################################################################################################
+    def stage(self,
+              name):
+        """Returns a stage to be used in a with statement.
+
+        :param name:
+            The name of the stage.
+        :return:
+            A context manager that profiles the stage, or does nothing if the profiler is disabled.
+        """
+
+        if not self.enabled or self.label is None:
+            return NoProfileStage()
+        return ProfileStage(self, name)
+
+
+# The profiler of the process
+profiler = Profiler()
+
+
+####################################################################################################
+# @profile_stage
+####################################################################################################
+def profile_stage(name):
+    """A decorator that profiles every call of a function as a stage of the pipeline.
+
+    :param name:
+        The name of the stage.
+    :return:
+        The decorator.
+    """
+
+    ################################################################################################
+    # @decorator
+    ################################################################################################
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+
+            # Call the function directly if the profiler is disabled
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+
+            # Profile the call
+            with profiler.stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,516 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python benchmark-suite.py -- --output results.json [--baseline baseline.json]
+#
+# The suite times the readers, the analysis kernels, the skeleton styles, the meshing techniques,
+# the soma builder and the mesh exporters on a fixed corpus: the bundled morphologies and
+# synthetic morphologies of 10K, 100K and 1M samples generated from a fixed seed. The results are
+# stored as JSON, and if a baseline is given, every benchmark that is slower than the baseline by
+# more than the threshold is reported as a regression and the suite exits with a non-zero status.
+
+import sys, os, copy
+import json
+import time
+import socket
+import tempfile
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import bpy
+
+import nmv
+import nmv.analysis
+import nmv.builders
+import nmv.enums
+import nmv.file
+import nmv.options
+import nmv.scene
+import nmv.skeleton
+import nmv.utilities
+
+
+# The benchmark groups
+BENCHMARK_GROUPS = ['readers', 'analysis', 'skeleton', 'meshing', 'soma', 'export']
+
+# The skeleton styles of the SkeletonBuilder
+SKELETON_METHODS = [
+    ('disconnected-segments', nmv.enums.Skeletonization.Method.DISCONNECTED_SEGMENTS),
+    ('disconnected-sections', nmv.enums.Skeletonization.Method.DISCONNECTED_SECTIONS),
+    ('articulated-sections', nmv.enums.Skeletonization.Method.ARTICULATED_SECTIONS),
+    ('disconnected-skeleton', nmv.enums.Skeletonization.Method.DISCONNECTED_SKELETON_REPAIRED),
+    ('connected-sections', nmv.enums.Skeletonization.Method.CONNECTED_SECTION_REPAIRED),
+]
+
+# The meshing techniques
+MESHING_BUILDERS = [
+    ('piecewise', nmv.builders.PiecewiseBuilder),
+    ('union', nmv.builders.UnionBuilder),
+    ('skinning', nmv.builders.SkinningBuilder),
+    ('meta', nmv.builders.MetaBuilder),
+]
+
+# The mesh export formats
+EXPORT_FORMATS = [
+    ('ply', nmv.enums.Meshing.ExportFormat.PLY),
+    ('obj', nmv.enums.Meshing.ExportFormat.OBJ),
+    ('stl', nmv.enums.Meshing.ExportFormat.STL),
+]
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the benchmark options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # The directory of the bundled morphologies
+    default_directory = '%s/../../data/morphologies' % os.path.dirname(os.path.realpath(__file__))
+
+    # Morphology directory
+    arg_help = 'A directory containing the .h5 or .swc morphologies of the corpus'
+    parser.add_argument('--morphologies-directory',
+                        action='store', default=default_directory,
+                        help=arg_help)
+
+    # Synthetic sizes
+    arg_help = 'Comma-separated numbers of samples of the synthetic morphologies'
+    parser.add_argument('--synthetic-sizes',
+                        action='store', default='10000,100000,1000000',
+                        help=arg_help)
+
+    # Seed
+    arg_help = 'The seed of the synthetic morphologies'
+    parser.add_argument('--seed',
+                        action='store', type=int, default=0,
+                        help=arg_help)
+
+    # Pathological morphology
+    arg_help = 'Add a synthetic morphology with all the pathological cases to the corpus'
+    parser.add_argument('--pathological',
+                        action='store_true', default=False,
+                        help=arg_help)
+
+    # Groups
+    arg_help = 'Comma-separated benchmark groups, from %s' % BENCHMARK_GROUPS
+    parser.add_argument('--groups',
+                        action='store', default=','.join(BENCHMARK_GROUPS),
+                        help=arg_help)
+
+    # Samples limit for the Blender benchmarks
+    arg_help = 'The largest morphology (in samples) used for the skeleton, meshing, soma and ' \
+               'export benchmarks'
+    parser.add_argument('--max-blender-samples',
+                        action='store', type=int, default=100000,
+                        help=arg_help)
+
+    # Number of repetitions
+    arg_help = 'Number of repetitions of each benchmark, the best time is reported'
+    parser.add_argument('--repetitions',
+                        action='store', type=int, default=3,
+                        help=arg_help)
+
+    # Output file
+    arg_help = 'The JSON file where the results are written'
+    parser.add_argument('--output',
+                        action='store', default='benchmark-results.json',
+                        help=arg_help)
+
+    # Baseline file
+    arg_help = 'A JSON results file of a previous run to compare against'
+    parser.add_argument('--baseline',
+                        action='store', default=None,
+                        help=arg_help)
+
+    # Regression threshold
+    arg_help = 'The relative slowdown reported as a regression, 0.2 for 20%%'
+    parser.add_argument('--threshold',
+                        action='store', type=float, default=0.2,
+                        help=arg_help)
+
+    # Minimum time
+    arg_help = 'Benchmarks faster than this time (in seconds) in both runs are not compared, ' \
+               'since their timings are dominated by noise'
+    parser.add_argument('--minimum-time',
+                        action='store', type=float, default=0.01,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @count_samples
+####################################################################################################
+def count_samples(morphology):
+    """Counts the samples of all the arbors of a morphology.
+
+    :param morphology:
+        A given morphology.
+    :return:
+        The total number of samples.
+    """
+
+    # A list to accumulate the number of samples of each section
+    samples = list()
+    nmv.skeleton.ops.apply_operation_to_morphology(
+        *[morphology, lambda section: samples.append(len(section.samples))])
+    return sum(samples)
+
+
+####################################################################################################
+# @read_morphology_file
+####################################################################################################
+def read_morphology_file(morphology_file):
+    """Reads a morphology file with the reader of its format.
+
+    :param morphology_file:
+        The path to an .h5 or .swc file.
+    :return:
+        The morphology, or None if the file cannot be read.
+    """
+
+    if morphology_file.endswith('.swc'):
+        return nmv.file.read_swc_morphology(morphology_file)
+    return nmv.file.read_h5_morphology(morphology_file)
+
+
+####################################################################################################
+# @time_function
+####################################################################################################
+def time_function(function,
+                  setup=None,
+                  repetitions=3):
+    """Times a function, the setup is called before each repetition and is not timed.
+
+    :param function:
+        The timed function, takes the output of the setup as its argument.
+    :param setup:
+        An optional function that prepares the input of the timed function.
+    :param repetitions:
+        Number of repetitions.
+    :return:
+        A dictionary with the best and the mean times in seconds.
+    """
+
+    times = list()
+    for _ in range(max(1, repetitions)):
+
+        # Prepare the input
+        data = setup() if setup is not None else None
+
+        # Time the function
+        starting_time = time.time()
+        function(data)
+        times.append(time.time() - starting_time)
+
+    return {'best': min(times), 'mean': sum(times) / len(times), 'repetitions': len(times)}
+
+
+####################################################################################################
+# @load_corpus
+####################################################################################################
+def load_corpus(args,
+                synthetic_directory):
+    """Loads the bundled morphologies and generates the synthetic ones. The synthetic morphologies
+    are written to .swc and .h5 files to benchmark the readers with them.
+
+    :param args:
+        The benchmark options.
+    :param synthetic_directory:
+        A directory where the synthetic files are written.
+    :return:
+        A list of (name, files paths, morphology) tuples.
+    """
+
+    corpus = list()
+
+    # The bundled morphologies
+    for root, _, files in sorted(os.walk(args.morphologies_directory)):
+        for file_name in sorted(files):
+            if file_name.endswith('.swc') or file_name.endswith('.h5'):
+                file_path = '%s/%s' % (root, file_name)
+                morphology = read_morphology_file(file_path)
+                if morphology is not None:
+                    corpus.append((file_name, [file_path], morphology))
+
+    # The synthetic morphologies, generated from a fixed seed
+    generators = list()
+    for number_samples in [int(size) for size in args.synthetic_sizes.split(',') if size]:
+        generators.append(nmv.skeleton.create_synthetic_morphology_generator(
+            number_samples, seed=args.seed))
+
+    # A pathological morphology for the smallest size
+    if args.pathological and len(generators) > 0:
+        number_samples = min([int(size) for size in args.synthetic_sizes.split(',') if size])
+        generators.append(nmv.skeleton.create_synthetic_morphology_generator(
+            number_samples, seed=args.seed,
+            pathologies=nmv.skeleton.SyntheticMorphologyGenerator.PATHOLOGIES,
+            label='synthetic_%d_pathological' % number_samples))
+
+    # Generate the morphologies and write their files
+    for generator in generators:
+        generator.generate()
+        files = [generator.write_swc_file(synthetic_directory)]
+        h5_file = generator.write_h5_file(synthetic_directory)
+        if h5_file is not None:
+            files.append(h5_file)
+        corpus.append((generator.label, files, generator.build_morphology()))
+
+    return corpus
+
+
+####################################################################################################
+# @benchmark_readers
+####################################################################################################
+def benchmark_readers(corpus, args, results):
+    """Times the parsing of the corpus files with the SWC and H5 readers.
+    """
+
+    for _, files, _ in corpus:
+        for file_path in files:
+            results['readers/%s' % os.path.basename(file_path)] = time_function(
+                lambda _: read_morphology_file(file_path), repetitions=args.repetitions)
+
+
+####################################################################################################
+# @benchmark_analysis
+####################################################################################################
+def benchmark_analysis(corpus, args, results):
+    """Times all the analysis kernels on the corpus morphologies.
+    """
+
+    for name, _, morphology in corpus:
+        for item in nmv.analysis.ui_analysis_items:
+            if item.kernel is None:
+                continue
+            results['analysis/%s/%s' % (item.variable, name)] = time_function(
+                lambda _: item.kernel(morphology), repetitions=args.repetitions)
+
+
+####################################################################################################
+# @benchmark_skeleton
+####################################################################################################
+def benchmark_skeleton(corpus, args, results):
+    """Times each skeleton style of the SkeletonBuilder.
+    """
+
+    for name, _, morphology in corpus:
+        for method_name, method in SKELETON_METHODS:
+
+            # The options of the style
+            options = nmv.options.NeuroMorphoVisOptions()
+            options.morphology.reconstruction_method = method
+
+            ########################################################################################
+            # @setup
+            ########################################################################################
+            def setup():
+                nmv.scene.ops.clear_scene()
+                return nmv.builders.SkeletonBuilder(copy.deepcopy(morphology), options)
+
+            results['skeleton/%s/%s' % (method_name, name)] = time_function(
+                lambda builder: builder.draw_morphology_skeleton(), setup, args.repetitions)
+
+
+####################################################################################################
+# @benchmark_meshing
+####################################################################################################
+def benchmark_meshing(corpus, args, results):
+    """Times each meshing technique.
+    """
+
+    for name, _, morphology in corpus:
+        for builder_name, builder_class in MESHING_BUILDERS:
+
+            # Default meshing options
+            options = nmv.options.NeuroMorphoVisOptions()
+
+            ########################################################################################
+            # @setup
+            ########################################################################################
+            def setup():
+                nmv.scene.ops.clear_scene()
+                return builder_class(copy.deepcopy(morphology), options)
+
+            results['meshing/%s/%s' % (builder_name, name)] = time_function(
+                lambda builder: builder.reconstruct_mesh(), setup, args.repetitions)
+
+
+####################################################################################################
+# @benchmark_soma
+####################################################################################################
+def benchmark_soma(corpus, args, results):
+    """Times the soma builder.
+    """
+
+    for name, _, morphology in corpus:
+
+        # Default soma options
+        options = nmv.options.NeuroMorphoVisOptions()
+
+        ############################################################################################
+        # @setup
+        ############################################################################################
+        def setup():
+            nmv.scene.ops.clear_scene()
+            return nmv.builders.SomaBuilder(copy.deepcopy(morphology), options)
+
+        results['soma/%s' % name] = time_function(
+            lambda builder: builder.reconstruct_soma_mesh(), setup, args.repetitions)
+
+
+####################################################################################################
+# @benchmark_export
+####################################################################################################
+def benchmark_export(corpus, args, results, output_directory):
+    """Times the export formats with the piecewise mesh of each corpus morphology.
+    """
+
+    for name, _, morphology in corpus:
+
+        # Build the mesh once
+        nmv.scene.ops.clear_scene()
+        builder = nmv.builders.PiecewiseBuilder(
+            copy.deepcopy(morphology), nmv.options.NeuroMorphoVisOptions())
+        mesh_object = builder.reconstruct_mesh()
+
+        # Export it in every format
+        for format_name, file_format in EXPORT_FORMATS:
+            results['export/%s/%s' % (format_name, name)] = time_function(
+                lambda _: nmv.file.export_mesh_object_to_file(
+                    mesh_object, output_directory, name, file_format),
+                repetitions=args.repetitions)
+
+        # And as a .blend file
+        results['export/blend/%s' % name] = time_function(
+            lambda _: nmv.file.export_scene_to_blend_file(output_directory, name),
+            repetitions=args.repetitions)
+
+
+####################################################################################################
+# @compare_with_baseline
+####################################################################################################
+def compare_with_baseline(results,
+                          baseline,
+                          threshold,
+                          minimum_time):
+    """Compares the results with a baseline and reports the regressions.
+
+    :param results:
+        The current results.
+    :param baseline:
+        The results of the baseline run.
+    :param threshold:
+        The relative slowdown reported as a regression.
+    :param minimum_time:
+        The benchmarks that are faster than this time in both runs are ignored.
+    :return:
+        A list of the keys of the regressed benchmarks.
+    """
+
+    regressions = list()
+    print('%-70s %12s %12s %8s' % ('BENCHMARK', 'BASELINE (S)', 'CURRENT (S)', 'RATIO'))
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+
+        # Compare the best times
+        baseline_time = baseline[key]['best']
+        current_time = results[key]['best']
+        if max(baseline_time, current_time) < minimum_time:
+            continue
+        ratio = current_time / baseline_time if baseline_time > 0 else float('inf')
+
+        # Report
+        status = ''
+        if ratio > 1.0 + threshold:
+            status = 'REGRESSION'
+            regressions.append(key)
+        elif ratio < 1.0 - threshold:
+            status = 'IMPROVEMENT'
+        print('%-70s %12.4f %12.4f %8.2f %s' % (
+            key[:70], baseline_time, current_time, ratio, status))
+
+    return regressions
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+    groups = args.groups.split(',')
+
+    # A temporary directory for the synthetic morphologies and the exported meshes
+    working_directory = tempfile.mkdtemp(prefix='nmv-benchmarks-')
+
+    # Load the corpus
+    corpus = load_corpus(args, working_directory)
+    blender_corpus = [entry for entry in corpus
+                      if count_samples(entry[2]) <= args.max_blender_samples]
+
+    # Run the benchmarks
+    results = dict()
+    if 'readers' in groups:
+        benchmark_readers(corpus, args, results)
+    if 'analysis' in groups:
+        benchmark_analysis(corpus, args, results)
+    if 'skeleton' in groups:
+        benchmark_skeleton(blender_corpus, args, results)
+    if 'meshing' in groups:
+        benchmark_meshing(blender_corpus, args, results)
+    if 'soma' in groups:
+        benchmark_soma(blender_corpus, args, results)
+    if 'export' in groups:
+        benchmark_export(blender_corpus, args, results, working_directory)
+
+    # Write the results
+    with open(args.output, 'w') as output_file:
+        json.dump({'host': socket.gethostname(),
+                   'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'nmv_version': nmv.utilities.get_nmv_version(),
+                   'blender_version': list(bpy.app.version),
+                   'corpus': {name: count_samples(morphology) for name, _, morphology in corpus},
+                   'results': results}, output_file, indent=2, sort_keys=True)
+    print('Results [%s]' % args.output)
+
+    # Compare with the baseline
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare_with_baseline(
+            results, baseline, args.threshold, args.minimum_time)
+        if len(regressions) > 0:
+            print('[%d] regressions above [%d%%]' % (len(regressions), args.threshold * 100))
+            sys.exit(1)
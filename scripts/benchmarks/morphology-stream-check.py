@@ -0,0 +1,191 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python morphology-stream-check.py -- [--gids 64]
+#
+# Verifies the error handling of the morphology stream with a fake circuit session: a morphology
+# that cannot be loaded is streamed as None, and a failure of the loading thread itself (a circuit
+# query that raises) is raised again in the consumer instead of ending the stream silently. The
+# script exits with a non-zero status if any case fails.
+
+import sys, os
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import nmv
+import nmv.file
+
+
+####################################################################################################
+# @FakeSession
+####################################################################################################
+class FakeSession:
+    """A circuit session that loads the GIDs themselves as morphologies, and fails on request.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 failing_query_gid=None,
+                 failing_load_gid=None):
+        """Constructor
+
+        :param failing_query_gid:
+            The circuit query of the chunk that contains this GID raises.
+        :param failing_load_gid:
+            The loading of the morphology of this GID raises.
+        """
+
+        self.failing_query_gid = failing_query_gid
+        self.failing_load_gid = failing_load_gid
+
+    ################################################################################################
+    # @get_morphology_uris
+    ################################################################################################
+    def get_morphology_uris(self,
+                            gids):
+        """Queries the URIs of a chunk of GIDs.
+
+        :param gids:
+            A list of GIDs.
+        """
+
+        if self.failing_query_gid in gids:
+            raise RuntimeError('Circuit query failed')
+
+    ################################################################################################
+    # @load_morphology
+    ################################################################################################
+    def load_morphology(self,
+                        gid):
+        """Loads the morphology of a GID.
+
+        :param gid:
+            A GID.
+        :return:
+            The GID itself.
+        """
+
+        if gid == self.failing_load_gid:
+            raise IOError('Cannot read the morphology')
+        return gid
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the check options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # Number of GIDs
+    arg_help = 'The number of the streamed GIDs'
+    parser.add_argument('--gids',
+                        action='store', type=int, default=64,
+                        help=arg_help)
+
+    # Chunk size
+    arg_help = 'The number of GIDs queried at once'
+    parser.add_argument('--chunk-size',
+                        action='store', type=int, default=8,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @consume_stream
+####################################################################################################
+def consume_stream(session,
+                   gids,
+                   chunk_size):
+    """Consumes a stream over a fake session.
+
+    :param session:
+        A fake circuit session.
+    :param gids:
+        A list of GIDs.
+    :param chunk_size:
+        The number of GIDs queried at once.
+    :return:
+        A list of the streamed (gid, morphology) tuples, and the exception raised by the stream or
+        None.
+    """
+
+    items = list()
+    stream = nmv.file.MorphologyStream(session, gids, chunk_size=chunk_size, prefetch_size=2)
+    try:
+        for item in stream:
+            items.append(item)
+    except Exception as exception:
+        return items, exception
+    return items, None
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+    gids = list(range(args.gids))
+    failing_gid = args.gids // 2
+
+    failures = 0
+    print('%-24s %10s %10s' % ('CASE', 'STREAMED', 'RESULT'))
+
+    # All the morphologies are streamed in order
+    items, exception = consume_stream(FakeSession(), gids, args.chunk_size)
+    passed = exception is None and items == [(gid, gid) for gid in gids]
+    failures += 0 if passed else 1
+    print('%-24s %10d %10s' % ('complete', len(items), 'PASS' if passed else 'FAIL'))
+
+    # A morphology that cannot be loaded is streamed as None
+    items, exception = consume_stream(
+        FakeSession(failing_load_gid=failing_gid), gids, args.chunk_size)
+    passed = exception is None and \
+        items == [(gid, None if gid == failing_gid else gid) for gid in gids]
+    failures += 0 if passed else 1
+    print('%-24s %10d %10s' % ('failing load', len(items), 'PASS' if passed else 'FAIL'))
+
+    # A failure of the loading thread is raised in the consumer after the previous chunks
+    items, exception = consume_stream(
+        FakeSession(failing_query_gid=failing_gid), gids, args.chunk_size)
+    streamed_gids = gids[:(failing_gid // args.chunk_size) * args.chunk_size]
+    passed = isinstance(exception, RuntimeError) and \
+        items == [(gid, gid) for gid in streamed_gids]
+    failures += 0 if passed else 1
+    print('%-24s %10d %10s' % ('failing query', len(items), 'PASS' if passed else 'FAIL'))
+
+    # Report the failures with the exit status
+    sys.exit(1 if failures > 0 else 0)
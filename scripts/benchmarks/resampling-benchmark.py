@@ -0,0 +1,148 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python resampling-benchmark.py -- --morphologies-directory DIRECTORY
+
+import sys, os, copy
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import nmv
+import nmv.file
+import nmv.skeleton
+import nmv.utilities
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the benchmark options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # The directory of the bundled morphologies
+    default_directory = '%s/../../data/morphologies' % os.path.dirname(os.path.realpath(__file__))
+
+    # Morphology directory
+    arg_help = 'A directory containing .h5 or .swc morphologies, searched recursively'
+    parser.add_argument('--morphologies-directory',
+                        action='store', default=default_directory,
+                        help=arg_help)
+
+    # Number of repetitions
+    arg_help = 'Number of repetitions of each resampling mode, the best time is reported'
+    parser.add_argument('--repetitions',
+                        action='store', type=int, default=3,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @count_samples
+####################################################################################################
+def count_samples(morphology):
+    """Counts the samples of all the arbors of a morphology.
+
+    :param morphology:
+        A given morphology.
+    :return:
+        The total number of samples.
+    """
+
+    # A list to accumulate the number of samples of each section
+    samples = list()
+    nmv.skeleton.ops.apply_operation_to_morphology(
+        *[morphology, lambda section: samples.append(len(section.samples))])
+    return sum(samples)
+
+
+# The benchmarked resampling modes
+RESAMPLING_MODES = [
+    ('fixed-distance',
+     lambda morphology: nmv.skeleton.ops.resample_morphology(morphology)),
+    ('smallest-segment',
+     lambda morphology: nmv.skeleton.ops.apply_operation_to_morphology(
+         *[morphology, nmv.skeleton.ops.resample_section_based_on_smallest_segment])),
+    ('remove-samples-inside-soma',
+     lambda morphology: nmv.skeleton.ops.apply_operation_to_morphology(
+         *[morphology, nmv.skeleton.ops.remove_samples_inside_soma])),
+    ('remove-duplicate-samples',
+     lambda morphology: nmv.skeleton.ops.apply_operation_to_morphology(
+         *[morphology, nmv.skeleton.ops.remove_duplicate_samples])),
+]
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Collect the morphologies
+    morphology_files = list()
+    for root, _, files in os.walk(args.morphologies_directory):
+        for file_name in sorted(files):
+            if file_name.endswith('.swc') or file_name.endswith('.h5'):
+                morphology_files.append('%s/%s' % (root, file_name))
+
+    # Benchmark each morphology
+    print('%-60s %-28s %10s %10s %12s' % ('MORPHOLOGY', 'MODE', 'SAMPLES', 'RESULT', 'TIME (S)'))
+    for morphology_file in morphology_files:
+
+        # Load the morphology
+        if morphology_file.endswith('.swc'):
+            morphology = nmv.file.read_swc_morphology(morphology_file)
+        else:
+            morphology = nmv.file.read_h5_morphology(morphology_file)
+        if morphology is None:
+            continue
+
+        # Run each mode on a fresh copy of the morphology
+        for mode_name, mode_function in RESAMPLING_MODES:
+
+            best_time = None
+            for _ in range(args.repetitions):
+                morphology_copy = copy.deepcopy(morphology)
+
+                timer = nmv.utilities.Timer()
+                timer.start()
+                mode_function(morphology_copy)
+                timer.end()
+
+                if best_time is None or timer.duration() < best_time:
+                    best_time = timer.duration()
+
+            print('%-60s %-28s %10d %10d %12.6f' % (
+                os.path.basename(morphology_file)[:60], mode_name, count_samples(morphology),
+                count_samples(morphology_copy), best_time))
@@ -0,0 +1,243 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python scene-ops-benchmark.py -- --number-objects 10000
+
+import sys, os
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import bpy
+
+import nmv
+import nmv.scene
+import nmv.shading
+import nmv.utilities
+
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the benchmark options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # Number of objects
+    arg_help = 'Number of the objects created in the scene for each operation'
+    parser.add_argument('--number-objects',
+                        action='store', type=int, default=10000,
+                        help=arg_help)
+
+    # Skip the per-object operators
+    arg_help = 'Only benchmark the batched operations, the per-object operators are very slow ' \
+               'on large scenes'
+    parser.add_argument('--batched-only',
+                        action='store_true', default=False,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @create_curve_objects
+####################################################################################################
+def create_curve_objects(number_objects,
+                         link_to_scene=True):
+    """Creates a list of small poly-line curves with a bevel depth, similar to the drawn sections.
+
+    :param number_objects:
+        Number of the created objects.
+    :param link_to_scene:
+        Link the created objects to the scene.
+    :return:
+        A list of the created curve objects.
+    """
+
+    curve_objects = list()
+    for i in range(number_objects):
+
+        # A single poly-line with two points
+        curve_data = bpy.data.curves.new(name='section_%d' % i, type='CURVE')
+        curve_data.dimensions = '3D'
+        curve_data.bevel_depth = 0.1
+        curve_data.bevel_resolution = 1
+        poly_line = curve_data.splines.new('POLY')
+        poly_line.points.add(1)
+        poly_line.points[0].co = (i, 0, 0, 1)
+        poly_line.points[1].co = (i, 1, 0, 1)
+
+        # Create the object
+        curve_objects.append(bpy.data.objects.new('section_%d' % i, curve_data))
+
+    # Link the objects
+    if link_to_scene:
+        nmv.scene.ops.link_objects_to_scene(curve_objects)
+
+    # Return the objects
+    return curve_objects
+
+
+####################################################################################################
+# @per_object_link
+####################################################################################################
+def per_object_link(scene_objects):
+    """Links the objects one by one, deselecting the scene for each object."""
+
+    for scene_object in scene_objects:
+        nmv.scene.ops.deselect_all()
+        bpy.context.scene.objects.link(scene_object)
+
+
+####################################################################################################
+# @per_object_convert
+####################################################################################################
+def per_object_convert(scene_objects):
+    """Converts the objects one by one with bpy.ops.object.convert."""
+
+    for scene_object in scene_objects:
+        nmv.scene.ops.set_active_object(scene_object)
+        bpy.ops.object.convert(target='MESH')
+    return scene_objects
+
+
+####################################################################################################
+# @per_object_assign_material
+####################################################################################################
+def per_object_assign_material(scene_objects,
+                               material):
+    """Assigns the material to the objects one by one, activating each object."""
+
+    for scene_object in scene_objects:
+        nmv.scene.ops.set_active_object(scene_object)
+        nmv.shading.set_material_to_object(scene_object, material)
+
+
+####################################################################################################
+# @per_object_delete
+####################################################################################################
+def per_object_delete(scene_objects):
+    """Deletes the objects one by one with bpy.ops.object.delete."""
+
+    nmv.scene.ops.deselect_all()
+    for scene_object in scene_objects:
+        scene_object.select = True
+        bpy.ops.object.delete(use_global=False)
+
+
+####################################################################################################
+# @run_operations
+####################################################################################################
+def run_operations(mode,
+                   number_objects):
+    """Runs the link, convert, material and delete operations on a fresh scene and reports the time
+    of each operation.
+
+    :param mode:
+        Either 'per-object' or 'batched'.
+    :param number_objects:
+        Number of the objects in the scene.
+    :return:
+        A list of (operation, time) tuples.
+    """
+
+    # Start from an empty scene
+    nmv.scene.ops.clear_scene()
+    material = bpy.data.materials.new('benchmark_material')
+
+    # The timings
+    timings = list()
+    timer = nmv.utilities.Timer()
+
+    # Link
+    curve_objects = create_curve_objects(number_objects, link_to_scene=False)
+    timer.start()
+    if mode == 'per-object':
+        per_object_link(curve_objects)
+    else:
+        nmv.scene.ops.link_objects_to_scene(curve_objects)
+    timer.end()
+    timings.append(('link', timer.duration()))
+
+    # Convert
+    timer.start()
+    if mode == 'per-object':
+        mesh_objects = per_object_convert(curve_objects)
+    else:
+        mesh_objects = nmv.scene.ops.convert_objects_to_meshes(curve_objects)
+    timer.end()
+    timings.append(('convert', timer.duration()))
+
+    # Material
+    timer.start()
+    if mode == 'per-object':
+        per_object_assign_material(mesh_objects, material)
+    else:
+        nmv.shading.set_material_to_objects(mesh_objects, material)
+    timer.end()
+    timings.append(('material', timer.duration()))
+
+    # Delete
+    timer.start()
+    if mode == 'per-object':
+        per_object_delete(mesh_objects)
+    else:
+        nmv.scene.ops.delete_objects(mesh_objects)
+    timer.end()
+    timings.append(('delete', timer.duration()))
+
+    # Clear a full scene
+    create_curve_objects(number_objects)
+    timer.start()
+    nmv.scene.ops.clear_scene()
+    timer.end()
+    timings.append(('clear', timer.duration()))
+
+    # Return the timings
+    return timings
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # The benchmarked modes
+    modes = ['batched'] if args.batched_only else ['per-object', 'batched']
+
+    # Benchmark each mode
+    print('%-12s %-12s %10s %12s' % ('MODE', 'OPERATION', 'OBJECTS', 'TIME (S)'))
+    for mode in modes:
+        for operation, duration in run_operations(mode, args.number_objects):
+            print('%-12s %-12s %10d %12.6f' % (mode, operation, args.number_objects, duration))
@@ -0,0 +1,133 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python sdf-radius-check.py -- [--voxel-size 0.1]
+#
+# Verifies that the signed distance field meshing preserves the radii of the sections: a straight
+# chain of segments is meshed with several radii and smoothing radii, and the mean distance of the
+# vertices from the axis, away from the ends, must match the radius of the chain. The script exits
+# with a non-zero status if any case fails.
+
+import sys, os
+import argparse
+import numpy
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import nmv
+import nmv.consts
+import nmv.mesh
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the check options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # Voxel size
+    arg_help = 'The voxel size of the signed distance field, in microns'
+    parser.add_argument('--voxel-size',
+                        action='store', type=float, default=0.1,
+                        help=arg_help)
+
+    # Number of segments
+    arg_help = 'The number of segments of the chain, one micron each'
+    parser.add_argument('--segments',
+                        action='store', type=int, default=20,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @get_chain_mean_radius
+####################################################################################################
+def get_chain_mean_radius(number_segments,
+                          radius,
+                          voxel_size,
+                          smoothing):
+    """Meshes a straight chain of segments along the x-axis and returns the mean distance of the
+    vertices from the axis, ignoring the vertices close to the ends of the chain.
+
+    :param number_segments:
+        The number of segments of the chain, one micron each.
+    :param radius:
+        The radius of the chain.
+    :param voxel_size:
+        The voxel size of the signed distance field.
+    :param smoothing:
+        The radius of the smooth union.
+    :return:
+        The mean radius of the mesh.
+    """
+
+    # The segments of the chain, all in the same section
+    x = numpy.arange(number_segments + 1, dtype=numpy.float64)
+    points = numpy.stack([x, numpy.zeros_like(x), numpy.zeros_like(x)], axis=1)
+    radii = numpy.full(number_segments, radius)
+
+    # Mesh the chain
+    vertices, _ = nmv.mesh.build_sdf_mesh_arrays(
+        points_1=points[:-1], points_2=points[1:], radii_1=radii, radii_2=radii,
+        voxel_size=voxel_size, narrow_band=nmv.consts.Meshing.SDF_NARROW_BAND,
+        smoothing=smoothing, sections=numpy.zeros(number_segments, dtype=numpy.int64))
+
+    # The distances of the vertices away from the caps
+    inner = (vertices[:, 0] > 2 * radius + 1) & (vertices[:, 0] < number_segments - 2 * radius - 1)
+    return numpy.sqrt(vertices[inner, 1] ** 2 + vertices[inner, 2] ** 2).mean()
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # The mean radius must be within a quarter of a voxel from the actual one
+    tolerance = 0.25 * args.voxel_size
+
+    # Check every case
+    failures = 0
+    print('%10s %10s %12s %10s' % ('RADIUS', 'SMOOTHING', 'MEAN RADIUS', 'RESULT'))
+    for radius in [0.5, 1.0, 2.0]:
+        for smoothing in [0.0, nmv.consts.Meshing.SDF_SMOOTHING, 1.0]:
+            mean_radius = get_chain_mean_radius(
+                args.segments, radius, args.voxel_size, smoothing)
+            passed = abs(mean_radius - radius) <= tolerance
+            failures += 0 if passed else 1
+            print('%10.3f %10.3f %12.4f %10s' % (
+                radius, smoothing, mean_radius, 'PASS' if passed else 'FAIL'))
+
+    # Report the failures with the exit status
+    sys.exit(1 if failures > 0 else 0)
@@ -0,0 +1,86 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python spans-report.py -- --output-directory OUTPUT_DIRECTORY
+
+import sys, os
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import nmv
+import nmv.consts
+import nmv.file
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the report options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # Output directory
+    arg_help = 'The output directory of a batch, the spans are read from its logs directory'
+    parser.add_argument('--output-directory',
+                        action='store', required=True,
+                        help=arg_help)
+
+    # Sorting key
+    arg_help = 'Sort the spans by [total, mean, max or count]'
+    parser.add_argument('--sort',
+                        action='store', default='total',
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Read the spans of all the processes of the batch
+    logs_directory = '%s/%s' % (args.output_directory, nmv.consts.Paths.LOGS_FOLDER)
+    records = nmv.file.read_span_records(logs_directory)
+
+    # Aggregate them by name
+    aggregates = nmv.file.aggregate_span_records(records)
+
+    # Report
+    print('%-40s %8s %12s %12s %12s %12s' % ('SPAN', 'COUNT', 'TOTAL (S)', 'MEAN (S)',
+                                             'MIN (S)', 'MAX (S)'))
+    for name in sorted(aggregates, key=lambda key: aggregates[key][args.sort], reverse=True):
+        entry = aggregates[name]
+        print('%-40s %8d %12.4f %12.4f %12.4f %12.4f' % (
+            name[:40], entry['count'], entry['total'], entry['mean'], entry['min'], entry['max']))
@@ -0,0 +1,122 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python synthetic-morphology-check.py -- [--seeds 8]
+#
+# Verifies that the synthetic morphologies are valid SWC trees: with every pathological case and
+# for several branching depths and seeds, the parent of every sample must be listed before it,
+# i.e. its index must be lower, and the parent of every section must come before the section. The
+# script exits with a non-zero status if any case fails.
+
+import sys, os
+import argparse
+import numpy
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import nmv
+import nmv.skeleton
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the check options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # Number of seeds
+    arg_help = 'The number of the seeds of every case'
+    parser.add_argument('--seeds',
+                        action='store', type=int, default=8,
+                        help=arg_help)
+
+    # Maximum branching depth
+    arg_help = 'The maximum branching depth of the generated arbors'
+    parser.add_argument('--max-depth',
+                        action='store', type=int, default=4,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @count_invalid_parents
+####################################################################################################
+def count_invalid_parents(generator):
+    """Counts the samples and the sections whose parents are not listed before them.
+
+    :param generator:
+        A SyntheticMorphologyGenerator whose morphology is generated.
+    :return:
+        The number of the samples and sections with invalid parents.
+    """
+
+    # Every sample except the soma centroid has a parent with a lower index
+    samples = generator.samples
+    invalid_samples = numpy.count_nonzero(samples[1:, 6] >= samples[1:, 0])
+
+    # Every non-root section has a parent with a lower index
+    parents = generator.sections[:, 2]
+    invalid_sections = numpy.count_nonzero(parents >= numpy.arange(len(parents)))
+
+    return int(invalid_samples + invalid_sections)
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Every pathological case alone, and all of them together
+    generator_class = nmv.skeleton.SyntheticMorphologyGenerator
+    cases = [[]] + [[pathology] for pathology in generator_class.PATHOLOGIES] + \
+        [generator_class.PATHOLOGIES]
+
+    # Check every case
+    failures = 0
+    print('%-72s %8s %10s' % ('PATHOLOGIES', 'INVALID', 'RESULT'))
+    for pathologies in cases:
+        invalid = 0
+        for depth in range(args.max_depth + 1):
+            for seed in range(args.seeds):
+                generator = generator_class(
+                    seed=seed, branching_depth=depth, samples_per_section=4,
+                    pathologies=pathologies, pathology_rate=0.1).generate()
+                invalid += count_invalid_parents(generator)
+        failures += 0 if invalid == 0 else 1
+        print('%-72s %8d %10s' % (', '.join(pathologies) if pathologies else 'none', invalid,
+                                  'PASS' if invalid == 0 else 'FAIL'))
+
+    # Report the failures with the exit status
+    sys.exit(1 if failures > 0 else 0)
@@ -0,0 +1,212 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+# blender -b --python union-benchmark.py -- --morphology-file FILE
+
+import sys, os
+import argparse
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+sys.path.append('%s/../..' % os.path.dirname(os.path.realpath(__file__)))
+
+import bpy
+
+import nmv
+import nmv.consts
+import nmv.file
+import nmv.mesh
+import nmv.scene
+import nmv.skeleton
+import nmv.utilities
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the command line arguments.
+
+    :return:
+        A structure with all the benchmark options.
+    """
+
+    # Create an argument parser, and then add the options one by one
+    parser = argparse.ArgumentParser()
+
+    # The default morphology
+    default_morphology = '%s/../../data/morphologies/swc/C031097B-I4.CNG.swc' % \
+                         os.path.dirname(os.path.realpath(__file__))
+
+    # Morphology file
+    arg_help = 'An .h5 or .swc morphology, the largest arbors are used for the benchmark'
+    parser.add_argument('--morphology-file',
+                        action='store', default=default_morphology,
+                        help=arg_help)
+
+    # Number of arbors
+    arg_help = 'Number of the largest arbors of the morphology used in the benchmark'
+    parser.add_argument('--number-arbors',
+                        action='store', type=int, default=2,
+                        help=arg_help)
+
+    # Skip the sequential union
+    arg_help = 'Only benchmark the reduction tree, the sequential union is very slow on large ' \
+               'arbors'
+    parser.add_argument('--tree-only',
+                        action='store_true', default=False,
+                        help=arg_help)
+
+    # Parse the arguments, and return a list of them
+    return parser.parse_args()
+
+
+####################################################################################################
+# @count_sections
+####################################################################################################
+def count_sections(arbor):
+    """Counts the sections of an arbor.
+
+    :param arbor:
+        The root section of the arbor.
+    :return:
+        The number of sections.
+    """
+
+    number_sections = 0
+    sections = [arbor]
+    while sections:
+        section = sections.pop()
+        number_sections += 1
+        sections.extend(section.children)
+    return number_sections
+
+
+####################################################################################################
+# @draw_arbor_sections
+####################################################################################################
+def draw_arbor_sections(arbor,
+                        bevel_object):
+    """Draws the poly-lines of an arbor and converts them to meshes, exactly like the union builder.
+
+    :param arbor:
+        The root section of the arbor.
+    :param bevel_object:
+        The bevel object used to draw the sections.
+    :return:
+        A list of the mesh objects of the sections.
+    """
+
+    # Construct the poly-lines
+    poly_lines_data = list()
+    nmv.skeleton.ops.get_connected_sections_poly_line_recursively(
+        section=arbor, poly_lines_data=poly_lines_data, poly_line_data=list(),
+        max_branching_level=nmv.consts.Arbors.MAX_BRANCHING_ORDER)
+
+    # Draw the poly-lines
+    poly_line_objects = list()
+    for i, poly_line_data in enumerate(poly_lines_data):
+        poly_line_objects.append(nmv.skeleton.ops.draw_section_from_poly_line_data(
+            data=poly_line_data[0], name=poly_line_data[1], bevel_object=bevel_object,
+            caps=i != 0))
+
+    # Convert them to meshes
+    return nmv.scene.ops.convert_objects_to_meshes(poly_line_objects)
+
+
+####################################################################################################
+# @sequential_union
+####################################################################################################
+def sequential_union(mesh_objects):
+    """Unions the objects one by one into an accumulator, with a cleanup after each union.
+
+    :param mesh_objects:
+        A list of mesh objects.
+    :return:
+        A reference to the union.
+    """
+
+    mesh_object_1 = mesh_objects[0]
+    for mesh_object in mesh_objects[1:]:
+        mesh_object_1 = nmv.mesh.ops.union_mesh_objects(mesh_object_1, mesh_object)
+        bpy.ops.object.editmode_toggle()
+        bpy.ops.mesh.select_all(action='SELECT')
+        bpy.ops.mesh.remove_doubles()
+        bpy.ops.mesh.normals_make_consistent(inside=False)
+        bpy.ops.object.editmode_toggle()
+        nmv.scene.ops.delete_list_objects([mesh_object])
+    return mesh_object_1
+
+
+# The benchmarked union modes
+UNION_MODES = [
+    ('sequential', sequential_union),
+    ('tree', nmv.mesh.ops.union_mesh_objects_in_list),
+]
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Ignore blender extra arguments required to launch blender given to the command line interface
+    args = sys.argv
+    sys.argv = args[args.index("--"):] if "--" in args else args[:1]
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    # Load the morphology
+    if args.morphology_file.endswith('.swc'):
+        morphology = nmv.file.read_swc_morphology(args.morphology_file)
+    else:
+        morphology = nmv.file.read_h5_morphology(args.morphology_file)
+
+    # Resample the morphology like the union builder
+    nmv.skeleton.ops.resample_morphology(morphology)
+
+    # Get the largest arbors
+    arbors = list()
+    if morphology.apical_dendrite is not None:
+        arbors.append(morphology.apical_dendrite)
+    if morphology.dendrites is not None:
+        arbors.extend(morphology.dendrites)
+    if morphology.axon is not None:
+        arbors.append(morphology.axon)
+    arbors.sort(key=count_sections, reverse=True)
+
+    # Benchmark each mode
+    modes = UNION_MODES[1:] if args.tree_only else UNION_MODES
+    print('%-8s %-12s %10s %12s %12s' % ('ARBOR', 'MODE', 'SECTIONS', 'FACES', 'TIME (S)'))
+    for i, arbor in enumerate(arbors[:args.number_arbors]):
+        for mode_name, mode_function in modes:
+
+            # Start from a clean scene
+            nmv.scene.ops.clear_scene()
+            bevel_object = nmv.mesh.create_bezier_circle(radius=1.0, vertices=16, name='bevel')
+            mesh_objects = draw_arbor_sections(arbor, bevel_object)
+            number_sections = len(mesh_objects)
+
+            # Union
+            timer = nmv.utilities.Timer()
+            timer.start()
+            union_mesh = mode_function(mesh_objects)
+            timer.end()
+
+            print('%-8d %-12s %10d %12d %12.6f' % (
+                i, mode_name, number_sections, len(union_mesh.data.polygons), timer.duration()))
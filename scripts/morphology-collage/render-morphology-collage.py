@@ -80,9 +80,15 @@ def parse_command_line_arguments():
 ####################################################################################################
 def load_morphologies(meshes_directory):
 
-    # List all the files in the directory (.blend)
+    # List all the mesh cache files in the directory (.nmc), they are loaded in bulk
     mesh_files = nmv.file.ops.get_files_in_directory(directory=meshes_directory,
-        file_extension='blend')
+        file_extension='nmc')
+    use_mesh_cache = len(mesh_files) > 0
+
+    # Otherwise, list all the files in the directory (.blend)
+    if not use_mesh_cache:
+        mesh_files = nmv.file.ops.get_files_in_directory(directory=meshes_directory,
+            file_extension='blend')
 
     # Sort
     mesh_files.sort()
@@ -93,7 +99,10 @@ def load_morphologies(meshes_directory):
     for mesh_file in mesh_files:
 
         # Load the mesh
-        mesh_objects = nmv.file.import_object_from_blend_file(meshes_directory, mesh_file)
+        if use_mesh_cache:
+            mesh_objects = nmv.file.import_mesh_cache_file(meshes_directory, mesh_file)
+        else:
+            mesh_objects = nmv.file.import_object_from_blend_file(meshes_directory, mesh_file)
 
         # Join all the meshes into a single mesh
         mesh_objects = [nmv.mesh.ops.join_mesh_objects(mesh_objects, mesh_file)]
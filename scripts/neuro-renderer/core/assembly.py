@@ -0,0 +1,234 @@
+####################################################################################################
+# Copyright (c) 2016 - 2018, EPFL / Blue Brain Project
+#               Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of NeuroMorphoVis <https://github.com/BlueBrain/NeuroMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import os
+import json
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal imports
+import nmv
+import nmv.bbox
+import nmv.enums
+import nmv.geometry
+import nmv.rendering
+import loading
+
+
+####################################################################################################
+# @get_neuron_bounds
+####################################################################################################
+def get_neuron_bounds(input_directory,
+                      neuron,
+                      default_radius,
+                      transform=False):
+    """Returns the bounding sphere of a neuron and the levels of detail of its mesh from the
+    .lod.json index that is exported with the mesh. If the neuron has no index, the sphere is
+    centered at the position of the neuron with a default radius.
+
+    :param input_directory:
+        The input directory where the meshes are located.
+    :param neuron:
+        A neuron parsed from the configuration file.
+    :param default_radius:
+        The radius of the neurons that have no index.
+    :param transform:
+        The meshes are placed in the global coordinates with the transformations of the neurons.
+    :return:
+        A tuple (center, radius, levels), where levels is None if the neuron has no index.
+    """
+
+    # The index of the levels of detail of the neuron
+    index_file_path = '%s/neuron_%s.lod.json' % (input_directory, str(neuron.gid))
+    if os.path.isfile(index_file_path):
+        with open(index_file_path, 'r') as index_file:
+            index = json.load(index_file)
+        center = Vector(index['center'])
+        if transform and neuron.transform is not None:
+            center = neuron.transform * center
+        return center, index['radius'], index['levels']
+
+    # The position of the neuron
+    if neuron.position is not None:
+        return Vector(neuron.position), default_radius, None
+    if neuron.transform is not None:
+        return neuron.transform.to_translation(), default_radius, None
+    return Vector((0.0, 0.0, 0.0)), default_radius, None
+
+
+####################################################################################################
+# @get_region_bounding_box
+####################################################################################################
+def get_region_bounding_box(region):
+    """Returns the bounding box of a region given as 'x_min y_min z_min x_max y_max z_max'.
+
+    :param region:
+        A string of the six bounds of the region.
+    :return:
+        The bounding box of the region.
+    """
+
+    bounds = [float(value) for value in region.split()]
+    return nmv.bbox.BoundingBox(p_min=Vector(bounds[0:3]), p_max=Vector(bounds[3:6]))
+
+
+####################################################################################################
+# @select_lod_file
+####################################################################################################
+def select_lod_file(levels,
+                    input_type,
+                    projected_size,
+                    full_detail_size):
+    """Selects the file of the coarsest level of detail whose decimation ratio is enough for the
+    projected size of the neuron, the full mesh is used when it covers full_detail_size pixels.
+
+    :param levels:
+        The levels of detail of the neuron from its index.
+    :param input_type:
+        The type of the input meshes, 'ply', 'obj' or 'cache'.
+    :param projected_size:
+        The projected size of the neuron in pixels.
+    :param full_detail_size:
+        The projected size in pixels that requires the full mesh.
+    :return:
+        The name of the file, or None if no level has a file of the input type.
+    """
+
+    extensions = {'ply': '.ply', 'obj': '.obj', 'cache': '.nmc'}
+    if input_type not in extensions:
+        return None
+
+    # The required ratio
+    ratio = min(1.0, projected_size / full_detail_size)
+
+    # The levels with a file of the input type, from the coarsest to the finest
+    candidates = list()
+    for level in sorted(levels, key=lambda level: level['ratio']):
+        for file_name in level['files']:
+            if file_name.endswith(extensions[input_type]):
+                candidates.append((level['ratio'], file_name))
+    if not candidates:
+        return None
+
+    # The coarsest sufficient level, otherwise the finest one
+    for level_ratio, file_name in candidates:
+        if level_ratio >= ratio:
+            return file_name
+    return candidates[-1][1]
+
+
+####################################################################################################
+# @assemble_neurons_into_scene
+####################################################################################################
+def assemble_neurons_into_scene(input_directory,
+                                neurons,
+                                input_type,
+                                transform=False,
+                                bounding_box=None,
+                                camera_views=(nmv.enums.Camera.View.FRONT,),
+                                camera_projection=nmv.enums.Camera.Projection.ORTHOGRAPHIC,
+                                image_resolution=512,
+                                cull_size=1.0,
+                                proxy_size=8.0,
+                                full_detail_size=512.0,
+                                default_radius=300.0):
+    """Loads the neurons into the scene with a detail that depends on their projected sizes in the
+    rendered views. The neurons outside the views or smaller than cull_size pixels are culled,
+    the ones smaller than proxy_size pixels are drawn as spheres, and the others are loaded at
+    the level of detail that matches their sizes.
+
+    :param input_directory:
+        The input directory where the meshes are located.
+    :param neurons:
+        A list of all the neurons parsed from the configuration file.
+    :param input_type:
+        The types of the input meshes, 'blend', 'ply', 'obj' or 'cache'.
+    :param transform:
+        Place the neurons in the global coordinates by updating the matrices of their objects.
+    :param bounding_box:
+        The bounding box that is rendered, by default the bounding box of all the neurons.
+    :param camera_views:
+        The views that are rendered.
+    :param camera_projection:
+        Camera projection either orthographic or perspective.
+    :param image_resolution:
+        The 'base' resolution of the images.
+    :param cull_size:
+        The projected size in pixels under which the neurons are culled.
+    :param proxy_size:
+        The projected size in pixels under which the neurons are drawn as spheres.
+    :param full_detail_size:
+        The projected size in pixels that requires the full meshes.
+    :param default_radius:
+        The radius of the neurons that have no index of levels of detail.
+    :return:
+        The bounding box that is rendered.
+    """
+
+    # The bounds of the neurons
+    bounds = [get_neuron_bounds(input_directory, neuron, default_radius, transform)
+              for neuron in neurons]
+    centers = numpy.array([list(center) for center, _, _ in bounds]).reshape(-1, 3)
+    radii = numpy.array([radius for _, radius, _ in bounds])
+
+    # The bounding box of all the neurons
+    if bounding_box is None:
+        bounding_box = nmv.bbox.BoundingBox(
+            p_min=Vector((centers - radii[:, None]).min(axis=0).tolist()),
+            p_max=Vector((centers + radii[:, None]).max(axis=0).tolist()))
+
+    # The largest projected size of every neuron in the rendered views
+    projected_sizes = numpy.zeros(len(neurons))
+    for camera_view in camera_views:
+        projected_sizes = numpy.maximum(projected_sizes, nmv.rendering.Camera.get_projected_sizes(
+            bounding_box=bounding_box, centers=centers, radii=radii, camera_view=camera_view,
+            camera_projection=camera_projection, image_resolution=image_resolution))
+
+    # Load every neuron with its detail
+    culled = proxies = 0
+    for neuron, (center, radius, levels), projected_size in zip(neurons, bounds, projected_sizes):
+
+        # Culled
+        if projected_size < cull_size:
+            neuron.membrane_meshes = None
+            culled += 1
+
+        # A sphere
+        elif projected_size < proxy_size:
+            location = neuron.position if neuron.position is not None else center
+            neuron.membrane_meshes = [nmv.geometry.create_uv_sphere(
+                location=location, radius=neuron.soma_mean_radius, subdivisions=8,
+                name='neuron_%s' % str(neuron.gid))]
+            proxies += 1
+
+        # A level of detail of the mesh, or the full mesh if the neuron has no levels
+        else:
+            input_file_name = None
+            if levels is not None:
+                input_file_name = select_lod_file(
+                    levels, input_type, projected_size, full_detail_size)
+            loading.load_neuron_membrane_meshes(
+                input_directory, neuron, input_type, input_file_name, transform)
+
+    print('* Assembly: [%d] meshes, [%d] spheres, [%d] culled' %
+          (len(neurons) - culled - proxies, proxies, culled))
+
+    # Return the rendered bounding box
+    return bounding_box
@@ -21,6 +21,10 @@ import os
 # Blender imports
 import bpy
 
+# Internal imports
+import nmv
+import nmv.file
+
 
 ####################################################################################################
 # @import_obj_file
@@ -152,6 +156,66 @@ def load_object_from_blend_file(input_directory,
     return objects
 
 
+####################################################################################################
+# @load_neuron_membrane_meshes
+####################################################################################################
+def load_neuron_membrane_meshes(input_directory,
+                                neuron,
+                                input_type,
+                                input_file_name=None,
+                                transform=False):
+    """Loads the meshes of the membrane of a single neuron into the scene.
+
+    :param input_directory:
+        The input directory where the meshes are located.
+    :param neuron:
+        A neuron parsed from the configuration file.
+    :param input_type:
+        The type of the input mesh, 'blend', 'ply', 'obj' or 'cache'.
+    :param input_file_name:
+        The name of the mesh file, for example a level of detail, by default neuron_<GID>.
+    :param transform:
+        Place the neuron in the global coordinates by updating the matrices of its objects.
+    """
+
+    # The default file of the neuron
+    if input_file_name is None:
+        extensions = {'blend': 'blend', 'ply': 'ply', 'obj': 'obj', 'cache': 'nmc'}
+        if input_type not in extensions:
+            print('ERROR: Unrecognized input type [%s]' % input_type)
+            return
+        input_file_name = 'neuron_%s.%s' % (str(neuron.gid), extensions[input_type])
+
+    # .blend neurons
+    if input_type == 'blend':
+        neuron.membrane_meshes = load_object_from_blend_file(input_directory, input_file_name)
+
+    # .ply neurons
+    elif input_type == 'ply':
+        neuron.membrane_meshes = [load_ply_file(input_directory, input_file_name)]
+
+    # .obj neurons
+    elif input_type == 'obj':
+        neuron.membrane_meshes = [load_obj_file(input_directory, input_file_name)]
+
+    # .nmc neurons, the meshes are created in bulk, and the transformation stored in the cache
+    # is used if the configuration has none
+    elif input_type == 'cache':
+        neuron.membrane_meshes = nmv.file.import_mesh_cache_file(
+            input_directory, input_file_name, transform=transform,
+            transformation_matrix=neuron.transform)
+        return
+
+    else:
+        print('ERROR: Unrecognized input type [%s]' % input_type)
+
+    # Transform the objects of the neuron through their matrices rather than their vertices
+    if transform and neuron.membrane_meshes is not None and neuron.transform is not None:
+        for i_object in neuron.membrane_meshes:
+            if i_object is not None:
+                i_object.matrix_world = neuron.transform * i_object.matrix_world
+
+
 ################################################################################
 # @ load_neurons
 ################################################################################
@@ -166,33 +230,12 @@ def load_neurons_membrane_meshes_into_scene(input_directory,
     :param neurons_list:
         A list of all the neurons parsed from the configuration file.
     :param input_type:
-        The types of the input meshes, 'blend', 'ply' or 'obj' .
+        The types of the input meshes, 'blend', 'ply', 'obj' or 'cache'.
+    :param transform:
+        Place the neurons in the global coordinates by updating the matrices of their objects.
     """
 
     # Get the neurons meshes
     for neuron in neurons_list:
-
-        # .blend neurons
-        if input_type == 'blend':
-            input_file_name = 'neuron_%s.blend' % str(neuron.gid)
-            neuron.membrane_meshes = load_object_from_blend_file(input_directory, input_file_name)
-
-        # .ply neurons
-        elif input_type == 'ply':
-            input_file_name = 'neuron_%s.ply' % str(neuron.gid)
-            neuron.membrane_meshes = [load_ply_file(input_directory, input_file_name)]
-
-        # .obj neurons
-        elif input_type == 'obj':
-            input_file_name = 'neuron_%s.obj' % str(neuron.gid)
-            neuron.membrane_meshes = [load_obj_file(input_directory, input_file_name)]
-
-        else:
-            print('ERROR: Unrecognized input type [%s]' % input_type)
-
-    if transform:
-        print('Transforming')
-        for i_neuron in neurons_list:
-            for i_object in i_neuron.membrane_meshes:
-                for vertex in i_object.data.vertices:
-                    vertex.co = i_neuron.transform * vertex.co
\ No newline at end of file
+        load_neuron_membrane_meshes(
+            input_directory, neuron, input_type, transform=transform)
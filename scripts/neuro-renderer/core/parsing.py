@@ -51,7 +51,7 @@ def parse_command_line_arguments(arguments=None):
     parser.add_argument('--input-directory',
                         action='store', dest='input_directory', help=arg_help)
 
-    arg_help = 'Input data type: blend, ply, obj'
+    arg_help = 'Input data type: blend, ply, obj, cache'
     parser.add_argument('--input-type',
                         action='store', dest='input_type', help=arg_help)
 
@@ -83,6 +83,33 @@ def parse_command_line_arguments(arguments=None):
     parser.add_argument('--prefix',
                         action='store', default='image', dest='prefix', help=arg_help)
 
+    arg_help = 'Select the levels of detail of the neurons, spheres or culling by projected size'
+    parser.add_argument('--lod',
+                        action='store_true', default=False, dest='lod', help=arg_help)
+
+    arg_help = 'Projected size in pixels under which the neurons are culled'
+    parser.add_argument('--cull-size',
+                        action='store', default=1.0, type=float, dest='cull_size', help=arg_help)
+
+    arg_help = 'Projected size in pixels under which the neurons are drawn as spheres'
+    parser.add_argument('--proxy-size',
+                        action='store', default=8.0, type=float, dest='proxy_size', help=arg_help)
+
+    arg_help = 'Projected size in pixels that requires the full meshes of the neurons'
+    parser.add_argument('--full-detail-size',
+                        action='store', default=512.0, type=float, dest='full_detail_size',
+                        help=arg_help)
+
+    arg_help = 'Radius of the neurons that have no index of levels of detail, in microns'
+    parser.add_argument('--neuron-radius',
+                        action='store', default=300.0, type=float, dest='neuron_radius',
+                        help=arg_help)
+
+    arg_help = 'Rendered region \'x_min y_min z_min x_max y_max z_max\', the neurons outside ' \
+               'are culled with --lod, by default the whole scene'
+    parser.add_argument('--region',
+                        action='store', default=None, dest='region', help=arg_help)
+
     # Parse the arguments
     return parser.parse_args()
 
@@ -103,6 +103,11 @@ def apply_style(neurons,
     """
 
     print('* Applying style')
+
+    # The membrane objects with their colors and shaders
+    membrane_objects = list()
+    colors = list()
+    shaders = list()
     for i, neuron in enumerate(neurons):
 
         if neuron.membrane_meshes is None:
@@ -117,18 +122,15 @@ def apply_style(neurons,
         # Shader
         shader = nmv.enums.Shading.get_enum(get_tag_shader(tag, styles))
 
-        # Alpha
-        alpha = get_tag_alpha(tag, styles)
-
-        style_name = 'style_%s_%s' % (str(tag),  str(neuron.gid))
-
-        # Create the shader from the shader library
-        material = nmv.shading.create_material(style_name, color, shader)
-
-        # Apply the shader to the membrane object
+        # Add the membrane objects
         for membrane_mesh in neuron.membrane_meshes:
             if membrane_mesh is None: continue
-            nmv.shading.set_material_to_object(membrane_mesh, material)
+            membrane_objects.append(membrane_mesh)
+            colors.append(color)
+            shaders.append(shader)
+
+    # A shared material per shader, the colors are set per object
+    nmv.shading.apply_object_color_materials(membrane_objects, colors, shaders)
 
 
 ####################################################################################################
@@ -147,6 +149,8 @@ def draw_spheres(neurons,
     """
 
     spheres = list()
+    colors = list()
+    shaders = list()
 
     for i, neuron in enumerate(neurons):
 
@@ -154,25 +158,18 @@ def draw_spheres(neurons,
         tag = neuron.tag
 
         # Color
-        color = get_tag_rgb_color(tag, styles)
+        colors.append(get_tag_rgb_color(tag, styles))
 
         # Shader
-        shader = nmv.enums.Shading.get_enum(get_tag_shader(tag, styles))
-
-        # Alpha
-        alpha = get_tag_alpha(tag, styles)
-
-        style_name = 'style_%s_%s' % (str(tag), str(neuron.gid))
-
-        # Create the shader from the shader library
-        material = nmv.shading.create_material(style_name, color, shader)
+        shaders.append(nmv.enums.Shading.get_enum(get_tag_shader(tag, styles)))
 
         # Draw the sphere
         neuron_sphere = nmv.geometry.create_uv_sphere(location=neuron.position,
             radius=neuron.soma_mean_radius, name='neuron_%s' % str(neuron.gid))
         spheres.append(neuron_sphere)
 
-        nmv.shading.set_material_to_object(neuron_sphere, material)
+    # A shared material per shader, the colors are set per sphere
+    nmv.shading.apply_object_color_materials(spheres, colors, shaders)
 
     # Return a list of spheres of the neurons
     return spheres
@@ -283,6 +280,11 @@ def apply_rainbow_style(neurons,
     """
 
     print('* Applying style')
+
+    # The membrane objects with their colors and shaders
+    membrane_objects = list()
+    colors = list()
+    shaders = list()
     for i, neuron in enumerate(neurons):
 
         if neuron.membrane_meshes is None:
@@ -300,15 +302,12 @@ def apply_rainbow_style(neurons,
         # Shader
         shader = nmv.enums.Shading.get_enum(get_tag_shader(tag, styles))
 
-        # Alpha
-        alpha = get_tag_alpha(tag, styles)
-
-        style_name = 'style_%s_%s' % (str(tag),  str(neuron.gid))
-
-        # Create the shader from the shader library
-        material = nmv.shading.create_material(style_name, color, shader)
-
-        # Apply the shader to the membrane object
+        # Add the membrane objects
         for membrane_mesh in neuron.membrane_meshes:
             if membrane_mesh is None: continue
-            nmv.shading.set_material_to_object(membrane_mesh, material)
\ No newline at end of file
+            membrane_objects.append(membrane_mesh)
+            colors.append(color)
+            shaders.append(shader)
+
+    # A shared material per shader, the colors are set per object
+    nmv.shading.apply_object_color_materials(membrane_objects, colors, shaders)
\ No newline at end of file
@@ -23,6 +23,7 @@ sys.path.append(('%s/core' %(os.path.dirname(os.path.realpath(__file__)))))
 
 
 # Blender imports
+import assembly
 import loading
 import parsing
 import styling
@@ -56,6 +57,9 @@ if __name__ == "__main__":
     # Clear the scene
     nmv.scene.clear_scene()
 
+    # The rendered bounding box, computed by the assembly of the neurons if used
+    bb = None
+
     if args.use_spheres:
 
         # Draw the neurons as spheres to know their positions
@@ -63,16 +67,32 @@ if __name__ == "__main__":
     else:
         print('Importing [%d] neurons' % len(neurons))
 
+        # Load the neurons with the detail of their projected sizes, the returned bounding box is
+        # the one that was used to select the details, and it is rendered as is
+        if args.lod:
+            bb = assembly.assemble_neurons_into_scene(
+                args.input_directory, neurons, args.input_type, args.transform,
+                bounding_box=assembly.get_region_bounding_box(args.region) if args.region else None,
+                camera_views=[nmv.enums.Camera.View.SIDE, nmv.enums.Camera.View.FRONT],
+                camera_projection=nmv.enums.Camera.Projection.get_enum(args.projection),
+                image_resolution=int(args.resolution), cull_size=args.cull_size,
+                proxy_size=args.proxy_size, full_detail_size=args.full_detail_size,
+                default_radius=args.neuron_radius)
+
         # Load the neurons into the scene
-        neuron_objects = loading.load_neurons_membrane_meshes_into_scene(
-            args.input_directory, neurons, args.input_type, args.transform)
+        else:
+            neuron_objects = loading.load_neurons_membrane_meshes_into_scene(
+                args.input_directory, neurons, args.input_type, args.transform)
 
         # Apply the style
         # styling.apply_style(neurons, styles)
 
-    # Setup the camera
+    # Setup the camera, with the bounding box of the assembly if the neurons were assembled
     camera = nmv.rendering.Camera('%s_camera' % args.prefix)
-    bb = nmv.bbox.compute_scene_bounding_box_for_meshes()
+    if bb is None and args.region:
+        bb = assembly.get_region_bounding_box(args.region)
+    elif bb is None:
+        bb = nmv.bbox.compute_scene_bounding_box_for_meshes()
 
     # Color based on the height
     styling.apply_rainbow_style(neurons, styles, bb.p_min[1], bb.p_max[1])
@@ -16,54 +16,230 @@
 ####################################################################################################
 
 # System imports
-import os, sys, ntpath, h5py
+import os, sys, argparse, subprocess
 
 # Blender imports
 import bpy
-from mathutils import Vector
 
 # NeuroMorphoVis imports
 import nmv
-import nmv.mesh
+import nmv.enums
 import nmv.scene
 
 # Internal imports
-project_space = ntpath.basename(os.path.dirname(os.path.realpath(__file__)))
-project_path = os.path.dirname(os.path.realpath(__file__)).replace(project_space, '')
-sys.path.append(project_path)
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
 import vasculature_loader
 import vasculature_skeletonizer
+import vasculature_sketcher
 
 
 ####################################################################################################
-# @reconstruct_vasculature
+# @parse_command_line_arguments
 ####################################################################################################
-def reconstruct_vasculature():
+def parse_command_line_arguments():
+    """Parses the arguments that are given to the script after the '--' of Blender.
 
-    # Clear the scene
-    nmv.scene.ops.clear_scene()
+    :return:
+        Arguments list.
+    """
+
+    # The arguments of the script
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else list()
+
+    # add all the options
+    description = 'Vasculature: reconstructs the meshes of a vasculature dataset block by block'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The vasculature dataset (.h5)'
+    parser.add_argument('--morphology',
+                        action='store', dest='morphology', help=arg_help,
+                        default='/data/morphologies/vasculature/vasculature-datas-set-2.h5')
+
+    arg_help = 'Output directory, where the meshes of the blocks will be stored'
+    parser.add_argument('--output-directory',
+                        action='store', dest='output_directory', help=arg_help)
+
+    arg_help = 'The size of the blocks in microns'
+    parser.add_argument('--block-size',
+                        action='store', type=float, default=200.0, dest='block_size',
+                        help=arg_help)
+
+    arg_help = 'The number of the rows read at once from the dataset'
+    parser.add_argument('--chunk-size',
+                        action='store', type=int, default=1000000, dest='chunk_size',
+                        help=arg_help)
+
+    arg_help = 'The format of the meshes of the blocks: ply, obj or stl'
+    parser.add_argument('--export-format',
+                        action='store', default='ply', dest='export_format', help=arg_help)
+
+    arg_help = 'The number of the worker processes, every worker is a background Blender process'
+    parser.add_argument('--workers',
+                        action='store', type=int, default=1, dest='workers', help=arg_help)
+
+    arg_help = 'The index of the worker, used internally by the worker processes'
+    parser.add_argument('--worker-index',
+                        action='store', type=int, default=None, dest='worker_index',
+                        help=arg_help)
+
+    # Parse the arguments
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @get_export_format
+####################################################################################################
+def get_export_format(export_format):
+    """Returns the export format of the meshes from its name.
+
+    :param export_format:
+        The name of the format.
+    :return:
+        The export format.
+    """
+
+    if export_format == 'obj':
+        return nmv.enums.Meshing.ExportFormat.OBJ
+    elif export_format == 'stl':
+        return nmv.enums.Meshing.ExportFormat.STL
+    return nmv.enums.Meshing.ExportFormat.PLY
+
+
+####################################################################################################
+# @get_skeleton_parameters
+####################################################################################################
+def get_skeleton_parameters(arguments):
+    """Returns the parameters that define the skeleton, to detect a skeleton that was saved by a
+    previous run with a different input or with different options.
+
+    :param arguments:
+        Command line arguments.
+    :return:
+        A dictionary of the parameters.
+    """
+
+    morphology_path = os.path.realpath(arguments.morphology)
+    return {'morphology': morphology_path,
+            'morphology_mtime': os.path.getmtime(morphology_path),
+            'block_size': arguments.block_size}
 
-    # Vasculature path
-    vasculature_morphology = '/data/morphologies/vasculature/vasculature-datas-set-2.h5'
-    #vasculature_morphology = '/computer/data/vasculature.h5'
-    #vasculature_morphology = '/data/vasculature/vasculature.h5'
+
+####################################################################################################
+# @skeletonize_vasculature
+####################################################################################################
+def skeletonize_vasculature(arguments,
+                            skeleton_directory):
+    """Loads and skeletonizes the vasculature, and saves the arrays of the skeleton. An existing
+    skeleton is reused only if it was built from the same input with the same parameters,
+    otherwise the skeleton and the meshes of its blocks are built again.
+
+    :param arguments:
+        Command line arguments.
+    :param skeleton_directory:
+        The directory of the arrays of the skeleton.
+    :return:
+        The skeleton.
+    """
+
+    # Resume from an existing skeleton
+    parameters = get_skeleton_parameters(arguments)
+    skeleton = vasculature_skeletonizer.load_skeleton_arrays(skeleton_directory, parameters)
+    if skeleton is not None:
+        print('STATUS: Using the skeleton in [%s]' % skeleton_directory)
+        return skeleton
+
+    # The blocks of a previous skeleton do not match the new one
+    vasculature_sketcher.VasculatureSketcher.clear_blocks(arguments.output_directory)
 
     # Load the morphology
-    loader = vasculature_loader.VasculatureLoader(vasculature_morphology)
+    loader = vasculature_loader.VasculatureLoader(arguments.morphology, arguments.chunk_size)
 
     # Skeletonize the morphology
-    skeletonizer = vasculature_skeletonizer.VasculatureSkeletonizer(
+    skeleton = vasculature_skeletonizer.VasculatureSkeletonizer(
         points_list=loader.points_list, segments_list=loader.segments_list,
         sections_list=loader.sections_list, connections_list=loader.connections_list)
-    skeletonizer.skeletonize()
+    skeleton.skeletonize(block_size=arguments.block_size)
+
+    # Save the arrays for the workers
+    skeleton.save_arrays(skeleton_directory, parameters)
 
     # Get the roots
-    print('Roots: %d' % len(skeletonizer.roots))
+    print('Roots: %d' % len(skeleton.roots))
+    print('Blocks: %d' % skeleton.get_number_blocks())
+
+    # Return the skeleton
+    return skeleton
+
+
+####################################################################################################
+# @run_workers
+####################################################################################################
+def run_workers(arguments):
+    """Runs the workers in background Blender processes, and waits for them.
+
+    :param arguments:
+        Command line arguments.
+    """
+
+    # Launch the workers
+    workers = list()
+    for worker_index in range(arguments.workers):
+        workers.append(subprocess.Popen(
+            [bpy.app.binary_path, '-b', '--python', os.path.realpath(__file__), '--'] +
+            sys.argv[sys.argv.index('--') + 1:] + ['--worker-index', str(worker_index)]))
+
+    # Wait for all the workers
+    for worker in workers:
+        if worker.wait() != 0:
+            print('WARNING: A worker failed, run again to resume the missing blocks')
+
+
+####################################################################################################
+# @reconstruct_vasculature
+####################################################################################################
+def reconstruct_vasculature():
+
+    # Parse the arguments
+    arguments = parse_command_line_arguments()
+
+    # The output directory
+    if arguments.output_directory is None:
+        arguments.output_directory = '%s/vasculature-meshes' % os.path.dirname(
+            os.path.realpath(arguments.morphology))
+    if not os.path.exists(arguments.output_directory):
+        os.makedirs(arguments.output_directory)
+    skeleton_directory = '%s/skeleton' % arguments.output_directory
+
+    # A worker loads the saved skeleton and meshes its blocks
+    if arguments.worker_index is not None:
+        skeleton = vasculature_skeletonizer.load_skeleton_arrays(
+            skeleton_directory, get_skeleton_parameters(arguments))
+        if skeleton is None:
+            print('ERROR: The skeleton in [%s] is missing or stale' % skeleton_directory)
+            sys.exit(1)
+        sketcher = vasculature_sketcher.VasculatureSketcher(
+            export_format=get_export_format(arguments.export_format))
+        sketcher.draw_and_save_blocks(skeleton, arguments.output_directory,
+                                      arguments.worker_index, arguments.workers)
+        return
+
+    # Clear the scene
+    nmv.scene.ops.clear_scene()
+
+    # Skeletonize the vasculature
+    skeleton = skeletonize_vasculature(arguments, skeleton_directory)
+
+    # Mesh the blocks in the worker processes, or directly in this process
+    if arguments.workers > 1 and '--' in sys.argv:
+        run_workers(arguments)
+    else:
+        sketcher = vasculature_sketcher.VasculatureSketcher(
+            export_format=get_export_format(arguments.export_format))
+        sketcher.draw_and_save_blocks(skeleton, arguments.output_directory)
 
     # Data
-    print('STATUS: Skeleton reconstruction Done !')
+    print('STATUS: Vasculature reconstruction Done !')
 
 
 reconstruct_vasculature()
-
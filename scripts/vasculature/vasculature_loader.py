@@ -16,11 +16,42 @@
 ####################################################################################################
 
 # System imports
+import numpy
 import h5py
 
-# Blender imports
-import bpy
-from mathutils import Vector
+
+####################################################################################################
+# @read_dataset_in_chunks
+####################################################################################################
+def read_dataset_in_chunks(dataset,
+                           chunk_size):
+    """Reads an HDF5 dataset into a numpy array chunk by chunk.
+
+    The array is allocated once and every chunk is read directly into it, so the memory is not
+    doubled by the temporary buffers of a single read of the whole dataset.
+
+    :param dataset:
+        An HDF5 dataset.
+    :param chunk_size:
+        The number of rows of the dataset read at once.
+    :return:
+        A numpy array with the data of the dataset.
+    """
+
+    # Allocate the array
+    data = numpy.empty(dataset.shape, dtype=dataset.dtype)
+
+    # Empty datasets are not read
+    if data.size == 0:
+        return data
+
+    # Read the chunks
+    for start in range(0, dataset.shape[0], chunk_size):
+        end = min(start + chunk_size, dataset.shape[0])
+        dataset.read_direct(data, numpy.s_[start:end], numpy.s_[start:end])
+
+    # Return the array
+    return data
 
 
 ####################################################################################################
@@ -33,27 +64,33 @@ class VasculatureLoader:
     # @__init__
     ################################################################################################
     def __init__(self,
-                 dataset):
+                 dataset,
+                 chunk_size=1000000):
         """Constructor
 
         :param dataset:
             A path to the data set to load.
+        :param chunk_size:
+            The number of rows read at once from the datasets of the file.
         """
 
         # Section index
         self.dataset = dataset
 
-        # A list of all the points in the data set
-        self.points_list = list()
+        # The number of rows read at once
+        self.chunk_size = chunk_size
+
+        # An array of all the points in the data set, x, y, z and radius
+        self.points_list = None
 
-        # A list of all the segments in the data set
-        self.segments_list = list()
+        # An array of all the segments in the data set, the indices of their two points
+        self.segments_list = None
 
-        # A list of all the sections in the data set
-        self.sections_list = list()
+        # An array of the index of the first segment of every section in the data set
+        self.sections_list = None
 
-        # A list of all the connections in the data set
-        self.connections_list = list()
+        # An array of all the connections in the data set, parent and child sections
+        self.connections_list = None
 
         # Load the dataset directly
         self.load_dataset_from_file()
@@ -67,17 +104,19 @@ class VasculatureLoader:
 
         print('STATUS: Loading dataset')
 
-        # Read the h5 file using the python module into a data array
-        data = h5py.File(self.dataset, 'r')
+        # Open the h5 file, the datasets are read chunk by chunk into arrays
+        with h5py.File(self.dataset, 'r') as data:
 
-        # A list of all the samples in the data set
-        self.points_list = data['points'].value
+            # An array of all the samples in the data set
+            self.points_list = read_dataset_in_chunks(data['points'], self.chunk_size)
 
-        # A list of all the edges or 'segments' in the data set
-        self.segments_list = data['edges'].value
+            # An array of all the edges or 'segments' in the data set
+            self.segments_list = read_dataset_in_chunks(data['edges'], self.chunk_size)
 
-        # A list of all the sections (called structures) in the data set
-        self.sections_list = data['chains']['structure'].value
+            # An array of all the sections (called structures) in the data set
+            self.sections_list = read_dataset_in_chunks(
+                data['chains']['structure'], self.chunk_size)
 
-        # A list of all the connections between the different sections in the data set
-        self.connections_list = data['chains']['connectivity'].value
+            # An array of all the connections between the different sections in the data set
+            self.connections_list = read_dataset_in_chunks(
+                data['chains']['connectivity'], self.chunk_size)
@@ -15,32 +15,38 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
 
 ####################################################################################################
 # VasculatureSection
 ####################################################################################################
 class VasculatureSection:
-    """ A morphological section represents a series of morphological samples of vasculature. """
+    """ A morphological section represents a series of morphological samples of vasculature.
+
+    The samples of the section are stored in an array with a row per sample, x, y, z and radius.
+    """
 
     ################################################################################################
     # @__init__
     ################################################################################################
     def __init__(self,
                  index,
-                 samples_list):
+                 samples):
         """Constructor
 
         :param index:
             Section index.
-        :param samples_list:
-            A list of samples that compose this section.
+        :param samples:
+            An array of the samples that compose this section, x, y, z and radius per row.
         """
 
         # Section index
         self.index = index
 
         # Segments samples (points along the section)
-        self.samples_list = samples_list
+        self.samples = numpy.asarray(samples)
 
         # A reference to the section parents, if exist
         self.parents = list()
@@ -51,6 +57,42 @@ class VasculatureSection:
         # Section name
         self.name = 'section_' + str(index)
 
+    ################################################################################################
+    # @get_points
+    ################################################################################################
+    def get_points(self):
+        """Returns the points of the samples of the section.
+
+        :return:
+            An array of the cartesian coordinates of the samples.
+        """
+
+        return self.samples[:, 0:3]
+
+    ################################################################################################
+    # @get_radii
+    ################################################################################################
+    def get_radii(self):
+        """Returns the radii of the samples of the section.
+
+        :return:
+            An array of the radii of the samples.
+        """
+
+        return self.samples[:, 3]
+
+    ################################################################################################
+    # @get_center
+    ################################################################################################
+    def get_center(self):
+        """Returns the center of the samples of the section.
+
+        :return:
+            The center of the section.
+        """
+
+        return self.get_points().mean(axis=0)
+
     ################################################################################################
     # @update_children
     ################################################################################################
@@ -15,19 +15,34 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
-# Blender import
-from mathutils import Vector
+# System imports
+import os
+import json
+import numpy
 
 # Import vasculature scripts
-import vasculature_sample
 import vasculature_section
 
 
 ####################################################################################################
-# VasculatureSection
+# VasculatureSkeletonizer
 ####################################################################################################
 class VasculatureSkeletonizer:
-    """Vasculature skeletonization class."""
+    """Vasculature skeletonization class.
+
+    The skeleton is kept in arrays. The samples of all the sections are concatenated into a single
+    array of point indices with an array of offsets per section, the connections between the
+    sections are represented with short joints of two samples, and the sections are tiled into
+    spatial blocks that are meshed independently.
+    """
+
+    # The names of the arrays that are saved to disk for the workers
+    SKELETON_ARRAYS = ['points', 'sections_samples', 'sections_offsets', 'joints', 'roots',
+                       'blocks_keys', 'blocks_sections', 'blocks_sections_offsets',
+                       'blocks_joints', 'blocks_joints_offsets']
+
+    # The manifest of the saved arrays, written last to mark the set of arrays as complete
+    SKELETON_MANIFEST = 'manifest.json'
 
     ################################################################################################
     # @__init__
@@ -40,204 +55,286 @@ class VasculatureSkeletonizer:
         """Constructor
 
         :param points_list:
-            A list of all the points in the morphology skeleton.
+            An array of all the points in the morphology skeleton.
         :param segments_list:
-            A list of all the edges in the morphology skeleton.
+            An array of all the edges in the morphology skeleton.
         :param sections_list:
-            A list of all the sections in the morphology skeleton.
+            An array of the first edge of all the sections in the morphology skeleton.
         :param connections_list:
-            A list of all the connections in the morphology skeleton.
+            An array of all the connections in the morphology skeleton.
         """
 
-        # A list of all the points in the morphology
-        self.morphology_points_list = points_list
+        # An array of all the points in the morphology, x, y, z and radius
+        self.points = points_list
 
-        # A list of all the segments in the morphology
+        # An array of all the segments in the morphology
         self.morphology_segments_list = segments_list
 
-        # A list of all the sections in the morphology
+        # An array of all the sections in the morphology
         self.morphology_sections_list = sections_list
 
-        # A list of all the connections in the morphology
+        # An array of all the connections in the morphology
         self.morphology_connections_list = connections_list
 
-        # A list of all the sections in the vasculature morphology
-        self.sections_list = list()
+        # The indices of the points of all the sections, concatenated section by section
+        self.sections_samples = None
+
+        # The offset of every section into the samples, with an extra entry for the end
+        self.sections_offsets = None
 
-        # A list of all the auxiliary sections that were added from the connectivity data
-        self.auxiliary_sections_list = list()
+        # The index of every section after ignoring the empty ones, or -1 if it is empty
+        self.valid_sections = None
 
-        # A list of all the root sections into the skeleton that can give us access to the rest
+        # The indices of the two points of the joint of every connection between two sections
+        self.joints = None
+
+        # The child section of every joint
+        self.joints_children = None
+
+        # The indices of the root sections into the skeleton that can give us access to the rest
         # of the sections
-        self.roots = list()
+        self.roots = None
+
+        # The integer coordinates of the spatial blocks
+        self.blocks_keys = None
+
+        # The indices of the sections of the blocks, concatenated block by block, and their offsets
+        self.blocks_sections = None
+        self.blocks_sections_offsets = None
+
+        # The indices of the joints of the blocks, concatenated block by block, and their offsets
+        self.blocks_joints = None
+        self.blocks_joints_offsets = None
 
     ################################################################################################
-    # @get_sample_on_segment
+    # @get_number_sections
     ################################################################################################
-    def get_sample_on_segment(self,
-                              sample_index):
-        """Returns an object of VasculatureSample using its index from the morphology samples list.
+    def get_number_sections(self):
+        """Returns the number of the sections in the skeleton.
 
-        :param sample_index:
-            The index of the sample.
         :return:
-            Returns an object of VasculatureSample using its index from the morphology samples list.
+            The number of the sections in the skeleton.
         """
 
-        # The coordinates of the first sample
-        x = self.morphology_points_list[sample_index][0]
-        y = self.morphology_points_list[sample_index][1]
-        z = self.morphology_points_list[sample_index][2]
-
-        # The cartesian coordinates of the sample
-        point = Vector((x, y, z))
-
-        # The radius of the first sample
-        radius = self.morphology_points_list[sample_index][3]
-
-        # Construct a new sample and return a reference to it
-        return vasculature_sample.VasculatureSample(sample_index, point, radius)
+        return len(self.sections_offsets) - 1
 
     ################################################################################################
-    # @get_samples_on_section
+    # @get_number_blocks
     ################################################################################################
-    def get_samples_on_section(self,
-                               initial_segment_index,
-                               final_segment_index):
-        """Returns a list of all the samples belonging to a section that is composed of a set of
-        connected segments.
+    def get_number_blocks(self):
+        """Returns the number of the spatial blocks of the skeleton.
 
-        :param initial_segment_index:
-            The index of the initial segment along the section.
-        :param final_segment_index:
-            The index of the final segment along the section.
         :return:
-            Returns a list of all the samples that belong to the section.
+            The number of the blocks.
         """
 
-        # A list of all the samples along the section
-        section_samples_list = list()
+        return len(self.blocks_keys)
 
-        # Traverse the section, segment by segment
-        for i_segment in range(initial_segment_index, final_segment_index):
+    ################################################################################################
+    # @get_section_samples
+    ################################################################################################
+    def get_section_samples(self,
+                            section_index):
+        """Returns the samples of a section.
 
-            # Get the first sample along the segment
-            sample = self.get_sample_on_segment(self.morphology_segments_list[i_segment][0])
+        :param section_index:
+            The index of the section.
+        :return:
+            An array of the samples of the section, x, y, z and radius per row.
+        """
 
-            # Add the sample to the samples list
-            section_samples_list.append(sample)
+        # The indices of the points of the section
+        start = self.sections_offsets[section_index]
+        end = self.sections_offsets[section_index + 1]
 
-        # Return a reference to the samples list along the section
-        return section_samples_list
+        # The samples
+        return self.points[self.sections_samples[start:end]]
 
     ################################################################################################
-    # @build_sections_list
+    # @get_section
     ################################################################################################
-    def build_sections_list(self):
-        """Builds a list of all the sections in the morphology to be able to skeletonize it
+    def get_section(self,
+                    section_index):
+        """Returns a VasculatureSection object of a section.
+
+        :param section_index:
+            The index of the section.
+        :return:
+            A VasculatureSection object.
         """
 
-        print('STATUS: Build sections list')
+        return vasculature_section.VasculatureSection(
+            section_index, self.get_section_samples(section_index))
 
-        # For each section in the morphology sections list
-        for i_section in range(len(self.morphology_sections_list) - 1):
+    ################################################################################################
+    # @get_block_polylines
+    ################################################################################################
+    def get_block_polylines(self,
+                            block_index):
+        """Returns the samples of the sections and the joints of a block.
 
-            # The index of the first segment (or edge) along the section
-            initial_segment_index = self.morphology_sections_list[i_section]
+        :param block_index:
+            The index of the block.
+        :return:
+            A list of arrays of samples, one per section or joint of the block.
+        """
 
-            # The index of the last segment (or edge) along the section
-            final_segment_index = self.morphology_sections_list[i_section + 1]
+        polylines = list()
 
-            # Get a list that has all the samples of the section
-            section_samples_list = self.get_samples_on_section(initial_segment_index,
-                                                               final_segment_index)
+        # The sections
+        start = self.blocks_sections_offsets[block_index]
+        end = self.blocks_sections_offsets[block_index + 1]
+        for section_index in self.blocks_sections[start:end]:
+            polylines.append(self.get_section_samples(section_index))
 
-            # Construct the section
-            section = vasculature_section.VasculatureSection(i_section, section_samples_list)
+        # The joints
+        start = self.blocks_joints_offsets[block_index]
+        end = self.blocks_joints_offsets[block_index + 1]
+        for joint_index in self.blocks_joints[start:end]:
+            polylines.append(self.points[self.joints[joint_index]])
 
-            # Add the section to the final list
-            self.sections_list.append(section)
+        # Return the list
+        return polylines
 
     ################################################################################################
-    # @construct_auxiliary_section
+    # @build_sections_list
     ################################################################################################
-    def construct_auxiliary_section(self,
-                                    parent_section,
-                                    child_section):
-        """Construct an auxiliary section that connects the parent to the child, and add it to
-        the auxiliary sections list.
+    def build_sections_list(self):
+        """Builds the arrays of the samples of all the sections in the morphology.
 
-        :param parent_section:
-            A reference to the parent section.
-        :param child_section:
-            A reference to the child section.
+        A section is composed of the first points of its segments followed by the last point of
+        its last segment. The empty sections are ignored.
         """
 
-        # A list of samples
-        section_samples_list = list()
-
-        # Add the parent section samples
-        section_samples_list.extend(parent_section.samples_list)
-
-        # Add the child section samples
-        section_samples_list.extend(child_section.samples_list)
-
-        # Construct the section
-        section = vasculature_section.VasculatureSection(-1, section_samples_list)
-        section.name = 'section_' + str(parent_section.index) + '_' + str(child_section.index)
+        print('STATUS: Build sections list')
 
-        # Add the section to the auxiliary sections list
-        self.auxiliary_sections_list.append(section)
+        # The first segment of every section, the last section ends at the last segment
+        segments = self.morphology_segments_list
+        sections = numpy.asarray(self.morphology_sections_list).reshape(
+            len(self.morphology_sections_list), -1)[:, 0].astype(numpy.int64)
+        starts = sections
+        ends = numpy.append(sections[1:], len(segments))
+
+        # Ignore the empty sections
+        valid = ends > starts
+        starts = starts[valid]
+        ends = ends[valid]
+
+        # The offsets of the sections
+        lengths = ends - starts + 1
+        self.sections_offsets = numpy.zeros(len(lengths) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=self.sections_offsets[1:])
+
+        # The position of every sample along its section and the segment it belongs to
+        positions = numpy.arange(self.sections_offsets[-1]) - \
+            numpy.repeat(self.sections_offsets[:-1], lengths)
+        samples_segments = numpy.repeat(starts, lengths) + positions
+
+        # The last sample of a section is the second point of the last segment
+        last = positions == numpy.repeat(lengths - 1, lengths)
+        samples_segments[last] -= 1
+        self.sections_samples = numpy.where(last, segments[samples_segments, 1],
+                                            segments[samples_segments, 0])
+
+        # Keep the original indices of the sections for the connectivity
+        self.valid_sections = numpy.full(len(sections), -1, dtype=numpy.int64)
+        self.valid_sections[valid] = numpy.arange(len(starts))
 
     ################################################################################################
     # @build_skeleton_trees
     ################################################################################################
     def build_skeleton_trees(self):
-        """Use the connectivity data to build the trees of the different structures in the data.
+        """Use the connectivity data to build the joints between the sections and find the roots.
+
+        A joint connects the closest terminals of the parent and the child sections, the joints of
+        the sections that already share a point are ignored.
         """
 
         print('STATUS: Build skeletons trees')
 
-        # For each connection in the data
-        for i_connection in range(len(self.morphology_connections_list)):
-
-            # Get the index of the parent
-            parent_index = self.morphology_connections_list[i_connection][0]
-
-            # Get the index of the child
-            child_index = self.morphology_connections_list[i_connection][1]
-
-            # Update the children list
-            # self.sections_list[parent_index].update_children(self.sections_list[child_index])
+        # The parents and the children of the connections, within the valid sections
+        connections = numpy.asarray(self.morphology_connections_list, dtype=numpy.int64)
+        connections = connections.reshape(-1, 2)
+        parents = self.valid_sections[connections[:, 0]]
+        children = self.valid_sections[connections[:, 1]]
+        valid = (parents >= 0) & (children >= 0)
+        parents = parents[valid]
+        children = children[valid]
+
+        # The terminal points of the sections
+        first_samples = self.sections_samples[self.sections_offsets[:-1]]
+        last_samples = self.sections_samples[self.sections_offsets[1:] - 1]
+
+        # The candidate joints between the terminals of the parents and the children
+        candidates = numpy.stack([
+            numpy.stack([last_samples[parents], first_samples[children]], axis=-1),
+            numpy.stack([last_samples[parents], last_samples[children]], axis=-1),
+            numpy.stack([first_samples[parents], first_samples[children]], axis=-1),
+            numpy.stack([first_samples[parents], last_samples[children]], axis=-1)], axis=1)
+
+        # Use the closest terminals
+        points = self.points[:, 0:3]
+        distances = numpy.linalg.norm(
+            points[candidates[:, :, 0]] - points[candidates[:, :, 1]], axis=-1)
+        closest = numpy.argmin(distances, axis=1)
+        joints = candidates[numpy.arange(len(candidates)), closest]
+        lengths = distances[numpy.arange(len(candidates)), closest]
+
+        # The joints of the sections that share a point are not needed
+        self.joints = joints[lengths > 0]
+        self.joints_children = children[lengths > 0]
+
+        # The roots are the sections that are never a child
+        self.roots = numpy.setdiff1d(numpy.arange(self.get_number_sections()), children)
 
-            # Update the parent from None to a specific parent, otherwise it is a root
-            # self.sections_list[child_index].update_parents(self.sections_list[parent_index])
-
-            # Get the parent section
-            parent_section = self.sections_list[parent_index]
-
-            # Get the child section
-            child_section = self.sections_list[child_index]
-
-            # Construct the connectivity section from the parent and child
-            self.construct_auxiliary_section(parent_section, child_section)
-
-        # Updating the roots
-        """ 
-        for section in self.sections_list:
-
-            # If the section has no parent
-            if not section.has_parents():
+    ################################################################################################
+    # @tile_into_blocks
+    ################################################################################################
+    def tile_into_blocks(self,
+                         block_size):
+        """Tiles the sections into cubic blocks by their centers. Every joint belongs to the block
+        of its child section.
 
-                # Add him to the root list
-                self.roots.append(section)
+        :param block_size:
+            The size of a block in microns.
         """
 
+        print('STATUS: Tile the sections into blocks')
+
+        # The centers of the sections
+        points = self.points[self.sections_samples, 0:3].astype(numpy.float64)
+        lengths = numpy.diff(self.sections_offsets)
+        centers = numpy.add.reduceat(points, self.sections_offsets[:-1], axis=0) / \
+            lengths[:, None]
+
+        # The block of every section
+        keys = numpy.floor(centers / block_size).astype(numpy.int64)
+        self.blocks_keys, sections_blocks = numpy.unique(keys, axis=0, return_inverse=True)
+        sections_blocks = sections_blocks.ravel()
+        number_blocks = len(self.blocks_keys)
+
+        # Group the sections per block
+        self.blocks_sections = numpy.argsort(sections_blocks, kind='mergesort')
+        self.blocks_sections_offsets = numpy.zeros(number_blocks + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(sections_blocks, minlength=number_blocks),
+                     out=self.blocks_sections_offsets[1:])
+
+        # Group the joints per block
+        joints_blocks = sections_blocks[self.joints_children]
+        self.blocks_joints = numpy.argsort(joints_blocks, kind='mergesort')
+        self.blocks_joints_offsets = numpy.zeros(number_blocks + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(joints_blocks, minlength=number_blocks),
+                     out=self.blocks_joints_offsets[1:])
+
     ################################################################################################
     # @skeletonize
     ################################################################################################
-    def skeletonize(self):
+    def skeletonize(self,
+                    block_size=None):
         """Skeletonizes the vasculature morphology.
+
+        :param block_size:
+            If given, the sections are tiled into blocks of this size in microns.
         """
 
         # Build the sections list
@@ -246,4 +343,79 @@ class VasculatureSkeletonizer:
         # Build the trees
         self.build_skeleton_trees()
 
+        # Tile the sections
+        if block_size is not None:
+            self.tile_into_blocks(block_size)
+
+    ################################################################################################
+    # @save_arrays
+    ################################################################################################
+    def save_arrays(self,
+                    directory,
+                    parameters=None):
+        """Saves the arrays of the skeleton to a directory, to be memory-mapped by the workers.
+
+        :param directory:
+            The directory where the arrays are saved.
+        :param parameters:
+            A dictionary of the parameters the skeleton was built with, saved in the manifest to
+            detect a stale skeleton. The values must be serializable to JSON.
+        """
+
+        # Create the directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
 
+        # Remove the manifest first, the arrays are incomplete until the new one is written
+        manifest_path = '%s/%s' % (directory, self.SKELETON_MANIFEST)
+        if os.path.isfile(manifest_path):
+            os.remove(manifest_path)
+
+        # Save the arrays, every rename is atomic, but the set is only complete with the manifest
+        for name in self.SKELETON_ARRAYS:
+            numpy.save('%s/%s.tmp.npy' % (directory, name), getattr(self, name))
+            os.replace('%s/%s.tmp.npy' % (directory, name), '%s/%s.npy' % (directory, name))
+
+        # Write the manifest last, and rename it into place once it is written
+        with open('%s.tmp' % manifest_path, 'w') as manifest_file:
+            json.dump({'arrays': self.SKELETON_ARRAYS, 'parameters': parameters}, manifest_file,
+                      indent=4, sort_keys=True)
+        os.replace('%s.tmp' % manifest_path, manifest_path)
+
+
+####################################################################################################
+# @load_skeleton_arrays
+####################################################################################################
+def load_skeleton_arrays(directory,
+                         parameters=None):
+    """Loads a skeleton that was saved with save_arrays. The arrays are memory-mapped.
+
+    :param directory:
+        The directory of the arrays.
+    :param parameters:
+        If given, the parameters the skeleton must have been built with.
+    :return:
+        A VasculatureSkeletonizer with the loaded arrays, or None if the arrays are incomplete or
+        if they were built with different parameters.
+    """
+
+    # The manifest marks a complete set of arrays
+    manifest_path = '%s/%s' % (directory, VasculatureSkeletonizer.SKELETON_MANIFEST)
+    if not os.path.isfile(manifest_path):
+        return None
+    with open(manifest_path, 'r') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    # The arrays must have been saved with the same parameters
+    if parameters is not None and manifest['parameters'] != parameters:
+        return None
+    if manifest['arrays'] != VasculatureSkeletonizer.SKELETON_ARRAYS:
+        return None
+
+    # Load the arrays
+    skeletonizer = VasculatureSkeletonizer(None, None, None, None)
+    for name in VasculatureSkeletonizer.SKELETON_ARRAYS:
+        setattr(skeletonizer, name, numpy.load('%s/%s.npy' % (directory, name), mmap_mode='r'))
+
+    # Return the skeleton
+    return skeletonizer
@@ -15,125 +15,222 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import os
+import glob
+import numpy
+
 # Blender imports
-from mathutils import Vector
+import bpy
 
 # NeuroMorphoVis imports
 import nmv
-import nmv.geometry
+import nmv.enums
 import nmv.mesh
 import nmv.file
 import nmv.scene
 
-# Import vasculature scripts
-import vasculature_sample
-import vasculature_section
-
 
 ####################################################################################################
 # VasculatureSketcher
 ####################################################################################################
 class VasculatureSketcher:
-    """Vasculature sketching class."""
+    """Vasculature sketching class.
+
+    The sections of every spatial block of the skeleton are drawn as the splines of a single curve,
+    which is converted into one mesh and exported to one file per block. A marker file is written
+    once the mesh of a block is exported, and the blocks that have a marker are skipped, so an
+    interrupted run can be resumed.
+    """
 
     ################################################################################################
     # @__init__
     ################################################################################################
     def __init__(self,
-                 bevel_object):
+                 bevel_sides=16,
+                 export_format=nmv.enums.Meshing.ExportFormat.PLY):
         """Constructor.
 
-        :param bevel_object:
-            Input bevel object.
+        :param bevel_sides:
+            The number of the sides of the cross section of the tubes.
+        :param export_format:
+            The format of the exported meshes.
         """
 
-        self.bevel_object = bevel_object
+        # The number of the sides of the bevel object
+        self.bevel_sides = bevel_sides
+
+        # The format of the meshes
+        self.export_format = export_format
 
     ################################################################################################
-    # @sketch_section
+    # @get_block_name
     ################################################################################################
-    def sketch_section(self,
-                       section):
-        """Sketches the section as a tube
+    @staticmethod
+    def get_block_name(block_key):
+        """Returns the name of a block from its integer coordinates.
 
-        :param section:
-            A given vasculature section.
+        :param block_key:
+            The integer coordinates of the block.
         :return:
-            A reference to the section polyline.
+            The name of the block.
         """
 
-        # Construct the poly-line data
-        poly_line_data = list()
+        return 'block_%d_%d_%d' % (block_key[0], block_key[1], block_key[2])
 
-        # Append the samples
-        for sample in section.samples_list:
-            poly_line_data.append([(sample.point[0], sample.point[1], sample.point[2], 1),
-                                   sample.radius])
+    ################################################################################################
+    # @is_block_done
+    ################################################################################################
+    @staticmethod
+    def is_block_done(output_directory,
+                      block_name):
+        """Checks if the mesh of a block was already exported.
 
-        bevel_object = nmv.mesh.create_bezier_circle(radius=1.0, vertices=16, name='bevel')
+        :param output_directory:
+            Output directory.
+        :param block_name:
+            The name of the block.
+        :return:
+            True if the block is done, and False otherwise.
+        """
 
-        # Draw a polyline
-        section_polyline = nmv.geometry.ops.draw_poly_line(poly_line_data,
-                                                           bevel_object=bevel_object,
-                                                           name=section.name,
-                                                           caps=True)
-        return section_polyline
+        return os.path.isfile('%s/%s.done' % (output_directory, block_name))
 
     ################################################################################################
-    # @sketch_section
+    # @clear_blocks
     ################################################################################################
-    def draw_and_save_section(self,
-                              section,
-                              output_directory):
-        """Draw and save the section.
+    @staticmethod
+    def clear_blocks(output_directory):
+        """Removes the meshes of all the blocks and their markers, including the meshes of the
+        blocks that were interrupted, to mesh the blocks again from a new skeleton.
 
-        :param section:
-            Input section.
         :param output_directory:
-            Output directory
+            The output directory of the blocks.
         """
 
-        # Construct the section polyline
-        section_polyline = self.sketch_section(section)
+        # Remove the markers first, a block is never marked as done without its mesh
+        for marker_path in glob.glob('%s/block_*.done' % output_directory):
+            os.remove(marker_path)
 
-        # Convert the section polyline into a mesh
-        section_mesh = nmv.scene.ops.convert_object_to_mesh(section_polyline)
+        # Remove the meshes
+        for mesh_path in glob.glob('%s/block_*' % output_directory):
+            os.remove(mesh_path)
 
-        # Save the section mesh into file
-        nmv.file.export_object_to_ply_file(section_mesh, output_directory, section.name)
+    ################################################################################################
+    # @sketch_polylines
+    ################################################################################################
+    def sketch_polylines(self,
+                         polylines,
+                         name):
+        """Sketches a list of polylines as the splines of a single curve object.
+
+        :param polylines:
+            A list of arrays of samples, x, y, z and radius per row.
+        :param name:
+            The name of the curve object.
+        :return:
+            A reference to the curve object.
+        """
+
+        # A single bevel object is used by all the splines
+        bevel_object = nmv.mesh.create_bezier_circle(
+            radius=1.0, vertices=self.bevel_sides, name='bevel')
+
+        # Setup the curve data, as in nmv.geometry.ops.draw_poly_line
+        curve_data = bpy.data.curves.new(name=name, type='CURVE')
+        curve_data.dimensions = '3D'
+        curve_data.fill_mode = 'FULL'
+        curve_data.bevel_depth = 1.0
+        curve_data.bevel_object = bevel_object
+        curve_data.use_fill_caps = True
+
+        # Add a spline per polyline, the points are set in bulk
+        for samples in polylines:
+            spline = curve_data.splines.new('POLY')
+            spline.points.add(len(samples) - 1)
+            points = numpy.ones((len(samples), 4), dtype=numpy.float32)
+            points[:, 0:3] = samples[:, 0:3]
+            spline.points.foreach_set('co', points.ravel())
+            spline.points.foreach_set('radius', numpy.ascontiguousarray(
+                samples[:, 3], dtype=numpy.float32))
+
+        # Create the object and link it to the scene
+        curve_object = bpy.data.objects.new(name, curve_data)
+        bpy.context.scene.objects.link(curve_object)
+
+        # Return a reference to the curve
+        return curve_object
 
     ################################################################################################
-    # @sketch_section
+    # @draw_and_save_block
     ################################################################################################
-    def draw_and_save_sections(self,
-                               sections_list,
-                               output_directory,
-                               portion,
-                               max_portions):
-        """Draws and saves the section as a ply file.
-
-        :param sections_list:
-            Input list of sections to be drawn.
+    def draw_and_save_block(self,
+                            skeleton,
+                            block_index,
+                            output_directory):
+        """Draws the sections of a block and saves them into a single mesh file.
+
+        :param skeleton:
+            A skeletonized vasculature, with its blocks.
+        :param block_index:
+            The index of the block.
         :param output_directory:
             Output directory.
         """
 
-        portion_size = int(float(len(sections_list)) / max_portions)
+        # The name of the block
+        block_name = self.get_block_name(skeleton.blocks_keys[block_index])
 
-        start_index = portion * portion_size
-        end_index = start_index + portion_size
+        # Clear the scene
+        nmv.scene.ops.clear_scene()
 
-        # For each section
-        for i in range(start_index, end_index):
+        # Construct the curve of the block
+        block_curve = self.sketch_polylines(skeleton.get_block_polylines(block_index), block_name)
 
-            if i >= len(sections_list):
-                break
+        # Convert the curve into a mesh
+        block_mesh = nmv.scene.ops.convert_object_to_mesh(block_curve)
 
-            # Indication
-            print('%d/%d' % (i, end_index))
+        # Save the block mesh into file
+        nmv.file.export_mesh_object_to_file(
+            block_mesh, output_directory, block_name, self.export_format)
 
-            # Clear the scene
-            nmv.scene.clear_scene()
+        # Mark the block as done
+        open('%s/%s.done' % (output_directory, block_name), 'w').close()
+
+    ################################################################################################
+    # @draw_and_save_blocks
+    ################################################################################################
+    def draw_and_save_blocks(self,
+                             skeleton,
+                             output_directory,
+                             worker_index=0,
+                             number_workers=1):
+        """Draws and saves the blocks of a worker, one mesh file per block. The blocks are shared
+        between the workers in a round-robin fashion, and the blocks that are done are skipped.
+
+        :param skeleton:
+            A skeletonized vasculature, with its blocks.
+        :param output_directory:
+            Output directory.
+        :param worker_index:
+            The index of this worker.
+        :param number_workers:
+            The number of the workers.
+        """
+
+        # The blocks of the worker
+        blocks = range(worker_index, skeleton.get_number_blocks(), number_workers)
+
+        # For each block
+        for i, block_index in enumerate(blocks):
+
+            # Skip the completed blocks
+            block_name = self.get_block_name(skeleton.blocks_keys[block_index])
+            if self.is_block_done(output_directory, block_name):
+                continue
+
+            # Indication
+            print('Worker %d: %d/%d [%s]' % (worker_index, i + 1, len(blocks), block_name))
 
-            # Draw and save the section
-            self.draw_and_save_section(sections_list[i], output_directory)
+            # Draw and save the block
+            self.draw_and_save_block(skeleton, block_index, output_directory)